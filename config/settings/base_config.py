@@ -203,10 +203,16 @@ TRADINGAGENTS_CONFIG = {
     'max_debate_rounds': 1,                      # Rounds of agent debate (more = deeper analysis)
     'max_risk_discuss_rounds': 1,                # Risk assessment rounds
     'max_recur_limit': 100,                      # Max recursion depth
+    'parallel_analysts': True,                   # Market/social/news/fundamentals analysts run concurrently
     'online_tools': True,                        # Use live data (False = cached only)
+    'memoize_tools': True,                       # Reuse identical tool calls across agents/candidates per trade date
     'results_dir': str(RESULTS_DIR),
     'data_dir': str(DATA_DIR),
     'data_cache_dir': str(CACHE_DIR),
+    'llm_cache_enabled': False,                  # Replay identical LLM calls from disk (reruns, debugging)
+    'llm_cache_path': str(CACHE_DIR / "llm_cache.db"),
+    'llm_cache_ttl_hours': 24 * 7,               # Cached responses expire after a week
+    'llm_cache_max_mb': 512,                     # Least recently used responses evicted past this size
 }
 
 # =============================================================================
@@ -245,6 +251,12 @@ DEFAULT_ANALYSIS_DATE = "2024-12-19"  # Default date for backtesting
 BATCH_SIZE = 50                # Process 50 stocks at a time
 BATCH_TIMEOUT = 300            # 5 minutes timeout per batch
 
+# TradingAgents candidate analysis (BatchProcessor.process_batch)
+TRADINGAGENTS_MAX_PARALLEL = 4       # Candidates analyzed at once (1 = one at a time)
+TRADINGAGENTS_SYMBOL_TIMEOUT = 900   # Seconds before one symbol's analysis is abandoned
+TRADINGAGENTS_PREFETCH_ENABLED = True  # Fetch prices/news/fundamentals for the whole batch up front
+TRADINGAGENTS_PREFETCH_WORKERS = 8     # Concurrent prefetch calls
+
 # =============================================================================
 # MARKET REGIME SETTINGS
 # =============================================================================
@@ -287,6 +299,47 @@ EXPECTED_WIN_RATES = {
     'extreme_greed': 0.55       # Lower win rate at tops
 }
 
+# Layer 2 scoring specs, compiled to NumPy by src/core/stock_screening/scoring_spec.py
+# Factor: column + weight, optional clip (lo, hi) and normalize over range (defaults to clip)
+#   'rising' -> (x - lo) / (hi - lo), 'falling' -> (hi - x) / (hi - lo), 'peak' -> 1 at mid, 0 at ends
+#   {'above': other} -> 1.0 where column > other
+# Blend factors mix in as score * (1 - weight) + factor * weight when their columns exist
+SCORING_SPECS = {
+    'mean_reversion': {         # Fear: lower RSI, quality, volume spike
+        'factors': [
+            {'column': 'rsi_2', 'weight': 0.5, 'clip': (0, 30), 'normalize': 'falling'},
+            {'column': 'quality_score', 'weight': 0.3},
+            {'column': 'volume_ratio', 'weight': 0.2, 'clip': (0, 3), 'normalize': 'rising'}
+        ]
+    },
+    'balanced': {               # Neutral: quality, volume, RSI near 50
+        'factors': [
+            {'column': 'quality_score', 'weight': 0.33},
+            {'column': 'volume_ratio', 'weight': 0.33, 'clip': (0, 2), 'normalize': 'rising'},
+            {'column': 'rsi_2', 'weight': 0.34, 'normalize': 'peak', 'range': (0, 100)}
+        ]
+    },
+    'momentum': {               # Greed: higher RSI, volume confirmation, quality
+        'factors': [
+            {'column': 'rsi_2', 'weight': 0.4, 'clip': (50, 100), 'normalize': 'rising'},
+            {'column': 'volume_ratio', 'weight': 0.3, 'clip': (0, 2), 'normalize': 'rising'},
+            {'column': 'quality_score', 'weight': 0.3}
+        ],
+        'blend': [
+            {'column': 'price', 'weight': 0.2, 'above': 'sma_20'}   # Bonus above the 20-day MA
+        ]
+    }
+}
+
+# Scoring spec used by each regime
+REGIME_SCORING = {
+    'extreme_fear': 'mean_reversion',
+    'fear': 'mean_reversion',
+    'neutral': 'balanced',
+    'greed': 'momentum',
+    'extreme_greed': 'momentum'
+}
+
 # =============================================================================
 # TRADING PARAMETERS
 # =============================================================================
@@ -320,6 +373,10 @@ STOP_LOSS_MULTIPLIERS = {
 
 CNN_FG_URL = "https://production.dataviz.cnn.io/index/fearandgreed/graphdata"
 CNN_FG_CACHE_DURATION = 900    # Cache for 15 minutes
+VIX_QUOTE_URL = "https://query1.finance.yahoo.com/v8/finance/chart/%5EVIX"  # Light quote endpoint
+REGIME_CONNECT_TIMEOUT = 3.05  # Seconds to connect to CNN / Yahoo
+REGIME_READ_TIMEOUT = 5        # Seconds to wait for a response
+REGIME_HTTP_POOL_SIZE = 4      # Pooled keep-alive connections per host
 
 # =============================================================================
 # S&P 500 DATA SOURCE
@@ -327,6 +384,99 @@ CNN_FG_CACHE_DURATION = 900    # Cache for 15 minutes
 
 SP500_CSV_URL = "https://raw.githubusercontent.com/datasets/s-and-p-500-companies/main/data/constituents.csv"
 
+# =============================================================================
+# SCREENING UNIVERSE
+# =============================================================================
+# Larger universes go through a two-tier screen: a cheap price/volume snapshot
+# applies the hard constraints, and only survivors get the full history download.
+# Small universes on the incremental bar store skip it (their download is already cheap)
+
+UNIVERSE = "sp500"             # 'sp500' | 'russell3000' | 'us_listed'
+RUSSELL3000_HOLDINGS_URL = (
+    "https://www.ishares.com/us/products/239714/ishares-russell-3000-etf/"
+    "1467271812596.ajax?fileType=csv&fileName=IWV_holdings&dataType=fund"
+)
+US_LISTED_URLS = [             # (Nasdaq Trader symbol directory, symbol column)
+    ("https://www.nasdaqtrader.com/dynamic/SymDir/nasdaqlisted.txt", "Symbol"),
+    ("https://www.nasdaqtrader.com/dynamic/SymDir/otherlisted.txt", "ACT Symbol"),
+]
+SNAPSHOT_SCREEN_MIN_UNIVERSE = 1000  # Bar store on: screen universes this large (None = never)
+SNAPSHOT_DAYS = 7              # Calendar days of bars in the snapshot pass
+SNAPSHOT_BATCH_SIZE = 200      # Tickers per snapshot request (short window, so larger batches)
+
+# =============================================================================
+# SHARED MARKET DATA CACHE
+# =============================================================================
+# Regime, Fear & Greed and VIX are cached once for every component and process
+# Fresh for CACHE_DURATION, then served stale while one process refreshes
+
+SHARED_CACHE_BACKEND = "sqlite"    # 'sqlite' | 'redis' (REDIS_HOST/PORT/PASSWORD/DB env vars)
+SHARED_CACHE_PATH = DATA_DIR / "cache" / "shared_cache.db"
+SHARED_CACHE_STALE_TTL = 6 * 3600  # Oldest value served while a background refresh runs
+SHARED_CACHE_LOCK_TTL = 60         # Seconds before an abandoned refresh lock can be taken over
+SHARED_CACHE_WAIT_TIMEOUT = 30     # Seconds to wait for another process's refresh
+
+# =============================================================================
+# LOCAL BAR STORE (INCREMENTAL PRICE HISTORY)
+# =============================================================================
+# Daily OHLCV bars are kept locally so each run only downloads new bars
+
+BAR_STORE_ENABLED = True       # False = download the full window every run
+BAR_STORE_PATH = DATA_DIR / "market_data" / "daily_bars.db"
+BAR_HISTORY_DAYS = 60          # Calendar days of history used for indicators
+BAR_OVERLAP_DAYS = 5           # Re-fetch this many days to catch split/dividend restatements
+BAR_STORE_RETENTION_DAYS = 400 # Keep ~13 months of daily bars
+
+# =============================================================================
+# MARKET DATA DOWNLOAD SCHEDULER
+# =============================================================================
+# Concurrent yfinance batches behind an adaptive token-bucket rate limiter
+
+DOWNLOAD_BATCH_SIZE = 50       # Tickers per yf.download call
+DOWNLOAD_MAX_WORKERS = 4       # Batches in flight at once
+DOWNLOAD_RATE_PER_SEC = 2.0    # Starting request rate (tokens per second)
+DOWNLOAD_MIN_RATE = 0.2        # Floor the rate backs off to when throttled
+DOWNLOAD_MAX_RATE = 4.0        # Ceiling the rate recovers to
+DOWNLOAD_THROTTLE_COOLDOWN = 10  # Seconds all workers pause after a throttle response
+DOWNLOAD_MAX_RETRIES = 3       # Retries per ticker before it is reported as failed
+DOWNLOAD_EMPTY_BATCH_THROTTLE = 3  # Consecutive empty first-attempt batches read as silent throttling
+
+# =============================================================================
+# SQLITE CONCURRENCY SETTINGS
+# =============================================================================
+# WAL lets dashboard/monitor readers run alongside the nightly pipeline writes
+
+SQLITE_JOURNAL_MODE = "WAL"        # WAL = readers never block the writer (DELETE = legacy)
+SQLITE_SYNCHRONOUS = "NORMAL"      # Safe with WAL; FULL fsyncs every commit
+SQLITE_CACHE_SIZE_KB = 65536       # Page cache per connection (64 MB)
+SQLITE_MMAP_SIZE = 268435456       # Memory-map up to 256 MB of the database file
+SQLITE_BUSY_TIMEOUT_MS = 5000      # Wait this long for a lock before raising
+
+# =============================================================================
+# STOCK METRICS PARTITIONING & RETENTION
+# =============================================================================
+# Raw snapshots live in monthly partitions; older months are rolled up into
+# per-symbol daily summaries (stock_metrics_daily) and dropped whole
+
+STOCK_METRICS_RAW_RETENTION_MONTHS = 3   # Full months of raw snapshots kept besides the current one
+STOCK_METRICS_PARTITIONS_AHEAD = 1       # Future monthly partitions created in advance
+
+# =============================================================================
+# WEB DASHBOARD SETTINGS
+# =============================================================================
+# Dashboard queries run on a dedicated thread pool so the event loop never blocks
+
+DASHBOARD_DB_WORKERS = 4           # Reader threads (each holds its own read-only connection)
+DASHBOARD_SEND_TIMEOUT = 5.0       # Seconds before a slow websocket client is dropped
+DASHBOARD_UPDATE_INTERVAL = 30     # Seconds between broadcast updates
+
+# =============================================================================
+# PERFORMANCE OBSERVER SETTINGS
+# =============================================================================
+# Buffered mode collects stage decisions in memory and writes them in bulk
+
+OBSERVER_BUFFER_SIZE = 500         # Pending decisions that trigger an early flush
+
 # =============================================================================
 # LOGGING CONFIGURATION
 # =============================================================================
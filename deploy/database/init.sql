@@ -26,17 +26,39 @@ GRANT ALL PRIVILEGES ON DATABASE khazad_dum TO khazad_user;
 -- CORE TRADING TABLES
 -- =============================================================================
 
+-- Data stage runs: each complete run is one consistent universe snapshot
+CREATE TABLE IF NOT EXISTS runs (
+    run_id SERIAL PRIMARY KEY,
+    started_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    completed_at TIMESTAMP WITH TIME ZONE,
+    status VARCHAR(20) NOT NULL DEFAULT 'running',  -- running / complete / failed
+    symbol_count INTEGER DEFAULT 0,
+    description TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_runs_status ON runs (status, run_id DESC);
+
 -- Stock metrics and market data
+-- Range-partitioned by month (stock_metrics_pYYYYMM); expired months are
+-- rolled up into stock_metrics_daily and dropped whole by
+-- PostgreSQLManager.apply_stock_metrics_retention
 CREATE TABLE IF NOT EXISTS stock_metrics (
-    id SERIAL PRIMARY KEY,
+    id BIGSERIAL,
     symbol VARCHAR(10) NOT NULL,
-    timestamp TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    timestamp TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    run_id INTEGER REFERENCES runs(run_id),
     price DECIMAL(10, 2),
     volume BIGINT,
+    dollar_volume DOUBLE PRECISION,
     market_cap BIGINT,
     rsi_2 DECIMAL(5, 2),
     rsi_14 DECIMAL(5, 2),
+    atr DOUBLE PRECISION,
+    sma_20 DOUBLE PRECISION,
+    sma_50 DOUBLE PRECISION,
+    avg_volume_20 DOUBLE PRECISION,
     volume_ratio DECIMAL(5, 2),
+    change_1d DOUBLE PRECISION,
     price_change_pct DECIMAL(5, 2),
     technical_score DECIMAL(5, 2),
     quality_score DECIMAL(5, 2),
@@ -44,11 +66,68 @@ CREATE TABLE IF NOT EXISTS stock_metrics (
     regime VARCHAR(20),
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     
-    INDEX idx_symbol_timestamp (symbol, timestamp),
-    INDEX idx_regime (regime),
-    INDEX idx_created_at (created_at)
+    UNIQUE (symbol, timestamp)
+) PARTITION BY RANGE (timestamp);
+
+-- Create (if missing) the monthly partition holding for_ts; returns its name
+CREATE OR REPLACE FUNCTION ensure_stock_metrics_partition(for_ts TIMESTAMP WITH TIME ZONE)
+RETURNS TEXT AS $$
+DECLARE
+    month_start DATE := date_trunc('month', for_ts)::date;
+    partition_name TEXT := 'stock_metrics_p' || to_char(month_start, 'YYYYMM');
+BEGIN
+    EXECUTE format(
+        'CREATE TABLE IF NOT EXISTS %I PARTITION OF stock_metrics FOR VALUES FROM (%L) TO (%L)',
+        partition_name, month_start, (month_start + INTERVAL '1 month')::date
+    );
+    RETURN partition_name;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT ensure_stock_metrics_partition(CURRENT_TIMESTAMP);
+SELECT ensure_stock_metrics_partition(CURRENT_TIMESTAMP + INTERVAL '1 month');
+
+-- Per-symbol daily summaries of rolled-up partitions (last snapshot of each day)
+CREATE TABLE IF NOT EXISTS stock_metrics_daily (
+    symbol VARCHAR(10) NOT NULL,
+    date DATE NOT NULL,
+    price_open DECIMAL(10, 2),
+    price_high DECIMAL(10, 2),
+    price_low DECIMAL(10, 2),
+    price DECIMAL(10, 2),
+    volume BIGINT,
+    dollar_volume DOUBLE PRECISION,
+    market_cap BIGINT,
+    rsi_2 DECIMAL(5, 2),
+    atr DOUBLE PRECISION,
+    sma_20 DOUBLE PRECISION,
+    sma_50 DOUBLE PRECISION,
+    avg_volume_20 DOUBLE PRECISION,
+    volume_ratio DECIMAL(5, 2),
+    change_1d DOUBLE PRECISION,
+    quality_score DECIMAL(5, 2),
+    samples INTEGER,
+    
+    PRIMARY KEY (symbol, date)
 );
 
+-- Upgrade databases created before runs / indicator columns existed
+ALTER TABLE stock_metrics ADD COLUMN IF NOT EXISTS run_id INTEGER REFERENCES runs(run_id);
+ALTER TABLE stock_metrics ADD COLUMN IF NOT EXISTS dollar_volume DOUBLE PRECISION;
+ALTER TABLE stock_metrics ADD COLUMN IF NOT EXISTS atr DOUBLE PRECISION;
+ALTER TABLE stock_metrics ADD COLUMN IF NOT EXISTS sma_20 DOUBLE PRECISION;
+ALTER TABLE stock_metrics ADD COLUMN IF NOT EXISTS sma_50 DOUBLE PRECISION;
+ALTER TABLE stock_metrics ADD COLUMN IF NOT EXISTS avg_volume_20 DOUBLE PRECISION;
+ALTER TABLE stock_metrics ADD COLUMN IF NOT EXISTS change_1d DOUBLE PRECISION;
+
+CREATE INDEX IF NOT EXISTS idx_regime ON stock_metrics (regime);
+CREATE INDEX IF NOT EXISTS idx_created_at ON stock_metrics (created_at);
+
+-- Covering index: a run snapshot is read with an index-only scan
+CREATE INDEX IF NOT EXISTS idx_stock_metrics_run ON stock_metrics (run_id, symbol)
+    INCLUDE (timestamp, price, volume, dollar_volume, market_cap, rsi_2, atr,
+             sma_20, sma_50, avg_volume_20, volume_ratio, change_1d, quality_score);
+
 -- TradingAgents analysis results
 CREATE TABLE IF NOT EXISTS tradingagents_analysis_results (
     id SERIAL PRIMARY KEY,
@@ -70,12 +149,13 @@ CREATE TABLE IF NOT EXISTS tradingagents_analysis_results (
     regime VARCHAR(20),
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     
-    INDEX idx_batch_symbol (batch_id, symbol),
-    INDEX idx_decision (decision),
-    INDEX idx_analysis_date (analysis_date),
-    INDEX idx_pattern_id (pattern_id)
+    UNIQUE (batch_id, symbol)
 );
 
+CREATE INDEX IF NOT EXISTS idx_analysis_decision ON tradingagents_analysis_results (decision);
+CREATE INDEX IF NOT EXISTS idx_analysis_date ON tradingagents_analysis_results (analysis_date);
+CREATE INDEX IF NOT EXISTS idx_analysis_pattern_id ON tradingagents_analysis_results (pattern_id);
+
 -- Position tracking for live trades
 CREATE TABLE IF NOT EXISTS position_tracking (
     id SERIAL PRIMARY KEY,
@@ -175,13 +255,13 @@ CREATE TABLE IF NOT EXISTS pipeline_decisions (
     symbol VARCHAR(10) NOT NULL,
     stage VARCHAR(30) NOT NULL,
     decision_data JSONB,
-    timestamp TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-    
-    INDEX idx_batch_symbol (batch_id, symbol),
-    INDEX idx_stage (stage),
-    INDEX idx_timestamp (timestamp)
+    timestamp TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
+CREATE INDEX IF NOT EXISTS idx_pipeline_batch_symbol ON pipeline_decisions (batch_id, symbol);
+CREATE INDEX IF NOT EXISTS idx_pipeline_stage ON pipeline_decisions (stage);
+CREATE INDEX IF NOT EXISTS idx_pipeline_timestamp ON pipeline_decisions (timestamp);
+
 -- System performance metrics
 CREATE TABLE IF NOT EXISTS system_metrics (
     id SERIAL PRIMARY KEY,
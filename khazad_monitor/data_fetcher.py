@@ -85,8 +85,10 @@ class DataFetcher:
             db_path.parent.mkdir(parents=True, exist_ok=True)
             raise FileNotFoundError(f"Database not found at {db_path}")
         
-        self.connection = sqlite3.connect(str(db_path))
+        # Read-only: the monitor must never take the pipeline's write lock
+        self.connection = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
         self.connection.row_factory = sqlite3.Row  # Enable dict-like access
+        self.connection.execute("PRAGMA query_only = ON")
     
     def disconnect(self):
         """Close database connection"""
@@ -94,7 +96,7 @@ class DataFetcher:
             self.connection.close()
         if self.db_manager:
             try:
-                self.db_manager.conn.close()
+                self.db_manager.close()
             except:
                 pass
     
@@ -106,7 +108,7 @@ class DataFetcher:
         try:
             if self.db_manager:
                 # Use production database manager
-                cursor = self.db_manager.conn.execute("""
+                cursor = self.db_manager.reader().execute("""
                     SELECT 
                         symbol,
                         quantity as shares,
@@ -164,7 +166,7 @@ class DataFetcher:
         try:
             # Get historical performance data
             if self.db_manager:
-                cursor = self.db_manager.conn.execute("""
+                cursor = self.db_manager.reader().execute("""
                     SELECT 
                         DATE(created_at) as date,
                         SUM(pnl_dollars) as daily_pnl
@@ -215,7 +217,7 @@ class DataFetcher:
         try:
             # Get historical stock metrics for the symbol
             if self.db_manager:
-                cursor = self.db_manager.conn.execute("""
+                cursor = self.db_manager.reader().execute("""
                     SELECT 
                         DATE(created_at) as date,
                         price
@@ -257,7 +259,7 @@ class DataFetcher:
         
         try:
             if self.db_manager:
-                cursor = self.db_manager.conn.execute("""
+                cursor = self.db_manager.reader().execute("""
                     SELECT * FROM position_tracking WHERE symbol = ? AND status = 'OPEN'
                 """, (symbol,))
             else:
@@ -301,7 +303,7 @@ class DataFetcher:
         
         try:
             if self.db_manager:
-                cursor = self.db_manager.conn.execute("""
+                cursor = self.db_manager.reader().execute("""
                     SELECT 
                         symbol, 
                         decision, 
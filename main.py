@@ -92,6 +92,7 @@ logger = get_trading_logger('main', {'component': 'main_workflow'})
 from src.core.market_analysis.regime_detector import RegimeDetector
 from src.data_pipeline.storage.database_manager import DatabaseManager
 from src.data_pipeline.market_data.stock_data_fetcher import StockDataFetcher
+from src.data_pipeline.metrics_pipeline import MetricsPipeline
 from src.core.stock_screening.stock_filter import StockFilter
 from src.trading_engines.tradingagents_integration.batch_processor import BatchProcessor
 from src.core.portfolio_management.position_tracker import PositionTracker
@@ -127,7 +128,7 @@ def initialize_components() -> Optional[Dict[str, Any]]:
         components['position_tracker'] = PositionTracker(components['database'].conn)
         
         logger.info("Initializing performance observer...")
-        components['observer'] = PerformanceObserver(components['database'].conn)
+        components['observer'] = PerformanceObserver(components['database'].conn, buffered=True)
         
         logger.info("All components initialized successfully")
         return components
@@ -161,6 +162,72 @@ def validate_portfolio_context(context: Dict[str, Any]) -> Dict[str, Any]:
     return validated
 
 
+def get_portfolio_context() -> Dict[str, Any]:
+    """
+    Portfolio state handed to the Portfolio Constructor (new and resumed batches)
+    """
+    return validate_portfolio_context({
+        "cash_available": 100000,  # TODO: Get from IBKR
+        "total_positions": 0,
+        "unrealized_pnl_pct": 0,
+    })
+
+
+def record_batch_decisions(observer, database, result: Dict[str, Any]):
+    """
+    Record a finished batch's TradingAgents, Portfolio Constructor and
+    execution decisions in the observer and flush them
+    """
+    batch_id = result["batch_id"]
+
+    # Get the actual analysis results from database
+    analysis_results = database.conn.execute(
+        """
+        SELECT symbol, decision, conviction_score
+        FROM tradingagents_analysis_results
+        WHERE batch_id = ?
+    """,
+        (batch_id,),
+    ).fetchall()
+
+    for symbol, decision, conviction in analysis_results:
+        observer.record_pipeline_decision(
+            batch_id=batch_id,
+            symbol=symbol,
+            stage="tradingagents",
+            data={"decision": decision, "conviction": conviction},
+        )
+
+    # Record portfolio constructor selections
+    for stock in result.get("selections", []):
+        observer.record_pipeline_decision(
+            batch_id=batch_id,
+            symbol=stock["symbol"],
+            stage="portfolio_constructor",
+            data={"selected": True},
+        )
+
+    for stock in result.get("excluded", []):
+        observer.record_pipeline_decision(
+            batch_id=batch_id,
+            symbol=stock["symbol"],
+            stage="portfolio_constructor",
+            data={"selected": False},
+        )
+
+    # Record execution intent
+    for stock in result.get("selections", []):
+        observer.record_pipeline_decision(
+            batch_id=batch_id,
+            symbol=stock["symbol"],
+            stage="execution",
+            data={"entry_price": stock.get("entry_price", 0), "regime": result.get("regime")},
+        )
+
+    # Write this batch's buffered stage decisions before anything reads observations
+    observer.flush()
+
+
 def main() -> int:
     """
     Complete KHAZAD_DUM workflow with robust error handling
@@ -252,17 +319,18 @@ def main() -> int:
         print(f"   Strategy: {regime.get('strategy', 'N/A')}")
 
         # Step 2: Fetch data with error handling
-        logger.info("Step 2: Fetching S&P 500 Data...")
+        logger.info("Step 2: Fetching Universe Data...")
         try:
-            metrics = fetcher.fetch_all_sp500()
-            if metrics.empty:
+            data_stage = MetricsPipeline(fetcher, database, prefilter=filter_engine.apply_hard_constraints).run()
+            if data_stage['fetched'] == 0:
                 logger.error("No stock data retrieved")
                 return 1
             
-            rows_inserted = database.insert_stock_metrics(metrics)
             print(f"\n2. Stock Data Fetch Complete")
-            print(f"   ✓ Fetched {len(metrics)} stocks")
-            print(f"   ✓ Inserted {rows_inserted} records")
+            if data_stage['screened'] is not None:
+                print(f"   ✓ Snapshot screen kept {data_stage['screened']} of {data_stage['universe']} tickers")
+            print(f"   ✓ Fetched {data_stage['fetched']} stocks")
+            print(f"   ✓ Inserted {data_stage['inserted']} records")
             
         except Exception as e:
             logger.error(f"Failed to fetch stock data: {e}")
@@ -289,6 +357,7 @@ def main() -> int:
         # Generate batch ID for this run
         batch_id = f"batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         logger.info(f"Generated batch ID: {batch_id}")
+        print(f"   Batch ID: {batch_id} (if interrupted: python main.py --resume {batch_id})")
 
         # Record filter decisions in observer
         try:
@@ -311,11 +380,7 @@ def main() -> int:
 
         # Step 4: Get portfolio context
         logger.info("Step 4: Getting Portfolio Context...")
-        portfolio_context = validate_portfolio_context({
-            "cash_available": 100000,  # TODO: Get from IBKR
-            "total_positions": 0,
-            "unrealized_pnl_pct": 0,
-        })
+        portfolio_context = get_portfolio_context()
         print(f"\n4. Portfolio Context")
         print(f"   Cash Available: ${portfolio_context['cash_available']:,.0f}")
 
@@ -326,6 +391,7 @@ def main() -> int:
                 candidates=candidates,
                 regime_data=regime,
                 portfolio_context=portfolio_context,
+                batch_id=batch_id,
             )
             
             if not result.get("success"):
@@ -348,40 +414,7 @@ def main() -> int:
                 print(f"   Batch ID: {result['batch_id']}")
                 print(f"   ✓ Analysis completed successfully")
                 
-                # Get the actual analysis results from database
-                analysis_results = database.conn.execute(
-                    """
-                    SELECT symbol, decision, conviction_score
-                    FROM tradingagents_analysis_results
-                    WHERE batch_id = ?
-                """,
-                    (result["batch_id"],),
-                ).fetchall()
-
-                for symbol, decision, conviction in analysis_results:
-                    observer.record_pipeline_decision(
-                        batch_id=batch_id,
-                        symbol=symbol,
-                        stage="tradingagents",
-                        data={"decision": decision, "conviction": conviction},
-                    )
-
-                # Record portfolio constructor selections
-                for stock in result.get("selections", []):
-                    observer.record_pipeline_decision(
-                        batch_id=batch_id,
-                        symbol=stock["symbol"],
-                        stage="portfolio_constructor",
-                        data={"selected": True},
-                    )
-
-                for stock in result.get("excluded", []):
-                    observer.record_pipeline_decision(
-                        batch_id=batch_id,
-                        symbol=stock["symbol"],
-                        stage="portfolio_constructor",
-                        data={"selected": False},
-                    )
+                record_batch_decisions(observer, database, result)
         except Exception as e:
             logger.warning(f"Failed to record pipeline decisions: {e}")
 
@@ -405,17 +438,6 @@ def main() -> int:
                 print(f"      Stop: ${stock.get('stop_loss', 0):.2f}")
                 print(f"      Target: ${stock.get('target_price', 0):.2f}")
                 print(f"      Reason: {stock.get('selection_reason', 'N/A')}")
-                
-                # Record execution intent
-                try:
-                    observer.record_pipeline_decision(
-                        batch_id=batch_id,
-                        symbol=stock.get("symbol", ""),
-                        stage="execution",
-                        data={"entry_price": stock.get("entry_price", 0), "regime": regime["regime"]},
-                    )
-                except Exception as e:
-                    logger.warning(f"Failed to record execution decision: {e}")
         else:
             print("   No positions selected for entry")
         print(f"\n{'='*60}")
@@ -437,13 +459,8 @@ def main() -> int:
             print(f"      Target: ${stock['target_price']:.2f}")
             print(f"      Reason: {stock.get('selection_reason', 'N/A')}")
 
-            # Record execution intent (original)
-            observer.record_pipeline_decision(
-                batch_id=batch_id,
-                symbol=stock["symbol"],
-                stage="execution",
-                data={"entry_price": stock["entry_price"], "regime": regime["regime"]},
-            )
+        # Write this batch's buffered stage decisions before anything reads observations
+        observer.flush()
 
         # Step 6: Update existing positions
         logger.info("Step 6: Updating Open Positions...")
@@ -527,7 +544,8 @@ def main() -> int:
         logger.info("Cleaning up resources...")
         try:
             if 'components' in locals() and components:
-                for component_name, component in components.items():
+                # Reverse init order so the observer flushes before the database closes
+                for component_name, component in reversed(list(components.items())):
                     if hasattr(component, 'close'):
                         try:
                             component.close()
@@ -591,6 +609,61 @@ def main() -> int:
     print("\n✓ KHAZAD_DUM Portfolio Construction Complete!")
 
 
+def resume_batch(batch_id: str) -> int:
+    """
+    Finish an interrupted TradingAgents batch from its queue checkpoint
+    (python main.py --resume <batch_id>); only unprocessed candidates are analyzed
+    Returns exit code: 0 for success, 1 for failure
+    """
+    logger.info(f"Resuming TradingAgents batch {batch_id}")
+    components = initialize_components()
+    if not components:
+        logger.error("Critical: Failed to initialize system components")
+        return 1
+
+    try:
+        result = components['batch_processor'].resume(batch_id, get_portfolio_context())
+        if not result.get("success"):
+            logger.error(f"Batch {batch_id} not resumed: {result.get('error', 'Unknown error')}")
+            print(f"\n❌ Batch {batch_id} not resumed: {result.get('error', 'Unknown error')}")
+            return 1
+
+        try:
+            record_batch_decisions(components['observer'], components['database'], result)
+        except Exception as e:
+            logger.warning(f"Failed to record pipeline decisions: {e}")
+
+        print(f"\n{'='*60}")
+        print("PORTFOLIO CONSTRUCTION COMPLETE (RESUMED)")
+        print(f"{'='*60}")
+        print(f"Batch ID: {result['batch_id']}")
+        print(f"Already Analyzed: {result.get('resumed', 0)}")
+        print(f"Total Analyzed: {result.get('total_analyzed', 0)}")
+        print(f"BUY Signals: {result.get('buy_signals', 0)}")
+        for stock in result.get('selections', []):
+            print(f"  {stock['symbol']}")
+        return 0
+
+    except KeyboardInterrupt:
+        print(f"\n⚠ Interrupted - resume again with: python main.py --resume {batch_id}")
+        return 130
+
+    except Exception as e:
+        logger.error(f"Failed to resume batch {batch_id}: {e}", exc_info=True)
+        return 1
+
+    finally:
+        for component_name, component in reversed(list(components.items())):
+            if hasattr(component, 'close'):
+                try:
+                    component.close()
+                except Exception as e:
+                    logger.warning(f"Error closing {component_name}: {e}")
+
+
 if __name__ == "__main__":
-    exit_code = main()
+    if len(sys.argv) == 3 and sys.argv[1] == "--resume":
+        exit_code = resume_batch(sys.argv[2])
+    else:
+        exit_code = main()
     sys.exit(exit_code)
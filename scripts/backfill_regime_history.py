@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+KHAZAD_DUM Regime History Backfill
+Classifies years of daily Fear & Greed / VIX history in one vectorized pass
+and upserts it into regime_history, so backtests and outcome labelling can
+look up the regime that was in force on any past date
+
+Sources (downloaded once, read from disk):
+  --fear-greed  CNN graphdata JSON or a CSV with date/value columns
+  --vix         CBOE VIX_History.csv or a Yahoo ^VIX CSV export
+"""
+
+import sys
+import argparse
+import logging
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.data_pipeline.storage.postgres_manager import get_database_manager
+from src.core.market_analysis.regime_history import backfill_regime_history
+
+logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="KHAZAD_DUM regime history backfill")
+    parser.add_argument('--fear-greed', required=True, help='Fear & Greed history (JSON or CSV)')
+    parser.add_argument('--vix', help='VIX daily history (CSV)')
+    parser.add_argument('--vix-fallback', action='store_true',
+                        help='Also backfill VIX-only days with F&G estimated from VIX')
+    parser.add_argument('--dry-run', action='store_true', help='Classify and summarize without writing')
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    # Summary lines come from regime_history's logger
+    logging.getLogger('src.core.market_analysis.regime_history').setLevel(logging.INFO)
+
+    db = None if args.dry_run else get_database_manager()
+    try:
+        backfill_regime_history(db, args.fear_greed, args.vix,
+                                fill_from_vix=args.vix_fallback, dry_run=args.dry_run)
+    finally:
+        if db is not None:
+            db.close()
+
+
+if __name__ == '__main__':
+    main()
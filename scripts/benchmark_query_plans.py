@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+KHAZAD_DUM Query Plan Benchmark
+Shows EXPLAIN QUERY PLAN and timings for the hot queries with and without
+the QUERY_INDEXES set shipped by the schema migrations
+"""
+
+import sys
+import time
+import random
+import argparse
+import logging
+import tempfile
+from pathlib import Path
+from datetime import date, timedelta
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.data_pipeline.storage.database_manager import DatabaseManager, QUERY_INDEXES
+from src.core.portfolio_management.performance_observer import PerformanceObserver
+
+logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+# (label, query, params) - one entry per query shape in the consumers
+HOT_QUERIES = [
+    ("PositionTracker.get_open_positions",
+     "SELECT * FROM position_tracking WHERE exit_date IS NULL AND status = 'OPEN' ORDER BY symbol", ()),
+    ("PositionTracker exit lookup",
+     "SELECT * FROM position_tracking WHERE batch_id = ? AND symbol = ? AND exit_date IS NULL", ('batch_0042', 'SYM0042')),
+    ("Dashboard closed last 7 days",
+     "SELECT COUNT(*) FROM position_tracking WHERE exit_date >= date('now', '-7 days') AND status = 'CLOSED'", ()),
+    ("PortfolioConstructor candidates",
+     "SELECT * FROM tradingagents_analysis_results WHERE batch_id = ? ORDER BY conviction_score DESC", ('batch_0042',)),
+    ("Dashboard recent signals",
+     "SELECT symbol, decision FROM tradingagents_analysis_results "
+     "WHERE analysis_date >= date('now', '-7 days') ORDER BY created_at DESC LIMIT 20", ()),
+    ("Context provider candidates",
+     "SELECT symbol, score FROM filter_results WHERE selected = 1 ORDER BY timestamp DESC LIMIT 10", ()),
+    ("PerformanceObserver daily lookup",
+     "SELECT id FROM observations WHERE symbol = ? AND observation_date = date('now')", ('SYM0042',)),
+    ("PerformanceObserver report window",
+     "SELECT COUNT(*) FROM observations WHERE observation_date > ?", ((date.today() - timedelta(days=7)).isoformat(),)),
+    ("PatternDatabase.get_top_patterns",
+     "SELECT * FROM trade_patterns WHERE total_trades >= ? AND is_active = 1 ORDER BY expectancy DESC LIMIT 10", (20,)),
+    ("PatternDatabase.get_regime_patterns",
+     "SELECT * FROM trade_patterns WHERE market_regime = ? AND is_active = 1 ORDER BY expectancy DESC", ('fear',)),
+]
+
+
+def seed(db: DatabaseManager, rows: int):
+    """Fill the hot tables with synthetic rows"""
+    rng = random.Random(42)
+    today = date.today()
+    conn = db.conn
+
+    # PatternDatabase reads trade_patterns but nothing in the tree creates it
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS trade_patterns (
+        pattern_id TEXT PRIMARY KEY,
+        strategy_type TEXT,
+        market_regime TEXT,
+        total_trades INTEGER DEFAULT 0,
+        win_rate REAL,
+        expectancy REAL,
+        recent_win_rate REAL,
+        is_active BOOLEAN DEFAULT 1,
+        last_traded_date DATE
+    )
+    """)
+    PerformanceObserver(conn)
+
+    with db.transaction():
+        for i in range(rows):
+            day = (today - timedelta(days=rng.randint(0, 365))).isoformat()
+            batch = f"batch_{i % 500:04d}"
+            symbol = f"SYM{i % 1000:04d}"
+            closed = rng.random() < 0.9
+            conn.execute(
+                "INSERT INTO position_tracking (batch_id, symbol, entry_date, entry_price, exit_date, status) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (batch, symbol, day, 100.0, day if closed else None, 'CLOSED' if closed else 'OPEN')
+            )
+            conn.execute(
+                "INSERT OR IGNORE INTO tradingagents_analysis_results "
+                "(batch_id, symbol, analysis_date, decision, conviction_score, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (batch, symbol, day, rng.choice(['BUY', 'HOLD', 'SELL']), rng.random() * 100, day)
+            )
+            conn.execute(
+                "INSERT OR IGNORE INTO filter_results (timestamp, symbol, score, regime, selected) VALUES (?, ?, ?, ?, ?)",
+                (day, symbol, rng.random() * 100, 'fear', int(rng.random() < 0.05))
+            )
+            conn.execute(
+                "INSERT OR IGNORE INTO observations (observation_date, symbol, entry_date) VALUES (?, ?, ?)",
+                (day, symbol, day)
+            )
+            conn.execute(
+                "INSERT OR IGNORE INTO trade_patterns "
+                "(pattern_id, market_regime, total_trades, win_rate, expectancy, is_active) VALUES (?, ?, ?, ?, ?, ?)",
+                (f"pattern_{i}", rng.choice(['fear', 'greed', 'neutral']), rng.randint(0, 100),
+                 rng.random(), rng.gauss(0, 2), int(rng.random() < 0.8))
+            )
+
+
+def set_indexes(db: DatabaseManager, enabled: bool):
+    """Drop or (re)create the QUERY_INDEXES set, then refresh planner stats"""
+    with db.transaction():
+        if enabled:
+            db._create_query_indexes()
+        else:
+            for indexes in QUERY_INDEXES.values():
+                for name, _ in indexes:
+                    db.conn.execute(f"DROP INDEX IF EXISTS {name}")
+        db.conn.execute("ANALYZE")
+
+
+def measure(db: DatabaseManager, query: str, params: tuple, repeat: int):
+    """Return (plan text, median milliseconds)"""
+    plan = ' | '.join(row[-1] for row in db.conn.execute(f"EXPLAIN QUERY PLAN {query}", params))
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        db.conn.execute(query, params).fetchall()
+        timings.append((time.perf_counter() - start) * 1000)
+    return plan, sorted(timings)[len(timings) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="KHAZAD_DUM query plan benchmark")
+    parser.add_argument('--rows', type=int, default=50000, help='Synthetic rows per table')
+    parser.add_argument('--repeat', type=int, default=20, help='Timed runs per query')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(str(Path(tmp) / "benchmark.db"))
+        print(f"Seeding {args.rows:,} rows per table...")
+        seed(db, args.rows)
+
+        results = {}
+        for enabled in (False, True):
+            set_indexes(db, enabled)
+            for label, query, params in HOT_QUERIES:
+                results[(label, enabled)] = measure(db, query, params, args.repeat)
+
+        for label, _, _ in HOT_QUERIES:
+            before_plan, before_ms = results[(label, False)]
+            after_plan, after_ms = results[(label, True)]
+            print(f"\n{label}")
+            print(f"  before {before_ms:8.3f} ms  {before_plan}")
+            print(f"  after  {after_ms:8.3f} ms  {after_plan}")
+
+        db.close()
+
+
+if __name__ == '__main__':
+    main()
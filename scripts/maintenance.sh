@@ -241,9 +241,14 @@ database_maintenance() {
     # Vacuum analyze for performance
     docker compose -f "$COMPOSE_FILE" exec -T database psql -U khazad_user -d khazad_dum -c "VACUUM ANALYZE;" >/dev/null
     
+    # stock_metrics: roll up expired monthly partitions and drop them whole
+    docker compose -f "$COMPOSE_FILE" exec -T trading-engine python -c "
+from src.data_pipeline.storage.postgres_manager import PostgreSQLManager
+print(PostgreSQLManager().apply_stock_metrics_retention())
+" >/dev/null || log WARN "stock_metrics retention failed"
+    
     # Clean old data (adjust based on your retention policy)
     docker compose -f "$COMPOSE_FILE" exec -T database psql -U khazad_user -d khazad_dum -c "
-        DELETE FROM stock_metrics WHERE created_at < NOW() - INTERVAL '90 days';
         DELETE FROM api_usage WHERE created_at < NOW() - INTERVAL '30 days';
         DELETE FROM pipeline_decisions WHERE timestamp < NOW() - INTERVAL '60 days';
     " >/dev/null
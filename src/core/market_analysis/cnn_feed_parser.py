@@ -21,8 +21,7 @@
 │                                                                                     │
 │ 🔧 DEPENDENCIES:                                                                   │
 │ - requests (HTTP client)                                                           │
-│ - json (data parsing)                                                              │
-│ - yfinance (VIX fallback)                                                          │
+│ - requests.Session (pooled keep-alive connections, shared with the VIX quote)      │
 │                                                                                     │
 │ 📈 TRADING PIPELINE STAGE: 1. Market Regime Detection                           │
 │ └── 1. Market Regime Detection ← YOU ARE HERE                                    │
@@ -33,13 +32,12 @@
 │ └── 6. Performance Observation                                                     │
 │                                                                                     │
 │ ⚠️  CRITICAL NOTES:                                                                │
-│ - Fallback to VIX-based regime when CNN API fails                                 │
+│ - Failures raise - RegimeDetector falls back to the VIX it already fetched        │
 │ - Browser-like headers to avoid blocking                                          │
-│ - Robust error handling for network issues                                        │
 │                                                                                     │
 │ 📊 PERFORMANCE NOTES:                                                              │
 │ - API call latency: ~500ms (network dependent)                                   │
-│ - 10-second timeout to prevent hanging                                            │
+│ - Tight connect/read timeouts (REGIME_CONNECT_TIMEOUT / REGIME_READ_TIMEOUT)      │
 │ - Automatic text label generation from numeric score                             │
 │                                                                                     │
 │ 🧪 TESTING:                                                                        │
@@ -57,9 +55,47 @@ Copyright (c) 2024 FeanorKingofNoldor
 "In the depths of Khazad-dûm, the markets reveal their secrets to those who dare..."
 """
 
+import threading
+from typing import Dict, Optional
+
 import requests
-import json
-from typing import Dict
+from requests.adapters import HTTPAdapter
+
+from config.settings.base_config import (
+    CNN_FG_URL,
+    REGIME_CONNECT_TIMEOUT,
+    REGIME_READ_TIMEOUT,
+    REGIME_HTTP_POOL_SIZE,
+)
+
+# Browser-like headers - CNN and Yahoo both reject the default requests agent
+BROWSER_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept': 'application/json, text/plain, */*',
+    'Referer': 'https://www.cnn.com/',
+}
+
+REQUEST_TIMEOUT = (REGIME_CONNECT_TIMEOUT, REGIME_READ_TIMEOUT)
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_http_session() -> requests.Session:
+    """
+    Process-wide pooled session for the regime sources (CNN, Yahoo quote)
+    Keep-alive connections are reused across fetches and threads
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            session.headers.update(BROWSER_HEADERS)
+            adapter = HTTPAdapter(pool_connections=REGIME_HTTP_POOL_SIZE, pool_maxsize=REGIME_HTTP_POOL_SIZE)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _session = session
+        return _session
 
 
 class CNNFeedParser:
@@ -67,86 +103,61 @@ class CNNFeedParser:
     Fetches CNN Fear & Greed Index without the broken package
     """
     
-    def __init__(self):
-        self.url = "https://production.dataviz.cnn.io/index/fearandgreed/graphdata"
+    def __init__(self, session: Optional[requests.Session] = None):
+        """
+        Args:
+            session: HTTP session (None = shared pooled session)
+        """
+        self.url = CNN_FG_URL
+        self.session = session or get_http_session()
         
     def get_fear_and_greed_index(self) -> Dict:
         """
         Fetch the Fear & Greed data from CNN
+        
+        Raises:
+            requests.RequestException / ValueError: If CNN is unreachable or the
+            response is unusable - the caller decides the fallback (RegimeDetector
+            uses the VIX it already fetched)
         """
-        try:
-            # Add headers to mimic a browser request
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-                'Accept': 'application/json, text/plain, */*',
-                'Referer': 'https://www.cnn.com/',
-            }
-            
-            response = requests.get(self.url, headers=headers, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                
-                # The API structure: data -> fear_and_greed -> score
-                if 'fear_and_greed' in data:
-                    fg_data = data['fear_and_greed']
-                    current_value = fg_data.get('score', 50)
-                    
-                    # Debug print to see what we got
-                    print(f"Successfully fetched CNN F&G: {current_value}")
-                else:
-                    # Print what keys we actually got
-                    print(f"Unexpected API structure. Keys: {list(data.keys())}")
-                    # Try direct score access
-                    current_value = data.get('score', 50)
-                
-                # Convert to integer
-                current_value = round(float(current_value))
-                
-                # Determine text label
-                if current_value < 25:
-                    text = "Extreme Fear"
-                elif current_value < 45:
-                    text = "Fear"
-                elif current_value < 55:
-                    text = "Neutral"
-                elif current_value < 75:
-                    text = "Greed"
-                else:
-                    text = "Extreme Greed"
-                
-                return {
-                    'value': current_value,
-                    'text': text
-                }
-            else:
-                print(f"API returned status code: {response.status_code}")
-                
-        except requests.exceptions.RequestException as e:
-            print(f"Network error: {e}")
-        except json.JSONDecodeError as e:
-            print(f"JSON parsing error: {e}")
-        except Exception as e:
-            print(f"Unexpected error: {e}")
+        response = self.session.get(self.url, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        data = response.json()
         
-        # Fallback based on VIX if we can't get CNN
-        print("CNN API failed, using VIX-based estimate")
-        try:
-            import yfinance as yf
-            vix = yf.Ticker("^VIX").info['regularMarketPrice']
-            
-            if vix < 15:
-                return {'value': 65, 'text': 'Greed'}
-            elif vix < 20:
-                return {'value': 50, 'text': 'Neutral'}
-            elif vix < 30:
-                return {'value': 35, 'text': 'Fear'}
-            else:
-                return {'value': 15, 'text': 'Extreme Fear'}
-        except:
-            return {'value': 50, 'text': 'Neutral'}
+        # The API structure: data -> fear_and_greed -> score
+        if 'fear_and_greed' in data:
+            current_value = data['fear_and_greed'].get('score', 50)
+        else:
+            # Print what keys we actually got
+            print(f"Unexpected API structure. Keys: {list(data.keys())}")
+            # Try direct score access
+            current_value = data.get('score', 50)
+        
+        # Convert to integer
+        current_value = round(float(current_value))
+        
+        # Determine text label
+        if current_value < 25:
+            text = "Extreme Fear"
+        elif current_value < 45:
+            text = "Fear"
+        elif current_value < 55:
+            text = "Neutral"
+        elif current_value < 75:
+            text = "Greed"
+        else:
+            text = "Extreme Greed"
+        
+        return {
+            'value': current_value,
+            'text': text
+        }
     
     def get_complete_report(self):
         """Compatibility method"""
-        data = self.get_fear_and_greed_index()
-        return {'fear_greed': data}
\ No newline at end of file
+        try:
+            data = self.get_fear_and_greed_index()
+        except Exception as e:
+            print(f"CNN Fear & Greed unavailable: {e}")
+            data = {'value': 50, 'text': 'Neutral'}
+        return {'fear_greed': data}
@@ -39,9 +39,10 @@
 │ - Extreme Fear = 1.5x positions, Extreme Greed = 0.5x positions                  │
 │                                                                                     │
 │ 📊 PERFORMANCE NOTES:                                                              │
-│ - Cached regime calls: ~1ms response time                                         │
-│ - Fresh regime calls: ~500ms (network dependent)                                  │
-│ - VIX fallback: ~200ms                                                             │
+│ - Cached regime calls: ~1ms, shared across components and processes              │
+│ - Stale regime served instantly while one process refreshes in the background     │
+│ - Fresh regime calls: F&G and VIX fetched concurrently, bounded by the slower    │
+│ - VIX fallback reuses the VIX already fetched (no second request)                 │
 │                                                                                     │
 │ 🧪 TESTING:                                                                        │
 │ - Unit Tests: tests/unit/test_regime_detector.py                                  │
@@ -61,15 +62,18 @@ Copyright (c) 2024 FeanorKingofNoldor
 # Market Regime Detection using CNN Fear & Greed Index
 # Using custom scraper for Python 3.13 compatibility
 
-import time
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, Optional
 
+import numpy as np
+import pandas as pd
 import yfinance as yf
 
 # Use our custom scraper instead
-from src.core.market_analysis.cnn_feed_parser import CNNFeedParser
+from src.core.market_analysis.cnn_feed_parser import CNNFeedParser, get_http_session, REQUEST_TIMEOUT
+from src.data_pipeline.storage.shared_cache import SharedCache, get_shared_cache
 
 from config.settings.base_config import (
     REGIME_THRESHOLDS,
@@ -77,20 +81,96 @@ from config.settings.base_config import (
     FILTER_PERCENTILES,
     EXPECTED_WIN_RATES,
     CACHE_DURATION,
+    SHARED_CACHE_STALE_TTL,
+    VIX_QUOTE_URL,
 )
 
+# Shared cache keys - every RegimeDetector (and process) reads the same entries
+REGIME_KEY = "market_regime"
+FEAR_GREED_KEY = "fear_greed"
+VIX_KEY = "vix"
+
+
+def classify_regimes(fear_greed_values, vix_values) -> pd.DataFrame:
+    """
+    Classify F&G/VIX readings into regimes (RegimeDetector._interpret_regime
+    is the single-reading case), vectorized over whole arrays
+    
+    Args:
+        fear_greed_values: F&G readings (array-like)
+        vix_values: VIX readings aligned with fear_greed_values (NaN = unknown)
+    
+    Returns:
+        DataFrame with regime, position_multiplier, filter_percentile,
+        expected_win_rate, strategy and volatility_regime per input row
+    """
+    fear_greed = np.asarray(fear_greed_values, dtype=float)
+    vix = np.asarray(vix_values, dtype=float)
+    
+    # First matching threshold band, neutral when none match
+    names = list(REGIME_THRESHOLDS)
+    bands = [(fear_greed >= lo) & (fear_greed < hi) for lo, hi in REGIME_THRESHOLDS.values()]
+    regime = np.select(bands, names, default="neutral")
+    
+    def lookup(table):
+        return pd.Series(regime).map(table).to_numpy()
+    
+    strategy = np.select(
+        [np.isin(regime, ["extreme_fear", "fear"]), np.isin(regime, ["greed", "extreme_greed"])],
+        ["mean_reversion", "momentum"], default="mixed"
+    )
+    expected_win_rate = lookup(EXPECTED_WIN_RATES).astype(float)
+    
+    # VIX override for extreme conditions
+    high_vol = vix > 30
+    strategy = np.where(high_vol, "mean_reversion", strategy)
+    expected_win_rate = np.where(high_vol, np.maximum(0.80, expected_win_rate), expected_win_rate)
+    volatility_regime = np.select([high_vol, vix < 15], ["high", "low"], default="normal")
+    
+    return pd.DataFrame({
+        "regime": regime,
+        "position_multiplier": lookup(POSITION_MULTIPLIERS).astype(float),
+        "filter_percentile": lookup(FILTER_PERCENTILES).astype(int),
+        "expected_win_rate": expected_win_rate,
+        "strategy": strategy,
+        "volatility_regime": volatility_regime,
+    })
+
+
+# Label of each F&G value vix_to_fear_greed estimates
+VIX_FALLBACK_TEXT = {65: "Greed", 50: "Neutral", 35: "Fear", 15: "Extreme Fear"}
+
+
+def vix_to_fear_greed(vix_values) -> np.ndarray:
+    """VIX -> estimated F&G value, as used by RegimeDetector._vix_fallback_regime"""
+    vix = np.asarray(vix_values, dtype=float)
+    return np.select([vix < 15, vix < 20, vix < 30], [65, 50, 35], default=15)
+
 
 class RegimeDetector:
     """
     Fetches market regime from professional sources
+    Regime, F&G and VIX live in the shared cache, so every component sees the
+    same regime and the network is hit once per CACHE_DURATION. Building a
+    regime always fetches F&G and VIX fresh; their cached readings are only
+    the fallback when a source is down, and only while younger than the stale
+    TTL (older F&G is replaced by the VIX estimate), so a rebuilt regime is
+    never older than its inputs.
     """
 
-    def __init__(self):
-        self.cnn_client = CNNFeedParser()  # Our custom scraper
-        self.cache = {}
+    def __init__(self, cache: Optional[SharedCache] = None):
+        """
+        Args:
+            cache: Shared cache (None = process-wide cache on the configured backend)
+        """
+        self.session = get_http_session()
+        self.cnn_client = CNNFeedParser(self.session)  # Our custom scraper
+        self.cache = cache or get_shared_cache()
         self.cache_duration = CACHE_DURATION
-        self._last_regime = None  # Cache the complete regime
-        self._last_regime_time = 0
+        self.stale_duration = SHARED_CACHE_STALE_TTL
+        
+        # F&G and VIX are fetched side by side
+        self._fetch_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="regime-fetch")
 
     def get_current_regime(self, force_refresh: bool = False) -> Dict:
         """
@@ -99,17 +179,22 @@ class RegimeDetector:
         Args:
             force_refresh: If True, bypass cache and fetch fresh data
         """
-        # Check if we have a recent cached regime (unless forced refresh)
-        if not force_refresh and self._last_regime:
-            if time.time() - self._last_regime_time < self.cache_duration:
-                print("Using cached regime data")
-                return self._last_regime.copy()  # Return a copy to prevent mutations
-
-        # Get Fear & Greed (with its own caching)
-        fg_data = self._get_fear_greed_cached(force_refresh)
-
-        # Get VIX for confirmation
-        vix = self._get_vix()
+        if force_refresh:
+            return self.cache.refresh(REGIME_KEY, self._build_regime, self.stale_duration)
+        
+        # Each call deserializes its own copy, so callers can't mutate the cached regime
+        return self.cache.get_or_refresh(REGIME_KEY, self._build_regime,
+                                         self.cache_duration, self.stale_duration)
+
+    def _build_regime(self) -> Dict:
+        """Combine freshly fetched Fear & Greed and VIX into a regime"""
+        # Fetch both sources at once - latency is the slower one, not the sum
+        vix_future = self._fetch_pool.submit(self._get_vix, True)
+        fg_future = self._fetch_pool.submit(self._get_fear_greed_cached, True)
+        vix = vix_future.result()
+        
+        # CNN down: estimate from the VIX we already have
+        fg_data = fg_future.result() or self._vix_fallback_regime(vix)
 
         # Interpret into trading regime
         regime = self._interpret_regime(fg_data["value"], vix)
@@ -124,138 +209,92 @@ class RegimeDetector:
             }
         )
 
-        # Cache the complete regime
-        self._last_regime = regime
-        self._last_regime_time = time.time()
-
         return regime
 
-    def _get_fear_greed_cached(self, force_refresh: bool = False) -> Dict:
+    def _get_fear_greed_cached(self, force_refresh: bool = False) -> Optional[Dict]:
         """
         Fetch CNN Fear & Greed with caching
+        Cached data younger than the stale TTL is used if the fetch fails
         
         Args:
             force_refresh: If True, bypass cache
+        
+        Returns:
+            F&G data, or None when CNN is down and nothing is cached
         """
-        cache_key = "fear_greed"
-
-        # Check cache (unless forced refresh)
-        if not force_refresh and cache_key in self.cache:
-            cached_time = self.cache[cache_key]["timestamp"]
-            if time.time() - cached_time < self.cache_duration:
-                print(f"Using cached Fear & Greed data")
-                return self.cache[cache_key]["data"]
-
-        # Fetch fresh
         try:
-            print("Fetching fresh CNN Fear & Greed...")
-            data = self.cnn_client.get_fear_and_greed_index()
-            
-            print(f"Successfully fetched CNN F&G: {data.get('value', 'Unknown')}")
-
-            # Cache it
-            self.cache[cache_key] = {"data": data, "timestamp": time.time()}
-
-            return data
+            if force_refresh:
+                return self.cache.refresh(FEAR_GREED_KEY, self._fetch_fear_greed, self.stale_duration)
+            return self.cache.get_or_refresh(FEAR_GREED_KEY, self._fetch_fear_greed,
+                                             self.cache_duration, self.stale_duration)
 
         except Exception as e:
             print(f"Error fetching CNN Fear & Greed: {e}")
-            
-            # Try to use stale cache if available
-            if cache_key in self.cache:
-                print("Using stale cached data due to fetch error")
-                return self.cache[cache_key]["data"]
-            
             print("Falling back to VIX-based regime")
-            return self._vix_fallback_regime()
+            return None
+
+    def _fetch_fear_greed(self) -> Dict:
+        print("Fetching fresh CNN Fear & Greed...")
+        data = self.cnn_client.get_fear_and_greed_index()
+        print(f"Successfully fetched CNN F&G: {data.get('value', 'Unknown')}")
+        return data
 
-    def _get_vix(self) -> float:
+    def _get_vix(self, force_refresh: bool = False) -> float:
         """
         Get current VIX level with caching
         """
-        cache_key = "vix"
-        
-        # Check cache
-        if cache_key in self.cache:
-            cached_time = self.cache[cache_key]["timestamp"]
-            if time.time() - cached_time < self.cache_duration:
-                return self.cache[cache_key]["value"]
-        
         try:
-            vix = yf.Ticker("^VIX")
-            value = vix.info["regularMarketPrice"]
-            
-            # Cache it
-            self.cache[cache_key] = {"value": value, "timestamp": time.time()}
-            return value
-        except:
+            if force_refresh:
+                return self.cache.refresh(VIX_KEY, self._fetch_vix, self.stale_duration)
+            return self.cache.get_or_refresh(VIX_KEY, self._fetch_vix,
+                                             self.cache_duration, self.stale_duration)
+        except Exception:
             return 20.0  # Default to normal if unavailable
 
-    def _vix_fallback_regime(self) -> Dict:
+    def _fetch_vix(self) -> float:
+        """
+        Last VIX from Yahoo's chart endpoint on the pooled session
+        (one small request, unlike Ticker.info), yfinance as a fallback
+        """
+        try:
+            response = self.session.get(VIX_QUOTE_URL, params={'range': '1d', 'interval': '1d'},
+                                        timeout=REQUEST_TIMEOUT)
+            response.raise_for_status()
+            return float(response.json()['chart']['result'][0]['meta']['regularMarketPrice'])
+        except Exception as e:
+            print(f"VIX quote endpoint failed ({e}), trying yfinance")
+            return float(yf.Ticker("^VIX").fast_info['last_price'])
+
+    def _vix_fallback_regime(self, vix: Optional[float] = None) -> Dict:
         """
         Fallback regime detection using only VIX
         """
-        vix = self._get_vix()
+        if vix is None:
+            vix = self._get_vix()
 
-        if vix < 15:
-            return {"value": 65, "text": "Greed"}
-        elif vix < 20:
-            return {"value": 50, "text": "Neutral"}
-        elif vix < 30:
-            return {"value": 35, "text": "Fear"}
-        else:
-            return {"value": 15, "text": "Extreme Fear"}
+        value = int(vix_to_fear_greed([vix])[0])
+        return {"value": value, "text": VIX_FALLBACK_TEXT[value]}
 
     def _interpret_regime(self, fear_greed_value: float, vix: float) -> Dict:
         """
         Convert Fear & Greed + VIX into trading regime
-        Based on your research findings
+        Based on your research findings (one row of classify_regimes)
         """
-        # Determine base regime from Fear & Greed
-        regime_name = None
-        for regime, (min_val, max_val) in REGIME_THRESHOLDS.items():
-            if min_val <= fear_greed_value < max_val:
-                regime_name = regime
-                break
-
-        if not regime_name:
-            regime_name = "neutral"
-
-        # Build regime dict
-        regime_dict = {
-            "regime": regime_name,
-            "position_multiplier": POSITION_MULTIPLIERS[regime_name],
-            "filter_percentile": FILTER_PERCENTILES[regime_name],
-            "expected_win_rate": EXPECTED_WIN_RATES[regime_name],
+        row = classify_regimes([fear_greed_value], [vix]).iloc[0]
+        return {
+            "regime": str(row["regime"]),
+            "position_multiplier": float(row["position_multiplier"]),
+            "filter_percentile": int(row["filter_percentile"]),
+            "expected_win_rate": float(row["expected_win_rate"]),
+            "strategy": str(row["strategy"]),
+            "volatility_regime": str(row["volatility_regime"]),
         }
 
-        # Determine strategy
-        if regime_name in ["extreme_fear", "fear"]:
-            regime_dict["strategy"] = "mean_reversion"
-        elif regime_name in ["greed", "extreme_greed"]:
-            regime_dict["strategy"] = "momentum"
-        else:
-            regime_dict["strategy"] = "mixed"
-
-        # VIX override for extreme conditions
-        if vix > 30:
-            regime_dict["strategy"] = "mean_reversion"
-            regime_dict["expected_win_rate"] = max(
-                0.80, regime_dict["expected_win_rate"]
-            )
-            regime_dict["volatility_regime"] = "high"
-        elif vix < 15:
-            regime_dict["volatility_regime"] = "low"
-        else:
-            regime_dict["volatility_regime"] = "normal"
-
-        return regime_dict
-
     def clear_cache(self):
         """
         Clear all cached data - useful for testing or forcing refresh
+        Clears the shared cache, so other components refetch too
         """
-        self.cache = {}
-        self._last_regime = None
-        self._last_regime_time = 0
-        print("Regime detector cache cleared")
\ No newline at end of file
+        for key in (REGIME_KEY, FEAR_GREED_KEY, VIX_KEY):
+            self.cache.invalidate(key)
+        print("Regime detector cache cleared")
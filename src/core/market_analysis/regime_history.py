@@ -0,0 +1,205 @@
+"""
+██╗  ██╗██╗  ██╗ █████╗ ███████╗ █████╗ ██████╗       ██████╗ ██╗   ██╗███╗   ███╗
+██║ ██╔╝██║  ██║██╔══██╗╚══███╔╝██╔══██╗██╔══██╗      ██╔══██╗██║   ██║████╗ ████║
+█████╔╝ ███████║███████║  ███╔╝ ███████║██║  ██║█████╗██║  ██║██║   ██║██╔████╔██║
+██╔═██╗ ██╔══██║██╔══██║ ███╔╝  ██╔══██║██║  ██║╚════╝██║  ██║██║   ██║██║╚██╔╝██║
+██║  ██╗██║  ██║██║  ██║███████╗██║  ██║██████╔╝      ██████╔╝╚██████╔╝██║ ╚═╝ ██║
+╚═╝  ╚═╝╚═╝  ╚═╝╚═╝  ╚═╝╚══════╝╚═╝  ╚═╝╚═════╝       ╚═════╝  ╚═════╝ ╚═╝     ╚═╝
+
+🏔️ ALGORITHMIC TRADING SYSTEM - "They delved too greedily and too deep..."
+
+┌─────────────────────────────────────────────────────────────────────────────────────┐
+│ 📋 MODULE: Regime History Backfill                                                   │
+│ 📄 FILE: regime_history.py                                                           │
+│ 📅 CREATED: 2026-10-16                                                               │
+│ 👑 AUTHOR: FeanorKingofNoldor                                                        │
+│ 🔗 REPOSITORY: https://github.com/FeanorKingofNoldor/khazad_dum                      │
+│ 📧 CONTACT: [Your Contact Info]                                                      │
+│                                                                                     │
+│ 🎯 PURPOSE:                                                                          │
+│ Loads local Fear & Greed and VIX history files, classifies every day with the       │
+│ vectorized regime classifier and writes the series into regime_history              │
+│                                                                                     │
+│ 🔧 DEPENDENCIES:                                                                     │
+│ - pandas / numpy (vectorized classification)                                        │
+│ - regime_detector.classify_regimes (REGIME_THRESHOLDS)                              │
+│ - DatabaseManager.bulk_upsert (one batched write)                                   │
+│                                                                                     │
+│ 📈 TRADING PIPELINE STAGE: 1. Market Regime Detection                                │
+│ └── 1. Market Regime Detection ← Historical Regimes                                 │
+│ └── 2. Stock Screening                                                              │
+│ └── 3. AI Analysis (TradingAgents)                                                  │
+│ └── 4. Pattern Recognition                                                          │
+│ └── 5. Portfolio Construction                                                       │
+│ └── 6. Performance Observation                                                      │
+│                                                                                     │
+│ ⚠️  CRITICAL NOTES:                                                                 │
+│ - Accepts CNN graphdata JSON or CSV for F&G, CBOE / Yahoo CSV for VIX               │
+│ - VIX is joined as-of (last known close on or before each F&G date)                 │
+│ - Re-running is idempotent - rows upsert on their timestamp                         │
+│                                                                                     │
+│ 📊 PERFORMANCE NOTES:                                                                │
+│ - Years of daily history classify in one NumPy pass                                 │
+│ - DatabaseManager.get_regime_for_dates answers any date list with one query         │
+│                                                                                     │
+│ 🧪 TESTING:                                                                          │
+│ - Unit Tests: tests/unit/core/test_regime_history.py                                │
+│                                                                                     │
+│ 📚 DOCUMENTATION:                                                                    │
+│ - API Docs: Auto-generated from docstrings                                          │
+│ - Usage Guide: docs/guides/MARKET_REGIME_USAGE.md                                   │
+└─────────────────────────────────────────────────────────────────────────────────────┘
+
+Licensed under MIT License - See LICENSE file for details
+Copyright (c) 2024 FeanorKingofNoldor
+
+"In the depths of Khazad-dûm, the markets reveal their secrets to those who dare..."
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from src.core.market_analysis.regime_detector import classify_regimes, vix_to_fear_greed
+
+logger = logging.getLogger(__name__)
+
+# Column names recognized in history CSVs (matched case-insensitively)
+DATE_COLUMNS = ('date', 'timestamp', 'datetime', 'x')
+FEAR_GREED_COLUMNS = ('fear_greed', 'fear_greed_value', 'value', 'score', 'y')
+VIX_COLUMNS = ('close', 'vix', 'adj close', 'value')
+
+REGIME_HISTORY_COLUMNS = ['timestamp', 'regime', 'fear_greed_value', 'vix', 'strategy', 'expected_win_rate']
+
+
+def load_fear_greed_history(path: Union[str, Path]) -> pd.Series:
+    """
+    Daily F&G values indexed by date
+    
+    Args:
+        path: CNN graphdata JSON (fear_and_greed_historical.data[{x: epoch ms, y: score}])
+              or a CSV with a date column and a value column
+    """
+    path = Path(path)
+    if path.suffix.lower() == '.json':
+        with open(path) as f:
+            data = json.load(f)
+        points = data.get('fear_and_greed_historical', data).get('data', [])
+        frame = pd.DataFrame(points)
+        frame['x'] = pd.to_datetime(frame['x'], unit='ms')
+        return _daily_series(frame, 'x', 'y')
+    
+    frame = pd.read_csv(path)
+    return _daily_series(frame, _find_column(frame, DATE_COLUMNS, path),
+                         _find_column(frame, FEAR_GREED_COLUMNS, path))
+
+
+def load_vix_history(path: Union[str, Path]) -> pd.Series:
+    """
+    Daily VIX closes indexed by date (CBOE VIX_History.csv or a Yahoo export)
+    """
+    frame = pd.read_csv(path)
+    return _daily_series(frame, _find_column(frame, DATE_COLUMNS, path),
+                         _find_column(frame, VIX_COLUMNS, path))
+
+
+def build_regime_history(fear_greed: pd.Series, vix: Optional[pd.Series] = None,
+                         fill_from_vix: bool = False) -> pd.DataFrame:
+    """
+    Classify every day into regime_history rows
+    
+    Args:
+        fear_greed: Daily F&G values indexed by date
+        vix: Daily VIX closes indexed by date, joined as-of onto each day
+        fill_from_vix: Also emit days that only have VIX, with F&G estimated
+                       the way the live detector does when CNN is down
+    
+    Returns:
+        DataFrame with REGIME_HISTORY_COLUMNS, one row per day
+    """
+    days = fear_greed.index
+    if fill_from_vix and vix is not None:
+        days = days.union(vix.index)
+    
+    frame = pd.DataFrame({'timestamp': days})
+    frame['fear_greed'] = fear_greed.reindex(days).to_numpy()
+    
+    if vix is not None and not vix.empty:
+        frame = pd.merge_asof(frame, vix.rename('vix').rename_axis('timestamp').reset_index(),
+                              on='timestamp', direction='backward')
+    else:
+        frame['vix'] = np.nan
+    
+    if fill_from_vix:
+        estimated = frame['fear_greed'].isna() & frame['vix'].notna()
+        frame.loc[estimated, 'fear_greed'] = vix_to_fear_greed(frame.loc[estimated, 'vix'])
+    
+    frame = frame[frame['fear_greed'].notna()].reset_index(drop=True)
+    regimes = classify_regimes(frame['fear_greed'], frame['vix'])
+    
+    return pd.DataFrame({
+        'timestamp': frame['timestamp'],
+        'regime': regimes['regime'],
+        'fear_greed_value': frame['fear_greed'].round().astype(int),
+        'vix': frame['vix'].round(2),
+        'strategy': regimes['strategy'],
+        'expected_win_rate': regimes['expected_win_rate'],
+    })[REGIME_HISTORY_COLUMNS]
+
+
+def backfill_regime_history(db, fear_greed_path: Union[str, Path],
+                            vix_path: Optional[Union[str, Path]] = None,
+                            fill_from_vix: bool = False,
+                            dry_run: bool = False) -> int:
+    """
+    Load history files and upsert the classified days into regime_history
+    
+    Args:
+        db: DatabaseManager / PostgreSQLManager providing bulk_upsert() (unused when dry_run)
+        dry_run: Classify and log the summary without writing
+    
+    Returns:
+        Number of rows written (days classified when dry_run)
+    """
+    fear_greed = load_fear_greed_history(fear_greed_path)
+    vix = load_vix_history(vix_path) if vix_path else None
+    logger.info(f"Loaded {len(fear_greed):,} F&G days"
+                + (f" and {len(vix):,} VIX days" if vix is not None else ""))
+    history = build_regime_history(fear_greed, vix, fill_from_vix=fill_from_vix)
+    
+    if history.empty:
+        logger.warning("No regime history to backfill")
+        return 0
+    
+    logger.info(f"Classified {len(history):,} regime days "
+                f"({history['timestamp'].min().date()} to {history['timestamp'].max().date()})")
+    for regime, count in history['regime'].value_counts().items():
+        logger.info(f"  {regime:15} {count:6,}")
+    
+    if dry_run:
+        return len(history)
+    
+    written = db.bulk_upsert('regime_history', history, conflict_columns=['timestamp'])
+    logger.info(f"Upserted {written:,} rows into regime_history")
+    return written
+
+
+def _find_column(frame: pd.DataFrame, candidates, path) -> str:
+    """First column whose lower-cased name is in candidates"""
+    by_name = {str(c).strip().lower(): c for c in frame.columns}
+    for candidate in candidates:
+        if candidate in by_name:
+            return by_name[candidate]
+    raise ValueError(f"{path}: none of {list(candidates)} in columns {list(frame.columns)}")
+
+
+def _daily_series(frame: pd.DataFrame, date_column: str, value_column: str) -> pd.Series:
+    """Last value per calendar day, sorted, NaNs dropped"""
+    dates = pd.to_datetime(frame[date_column]).dt.normalize().astype('datetime64[ns]')
+    values = pd.to_numeric(frame[value_column], errors='coerce')
+    series = pd.Series(values.to_numpy(), index=dates).dropna()
+    return series.groupby(level=0).last().sort_index()
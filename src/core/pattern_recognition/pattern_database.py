@@ -23,6 +23,10 @@ logger = logging.getLogger(__name__)
 class PatternDatabase:
     """
     Single responsibility: All pattern-related database operations
+    
+    Writes run in `with self.conn:` blocks so they are committed or rolled
+    back as a unit; batch workers call these on DatabaseManager's shared
+    writer, which stays locked while a transaction is open.
     """
     
     def __init__(self, db_connection: sqlite3.Connection):
@@ -53,14 +57,14 @@ class PatternDatabase:
             ) VALUES (?, ?, ?, ?, ?, date('now'))
             """
             
-            self.conn.execute(query, (
-                pattern_id,
-                components['strategy_type'],
-                components['market_regime'],
-                components['volume_profile'],
-                components['technical_setup']
-            ))
-            self.conn.commit()
+            with self.conn:
+                self.conn.execute(query, (
+                    pattern_id,
+                    components['strategy_type'],
+                    components['market_regime'],
+                    components['volume_profile'],
+                    components['technical_setup']
+                ))
             return True
             
         except Exception as e:
@@ -188,14 +192,13 @@ class PatternDatabase:
             WHERE pattern_id = ?
             """
             
-            self.conn.execute(update_query, (
-                total_trades, winning_trades, losing_trades, win_rate,
-                avg_win, avg_loss, expectancy, json.dumps(recent_trades),
-                recent_win_rate, recent_avg_return, momentum_score,
-                confidence_level, pattern_id
-            ))
-            
-            self.conn.commit()
+            with self.conn:
+                self.conn.execute(update_query, (
+                    total_trades, winning_trades, losing_trades, win_rate,
+                    avg_win, avg_loss, expectancy, json.dumps(recent_trades),
+                    recent_win_rate, recent_avg_return, momentum_score,
+                    confidence_level, pattern_id
+                ))
             
             # Log significant changes
             if abs(momentum_score) > PATTERN_MOMENTUM_THRESHOLD:
@@ -288,23 +291,22 @@ class PatternDatabase:
             ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """
             
-            self.conn.execute(query, (
-                pattern_id,
-                trade_data['batch_id'],
-                trade_data['symbol'],
-                trade_data['entry_date'],
-                trade_data['entry_price'],
-                trade_data.get('rsi', None),
-                trade_data.get('volume_ratio', None),
-                trade_data.get('atr', None),
-                trade_data.get('vix', None),
-                trade_data.get('fear_greed', None),
-                trade_data.get('decision', 'HOLD'),
-                trade_data.get('conviction', 0),
-                trade_data.get('position_size_pct', 0)
-            ))
-            
-            self.conn.commit()
+            with self.conn:
+                self.conn.execute(query, (
+                    pattern_id,
+                    trade_data['batch_id'],
+                    trade_data['symbol'],
+                    trade_data['entry_date'],
+                    trade_data['entry_price'],
+                    trade_data.get('rsi', None),
+                    trade_data.get('volume_ratio', None),
+                    trade_data.get('atr', None),
+                    trade_data.get('vix', None),
+                    trade_data.get('fear_greed', None),
+                    trade_data.get('decision', 'HOLD'),
+                    trade_data.get('conviction', 0),
+                    trade_data.get('position_size_pct', 0)
+                ))
             return True
             
         except Exception as e:
@@ -326,18 +328,17 @@ class PatternDatabase:
             WHERE batch_id = ? AND symbol = ?
             """
             
-            self.conn.execute(query, (
-                exit_data.get('exit_date'),
-                exit_data.get('exit_price'),
-                exit_data.get('exit_reason', 'unknown'),  # Default if missing
-                exit_data.get('holding_days'),
-                exit_data.get('pnl_percent'),
-                exit_data.get('max_gain_percent', 0),
-                exit_data.get('max_drawdown_percent', 0),
-                batch_id, symbol
-            ))
-            
-            self.conn.commit()
+            with self.conn:
+                self.conn.execute(query, (
+                    exit_data.get('exit_date'),
+                    exit_data.get('exit_price'),
+                    exit_data.get('exit_reason', 'unknown'),  # Default if missing
+                    exit_data.get('holding_days'),
+                    exit_data.get('pnl_percent'),
+                    exit_data.get('max_gain_percent', 0),
+                    exit_data.get('max_drawdown_percent', 0),
+                    batch_id, symbol
+                ))
             return True
             
         except Exception as e:
@@ -360,15 +361,14 @@ class PatternDatabase:
             ) VALUES (date('now'), ?, ?, ?, ?, ?)
             """
             
-            self.conn.execute(query, (
-                lesson_type,
-                json.dumps(patterns),
-                situation,
-                recommendation,
-                json.dumps(memory_systems)
-            ))
-            
-            self.conn.commit()
+            with self.conn:
+                self.conn.execute(query, (
+                    lesson_type,
+                    json.dumps(patterns),
+                    situation,
+                    recommendation,
+                    json.dumps(memory_systems)
+                ))
             return True
             
         except Exception as e:
@@ -448,8 +448,8 @@ class PatternDatabase:
           AND is_active = 1
         """
         
-        cursor = self.conn.execute(query, (days_inactive,))
-        self.conn.commit()
+        with self.conn:
+            cursor = self.conn.execute(query, (days_inactive,))
         
         deactivated = cursor.rowcount
         if deactivated > 0:
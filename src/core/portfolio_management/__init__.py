@@ -1,11 +1,17 @@
 """Portfolio Management Module"""
 
-from .portfolio_constructor import PortfolioConstructor
 from .position_tracker import PositionTracker
 from .performance_observer import PerformanceObserver
 
-__all__ = [
-    'PortfolioConstructor',
-    'PositionTracker',
-    'PerformanceObserver'
-]
+try:
+    # Needs langchain_openai (LLM-backed portfolio selection)
+    from .portfolio_constructor import PortfolioConstructor
+
+    __all__ = [
+        'PortfolioConstructor',
+        'PositionTracker',
+        'PerformanceObserver'
+    ]
+except ImportError:
+    # LLM stack not installed - tracking and observation still work
+    __all__ = ['PositionTracker', 'PerformanceObserver']
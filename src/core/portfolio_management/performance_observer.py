@@ -11,17 +11,46 @@ from typing import Dict, List, Optional
 import json
 import logging
 
+from config.settings.base_config import OBSERVER_BUFFER_SIZE
+
 logger = logging.getLogger(__name__)
 
+# Order stages are flushed in - later stages update the row the filter stage created
+PIPELINE_STAGES = ('filter', 'tradingagents', 'portfolio_constructor', 'execution')
+
+# Stage -> (SET clause, data -> params) for the stages that update an existing observation
+STAGE_UPDATES = {
+    'tradingagents': (
+        "analyzed_by_tradingagents = 1, tradingagents_decision = ?, tradingagents_conviction = ?",
+        lambda data: (data.get('decision', 'HOLD'), data.get('conviction', 50))
+    ),
+    'portfolio_constructor': (
+        "selected_by_portfolio_constructor = ?",
+        lambda data: (data.get('selected', False),)
+    ),
+    'execution': (
+        "executed = 1, entry_date = date('now'), entry_price = ?, regime_at_entry = ?",
+        lambda data: (data.get('entry_price', 0), data.get('regime', 'unknown'))
+    ),
+}
+
 
 class PerformanceObserver:
     """
     Observes and records all system decisions and their outcomes
     No adjustments - just pure observation until we have 100+ trades
+    
+    With buffered=True, stage decisions are held in memory keyed by
+    (batch_id, symbol) and written by flush() as one statement per stage.
+    Flush happens when buffer_size decisions are pending, and on close().
     """
     
-    def __init__(self, db_connection):
+    def __init__(self, db_connection, buffered: bool = False, buffer_size: int = OBSERVER_BUFFER_SIZE):
         self.db = db_connection
+        self.buffered = buffered
+        self.buffer_size = buffer_size
+        self._pending = {}  # (batch_id, symbol) -> {stage: data}
+        self._pending_count = 0
         self.create_observation_tables()
     
     def create_observation_tables(self):
@@ -115,6 +144,17 @@ class PerformanceObserver:
         )
         """)
         
+        # Indexes for the per-symbol daily lookup and the date-windowed reports
+        self.db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_observations_symbol_date ON observations(symbol, observation_date)"
+        )
+        self.db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_observations_date ON observations(observation_date)"
+        )
+        self.db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_missed_opportunities_date ON missed_opportunities(date)"
+        )
+        
         self.db.commit()
         logger.info("Observation tables created/verified")
     
@@ -128,6 +168,14 @@ class PerformanceObserver:
             stage: 'filter' | 'tradingagents' | 'portfolio_constructor' | 'execution'
             data: Stage-specific data
         """
+        if self.buffered:
+            # Later decisions for the same stage replace earlier ones, as sequential updates would
+            self._pending.setdefault((batch_id, symbol), {})[stage] = data
+            self._pending_count += 1
+            if self._pending_count >= self.buffer_size:
+                self.flush()
+            return
+        
         try:
             # Check if observation exists
             existing = self.db.execute("""
@@ -148,6 +196,75 @@ class PerformanceObserver:
         except Exception as e:
             logger.error(f"Failed to record observation for {symbol}: {e}")
     
+    def flush(self) -> int:
+        """
+        Write buffered decisions - one executemany per stage, one commit
+        
+        Returns:
+            Number of buffered decisions written
+        """
+        if not self._pending:
+            return 0
+        
+        pending, count = self._pending, self._pending_count
+        self._pending, self._pending_count = {}, 0
+        
+        try:
+            for stage in PIPELINE_STAGES:
+                entries = [(batch_id, symbol, stages[stage])
+                           for (batch_id, symbol), stages in pending.items() if stage in stages]
+                if not entries:
+                    continue
+                
+                if stage == 'filter':
+                    # Only the first filter decision of the day creates the row
+                    self.db.executemany("""
+                        INSERT INTO observations 
+                        (batch_id, symbol, observation_date, passed_filter, filter_score, 
+                         filter_layer, rsi_at_entry, volume_ratio_at_entry)
+                        SELECT ?, ?, date('now'), ?, ?, ?, ?, ?
+                        WHERE NOT EXISTS (
+                            SELECT 1 FROM observations WHERE symbol = ? AND observation_date = date('now')
+                        )
+                    """, [self._filter_params(batch_id, symbol, data) + (symbol,)
+                          for batch_id, symbol, data in entries])
+                else:
+                    set_clause, params = STAGE_UPDATES[stage]
+                    self.db.executemany(f"""
+                        UPDATE observations SET {set_clause}
+                        WHERE symbol = ? AND observation_date = date('now')
+                    """, [params(data) + (symbol,) for _, symbol, data in entries])
+            
+            self.db.commit()
+            logger.debug(f"Flushed {count} buffered observations for {len(pending)} symbols")
+            return count
+            
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Failed to flush {count} buffered observations, keeping them buffered: {e}")
+            # Decisions recorded since the swap are newer and win over the restored ones
+            for key, stages in self._pending.items():
+                pending.setdefault(key, {}).update(stages)
+            self._pending, self._pending_count = pending, count + self._pending_count
+            return 0
+    
+    def close(self):
+        """Flush anything still buffered"""
+        self.flush()
+    
+    @staticmethod
+    def _filter_params(batch_id: str, symbol: str, data: Dict) -> tuple:
+        """Insert parameters for a filter-stage observation"""
+        return (
+            batch_id,
+            symbol,
+            data.get('passed', False),
+            data.get('score', 0),
+            data.get('layer', 'unknown'),
+            data.get('rsi_2', 0),
+            data.get('volume_ratio', 0)
+        )
+    
     def _create_observation(self, batch_id: str, symbol: str, stage: str, data: Dict):
         """Create a new observation entry"""
         
@@ -157,55 +274,17 @@ class PerformanceObserver:
                 (batch_id, symbol, observation_date, passed_filter, filter_score, 
                  filter_layer, rsi_at_entry, volume_ratio_at_entry)
                 VALUES (?, ?, date('now'), ?, ?, ?, ?, ?)
-            """, (
-                batch_id,
-                symbol,
-                data.get('passed', False),
-                data.get('score', 0),
-                data.get('layer', 'unknown'),
-                data.get('rsi_2', 0),
-                data.get('volume_ratio', 0)
-            ))
+            """, self._filter_params(batch_id, symbol, data))
     
     def _update_observation(self, observation_id: int, stage: str, data: Dict):
         """Update an existing observation"""
         
-        if stage == 'tradingagents':
-            self.db.execute("""
-                UPDATE observations 
-                SET analyzed_by_tradingagents = 1,
-                    tradingagents_decision = ?,
-                    tradingagents_conviction = ?
-                WHERE id = ?
-            """, (
-                data.get('decision', 'HOLD'),
-                data.get('conviction', 50),
-                observation_id
-            ))
-        
-        elif stage == 'portfolio_constructor':
-            self.db.execute("""
-                UPDATE observations 
-                SET selected_by_portfolio_constructor = ?
-                WHERE id = ?
-            """, (
-                data.get('selected', False),
-                observation_id
-            ))
-        
-        elif stage == 'execution':
-            self.db.execute("""
-                UPDATE observations 
-                SET executed = 1,
-                    entry_date = date('now'),
-                    entry_price = ?,
-                    regime_at_entry = ?
-                WHERE id = ?
-            """, (
-                data.get('entry_price', 0),
-                data.get('regime', 'unknown'),
-                observation_id
-            ))
+        if stage in STAGE_UPDATES:
+            set_clause, params = STAGE_UPDATES[stage]
+            self.db.execute(
+                f"UPDATE observations SET {set_clause} WHERE id = ?",
+                params(data) + (observation_id,)
+            )
     
     def update_position_outcome(self, symbol: str, exit_data: Dict):
         """
@@ -462,7 +541,7 @@ def integrate_observer_with_pipeline(batch_processor, observer):
     """
     original_process_batch = batch_processor.process_batch
     
-    def observed_process_batch(candidates, regime_data, portfolio_context=None):
+    def observed_process_batch(candidates, regime_data, portfolio_context=None, batch_id=None):
         # Record filter decisions
         for _, row in candidates.iterrows():
             observer.record_pipeline_decision(
@@ -479,7 +558,7 @@ def integrate_observer_with_pipeline(batch_processor, observer):
             )
         
         # Run original process
-        result = original_process_batch(candidates, regime_data, portfolio_context)
+        result = original_process_batch(candidates, regime_data, portfolio_context, batch_id=batch_id)
         
         # Record TradingAgents and selection decisions
         # This would need to be added to the batch processor
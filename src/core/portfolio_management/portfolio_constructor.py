@@ -66,6 +66,8 @@ from typing import List, Dict, Any, Optional, Tuple
 from langchain_openai import ChatOpenAI
 import logging
 
+from src.data_pipeline.storage.database_manager import bulk_write
+
 logger = logging.getLogger(__name__)
 
 
@@ -423,25 +425,7 @@ Select exactly {max_positions} stocks. Be specific in exclusion reasons."""
     ):
         """Save portfolio selections to database"""
         
-        # Save selections
-        for i, stock in enumerate(selections, 1):
-            self.db.execute("""
-            INSERT OR REPLACE INTO portfolio_selections
-            (batch_id, selection_date, symbol, rank, selected,
-             position_size_pct, position_size_dollars, selection_reason)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                batch_id,
-                datetime.now().date(),
-                stock['symbol'],
-                stock.get('rank', i),
-                1,  # selected = True
-                stock['position_size_pct'],
-                stock['position_size_dollars'],
-                stock.get('selection_reason', '')
-            ))
-        
-        # Save excluded with reasons
+        # Excluded with reasons (stored on the top selection)
         excluded_data = json.dumps([
             {
                 'symbol': e['symbol'],
@@ -451,12 +435,22 @@ Select exactly {max_positions} stocks. Be specific in exclusion reasons."""
             for e in excluded
         ])
         
-        if selections:
-            self.db.execute("""
-            UPDATE portfolio_selections
-            SET excluded_symbols = ?
-            WHERE batch_id = ? AND symbol = ?
-            """, (excluded_data, batch_id, selections[0]['symbol']))
+        # Save selections in one bulk write
+        selection_date = datetime.now().date()
+        bulk_write(self.db, 'portfolio_selections', [
+            {
+                'batch_id': batch_id,
+                'selection_date': selection_date,
+                'symbol': stock['symbol'],
+                'rank': stock.get('rank', i),
+                'selected': 1,
+                'position_size_pct': stock['position_size_pct'],
+                'position_size_dollars': stock['position_size_dollars'],
+                'selection_reason': stock.get('selection_reason', ''),
+                'excluded_symbols': excluded_data if i == 1 else None
+            }
+            for i, stock in enumerate(selections, 1)
+        ], conflict_columns=['batch_id', 'symbol'])
         
         self.db.commit()
         logger.info(f"Saved {len(selections)} selections, {len(excluded)} excluded")
\ No newline at end of file
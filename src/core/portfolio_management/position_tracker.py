@@ -12,6 +12,8 @@ import yfinance as yf
 import logging
 from contextlib import contextmanager
 
+from src.data_pipeline.storage.database_manager import bulk_write
+
 logger = logging.getLogger(__name__)
 
 
@@ -84,49 +86,49 @@ class PositionTracker:
             return True
         
         try:
+            # Validate every row first, then write them in one bulk insert
+            entry_date = datetime.now().date()
+            rows = []
+            for i, stock in enumerate(selections):
+                try:
+                    # Validate required fields
+                    symbol = stock.get('symbol', '').strip().upper()
+                    if not symbol:
+                        raise ValueError(f"Selection {i}: symbol cannot be empty")
+                    
+                    entry_price = self._validate_price(stock.get('entry_price', 0), "entry_price")
+                    shares = max(0, int(stock.get('shares', 0)))
+                    position_value = max(0, float(stock.get('position_size_dollars', 0)))
+                    conviction = max(0, min(100, float(stock.get('conviction_score', 0))))
+                    
+                    # Sanity check: position value should roughly equal shares * price
+                    if shares > 0 and position_value > 0:
+                        expected_value = self._safe_multiply(shares, entry_price)
+                        value_diff = abs(position_value - expected_value) / max(position_value, expected_value)
+                        if value_diff > 0.1:  # 10% tolerance
+                            self.logger.warning(
+                                f"Position value mismatch for {symbol}: "
+                                f"expected ~${expected_value:.2f}, got ${position_value:.2f}"
+                            )
+                    
+                    rows.append({
+                        'batch_id': batch_id,
+                        'symbol': symbol,
+                        'entry_date': entry_date,
+                        'entry_price': entry_price,
+                        'shares': shares,
+                        'position_value': position_value,
+                        'was_selected': 1,
+                        'tradingagents_conviction': conviction,
+                        'regime_at_entry': stock.get('regime', 'Unknown')
+                    })
+                    
+                except Exception as e:
+                    self.logger.error(f"Invalid position {i} ({stock.get('symbol', 'unknown')}): {e}")
+                    raise
+            
             with self._db_transaction():
-                for i, stock in enumerate(selections):
-                    try:
-                        # Validate required fields
-                        symbol = stock.get('symbol', '').strip().upper()
-                        if not symbol:
-                            raise ValueError(f"Selection {i}: symbol cannot be empty")
-                        
-                        entry_price = self._validate_price(stock.get('entry_price', 0), "entry_price")
-                        shares = max(0, int(stock.get('shares', 0)))
-                        position_value = max(0, float(stock.get('position_size_dollars', 0)))
-                        conviction = max(0, min(100, float(stock.get('conviction_score', 0))))
-                        
-                        # Sanity check: position value should roughly equal shares * price
-                        if shares > 0 and position_value > 0:
-                            expected_value = self._safe_multiply(shares, entry_price)
-                            value_diff = abs(position_value - expected_value) / max(position_value, expected_value)
-                            if value_diff > 0.1:  # 10% tolerance
-                                self.logger.warning(
-                                    f"Position value mismatch for {symbol}: "
-                                    f"expected ~${expected_value:.2f}, got ${position_value:.2f}"
-                                )
-                        
-                        self.db.execute("""
-                        INSERT INTO position_tracking
-                        (batch_id, symbol, entry_date, entry_price, shares, 
-                         position_value, was_selected, tradingagents_conviction, regime_at_entry)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                        """, (
-                            batch_id,
-                            symbol,
-                            datetime.now().date(),
-                            entry_price,
-                            shares,
-                            position_value,
-                            1,  # was_selected = True
-                            conviction,
-                            stock.get('regime', 'Unknown')
-                        ))
-                        
-                    except Exception as e:
-                        self.logger.error(f"Failed to insert position {i} ({stock.get('symbol', 'unknown')}): {e}")
-                        raise
+                bulk_write(self.db, 'position_tracking', rows)
                 
                 # Also track excluded BUY signals for comparison
                 try:
@@ -156,21 +158,15 @@ class PositionTracker:
         
         df = pd.read_sql(query, self.db, params=[batch_id, batch_id])
         
-        for _, row in df.iterrows():
-            self.db.execute("""
-            INSERT INTO position_tracking
-            (batch_id, symbol, entry_date, entry_price, 
-             was_selected, tradingagents_conviction, regime_at_entry)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (
-                batch_id,
-                row['symbol'],
-                datetime.now().date(),
-                row['entry_price'],
-                0,  # was_selected = False
-                row['conviction_score'],
-                row['regime']
-            ))
+        bulk_write(self.db, 'position_tracking', pd.DataFrame({
+            'batch_id': batch_id,
+            'symbol': df['symbol'].values,
+            'entry_date': datetime.now().date(),
+            'entry_price': df['entry_price'].values,
+            'was_selected': 0,
+            'tradingagents_conviction': df['conviction_score'].values,
+            'regime_at_entry': df['regime'].values
+        }))
     
     def update_positions(self, check_exits: bool = True) -> Dict[str, int]:
         """
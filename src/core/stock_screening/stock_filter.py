@@ -36,12 +36,14 @@
 │ ⚠️  CRITICAL NOTES:                                                                │
 │ - Reduces thousands of stocks to ~30 candidates                                   │
 │ - Regime-adaptive scoring: fear = mean reversion, greed = momentum                │
+│ - Scoring weights live in config SCORING_SPECS (see scoring_spec.py)              │
 │ - Includes exploration component to avoid overfitting                             │
 │                                                                                     │
 │ 📊 PERFORMANCE NOTES:                                                              │
 │ - Layer 1: Eliminates 80-95% of stocks instantly                                 │
-│ - Layer 2: Regime-based scoring in ~100ms                                        │
-│ - Layer 3: Final selection with exploration ratio                                │
+│ - Layer 2: All five regime scores in one vectorized NumPy pass                   │
+│ - Layer 3: Mask-based selection with exploration ratio, no row-wise apply        │
+│ - candidates_for_regime() answers "what would regime X pick" without rescoring   │
 │                                                                                     │
 │ 🧪 TESTING:                                                                        │
 │ - Unit Tests: tests/unit/test_stock_filter.py                                     │
@@ -68,8 +70,18 @@ from config.settings.base_config import (
     MIN_MARKET_CAP,
     MIN_PRICE,
     FILTER_PERCENTILES,
-    EXPLORATION_RATIO
+    EXPLORATION_RATIO,
+    SCORING_SPECS,
+    REGIME_SCORING
 )
+from src.core.stock_screening.scoring_spec import compile_scoring_spec, metric_arrays
+
+REGIMES = tuple(FILTER_PERCENTILES)
+
+
+def score_column(regime_name: str) -> str:
+    """Name of the per-regime score column added by score_all_regimes"""
+    return f"score_{regime_name}"
 
 
 class StockFilter:
@@ -77,12 +89,16 @@ class StockFilter:
     Three-layer filter to reduce thousands of stocks to 30 candidates
     """
     
-    def __init__(self, database):
+    def __init__(self, database, scoring_specs: Dict = None):
         self.db = database
         self.min_dollar_volume = MIN_DOLLAR_VOLUME
         self.min_market_cap = MIN_MARKET_CAP
         self.min_price = MIN_PRICE
         self.exploration_ratio = EXPLORATION_RATIO
+        
+        # Layer 2 evaluators, compiled once per regime
+        specs = scoring_specs or SCORING_SPECS
+        self.scorers = {name: compile_scoring_spec(specs[REGIME_SCORING[name]]) for name in REGIMES}
     
     def run_full_filter(self, regime: Dict) -> pd.DataFrame:
         """
@@ -128,77 +144,119 @@ class StockFilter:
         ]
         return filtered
     
+    def score_all_regimes(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Layer 2 for every regime at once
+        Adds a score_<regime> column per regime in a single assign - no
+        per-regime copies of the frame
+        """
+        return df.assign(**{score_column(name): scores for name, scores in self._regime_scores(df).items()})
+    
     def apply_regime_scoring(self, df: pd.DataFrame, regime: Dict) -> pd.DataFrame:
         """
         Layer 2: Score based on current regime
-        Weights from research findings
-        """
-        df = df.copy()
-        
-        if regime['regime'] in ['extreme_fear', 'fear']:
-            # Mean reversion scoring
-            df['score'] = (
-                0.5 * (30 - df['rsi_2'].clip(0, 30)) / 30 +  # Lower RSI better
-                0.3 * df['quality_score'] +                    # Quality matters
-                0.2 * df['volume_ratio'].clip(0, 3) / 3       # Volume spike
-            )
-            
-        elif regime['regime'] in ['greed', 'extreme_greed']:
-            # Momentum scoring (current regime!)
-            df['score'] = (
-                0.4 * (df['rsi_2'].clip(50, 100) - 50) / 50 +  # Higher RSI better
-                0.3 * df['volume_ratio'].clip(0, 2) / 2 +       # Volume confirmation
-                0.3 * df['quality_score']                        # Quality always matters
-            )
-            
-            # Bonus for price above moving average
-            if 'sma_20' in df.columns:
-                df['above_ma'] = (df['price'] > df['sma_20']).astype(float)
-                df['score'] = df['score'] * 0.8 + df['above_ma'] * 0.2
-        
-        else:  # neutral
-            # Balanced scoring
-            df['score'] = (
-                0.33 * df['quality_score'] +
-                0.33 * df['volume_ratio'].clip(0, 2) / 2 +
-                0.34 * (50 - abs(df['rsi_2'] - 50)) / 50  # Neutral RSI
-            )
-        
-        return df.sort_values('score', ascending=False)
+        Weights come from SCORING_SPECS in config
+        
+        All regime scores are kept on the frame so candidates_for_regime()
+        can answer what-if questions without rescoring
+        """
+        scores = self._regime_scores(df)
+        columns = {score_column(name): values for name, values in scores.items()}
+        columns['score'] = scores.get(regime['regime'], scores['neutral'])
+        
+        scored = df.assign(**columns)
+        return scored.iloc[np.argsort(-columns['score'], kind='stable')]
+    
+    def score_variants(self, df: pd.DataFrame, variants: Dict[str, Dict]) -> pd.DataFrame:
+        """
+        Score one metrics snapshot under several scoring specs (A/B testing)
+        
+        Args:
+            df: Metrics frame (Layer 1 survivors)
+            variants: {variant name: scoring spec} in the SCORING_SPECS format
+        
+        Returns:
+            DataFrame with one score column per variant, indexed like df
+        """
+        scorers = {name: compile_scoring_spec(spec) for name, spec in variants.items()}
+        return pd.DataFrame(self._evaluate(df, scorers), index=df.index)
+    
+    def _regime_scores(self, df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """Evaluate every regime's compiled spec over df"""
+        return self._evaluate(df, self.scorers)
+    
+    @staticmethod
+    def _evaluate(df: pd.DataFrame, scorers: Dict) -> Dict[str, np.ndarray]:
+        """Extract the metrics columns once, run each distinct evaluator once"""
+        columns = dict.fromkeys(c for scorer in scorers.values() for c in scorer.all_columns)
+        arrays = metric_arrays(df, columns)
+        
+        results = {}
+        for scorer in scorers.values():
+            if id(scorer) not in results:
+                results[id(scorer)] = scorer(arrays)
+        return {name: results[id(scorer)] for name, scorer in scorers.items()}
     
     def select_candidates(self, df: pd.DataFrame, regime: Dict, max_stocks: int = 30) -> pd.DataFrame:
         """
         Layer 3: Select final candidates based on regime percentiles
         Research validated thresholds
         """
+        return self._select(df, regime['regime'], max_stocks, explore=True)
+    
+    def candidates_for_regime(self, df: pd.DataFrame, regime_name: str, max_stocks: int = 30,
+                              explore: bool = False) -> pd.DataFrame:
+        """
+        What would we pick if the market were in regime_name?
+        
+        Args:
+            df: Layer 1 survivors, or frames already scored by
+                apply_regime_scoring / score_all_regimes (no rescoring then)
+            regime_name: Any key of FILTER_PERCENTILES
+            max_stocks: Selection size
+            explore: Include the random exploration slice (off for planning,
+                so repeated calls are deterministic)
+        
+        Returns:
+            Selected rows with 'score' set to that regime's score
+        """
+        column = score_column(regime_name)
+        if column not in df.columns:
+            df = self.score_all_regimes(df)
+        
+        return self._select(df.assign(score=df[column]), regime_name, max_stocks, explore)
+    
+    def _select(self, df: pd.DataFrame, regime_name: str, max_stocks: int, explore: bool) -> pd.DataFrame:
+        """Percentile cut + exploration + top-N, all on NumPy masks"""
         if df.empty:
             return df
         
+        scores = df['score'].to_numpy(dtype=float)
+        
         # Get percentile threshold for this regime
-        percentile = FILTER_PERCENTILES[regime['regime']]
-        threshold_score = np.percentile(df['score'], percentile)
+        percentile = FILTER_PERCENTILES[regime_name]
+        threshold_score = np.percentile(scores, percentile)
         
-        # Select stocks above threshold
-        candidates = df[df['score'] >= threshold_score]
+        # Stocks above threshold
+        top_mask = scores >= threshold_score
+        picked = np.flatnonzero(top_mask)
         
         # Add exploration (15% random from remaining)
-        remaining = df[df['score'] < threshold_score]
-        if len(remaining) > 0:
+        remaining = np.flatnonzero(scores < threshold_score)
+        if explore and len(remaining) > 0:
             n_explore = min(int(max_stocks * self.exploration_ratio), len(remaining))
-            exploration = remaining.sample(n=min(n_explore, len(remaining)))
-            candidates = pd.concat([candidates, exploration])
+            exploration = np.random.choice(remaining, size=n_explore, replace=False)
+            picked = np.concatenate([picked, exploration])
         
-        # Limit to max stocks
-        final = candidates.nlargest(min(max_stocks, len(candidates)), 'score')
+        # Limit to max stocks, best first
+        order = np.argsort(-scores[picked], kind='stable')[:max_stocks]
+        picked = picked[order]
         
         # Add selection metadata
-        final['selected'] = True
-        final['selection_reason'] = final.apply(
-            lambda x: 'top_score' if x['score'] >= threshold_score else 'exploration',
-            axis=1
+        return df.iloc[picked].assign(
+            selected=True,
+            selection_reason=np.where(top_mask[picked], 'top_score', 'exploration')
         )
-        
-        return final
     
     def save_filter_results(self, df: pd.DataFrame, regime: Dict):
         """
@@ -207,19 +265,14 @@ class StockFilter:
         if df.empty:
             return
         
-        for _, row in df.iterrows():
-            self.db.conn.execute("""
-            INSERT OR REPLACE INTO filter_results 
-            (timestamp, symbol, score, regime, selected)
-            VALUES (?, ?, ?, ?, ?)
-            """, (
-                datetime.now(),
-                row['symbol'],
-                row['score'],
-                regime['regime'],
-                True
-            ))
-        self.db.conn.commit()
+        # One bulk write for the whole selection
+        self.db.bulk_upsert('filter_results', pd.DataFrame({
+            'timestamp': datetime.now(),
+            'symbol': df['symbol'].values,
+            'score': df['score'].values,
+            'regime': regime['regime'],
+            'selected': True
+        }), conflict_columns=['timestamp', 'symbol'])
     
     def get_filter_stats(self) -> Dict:
         """
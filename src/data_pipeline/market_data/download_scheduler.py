@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+██╗  ██╗██╗  ██╗ █████╗ ███████╗ █████╗ ██████╗       ██████╗ ██╗   ██╗███╗   ███╗
+██║ ██╔╝██║  ██║██╔══██╗╚══███╔╝██╔══██╗██╔══██╗      ██╔══██╗██║   ██║████╗ ████║
+█████╔╝ ███████║███████║  ███╔╝ ███████║██║  ██║█████╗██║  ██║██║   ██║██╔████╔██║
+██╔═██╗ ██╔══██║██╔══██║ ███╔╝  ██╔══██║██║  ██║╚════╝██║  ██║██║   ██║██║╚██╔╝██║
+██║  ██╗██║  ██║██║  ██║███████╗██║  ██║██████╔╝      ██████╔╝╚██████╔╝██║ ╚═╝ ██║
+╚═╝  ╚═╝╚═╝  ╚═╝╚═╝  ╚═╝╚══════╝╚═╝  ╚═╝╚═════╝       ╚═════╝  ╚═════╝ ╚═╝     ╚═╝
+
+🏔️ ALGORITHMIC TRADING SYSTEM - "They delved too greedily and too deep..."
+
+┌─────────────────────────────────────────────────────────────────────────────────────┐
+│ 📋 MODULE: Concurrent Market Data Download Scheduler                                 │
+│ 📄 FILE: download_scheduler.py                                                       │
+│ 📅 CREATED: 2026-10-16                                                               │
+│ 👑 AUTHOR: FeanorKingofNoldor                                                        │
+│ 🔗 REPOSITORY: https://github.com/FeanorKingofNoldor/khazad_dum                      │
+│ 📧 CONTACT: [Your Contact Info]                                                      │
+│                                                                                     │
+│ 🎯 PURPOSE:                                                                          │
+│ Downloads the screening universe in concurrent yfinance batches                     │
+│ with adaptive rate limiting and per-ticker retries                                  │
+│                                                                                     │
+│ 🔧 DEPENDENCIES:                                                                     │
+│ - yfinance (market data API)                                                        │
+│ - concurrent.futures (bounded batch pool)                                           │
+│                                                                                     │
+│ 📈 TRADING PIPELINE STAGE: Data Pipeline (Pre-Screening)                             │
+│ └── 1. Market Regime Detection                                                      │
+│ └── 2. Stock Screening ← Download Layer                                             │
+│ └── 3. AI Analysis (TradingAgents)                                                  │
+│ └── 4. Pattern Recognition                                                          │
+│ └── 5. Portfolio Construction                                                       │
+│ └── 6. Performance Observation                                                      │
+│                                                                                     │
+│ ⚠️  CRITICAL NOTES:                                                                 │
+│ - Results are yielded on the caller's thread (bar store writes stay single-threaded) │
+│ - Failed batches are bisected so only failing tickers are retried                   │
+│ - Rate halves on throttling and recovers additively on success                      │
+│                                                                                     │
+│ 📊 PERFORMANCE NOTES:                                                                │
+│ - 4 batches in flight by default instead of strictly serial batches                 │
+│ - Fixed 1s sleep replaced by a token bucket                                         │
+│                                                                                     │
+│ 🧪 TESTING:                                                                          │
+│ - Unit Tests: tests/unit/data_pipeline/test_download_scheduler.py                   │
+│                                                                                     │
+│ 📚 DOCUMENTATION:                                                                    │
+│ - API Docs: Auto-generated from docstrings                                          │
+│ - Usage Guide: docs/guides/DATA_FETCHING_USAGE.md                                   │
+└─────────────────────────────────────────────────────────────────────────────────────┘
+
+Licensed under MIT License - See LICENSE file for details
+Copyright (c) 2024 FeanorKingofNoldor
+
+"In the depths of Khazad-dûm, the markets reveal their secrets to those who dare..."
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Iterator, List, Optional, Tuple
+
+import pandas as pd
+import yfinance as yf
+
+from config.settings.base_config import (
+    DOWNLOAD_BATCH_SIZE,
+    DOWNLOAD_MAX_WORKERS,
+    DOWNLOAD_RATE_PER_SEC,
+    DOWNLOAD_MIN_RATE,
+    DOWNLOAD_MAX_RATE,
+    DOWNLOAD_THROTTLE_COOLDOWN,
+    DOWNLOAD_MAX_RETRIES,
+    DOWNLOAD_EMPTY_BATCH_THROTTLE,
+)
+
+
+class RateLimitError(Exception):
+    """Provider signalled throttling (HTTP 429 / rate limit)"""
+    pass
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket with AIMD rate adaptation
+    Rate is halved on throttling and recovers additively on success
+    """
+
+    def __init__(self, rate: float = DOWNLOAD_RATE_PER_SEC, capacity: float = DOWNLOAD_MAX_WORKERS,
+                 min_rate: float = DOWNLOAD_MIN_RATE, max_rate: float = DOWNLOAD_MAX_RATE,
+                 cooldown: float = DOWNLOAD_THROTTLE_COOLDOWN):
+        self.rate = rate
+        self.capacity = capacity
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.cooldown = cooldown
+
+        self._tokens = capacity
+        self._last = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now >= self._paused_until:
+                    self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                    self._last = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait_time = (1 - self._tokens) / self.rate
+                else:
+                    self._last = self._paused_until
+                    wait_time = self._paused_until - now
+            time.sleep(wait_time)
+
+    def throttle(self):
+        """Provider pushed back: halve the rate and pause everyone"""
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            self._tokens = 0
+            self._paused_until = time.monotonic() + self.cooldown
+
+    def recover(self):
+        """Successful request: creep the rate back up"""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + 0.1)
+
+
+class DownloadScheduler:
+    """
+    Bounded pool of concurrent batch downloads with per-ticker retry
+    """
+
+    def __init__(self, download_fn: Optional[Callable] = None,
+                 batch_size: int = DOWNLOAD_BATCH_SIZE,
+                 max_workers: int = DOWNLOAD_MAX_WORKERS,
+                 max_retries: int = DOWNLOAD_MAX_RETRIES,
+                 bucket: Optional[TokenBucket] = None):
+        """
+        Args:
+            download_fn: Callable(tickers, start, end) -> yfinance-style frame
+                         (None = yf.download)
+            batch_size: Tickers per request
+            max_workers: Requests in flight at once
+            max_retries: Retries per ticker before giving up on it
+            bucket: Rate limiter shared by all workers
+        """
+        self.download_fn = download_fn or self._yf_download
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.bucket = bucket or TokenBucket(capacity=max_workers)
+
+    def run(self, tickers: List[str], start_date, end_date,
+            failed_tickers: List[str]) -> Iterator[Tuple[pd.DataFrame, List[str]]]:
+        """
+        Download tickers, yielding (data, batch) as batches complete
+        batch lists the tickers that actually have data in the frame.
+        Tickers still failing after retries are appended to failed_tickers.
+        """
+        queue = deque(
+            (tickers[i:i + self.batch_size], 0)
+            for i in range(0, len(tickers), self.batch_size)
+        )
+        total = len(queue)
+        completed = 0
+        
+        # yfinance swallows 429s per ticker, so a run of empty first-attempt
+        # batches is read as throttling. One empty batch (delisted or bad
+        # symbols) is not, and neither are the bisected halves it is retried as
+        initial_batches = {tuple(batch) for batch, _ in queue}
+        empty_streak = 0
+
+        # Downloaded-but-unconsumed batches count against the limit, so memory
+        # stays bounded by a few batches however slow the consumer is
+        max_pending = self.max_workers * 2
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            pending = {}
+
+            while queue or pending:
+                while queue and len(pending) < max_pending:
+                    batch, attempt = queue.popleft()
+                    pending[pool.submit(self._fetch, batch, start_date, end_date)] = (batch, attempt)
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    batch, attempt = pending.pop(future)
+                    retry = []
+
+                    try:
+                        data = future.result()
+                    except RateLimitError:
+                        # Whole batch again once the bucket cools down
+                        print(f"Rate limited on {len(batch)} tickers, backing off to {self.bucket.rate:.2f} req/s")
+                        retry = [(batch, attempt + 1)]
+                        data = None
+                    except Exception as e:
+                        print(f"Error downloading {len(batch)} tickers: {e}")
+                        retry = self._bisect(batch, attempt)
+                        data = None
+
+                    if data is not None:
+                        got = self._tickers_with_data(data, batch)
+                        missing = [t for t in batch if t not in got]
+                        if got:
+                            empty_streak = 0
+                        elif len(batch) > 1 and tuple(batch) in initial_batches:
+                            empty_streak += 1
+                            if empty_streak >= DOWNLOAD_EMPTY_BATCH_THROTTLE:
+                                self.bucket.throttle()
+                                empty_streak = 0
+                        if missing:
+                            retry = self._bisect(missing, attempt)
+
+                    for retry_batch, retry_attempt in retry:
+                        if retry_attempt > self.max_retries:
+                            failed_tickers.extend(retry_batch)
+                        else:
+                            queue.append((retry_batch, retry_attempt))
+
+                    if data is not None and got:
+                        completed += 1
+                        print(f"Downloaded batch {completed} ({len(got)} stocks, {total} initial batches)")
+                        yield data, got
+
+    def _bisect(self, batch: List[str], attempt: int) -> List[Tuple[List[str], int]]:
+        """
+        Split a failing batch so good tickers are not held hostage by bad ones
+        Only single-ticker retries count against max_retries
+        """
+        if len(batch) > 1:
+            mid = len(batch) // 2
+            return [(batch[:mid], attempt), (batch[mid:], attempt)]
+        return [(batch, attempt + 1)]
+
+    def _fetch(self, batch: List[str], start_date, end_date) -> pd.DataFrame:
+        """Rate-limited download of one batch (runs on a worker thread)"""
+        self.bucket.acquire()
+        try:
+            data = self.download_fn(batch, start_date, end_date)
+        except Exception as e:
+            if self._is_rate_limit(e):
+                self.bucket.throttle()
+                raise RateLimitError(str(e)) from e
+            raise
+
+        self.bucket.recover()
+        return data
+
+    @staticmethod
+    def _is_rate_limit(error: Exception) -> bool:
+        """Recognize throttling responses from yfinance / requests"""
+        text = f"{type(error).__name__} {error}".lower()
+        return any(marker in text for marker in ('ratelimit', 'rate limit', 'too many requests', '429'))
+
+    @staticmethod
+    def _tickers_with_data(data: pd.DataFrame, batch: List[str]) -> List[str]:
+        """Tickers in the batch that came back with at least one close"""
+        if data is None or data.empty or 'Close' not in data.columns.get_level_values(0):
+            return []
+        if not isinstance(data.columns, pd.MultiIndex):
+            # Flat frame: single-ticker request
+            return list(batch) if len(batch) == 1 and data['Close'].notna().any() else []
+
+        closes = data['Close']
+        return [t for t in batch if t in closes.columns and closes[t].notna().any()]
+
+    @staticmethod
+    def _yf_download(batch: List[str], start_date, end_date) -> pd.DataFrame:
+        """Default downloader: one yfinance request for the batch"""
+        return yf.download(
+            batch,
+            start=start_date,
+            end=end_date,
+            progress=False,
+            auto_adjust=True,
+            threads=True
+        )
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+██╗  ██╗██╗  ██╗ █████╗ ███████╗ █████╗ ██████╗       ██████╗ ██╗   ██╗███╗   ███╗
+██║ ██╔╝██║  ██║██╔══██╗╚══███╔╝██╔══██╗██╔══██╗      ██╔══██╗██║   ██║████╗ ████║
+█████╔╝ ███████║███████║  ███╔╝ ███████║██║  ██║█████╗██║  ██║██║   ██║██╔████╔██║
+██╔═██╗ ██╔══██║██╔══██║ ███╔╝  ██╔══██║██║  ██║╚════╝██║  ██║██║   ██║██║╚██╔╝██║
+██║  ██╗██║  ██║██║  ██║███████╗██║  ██║██████╔╝      ██████╔╝╚██████╔╝██║ ╚═╝ ██║
+╚═╝  ╚═╝╚═╝  ╚═╝╚═╝  ╚═╝╚══════╝╚═╝  ╚═╝╚═════╝       ╚═════╝  ╚═════╝ ╚═╝     ╚═╝
+
+🏔️ ALGORITHMIC TRADING SYSTEM - "They delved too greedily and too deep..."
+
+┌─────────────────────────────────────────────────────────────────────────────────────┐
+│ 📋 MODULE: Vectorized Indicator Engine                                               │
+│ 📄 FILE: indicator_engine.py                                                         │
+│ 📅 CREATED: 2026-10-16                                                               │
+│ 👑 AUTHOR: FeanorKingofNoldor                                                        │
+│ 🔗 REPOSITORY: https://github.com/FeanorKingofNoldor/khazad_dum                      │
+│ 📧 CONTACT: [Your Contact Info]                                                      │
+│                                                                                     │
+│ 🎯 PURPOSE:                                                                          │
+│ Computes screening indicators for the whole universe at once on                     │
+│ wide (date x symbol) NumPy matrices                                                 │
+│                                                                                     │
+│ 🔧 DEPENDENCIES:                                                                     │
+│ - numpy (matrix indicator math)                                                     │
+│ - pandas (input/output frames)                                                      │
+│                                                                                     │
+│ 📈 TRADING PIPELINE STAGE: Data Pipeline (Pre-Screening)                             │
+│ └── 1. Market Regime Detection                                                      │
+│ └── 2. Stock Screening ← Indicator Source                                           │
+│ └── 3. AI Analysis (TradingAgents)                                                  │
+│ └── 4. Pattern Recognition                                                          │
+│ └── 5. Portfolio Construction                                                       │
+│ └── 6. Performance Observation                                                      │
+│                                                                                     │
+│ ⚠️  CRITICAL NOTES:                                                                 │
+│ - Output matches the former per-ticker calculate_metrics loop                       │
+│ - Each symbol's valid bars are right-aligned so gaps behave like dropna             │
+│                                                                                     │
+│ 📊 PERFORMANCE NOTES:                                                                │
+│ - One pass of array ops per indicator instead of one pandas rolling per symbol      │
+│ - Only the trailing lookback rows are materialized                                  │
+│                                                                                     │
+│ 🧪 TESTING:                                                                          │
+│ - Unit Tests: tests/unit/data_pipeline/test_indicator_engine.py                     │
+│                                                                                     │
+│ 📚 DOCUMENTATION:                                                                    │
+│ - API Docs: Auto-generated from docstrings                                          │
+│ - Usage Guide: docs/guides/DATA_FETCHING_USAGE.md                                   │
+└─────────────────────────────────────────────────────────────────────────────────────┘
+
+Licensed under MIT License - See LICENSE file for details
+Copyright (c) 2024 FeanorKingofNoldor
+
+"In the depths of Khazad-dûm, the markets reveal their secrets to those who dare..."
+"""
+
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+
+class IndicatorEngine:
+    """
+    Cross-sectional technical indicators for the screening universe
+    Works on yfinance-style frames with (field, symbol) columns
+    """
+
+    FIELDS = ['High', 'Low', 'Close', 'Volume']
+    MIN_BARS = 20     # Symbols with fewer valid closes are skipped
+    LOOKBACK = 51     # Longest window (SMA50) plus one bar for diffs
+    RSI_PERIOD = 2
+    ATR_PERIOD = 14
+
+    def compute(self, data: pd.DataFrame, tickers: List[str]) -> pd.DataFrame:
+        """
+        Calculate metrics for every ticker in one pass
+        Returns one row per ticker with at least MIN_BARS valid closes
+        """
+        if data is None or data.empty:
+            return pd.DataFrame()
+
+        symbols, matrices = self._to_matrices(data, tickers)
+        if not symbols:
+            return pd.DataFrame()
+
+        close = matrices['Close']
+        n_valid = (~np.isnan(close)).sum(axis=0)
+        keep = n_valid >= self.MIN_BARS
+        if not keep.any():
+            return pd.DataFrame()
+
+        symbols = [s for s, k in zip(symbols, keep) if k]
+        n_valid = n_valid[keep]
+        matrices = self._right_align({f: m[:, keep] for f, m in matrices.items()}, close[:, keep])
+
+        return self._metrics(symbols, matrices, n_valid)
+
+    def _to_matrices(self, data: pd.DataFrame, tickers: List[str]):
+        """Extract (dates x symbols) float matrices for each field"""
+        if not isinstance(data.columns, pd.MultiIndex):
+            # Flat frame: only attributable to a single-ticker request
+            if len(tickers) != 1:
+                return [], {}
+            matrices = {f: data[f].to_numpy(dtype=float)[:, None] for f in self.FIELDS}
+            return list(tickers), matrices
+
+        available = set(data.columns.get_level_values(1))
+        symbols = [t for t in dict.fromkeys(tickers) if t in available]
+        matrices = {}
+        for f in self.FIELDS:
+            field = data[f] if f in data.columns.get_level_values(0) else pd.DataFrame(index=data.index)
+            matrices[f] = field.reindex(columns=symbols).to_numpy(dtype=float)
+        return symbols, matrices
+
+    def _right_align(self, matrices: Dict[str, np.ndarray], close: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Move each symbol's valid-close rows to the bottom, keeping their order,
+        and trim to the trailing LOOKBACK rows. Equivalent to a per-symbol
+        dropna(subset=['Close']) followed by tail(LOOKBACK).
+        """
+        valid = ~np.isnan(close)
+        if valid.all():
+            order = None
+        else:
+            # Stable sort puts invalid rows (key 0) first, valid rows (key 1) last
+            order = np.argsort(valid, axis=0, kind='stable')
+
+        aligned = {}
+        for f, m in matrices.items():
+            if order is not None:
+                m = np.take_along_axis(m, order, axis=0)
+            aligned[f] = m[-self.LOOKBACK:]
+        return aligned
+
+    def _metrics(self, symbols: List[str], m: Dict[str, np.ndarray], n_valid: np.ndarray) -> pd.DataFrame:
+        """Compute indicator columns from right-aligned matrices"""
+        close, high, low, volume = m['Close'], m['High'], m['Low'], m['Volume']
+
+        price = close[-1]
+        last_volume = volume[-1]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            sma_20 = close[-20:].mean(axis=0)
+            sma_50 = np.where(n_valid >= 50, close[-50:].mean(axis=0), np.nan)
+
+            avg_volume_20 = volume[-20:].mean(axis=0)
+            volume_ratio = last_volume / avg_volume_20
+
+            prev_close = close[-2]
+            change_1d = (price - prev_close) / prev_close * 100
+
+            rsi_2 = self._rsi(close, self.RSI_PERIOD)
+            atr = self._atr(high, low, close, n_valid, self.ATR_PERIOD)
+
+        metrics = pd.DataFrame({
+            'symbol': symbols,
+            'price': price,
+            'volume': last_volume,
+            'dollar_volume': price * last_volume,
+            'rsi_2': rsi_2,
+            'atr': atr,
+            'sma_20': sma_20,
+            'sma_50': sma_50,
+            'avg_volume_20': avg_volume_20,
+            'volume_ratio': volume_ratio,
+            'change_1d': change_1d,
+            # Rough market cap (would need shares outstanding for real)
+            'market_cap': price * last_volume * 1000  # Placeholder
+        })
+        metrics['quality_score'] = self._quality_score(metrics)
+        return metrics
+
+    def _rsi(self, close: np.ndarray, period: int) -> np.ndarray:
+        """Simple-average RSI of the last bar (100 when there were no losses)"""
+        delta = np.diff(close[-(period + 1):], axis=0)
+        gain = np.where(delta > 0, delta, 0.0).mean(axis=0)
+        loss = np.where(delta < 0, -delta, 0.0).mean(axis=0)
+
+        rsi = 100 - (100 / (1 + gain / loss))
+        return np.where(loss == 0, 100.0, rsi)
+
+    def _atr(self, high: np.ndarray, low: np.ndarray, close: np.ndarray,
+             n_valid: np.ndarray, period: int) -> np.ndarray:
+        """Average True Range over the last `period` bars"""
+        prev_close = np.vstack([np.full((1, close.shape[1]), np.nan), close[:-1]])
+        # The first valid bar of each symbol has no previous close
+        rows = np.arange(close.shape[0])[:, None]
+        prev_close[rows == close.shape[0] - n_valid] = np.nan
+
+        tr = np.stack([
+            high - low,
+            np.abs(high - prev_close),
+            np.abs(low - prev_close),
+        ])
+        # Row max that skips NaN but stays NaN when every component is missing
+        all_missing = np.isnan(tr).all(axis=0)
+        tr = np.where(all_missing, np.nan, np.where(np.isnan(tr), -np.inf, tr).max(axis=0))
+
+        return tr[-period:].mean(axis=0)
+
+    def _quality_score(self, metrics: pd.DataFrame) -> np.ndarray:
+        """Simple quality score (0-1)"""
+        volume_ratio = metrics['volume_ratio'].to_numpy()
+        score = np.zeros(len(metrics))
+
+        # Volume consistency (not too high, not too low)
+        score += np.where((volume_ratio > 0.5) & (volume_ratio < 2.0), 0.33, 0)
+
+        # Not oversold
+        score += np.where(metrics['rsi_2'].to_numpy() > 30, 0.33, 0)
+
+        # Price above 20-day average (momentum)
+        score += np.where(metrics['price'].to_numpy() > metrics['sma_20'].to_numpy(), 0.34, 0)
+
+        return score
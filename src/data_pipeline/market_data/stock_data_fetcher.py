@@ -18,13 +18,14 @@
 │ 📧 CONTACT: [Your Contact Info]                                                    │
 │                                                                                     │
 │ 🎯 PURPOSE:                                                                        │
-│ Fetches S&P 500 market data and calculates technical indicators for screening     │
+│ Fetches market data for the screening universe (S&P 500, Russell 3000 or all     │
+│ US-listed) and calculates technical indicators for screening                      │
 │                                                                                     │
 │ 🔧 DEPENDENCIES:                                                                   │
 │ - yfinance (market data API)                                                       │
 │ - pandas (data manipulation)                                                       │
 │ - numpy (numerical calculations)                                                   │
-│ - Multiple S&P 500 ticker sources with fallback                                   │
+│ - Multiple universe sources with fallback to the S&P 500                          │
 │                                                                                     │
 │ 📈 TRADING PIPELINE STAGE: Data Pipeline (Pre-Screening)                        │
 │ └── 1. Market Regime Detection                                                     │
@@ -35,13 +36,18 @@
 │ └── 6. Performance Observation                                                     │
 │                                                                                     │
 │ ⚠️  CRITICAL NOTES:                                                                │
-│ - Processes entire S&P 500 universe in batches                                    │
+│ - Processes the universe in batches                                               │
+│ - Two-tier screen: a price/volume snapshot pass applies the hard constraints,     │
+│   only survivors get the full history download and indicators                     │
 │ - Fallback ticker list if external sources fail                                   │
 │ - Calculates RSI(2), ATR, moving averages, volume metrics                        │
 │                                                                                     │
 │ 📊 PERFORMANCE NOTES:                                                              │
-│ - Batch processing: 50 tickers per batch with 1s delay                          │
-│ - Complete S&P 500 fetch: ~10-15 minutes                                         │
+│ - Batch processing: 50 tickers per batch, 4 concurrent, token-bucket limited    │
+│ - Complete S&P 500 fetch: ~10-15 minutes (first run / bar store disabled)        │
+│ - Incremental fetch from local bar store: seconds on a normal day                │
+│ - Indicators computed for all tickers at once (indicator_engine.py)              │
+│ - Snapshot pass: a few days of bars in 200-ticker batches per universe name      │
 │ - 24-hour ticker list caching for efficiency                                      │
 │                                                                                     │
 │ 🧪 TESTING:                                                                        │
@@ -59,39 +65,103 @@ Copyright (c) 2024 FeanorKingofNoldor
 "In the depths of Khazad-dûm, the markets reveal their secrets to those who dare..."
 """
 
+import io
 import pandas as pd
-import yfinance as yf
 import numpy as np
+import requests
 from datetime import datetime, timedelta
-from typing import List, Dict
+from typing import Callable, Iterator, List, Dict, Optional, Union
 import time
 
+from src.data_pipeline.market_data.bar_store import BarStore
+from src.data_pipeline.market_data.indicator_engine import IndicatorEngine
+from src.data_pipeline.market_data.download_scheduler import DownloadScheduler
+from config.settings.base_config import (
+    BAR_STORE_ENABLED,
+    BAR_HISTORY_DAYS,
+    BAR_OVERLAP_DAYS,
+    BAR_STORE_RETENTION_DAYS,
+    UNIVERSE,
+    RUSSELL3000_HOLDINGS_URL,
+    US_LISTED_URLS,
+    SNAPSHOT_DAYS,
+    SNAPSHOT_BATCH_SIZE,
+)
+
 
 class StockDataFetcher:
     """
-    Fetches and calculates metrics for S&P 500 universe
+    Fetches and calculates metrics for the screening universe
+    (S&P 500 by default, Russell 3000 or all US-listed via UNIVERSE)
     """
     
-    def __init__(self):
+    def __init__(self, bar_store: Union[BarStore, None, bool] = None,
+                 download_scheduler: Optional[DownloadScheduler] = None,
+                 snapshot_scheduler: Optional[DownloadScheduler] = None):
+        """
+        Args:
+            bar_store: Local daily bar store (None = create default if enabled,
+                       False = always download the full window)
+            download_scheduler: Batch downloader (None = default concurrent scheduler)
+            snapshot_scheduler: Downloader for the snapshot screen (None = large
+                                batches sharing download_scheduler's rate limiter)
+        """
+        if bar_store is None and BAR_STORE_ENABLED:
+            bar_store = BarStore()
+        self.bar_store = bar_store or None
+        self.indicator_engine = IndicatorEngine()
+        self.download_scheduler = download_scheduler or DownloadScheduler()
+        self.snapshot_scheduler = snapshot_scheduler or DownloadScheduler(
+            download_fn=self.download_scheduler.download_fn,
+            batch_size=SNAPSHOT_BATCH_SIZE,
+            max_workers=self.download_scheduler.max_workers,
+            max_retries=self.download_scheduler.max_retries,
+            bucket=self.download_scheduler.bucket
+        )
+        
         self.sp500_sources = [
             "https://raw.githubusercontent.com/datasets/s-and-p-500-companies/main/data/constituents.csv",
             "https://datahub.io/core/s-and-p-500-companies/r/constituents.csv",
         ]
-        self._ticker_cache = None
-        self._cache_time = None
+        self._ticker_cache = {}  # universe -> (tickers, fetched at)
         self._cache_duration = 86400  # 24 hours
         
-    def get_universe(self) -> List[str]:
+    def get_universe(self, universe: str = UNIVERSE) -> List[str]:
         """
-        Get complete S&P 500 ticker list with caching
+        Get the ticker list for a universe with caching
+        
+        Args:
+            universe: 'sp500' | 'russell3000' | 'us_listed'
         """
+        loaders = {
+            'sp500': self._load_sp500,
+            'russell3000': self._load_russell3000,
+            'us_listed': self._load_us_listed,
+        }
+        if universe not in loaders:
+            raise ValueError(f"Unknown universe '{universe}', expected one of {list(loaders)}")
+        
         # Check cache
-        if self._ticker_cache and self._cache_time:
-            if time.time() - self._cache_time < self._cache_duration:
-                print(f"Using cached ticker list ({len(self._ticker_cache)} tickers)")
-                return self._ticker_cache
+        cached = self._ticker_cache.get(universe)
+        if cached and time.time() - cached[1] < self._cache_duration:
+            print(f"Using cached ticker list ({len(cached[0])} tickers)")
+            return cached[0]
+        
+        tickers = loaders[universe]()
+        if tickers:
+            self._ticker_cache[universe] = (tickers, time.time())
+            return tickers
         
-        # Try primary sources
+        if universe != 'sp500':
+            print(f"No {universe} list available, falling back to S&P 500")
+            return self.get_universe('sp500')
+        
+        # Fallback to hardcoded top 100
+        print("Using fallback ticker list")
+        return self.get_fallback_tickers()
+    
+    def _load_sp500(self) -> Optional[List[str]]:
+        """S&P 500 constituents from the first source that answers"""
         for url in self.sp500_sources:
             try:
                 print(f"Fetching S&P 500 list from {url}")
@@ -99,14 +169,7 @@ class StockDataFetcher:
                 
                 # Handle different column names
                 symbol_col = 'Symbol' if 'Symbol' in df.columns else 'symbol'
-                tickers = df[symbol_col].tolist()
-                
-                # Clean tickers (BRK.B -> BRK-B for Yahoo)
-                tickers = [str(t).replace('.', '-') for t in tickers]
-                
-                # Cache the result
-                self._ticker_cache = tickers
-                self._cache_time = time.time()
+                tickers = self._clean_tickers(df[symbol_col])
                 
                 print(f"Successfully fetched {len(tickers)} S&P 500 tickers")
                 return tickers
@@ -114,10 +177,54 @@ class StockDataFetcher:
             except Exception as e:
                 print(f"Failed to fetch from {url}: {e}")
                 continue
+        return None
+    
+    def _load_russell3000(self) -> Optional[List[str]]:
+        """Russell 3000 constituents from the iShares IWV holdings file"""
+        try:
+            print(f"Fetching Russell 3000 holdings from {RUSSELL3000_HOLDINGS_URL}")
+            response = requests.get(RUSSELL3000_HOLDINGS_URL, timeout=30)
+            response.raise_for_status()
+            
+            # Fund metadata precedes the holdings table
+            lines = response.text.splitlines()
+            header = next(i for i, line in enumerate(lines) if line.startswith('Ticker'))
+            df = pd.read_csv(io.StringIO('\n'.join(lines[header:])), on_bad_lines='skip')
+            
+            tickers = self._clean_tickers(df.loc[df['Asset Class'] == 'Equity', 'Ticker'])
+            print(f"Successfully fetched {len(tickers)} Russell 3000 tickers")
+            return tickers
+            
+        except Exception as e:
+            print(f"Failed to fetch Russell 3000 holdings: {e}")
+            return None
+    
+    def _load_us_listed(self) -> Optional[List[str]]:
+        """All US-listed common stocks from the Nasdaq Trader symbol directories"""
+        tickers = []
+        for url, symbol_col in US_LISTED_URLS:
+            try:
+                print(f"Fetching listed symbols from {url}")
+                df = pd.read_csv(url, sep='|', dtype=str)
+                
+                # Trailer row is "File Creation Time: ..."; skip test issues and ETFs
+                df = df[(df['Test Issue'] == 'N') & (df['ETF'] == 'N')]
+                tickers.extend(df[symbol_col])
+                
+            except Exception as e:
+                print(f"Failed to fetch from {url}: {e}")
+                return None
         
-        # Fallback to hardcoded top 100
-        print("Using fallback ticker list")
-        return self.get_fallback_tickers()
+        tickers = self._clean_tickers(pd.Series(tickers))
+        print(f"Successfully fetched {len(tickers)} US-listed tickers")
+        return tickers
+    
+    @staticmethod
+    def _clean_tickers(symbols: pd.Series) -> List[str]:
+        """Yahoo-style tickers (BRK.B -> BRK-B), without blanks, preferreds and duplicates"""
+        tickers = symbols.dropna().astype(str).str.strip().str.replace('.', '-', regex=False)
+        tickers = tickers[(tickers != '') & (tickers != '-') & ~tickers.str.contains(r'[$\s^/]')]
+        return list(dict.fromkeys(tickers))
     
     def get_fallback_tickers(self) -> List[str]:
         """
@@ -138,50 +245,11 @@ class StockDataFetcher:
     def fetch_all_sp500(self) -> pd.DataFrame:
         """
         Fetch data for entire S&P 500 universe
-        Processes in batches to avoid timeout
+        With the bar store enabled only bars newer than the stored history are
+        downloaded and metrics are computed from local history
         """
-        tickers = self.get_universe()
-        print(f"\nFetching data for {len(tickers)} S&P 500 stocks...")
-        
-        # Process in batches
-        batch_size = 50
-        all_metrics = []
         failed_tickers = []
-        
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=60)
-        
-        for i in range(0, len(tickers), batch_size):
-            batch = tickers[i:i + batch_size]
-            batch_num = i // batch_size + 1
-            total_batches = (len(tickers) + batch_size - 1) // batch_size
-            
-            print(f"Processing batch {batch_num}/{total_batches} ({len(batch)} stocks)")
-            
-            try:
-                # Download batch
-                data = yf.download(
-                    batch,
-                    start=start_date,
-                    end=end_date,
-                    progress=False,
-                    auto_adjust=True,
-                    threads=True
-                )
-                
-                if not data.empty:
-                    # Calculate metrics for each ticker in batch
-                    batch_metrics = self.calculate_metrics(data, batch)
-                    if not batch_metrics.empty:
-                        all_metrics.append(batch_metrics)
-                    
-                    # Add small delay to be nice to Yahoo
-                    time.sleep(1)
-                    
-            except Exception as e:
-                print(f"Error processing batch {batch_num}: {e}")
-                failed_tickers.extend(batch)
-                continue
+        all_metrics = list(self.stream_metrics(failed_tickers=failed_tickers))
         
         if failed_tickers:
             print(f"Failed to fetch {len(failed_tickers)} tickers: {failed_tickers[:10]}...")
@@ -194,117 +262,184 @@ class StockDataFetcher:
             print("No data fetched")
             return pd.DataFrame()
     
-    def calculate_metrics(self, data: pd.DataFrame, tickers: List[str]) -> pd.DataFrame:
+    def stream_metrics(self, tickers: Optional[List[str]] = None,
+                       failed_tickers: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
         """
-        Calculate technical indicators and metrics for multiple tickers
+        Yield one metrics DataFrame per downloaded batch as soon as it arrives
+        Downloads keep running in the scheduler pool while a batch is consumed
+        
+        Args:
+            tickers: Universe to fetch (None = configured UNIVERSE)
+            failed_tickers: Receives tickers whose download failed (no metrics
+                            are produced for them, stored history is not reused)
         """
-        results = []
+        if tickers is None:
+            tickers = self.get_universe()
+        if failed_tickers is None:
+            failed_tickers = []
+        print(f"\nFetching data for {len(tickers)} stocks...")
         
-        for ticker in tickers:
-            try:
-                # Extract ticker data
-                if len(tickers) == 1:
-                    ticker_data = data
-                else:
-                    # Handle multi-ticker download structure
-                    try:
-                        ticker_data = data.xs(ticker, level=1, axis=1)
-                    except:
-                        continue
-                
-                if ticker_data.empty or len(ticker_data) < 20:
-                    continue
-                
-                # Get latest values
-                latest = ticker_data.iloc[-1]
-                
-                # Basic metrics
-                metrics = {
-                    'symbol': ticker,
-                    'price': latest['Close'],
-                    'volume': latest['Volume'],
-                    'dollar_volume': latest['Close'] * latest['Volume'],
-                    
-                    # Simple RSI(2) calculation
-                    'rsi_2': self._calculate_rsi(ticker_data['Close'], 2),
-                    
-                    # ATR for stop loss calculation
-                    'atr': self._calculate_atr(ticker_data),
-                    
-                    # Moving averages
-                    'sma_20': ticker_data['Close'].rolling(20).mean().iloc[-1],
-                    'sma_50': ticker_data['Close'].rolling(50).mean().iloc[-1] if len(ticker_data) >= 50 else np.nan,
-                    
-                    # Volume metrics
-                    'avg_volume_20': ticker_data['Volume'].rolling(20).mean().iloc[-1],
-                    'volume_ratio': latest['Volume'] / ticker_data['Volume'].rolling(20).mean().iloc[-1],
-                    
-                    # Price change
-                    'change_1d': (latest['Close'] - ticker_data['Close'].iloc[-2]) / ticker_data['Close'].iloc[-2] * 100,
-                    
-                    # Rough market cap (would need shares outstanding for real)
-                    'market_cap': latest['Close'] * latest['Volume'] * 1000  # Placeholder
-                }
-                
-                # Quality score (simplified)
-                metrics['quality_score'] = self._calculate_quality_score(metrics)
-                
-                results.append(metrics)
-                
-            except Exception as e:
-                # Skip failed tickers silently
-                continue
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=BAR_HISTORY_DAYS)
+        
+        if self.bar_store is None:
+            for data, batch in self._download_batches(tickers, start_date, end_date, failed_tickers):
+                metrics = self.calculate_metrics(data, batch)
+                if not metrics.empty:
+                    yield metrics
+            return
         
-        return pd.DataFrame(results)
+        for batch in self._sync_bar_batches(tickers, start_date, end_date, failed_tickers):
+            metrics = self.calculate_metrics(self.bar_store.load_history(batch, start_date), batch)
+            if not metrics.empty:
+                yield metrics
     
-    def _calculate_rsi(self, prices: pd.Series, period: int = 2) -> float:
-        """Calculate RSI"""
-        try:
-            delta = prices.diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-            
-            if loss.iloc[-1] == 0:
-                return 100.0
-            
-            rs = gain / loss
-            rsi = 100 - (100 / (1 + rs))
-            return float(rsi.iloc[-1])
-        except:
-            return 50.0
+    def screen_universe(self, tickers: List[str], prefilter: Callable[[pd.DataFrame], pd.DataFrame],
+                        snapshot_failed: Optional[List[str]] = None) -> List[str]:
+        """
+        First tier of the two-tier screen: apply prefilter to a cheap
+        price/volume snapshot and return the tickers worth a full download
+        
+        Args:
+            tickers: Full universe
+            prefilter: Frame -> surviving rows (e.g. StockFilter.apply_hard_constraints)
+            snapshot_failed: Receives tickers whose snapshot download failed;
+                             they are not screened out but retried in the full download
+        
+        Returns:
+            Surviving tickers in universe order (the whole universe if the
+            snapshot came back empty)
+        """
+        failed = []
+        snapshot = self.fetch_snapshot(tickers, failed)
+        
+        if snapshot.empty:
+            print("Snapshot screen returned no data - fetching the full universe")
+            return list(tickers)
+        
+        if snapshot_failed is not None:
+            snapshot_failed.extend(failed)
+        
+        passed = set(prefilter(snapshot)['symbol']) | set(failed)
+        survivors = [t for t in tickers if t in passed]
+        print(f"Snapshot screen: {len(survivors)} of {len(tickers)} tickers pass hard constraints"
+              + (f" ({len(failed)} unscreened, snapshot failed)" if failed else ""))
+        return survivors
     
-    def _calculate_atr(self, data: pd.DataFrame, period: int = 14) -> float:
-        """Calculate Average True Range"""
-        try:
-            high = data['High']
-            low = data['Low']
-            close = data['Close']
-            
-            tr1 = high - low
-            tr2 = abs(high - close.shift())
-            tr3 = abs(low - close.shift())
-            
-            tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-            atr = tr.rolling(window=period).mean().iloc[-1]
-            
-            return float(atr)
-        except:
-            return 0.0
+    def fetch_snapshot(self, tickers: List[str], failed_tickers: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Last price and volume for every ticker from a few days of bars,
+        downloaded in large batches
+        
+        Returns:
+            DataFrame with symbol, price, volume, dollar_volume (same
+            definitions as the indicator engine's last-bar metrics)
+        """
+        if failed_tickers is None:
+            failed_tickers = []
+        print(f"\nSnapshot of {len(tickers)} stocks...")
+        
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=SNAPSHOT_DAYS)
+        
+        frames = [
+            self._last_bars(data, batch)
+            for data, batch in self.snapshot_scheduler.run(tickers, start_date, end_date, failed_tickers)
+        ]
+        if not frames:
+            return pd.DataFrame(columns=['symbol', 'price', 'volume', 'dollar_volume'])
+        return pd.concat(frames, ignore_index=True)
+    
+    @staticmethod
+    def _last_bars(data: pd.DataFrame, batch: List[str]) -> pd.DataFrame:
+        """Last valid close per ticker and the volume on that bar"""
+        if isinstance(data.columns, pd.MultiIndex):
+            close = data['Close'].reindex(columns=batch).to_numpy(dtype=float)
+            volume = data['Volume'].reindex(columns=batch).to_numpy(dtype=float)
+        else:
+            # Single-ticker download
+            close = data[['Close']].to_numpy(dtype=float)
+            volume = data[['Volume']].to_numpy(dtype=float)
+        
+        last = close.shape[0] - 1 - np.argmax(~np.isnan(close[::-1]), axis=0)
+        columns = np.arange(close.shape[1])
+        price, last_volume = close[last, columns], volume[last, columns]
+        
+        return pd.DataFrame({
+            'symbol': list(batch),
+            'price': price,
+            'volume': last_volume,
+            'dollar_volume': price * last_volume
+        })
     
-    def _calculate_quality_score(self, metrics: Dict) -> float:
-        """Simple quality score (0-1)"""
-        score = 0
+    def sync_bar_store(self, tickers: List[str], start_date: datetime, end_date: datetime) -> List[str]:
+        """
+        Bring the local bar store up to date for these tickers
+        Returns tickers whose download failed
+        """
+        failed_tickers = []
+        for _ in self._sync_bar_batches(tickers, start_date, end_date, failed_tickers):
+            pass
+        return failed_tickers
+    
+    def _sync_bar_batches(self, tickers: List[str], start_date: datetime, end_date: datetime,
+                          failed_tickers: List[str]) -> Iterator[List[str]]:
+        """
+        Update the bar store batch by batch, yielding the tickers whose stored
+        history is current after each write
+        Failed downloads are appended to failed_tickers
+        """
+        window_start = start_date.date()
+        last_dates = self.bar_store.get_last_dates(tickers)
         
-        # Volume consistency (not too high, not too low)
-        if 0.5 < metrics['volume_ratio'] < 2.0:
-            score += 0.33
+        # Group tickers by the date their download has to start from
+        plan: Dict = {}
+        for ticker in tickers:
+            last = last_dates.get(ticker)
+            if last is None or last < window_start:
+                fetch_from = window_start
+            else:
+                # Overlap with stored bars: refreshes a partial last bar and
+                # lets us detect restated (re-adjusted) history
+                fetch_from = max(window_start, last - timedelta(days=BAR_OVERLAP_DAYS))
+            plan.setdefault(fetch_from, []).append(ticker)
+        
+        new_count = sum(len(g) for d, g in plan.items() if d == window_start)
+        print(f"Bar store: {len(tickers) - new_count} tickers incremental, {new_count} full window")
+        
+        restated = []
         
-        # Not oversold
-        if metrics['rsi_2'] > 30:
-            score += 0.33
+        for fetch_from, group in sorted(plan.items()):
+            for data, batch in self._download_batches(group, fetch_from, end_date, failed_tickers):
+                overlap = {t: last_dates[t] for t in batch if t in last_dates}
+                restated_batch = self.bar_store.find_restated(data, batch, overlap)
+                restated.extend(restated_batch)
+                
+                fresh = [t for t in batch if t not in restated_batch]
+                self.bar_store.upsert_bars(data, fresh)
+                if fresh:
+                    yield fresh
         
-        # Price above 20-day average (momentum)
-        if metrics['price'] > metrics['sma_20']:
-            score += 0.34
+        # Restated symbols (splits, dividends) get their whole window re-downloaded
+        if restated:
+            print(f"Re-downloading {len(restated)} tickers with restated history: {restated[:10]}")
+            for data, batch in self._download_batches(restated, window_start, end_date, failed_tickers):
+                self.bar_store.replace_history(data, batch)
+                yield batch
         
-        return score
\ No newline at end of file
+        self.bar_store.prune(BAR_STORE_RETENTION_DAYS)
+    
+    def _download_batches(self, tickers: List[str], start_date, end_date, failed_tickers: List[str]):
+        """
+        Download tickers in concurrent, rate-limited batches, yielding
+        (data, batch) as each completes
+        Tickers still failing after retries are appended to failed_tickers
+        """
+        return self.download_scheduler.run(tickers, start_date, end_date, failed_tickers)
+    
+    def calculate_metrics(self, data: pd.DataFrame, tickers: List[str]) -> pd.DataFrame:
+        """
+        Calculate technical indicators and metrics for multiple tickers
+        All tickers are computed together by the vectorized indicator engine
+        """
+        return self.indicator_engine.compute(data, tickers)
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+██╗  ██╗██╗  ██╗ █████╗ ███████╗ █████╗ ██████╗       ██████╗ ██╗   ██╗███╗   ███╗
+██║ ██╔╝██║  ██║██╔══██╗╚══███╔╝██╔══██╗██╔══██╗      ██╔══██╗██║   ██║████╗ ████║
+█████╔╝ ███████║███████║  ███╔╝ ███████║██║  ██║█████╗██║  ██║██║   ██║██╔████╔██║
+██╔═██╗ ██╔══██║██╔══██║ ███╔╝  ██╔══██║██║  ██║╚════╝██║  ██║██║   ██║██║╚██╔╝██║
+██║  ██╗██║  ██║██║  ██║███████╗██║  ██║██████╔╝      ██████╔╝╚██████╔╝██║ ╚═╝ ██║
+╚═╝  ╚═╝╚═╝  ╚═╝╚═╝  ╚═╝╚══════╝╚═╝  ╚═╝╚═════╝       ╚═════╝  ╚═════╝ ╚═╝     ╚═╝
+
+🏔️ ALGORITHMIC TRADING SYSTEM - "They delved too greedily and too deep..."
+
+┌─────────────────────────────────────────────────────────────────────────────────────┐
+│ 📋 MODULE: Streaming Market Data Pipeline                                            │
+│ 📄 FILE: metrics_pipeline.py                                                         │
+│ 📅 CREATED: 2026-10-16                                                               │
+│ 👑 AUTHOR: FeanorKingofNoldor                                                        │
+│ 🔗 REPOSITORY: https://github.com/FeanorKingofNoldor/khazad_dum                      │
+│ 📧 CONTACT: [Your Contact Info]                                                      │
+│                                                                                     │
+│ 🎯 PURPOSE:                                                                          │
+│ Streams each downloaded batch through metric calculation, validation                │
+│ and database insert as soon as it arrives                                           │
+│                                                                                     │
+│ 🔧 DEPENDENCIES:                                                                     │
+│ - StockDataFetcher (batch metric stream)                                            │
+│ - DatabaseManager / PostgreSQLManager (validated inserts)                           │
+│                                                                                     │
+│ 📈 TRADING PIPELINE STAGE: Data Pipeline (Pre-Screening)                             │
+│ └── 1. Market Regime Detection                                                      │
+│ └── 2. Stock Screening ← Data Stage Driver                                          │
+│ └── 3. AI Analysis (TradingAgents)                                                  │
+│ └── 4. Pattern Recognition                                                          │
+│ └── 5. Portfolio Construction                                                       │
+│ └── 6. Performance Observation                                                      │
+│                                                                                     │
+│ ⚠️  CRITICAL NOTES:                                                                 │
+│ - Each run is recorded in runs; every batch carries its run_id                      │
+│ - Only complete runs are visible to get_latest_metrics                              │
+│                                                                                     │
+│ 📊 PERFORMANCE NOTES:                                                                │
+│ - Downloads continue in the scheduler pool while a batch is computed and inserted   │
+│ - Peak memory is a few batches, not the whole universe                              │
+│                                                                                     │
+│ 🧪 TESTING:                                                                          │
+│ - Unit Tests: tests/unit/data_pipeline/test_metrics_pipeline.py                     │
+│                                                                                     │
+│ 📚 DOCUMENTATION:                                                                    │
+│ - API Docs: Auto-generated from docstrings                                          │
+│ - Usage Guide: docs/guides/DATA_FETCHING_USAGE.md                                   │
+└─────────────────────────────────────────────────────────────────────────────────────┘
+
+Licensed under MIT License - See LICENSE file for details
+Copyright (c) 2024 FeanorKingofNoldor
+
+"In the depths of Khazad-dûm, the markets reveal their secrets to those who dare..."
+"""
+
+import logging
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+from config.settings.base_config import SNAPSHOT_SCREEN_MIN_UNIVERSE
+
+logger = logging.getLogger(__name__)
+
+
+class MetricsPipeline:
+    """
+    fetch -> compute -> validate -> insert, one batch at a time
+    """
+
+    def __init__(self, fetcher, db, prefilter: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None,
+                 snapshot_min_universe: Optional[int] = SNAPSHOT_SCREEN_MIN_UNIVERSE):
+        """
+        Args:
+            fetcher: StockDataFetcher providing stream_metrics()
+            db: Database manager providing insert_stock_metrics()
+            prefilter: Hard constraints applied to a price/volume snapshot before
+                       the full download (e.g. StockFilter.apply_hard_constraints)
+            snapshot_min_universe: Smallest universe screened when the fetcher has
+                       a bar store (None = never); without one every universe is
+        """
+        self.fetcher = fetcher
+        self.db = db
+        self.prefilter = prefilter
+        self.snapshot_min_universe = snapshot_min_universe
+
+    def run(self, tickers: Optional[List[str]] = None) -> Dict:
+        """
+        Fetch and store metrics for the universe
+        Returns run summary: run_id, timestamp, universe, screened, batches,
+        fetched, inserted, failed_tickers, snapshot_failed
+        """
+        run_timestamp = datetime.now()
+        run_id = self.db.start_run("daily data stage")
+        failed_tickers = []
+        summary = {
+            'run_id': run_id,
+            'timestamp': run_timestamp,
+            'universe': None,
+            'screened': None,
+            'batches': 0,
+            'fetched': 0,
+            'inserted': 0,
+            'failed_tickers': failed_tickers,
+            'snapshot_failed': [],
+        }
+        
+        try:
+            # Two-tier screen: only snapshot survivors get the full download
+            if self.prefilter is not None:
+                if tickers is None:
+                    tickers = self.fetcher.get_universe()
+                summary['universe'] = len(tickers)
+                if self._needs_snapshot_screen(len(tickers)):
+                    tickers = self.fetcher.screen_universe(tickers, self.prefilter, summary['snapshot_failed'])
+                    summary['screened'] = len(tickers)
+            
+            for metrics in self.fetcher.stream_metrics(tickers, failed_tickers=failed_tickers):
+                inserted = self.db.insert_stock_metrics(metrics, timestamp=run_timestamp, run_id=run_id)
+                
+                summary['batches'] += 1
+                summary['fetched'] += len(metrics)
+                summary['inserted'] += inserted
+                print(f"   Batch {summary['batches']}: {len(metrics)} stocks, {inserted} inserted "
+                      f"({summary['inserted']} total)")
+        except Exception:
+            # A partial run never becomes the latest snapshot
+            self.db.complete_run(run_id, status='failed')
+            raise
+        
+        self.db.complete_run(run_id, status='complete' if summary['inserted'] else 'failed')
+        
+        # Roll up and drop expired stock_metrics partitions (cheap when nothing expired)
+        try:
+            retention = self.db.apply_stock_metrics_retention()
+            if retention['dropped']:
+                print(f"   Rolled up {len(retention['dropped'])} expired partitions "
+                      f"into {retention['rolled_up']} daily rows")
+        except Exception as e:
+            logger.error(f"stock_metrics retention failed: {e}")
+        
+        if failed_tickers:
+            print(f"Failed to fetch {len(failed_tickers)} tickers: {failed_tickers[:10]}...")
+
+        logger.info(
+            f"Data stage complete: {summary['fetched']} stocks fetched, "
+            f"{summary['inserted']} inserted in {summary['batches']} batches"
+        )
+        return summary
+
+    def _needs_snapshot_screen(self, universe_size: int) -> bool:
+        """
+        The snapshot pass is a second network round trip; it only pays off when
+        the full download is expensive - no bar store, or a large universe
+        """
+        if self.fetcher.bar_store is None:
+            return True
+        return self.snapshot_min_universe is not None and universe_size >= self.snapshot_min_universe
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+██╗  ██╗██╗  ██╗ █████╗ ███████╗ █████╗ ██████╗       ██████╗ ██╗   ██╗███╗   ███╗
+██║ ██╔╝██║  ██║██╔══██╗╚══███╔╝██╔══██╗██╔══██╗      ██╔══██╗██║   ██║████╗ ████║
+█████╔╝ ███████║███████║  ███╔╝ ███████║██║  ██║█████╗██║  ██║██║   ██║██╔████╔██║
+██╔═██╗ ██╔══██║██╔══██║ ███╔╝  ██╔══██║██║  ██║╚════╝██║  ██║██║   ██║██║╚██╔╝██║
+██║  ██╗██║  ██║██║  ██║███████╗██║  ██║██████╔╝      ██████╔╝╚██████╔╝██║ ╚═╝ ██║
+╚═╝  ╚═╝╚═╝  ╚═╝╚═╝  ╚═╝╚══════╝╚═╝  ╚═╝╚═════╝       ╚═════╝  ╚═════╝ ╚═╝     ╚═╝
+
+🏔️ ALGORITHMIC TRADING SYSTEM - "They delved too greedily and too deep..."
+
+┌─────────────────────────────────────────────────────────────────────────────────────┐
+│ 📋 MODULE: Async Database Reader                                                     │
+│ 📄 FILE: async_reader.py                                                             │
+│ 📅 CREATED: 2026-10-16                                                               │
+│ 👑 AUTHOR: FeanorKingofNoldor                                                        │
+│ 🔗 REPOSITORY: https://github.com/FeanorKingofNoldor/khazad_dum                      │
+│ 📧 CONTACT: [Your Contact Info]                                                      │
+│                                                                                     │
+│ 🎯 PURPOSE:                                                                          │
+│ Awaitable read-only queries for async callers (web dashboard)                       │
+│ backed by a dedicated thread pool with one SQLite connection per thread             │
+│                                                                                     │
+│ 🔧 DEPENDENCIES:                                                                     │
+│ - DatabaseManager.reader() (per-thread read-only connections)                       │
+│ - concurrent.futures.ThreadPoolExecutor                                             │
+│                                                                                     │
+│ 📈 TRADING PIPELINE STAGE: System Monitoring (All Stages)                            │
+│ └── 1. Market Regime Detection                                                      │
+│ └── 2. Stock Screening                                                              │
+│ └── 3. AI Analysis (TradingAgents)                                                  │
+│ └── 4. Pattern Recognition                                                          │
+│ └── 5. Portfolio Construction                                                       │
+│ └── 6. Performance Observation ← Dashboard Reads                                    │
+│                                                                                     │
+│ ⚠️  CRITICAL NOTES:                                                                 │
+│ - Read-only: writes still go through DatabaseManager.transaction()                  │
+│ - Relies on WAL so readers never wait on the pipeline writer                        │
+│                                                                                     │
+│ 📊 PERFORMANCE NOTES:                                                                │
+│ - Queries never run on the event loop thread                                        │
+│ - Up to max_workers queries run in parallel                                         │
+│                                                                                     │
+│ 🧪 TESTING:                                                                          │
+│ - Unit Tests: tests/unit/data_pipeline/test_async_reader.py                         │
+│                                                                                     │
+│ 📚 DOCUMENTATION:                                                                    │
+│ - API Docs: Auto-generated from docstrings                                          │
+│ - Usage Guide: docs/guides/WEB_DASHBOARD_USAGE.md                                   │
+└─────────────────────────────────────────────────────────────────────────────────────┘
+
+Licensed under MIT License - See LICENSE file for details
+Copyright (c) 2024 FeanorKingofNoldor
+
+"In the depths of Khazad-dûm, the markets reveal their secrets to those who dare..."
+"""
+
+import asyncio
+import logging
+import sqlite3
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Sequence
+
+from config.settings.base_config import DASHBOARD_DB_WORKERS
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncDatabaseReader:
+    """
+    Run read-only queries off the event loop
+    
+    Every worker thread lazily opens its own read-only connection through
+    DatabaseManager.reader(), so concurrent queries never share a connection.
+    """
+    
+    def __init__(self, db, max_workers: int = DASHBOARD_DB_WORKERS):
+        """
+        Args:
+            db: DatabaseManager providing reader()
+            max_workers: Threads (and read connections) in the pool
+        """
+        self.db = db
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="db-reader")
+    
+    async def run(self, func: Callable[[sqlite3.Connection], Any]) -> Any:
+        """Call func(connection) on a pool thread and await its result"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, lambda: func(self.db.reader()))
+    
+    async def fetchall(self, query: str, params: Sequence = ()) -> List[sqlite3.Row]:
+        return await self.run(lambda conn: conn.execute(query, params).fetchall())
+    
+    async def fetchone(self, query: str, params: Sequence = ()) -> Optional[sqlite3.Row]:
+        return await self.run(lambda conn: conn.execute(query, params).fetchone())
+    
+    async def read_sql(self, query: str, params: Optional[Sequence] = None) -> pd.DataFrame:
+        return await self.run(lambda conn: pd.read_sql(query, conn, params=params))
+    
+    def close(self):
+        """Stop the pool; read connections are closed with the DatabaseManager"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
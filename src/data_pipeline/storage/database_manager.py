@@ -66,12 +66,24 @@ import sqlite3
 import pandas as pd
 import os
 import logging
+import threading
+import json
 from datetime import datetime
-from typing import List, Dict, Optional
+from functools import lru_cache
+from typing import List, Dict, Optional, Tuple, Callable, Union, Sequence
 from contextlib import contextmanager
 from pathlib import Path
 from decimal import Decimal
-from config.settings.base_config import DATABASE_PATH
+from config.settings.base_config import (
+    DATABASE_PATH,
+    SQLITE_JOURNAL_MODE,
+    SQLITE_SYNCHRONOUS,
+    SQLITE_CACHE_SIZE_KB,
+    SQLITE_MMAP_SIZE,
+    SQLITE_BUSY_TIMEOUT_MS,
+    STOCK_METRICS_RAW_RETENTION_MONTHS,
+    STOCK_METRICS_PARTITIONS_AHEAD,
+)
 
 # Import input validation for security
 from src.security.input_validator import (
@@ -85,12 +97,178 @@ logger = logging.getLogger(__name__)
 
 
 # Database schema version for migration management
-SCHEMA_VERSION = 3
+SCHEMA_VERSION = 7
+
+# stock_metrics is a UNION ALL view over monthly tables stock_metrics_pYYYYMM
+STOCK_METRICS_PARTITION_PREFIX = 'stock_metrics_p'
+
+STOCK_METRICS_COLUMNS_SQL = """
+    symbol TEXT NOT NULL,
+    timestamp DATETIME NOT NULL,
+    run_id INTEGER REFERENCES runs(run_id),
+    price REAL,
+    volume INTEGER,
+    dollar_volume REAL,
+    market_cap REAL,
+    
+    -- Technical indicators from fetcher
+    rsi_2 REAL,
+    atr REAL,
+    sma_20 REAL,
+    sma_50 REAL,
+    
+    -- Volume metrics
+    avg_volume_20 REAL,
+    volume_ratio REAL,
+    
+    -- Other metrics
+    change_1d REAL,
+    quality_score REAL,
+    
+    PRIMARY KEY (symbol, timestamp)
+"""
+
+# Metric columns carried into stock_metrics_daily (value of the day's last snapshot)
+ROLLUP_COLUMNS = [
+    'price', 'volume', 'dollar_volume', 'market_cap', 'rsi_2', 'atr',
+    'sma_20', 'sma_50', 'avg_volume_20', 'volume_ratio', 'change_1d', 'quality_score'
+]
+
+# Secondary indexes, one per hot query shape: table -> [(index name, columns)]
+QUERY_INDEXES = {
+    'position_tracking': [
+        # PositionTracker.get_open_positions, dashboard open/closed summaries
+        ('idx_position_tracking_status_exit', 'status, exit_date, symbol'),
+        # PositionTracker entry/exit lookups by batch and symbol
+        ('idx_position_tracking_batch_symbol', 'batch_id, symbol, exit_date'),
+    ],
+    'tradingagents_analysis_results': [
+        # PortfolioConstructor candidates: WHERE batch_id = ? ORDER BY conviction_score DESC
+        ('idx_ta_results_batch_conviction', 'batch_id, conviction_score DESC'),
+        # Dashboard recent signals: ORDER BY created_at DESC LIMIT 20
+        ('idx_ta_results_created', 'created_at'),
+    ],
+    'filter_results': [
+        # Context provider / filter stats: WHERE selected = 1 ORDER BY timestamp DESC
+        ('idx_filter_results_selected', 'selected, timestamp'),
+    ],
+    'observations': [
+        # PerformanceObserver: WHERE symbol = ? AND observation_date = date('now')
+        ('idx_observations_symbol_date', 'symbol, observation_date'),
+        # Observation reports: WHERE observation_date > ?
+        ('idx_observations_date', 'observation_date'),
+    ],
+    'missed_opportunities': [
+        ('idx_missed_opportunities_date', 'date'),
+    ],
+    'trade_patterns': [
+        # PatternDatabase top/regime patterns: is_active = 1 ORDER BY expectancy DESC
+        ('idx_trade_patterns_active_expectancy', 'is_active, expectancy DESC'),
+        ('idx_trade_patterns_regime', 'market_regime, is_active, expectancy DESC'),
+        # deactivate_stale_patterns
+        ('idx_trade_patterns_last_traded', 'is_active, last_traded_date'),
+    ],
+    'pattern_learning_log': [
+        ('idx_pattern_learning_log_date', 'learning_date'),
+    ],
+}
+
+class SerializedConnection(sqlite3.Connection):
+    """
+    Writer connection shared across threads (DatabaseManager.conn)
+    
+    Components are handed this connection and call execute()/commit() on it
+    directly. A statement takes write_lock; if it leaves a transaction open
+    the calling thread keeps the lock until it commits or rolls back, so one
+    thread's commit or rollback never ends another thread's half-finished
+    writes. Statements that leave no transaction open (reads, DDL) release
+    it straight away.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.write_lock = threading.RLock()
+        self._held = threading.local()
+    
+    def _run(self, statement, *args):
+        """Run a statement under write_lock, holding it while a transaction is open"""
+        self.write_lock.acquire()
+        was_open = self.in_transaction
+        try:
+            return statement(*args)
+        except Exception:
+            # A failed statement that opened the transaction leaves nothing to
+            # keep; end it so a caller that never rolls back can't keep the lock
+            if not was_open and self.in_transaction:
+                super().rollback()
+            raise
+        finally:
+            if self.in_transaction:
+                self._held.count = getattr(self._held, 'count', 0) + 1
+            else:
+                self.write_lock.release()
+    
+    def _finish(self, finish):
+        """Commit or roll back, then give up the lock held for the transaction"""
+        self.write_lock.acquire()
+        try:
+            finish()
+        finally:
+            self.write_lock.release()
+            if not self.in_transaction:
+                for _ in range(getattr(self._held, 'count', 0)):
+                    self.write_lock.release()
+                self._held.count = 0
+    
+    def execute(self, sql, parameters=(), /):
+        return self._run(super().execute, sql, parameters)
+    
+    def executemany(self, sql, parameters, /):
+        return self._run(super().executemany, sql, parameters)
+    
+    def executescript(self, sql_script, /):
+        return self._run(super().executescript, sql_script)
+    
+    def cursor(self, factory=None):
+        return super().cursor(factory or SerializedCursor)
+    
+    def commit(self):
+        self._finish(super().commit)
+    
+    def rollback(self):
+        self._finish(super().rollback)
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+        return False
+
+
+class SerializedCursor(sqlite3.Cursor):
+    """Cursor whose statements go through SerializedConnection's write lock"""
+    
+    def execute(self, sql, parameters=(), /):
+        return self.connection._run(super().execute, sql, parameters)
+    
+    def executemany(self, sql, parameters, /):
+        return self.connection._run(super().executemany, sql, parameters)
+    
+    def executescript(self, sql_script, /):
+        return self.connection._run(super().executescript, sql_script)
+
 
 class DatabaseManager:
     """
     Robust database interface with transaction management and schema versioning
     Using SQLite for now (auto-creates file)
+    
+    self.conn is the single writer connection (a SerializedConnection), so
+    components that write through it directly are serialized with
+    transaction() and bulk_upsert(). Read-only callers (dashboard, monitor)
+    use reader(), which gives each thread its own read-only connection that
+    WAL keeps from blocking on, or being blocked by, the writer.
     """
     
     def __init__(self, db_path: Optional[str] = None):
@@ -98,6 +276,9 @@ class DatabaseManager:
         try:
             self.db_path = self._determine_db_path(db_path)
             self.conn = None
+            self._local = threading.local()
+            self._readers = []
+            self._readers_lock = threading.Lock()
             self._setup_database()
             logger.info(f"Database initialized at {self.db_path}")
         except Exception as e:
@@ -122,17 +303,66 @@ class DatabaseManager:
     
     @contextmanager
     def transaction(self):
-        """Context manager for database transactions"""
+        """
+        Context manager for database transactions (serialized across threads)
+        A transaction() opened inside another on the same thread joins it:
+        only the outermost block commits or rolls back
+        """
         if not self.conn:
             raise RuntimeError("Database not connected")
-        
-        try:
-            yield self.conn
-            self.conn.commit()
-        except Exception as e:
-            logger.error(f"Transaction failed, rolling back: {e}")
-            self.conn.rollback()
-            raise
+
+        with self._write_lock:
+            depth = getattr(self._local, 'transaction_depth', 0)
+            if depth:
+                self._local.transaction_depth = depth + 1
+                try:
+                    yield self.conn
+                finally:
+                    self._local.transaction_depth = depth
+                return
+
+            self._local.transaction_depth = 1
+            try:
+                yield self.conn
+                self.conn.commit()
+            except Exception as e:
+                logger.error(f"Transaction failed, rolling back: {e}")
+                self.conn.rollback()
+                raise
+            finally:
+                self._local.transaction_depth = 0
+    
+    def _apply_pragmas(self, conn: sqlite3.Connection):
+        """Per-connection cache, mmap and lock-wait settings"""
+        conn.execute(f"PRAGMA busy_timeout = {int(SQLITE_BUSY_TIMEOUT_MS)}")
+        conn.execute(f"PRAGMA cache_size = -{int(SQLITE_CACHE_SIZE_KB)}")
+        conn.execute(f"PRAGMA mmap_size = {int(SQLITE_MMAP_SIZE)}")
+        conn.execute("PRAGMA temp_store = MEMORY")
+    
+    def reader(self) -> sqlite3.Connection:
+        """
+        Read-only connection for the calling thread (created on first use)
+        Rows are sqlite3.Row, so they can be read by index or by column name
+        """
+        conn = getattr(self._local, 'reader', None)
+        if conn is None:
+            conn = sqlite3.connect(
+                f"file:{self.db_path}?mode=ro",
+                uri=True,
+                check_same_thread=False,
+                timeout=SQLITE_BUSY_TIMEOUT_MS / 1000
+            )
+            conn.row_factory = sqlite3.Row
+            self._apply_pragmas(conn)
+            conn.execute("PRAGMA query_only = ON")
+            self._local.reader = conn
+            with self._readers_lock:
+                self._readers.append(conn)
+        return conn
+    
+    def read_sql(self, query: str, params=None) -> pd.DataFrame:
+        """Run a SELECT on this thread's read-only connection"""
+        return pd.read_sql(query, self.reader(), params=params)
     
     def _setup_database(self):
         """
@@ -140,8 +370,18 @@ class DatabaseManager:
         NO DATA LOSS - only creates tables if they don't exist
         """
         try:
-            self.conn = sqlite3.connect(self.db_path)
+            # Writer connection; may be used from worker threads, serialized by its write lock
+            self.conn = sqlite3.connect(
+                self.db_path,
+                check_same_thread=False,
+                timeout=SQLITE_BUSY_TIMEOUT_MS / 1000,
+                factory=SerializedConnection
+            )
+            self._write_lock = self.conn.write_lock
             self.conn.execute("PRAGMA foreign_keys = ON")  # Enable FK constraints
+            self.conn.execute(f"PRAGMA journal_mode = {SQLITE_JOURNAL_MODE}")
+            self.conn.execute(f"PRAGMA synchronous = {SQLITE_SYNCHRONOUS}")
+            self._apply_pragmas(self.conn)
             
             # Check schema version
             current_version = self._get_schema_version()
@@ -154,6 +394,10 @@ class DatabaseManager:
                 self._migrate_schema(current_version)
             else:
                 logger.info(f"Database schema is current (v{current_version})")
+            
+            # Indexes for tables created after the migration ran (observer, patterns)
+            with self.transaction():
+                self._create_query_indexes()
                 
         except Exception as e:
             logger.error(f"Database setup failed: {e}")
@@ -185,38 +429,12 @@ class DatabaseManager:
             )
             """)
             
-            # Stock metrics table - matching fetcher output
-            self.conn.execute("""
-            CREATE TABLE IF NOT EXISTS stock_metrics (
-                symbol TEXT NOT NULL,
-                timestamp DATETIME NOT NULL,
-                price REAL,
-                volume INTEGER,
-                dollar_volume REAL,
-                market_cap REAL,
-                
-                -- Technical indicators from fetcher
-                rsi_2 REAL,
-                atr REAL,
-                sma_20 REAL,
-                sma_50 REAL,
-                
-                -- Volume metrics
-                avg_volume_20 REAL,
-                volume_ratio REAL,
-                
-                -- Other metrics
-                change_1d REAL,
-                quality_score REAL,
-                
-                PRIMARY KEY (symbol, timestamp)
-            )
-            """)
+            # Data stage runs - each run is one complete universe snapshot
+            self._create_runs_table()
             
-            # Add index for performance
-            self.conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_stock_metrics_symbol ON stock_metrics(symbol)"
-            )
+            # Stock metrics - monthly partitions behind the stock_metrics view
+            self._create_daily_rollup_table()
+            self._ensure_stock_metrics_partitions()
             
             # Regime history
             self.conn.execute("""
@@ -332,6 +550,9 @@ class DatabaseManager:
             )
             """)
             
+            # TradingAgents work queue (one row per batch candidate, resume checkpoint)
+            self._create_tradingagents_queue()
+            
             # Record schema version
             self.conn.execute(
                 "INSERT INTO schema_version (version, description) VALUES (?, ?)",
@@ -339,20 +560,355 @@ class DatabaseManager:
             )
     
     def _migrate_schema(self, from_version: int):
-        """Migrate schema from older version"""
-        logger.info(f"Migration from v{from_version} to v{SCHEMA_VERSION} would go here")
-        # Future migrations will be implemented here
-        # For now, just update version
-        with self.transaction():
+        """
+        Apply every migration newer than from_version, oldest first
+        
+        Each step runs in its own explicit transaction (SQLite DDL is
+        transactional), so a failing step leaves the schema and its version
+        row exactly as the previous step left them.
+        """
+        for version, description, apply in self._migrations():
+            if version <= from_version:
+                continue
+            
+            with self.transaction():
+                self.conn.execute("BEGIN")
+                apply()
+                self.conn.execute(
+                    "INSERT INTO schema_version (version, description) VALUES (?, ?)",
+                    (version, description)
+                )
+            logger.info(f"Applied schema migration v{version}: {description}")
+    
+    def _migrations(self) -> List[Tuple[int, str, Callable[[], None]]]:
+        """Ordered (version, description, step) list - additive DDL only"""
+        return [
+            (4, "Run-scoped stock_metrics snapshots", self._migrate_v4_runs),
+            (5, "Query-driven indexes", self._create_query_indexes),
+            (6, "Monthly stock_metrics partitions with daily rollups", self._migrate_v6_partitions),
+            (7, "Batch-scoped tradingagents_queue checkpoints", self._create_tradingagents_queue),
+        ]
+    
+    def _migrate_v4_runs(self):
+        """v4: runs table and stock_metrics.run_id"""
+        self._create_runs_table()
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(stock_metrics)")]
+        if 'run_id' not in columns:
             self.conn.execute(
-                "INSERT INTO schema_version (version, description) VALUES (?, ?)",
-                (SCHEMA_VERSION, f"Migrated from v{from_version}")
+                "ALTER TABLE stock_metrics ADD COLUMN run_id INTEGER REFERENCES runs(run_id)"
+            )
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_stock_metrics_run ON stock_metrics(run_id, symbol)"
+        )
+    
+    def _migrate_v6_partitions(self):
+        """v6: move the stock_metrics table into monthly partitions behind a view"""
+        self._create_daily_rollup_table()
+        kind = self.conn.execute(
+            "SELECT type FROM sqlite_master WHERE name = 'stock_metrics'"
+        ).fetchone()
+        
+        if kind and kind[0] == 'table':
+            columns = ', '.join(row[1] for row in self.conn.execute("PRAGMA table_info(stock_metrics)"))
+            current = datetime.now().strftime('%Y%m')
+            months = self.conn.execute(
+                "SELECT DISTINCT COALESCE(strftime('%Y%m', timestamp), ?) FROM stock_metrics", (current,)
+            ).fetchall()
+            
+            for (month,) in months:
+                partition = self._create_stock_metrics_partition(month)
+                self.conn.execute(
+                    f"INSERT INTO {partition} ({columns}) SELECT {columns} FROM stock_metrics "
+                    f"WHERE COALESCE(strftime('%Y%m', timestamp), ?) = ?",
+                    (current, month)
+                )
+            self.conn.execute("DROP TABLE stock_metrics")
+        
+        self._ensure_stock_metrics_partitions()
+    
+    def _create_query_indexes(self):
+        """
+        Create QUERY_INDEXES for every table that exists
+        Tables owned by other components are picked up on the next startup
+        """
+        existing = {
+            row[0] for row in self.conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table'"
             )
+        }
+        for table, indexes in QUERY_INDEXES.items():
+            if table not in existing:
+                continue
+            for name, columns in indexes:
+                self.conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table}({columns})")
     
-    def insert_stock_metrics(self, df: pd.DataFrame) -> int:
+    def _create_tradingagents_queue(self):
+        """
+        tradingagents_queue: one row per (batch_id, symbol), marked processed as
+        soon as the analysis is stored so an interrupted batch can resume.
+        Older queues created by OvernightProcessor gain the batch columns.
+        """
+        self.conn.execute("""
+        CREATE TABLE IF NOT EXISTS tradingagents_queue (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            batch_id TEXT,
+            symbol TEXT NOT NULL,
+            queued_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            regime TEXT,
+            filter_score REAL,
+            rsi_2 REAL,
+            volume_ratio REAL,
+            price REAL,
+            atr REAL,
+            processed BOOLEAN DEFAULT 0,
+            conviction_score REAL,
+            recommendation TEXT,
+            processed_at DATETIME,
+            candidate_data TEXT,  -- JSON row from the filter (inputs to re-run the analysis)
+            regime_data TEXT      -- JSON regime dict the batch started with
+        )
+        """)
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(tradingagents_queue)")]
+        for column in ('batch_id', 'candidate_data', 'regime_data'):
+            if column not in columns:
+                self.conn.execute(f"ALTER TABLE tradingagents_queue ADD COLUMN {column} TEXT")
+        self.conn.execute(
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_tradingagents_queue_batch_symbol "
+            "ON tradingagents_queue(batch_id, symbol)"
+        )
+    
+    def _create_runs_table(self):
+        """Create the runs table (one row per data stage run)"""
+        self.conn.execute("""
+        CREATE TABLE IF NOT EXISTS runs (
+            run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            started_at DATETIME NOT NULL,
+            completed_at DATETIME,
+            status TEXT NOT NULL DEFAULT 'running',  -- running / complete / failed
+            symbol_count INTEGER DEFAULT 0,
+            description TEXT
+        )
+        """)
+    
+    def _create_daily_rollup_table(self):
+        """Per-symbol daily summaries of rolled-up stock_metrics partitions"""
+        self.conn.execute("""
+        CREATE TABLE IF NOT EXISTS stock_metrics_daily (
+            symbol TEXT NOT NULL,
+            date DATE NOT NULL,
+            price_open REAL,
+            price_high REAL,
+            price_low REAL,
+            price REAL,  -- close (last snapshot of the day)
+            volume INTEGER,
+            dollar_volume REAL,
+            market_cap REAL,
+            rsi_2 REAL,
+            atr REAL,
+            sma_20 REAL,
+            sma_50 REAL,
+            avg_volume_20 REAL,
+            volume_ratio REAL,
+            change_1d REAL,
+            quality_score REAL,
+            samples INTEGER,
+            PRIMARY KEY (symbol, date)
+        )
+        """)
+    
+    def _stock_metrics_partitions(self) -> List[str]:
+        """Existing partition tables, oldest first"""
+        rows = self.conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE ? ORDER BY name",
+            (f"{STOCK_METRICS_PARTITION_PREFIX}%",)
+        )
+        return [row[0] for row in rows]
+    
+    def _create_stock_metrics_partition(self, month: str) -> str:
+        """Create the partition for month (YYYYMM) if missing; returns its name"""
+        if not (len(month) == 6 and month.isdigit()):
+            raise ValueError(f"Invalid partition month: {month!r}")
+        
+        name = f"{STOCK_METRICS_PARTITION_PREFIX}{month}"
+        self.conn.execute(f"CREATE TABLE IF NOT EXISTS {name} ({STOCK_METRICS_COLUMNS_SQL})")
+        self.conn.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_stock_metrics_run_{month} ON {name}(run_id, symbol)"
+        )
+        return name
+    
+    def _rebuild_stock_metrics_view(self):
+        """Point the stock_metrics view at the current set of partitions"""
+        partitions = self._stock_metrics_partitions()
+        self.conn.execute("DROP VIEW IF EXISTS stock_metrics")
+        self.conn.execute(
+            "CREATE VIEW stock_metrics AS "
+            + " UNION ALL ".join(f"SELECT * FROM {name}" for name in partitions)
+        )
+    
+    def _ensure_stock_metrics_partitions(self, when: Optional[datetime] = None) -> str:
+        """
+        Make sure the partition for `when` (default now) and the configured
+        months ahead exist; returns the partition name for `when`
+        """
+        when = when or datetime.now()
+        existing = set(self._stock_metrics_partitions())
+        month_index = when.year * 12 + when.month - 1
+        
+        months = [
+            f"{index // 12:04d}{index % 12 + 1:02d}"
+            for index in range(month_index, month_index + STOCK_METRICS_PARTITIONS_AHEAD + 1)
+        ]
+        wanted = [f"{STOCK_METRICS_PARTITION_PREFIX}{month}" for month in months]
+        
+        if not set(wanted) <= existing or 'stock_metrics' not in self._view_names():
+            for month in months:
+                self._create_stock_metrics_partition(month)
+            self._rebuild_stock_metrics_view()
+        return wanted[0]
+    
+    def _view_names(self) -> List[str]:
+        return [row[0] for row in self.conn.execute("SELECT name FROM sqlite_master WHERE type = 'view'")]
+    
+    @staticmethod
+    def _daily_rollup_select(source: str, where: str = "") -> str:
+        """
+        SELECT producing stock_metrics_daily rows from raw snapshots in source:
+        open/high/low of price plus the day's last value of every ROLLUP_COLUMNS
+        """
+        last_values = ",\n".join(
+            f"MAX(CASE WHEN last_rank = 1 THEN {column} END) AS {column}" for column in ROLLUP_COLUMNS
+        )
+        return f"""
+        SELECT
+            symbol,
+            date,
+            MAX(CASE WHEN first_rank = 1 THEN price END) AS price_open,
+            MAX(price) AS price_high,
+            MIN(price) AS price_low,
+            {last_values},
+            COUNT(*) AS samples
+        FROM (
+            SELECT *,
+                   date(timestamp) AS date,
+                   ROW_NUMBER() OVER (PARTITION BY symbol, date(timestamp) ORDER BY timestamp) AS first_rank,
+                   ROW_NUMBER() OVER (PARTITION BY symbol, date(timestamp) ORDER BY timestamp DESC) AS last_rank
+            FROM {source}
+            {where}
+        )
+        GROUP BY symbol, date
+        """
+    
+    def apply_stock_metrics_retention(self, now: Optional[datetime] = None) -> Dict:
+        """
+        Roll up and drop stock_metrics partitions older than
+        STOCK_METRICS_RAW_RETENTION_MONTHS (one transaction per partition)
+        Returns {'dropped': [partition names], 'rolled_up': daily rows written}
+        """
+        now = now or datetime.now()
+        self._ensure_stock_metrics_partitions(now)
+        
+        cutoff_index = now.year * 12 + now.month - 1 - STOCK_METRICS_RAW_RETENTION_MONTHS
+        cutoff = f"{STOCK_METRICS_PARTITION_PREFIX}{cutoff_index // 12:04d}{cutoff_index % 12 + 1:02d}"
+        columns = ['symbol', 'date', 'price_open', 'price_high', 'price_low'] + ROLLUP_COLUMNS + ['samples']
+        result = {'dropped': [], 'rolled_up': 0}
+        
+        for partition in self._stock_metrics_partitions():
+            if partition >= cutoff:
+                break
+            
+            with self.transaction():
+                self.conn.execute("BEGIN")
+                cursor = self.conn.execute(
+                    f"INSERT OR REPLACE INTO stock_metrics_daily ({', '.join(columns)}) "
+                    + self._daily_rollup_select(partition)
+                )
+                self.conn.execute(f"DROP TABLE {partition}")
+                self._rebuild_stock_metrics_view()
+            
+            result['dropped'].append(partition)
+            result['rolled_up'] += cursor.rowcount
+            logger.info(f"Rolled up {cursor.rowcount} daily rows from {partition} and dropped it")
+        
+        return result
+    
+    def get_metric_history(self, symbol: str, start_date: Optional[str] = None,
+                           end_date: Optional[str] = None) -> pd.DataFrame:
+        """
+        Daily metric history for one symbol (for charts)
+        Rolled-up days come from stock_metrics_daily, recent days are
+        summarized on the fly from the raw partitions
+        
+        Args:
+            symbol: Stock symbol
+            start_date / end_date: Inclusive 'YYYY-MM-DD' bounds (None = open)
+        """
+        start_date = start_date or '0000-01-01'
+        end_date = end_date or '9999-12-31'
+        columns = ', '.join(['symbol', 'date', 'price_open', 'price_high', 'price_low'] + ROLLUP_COLUMNS + ['samples'])
+        
+        query = f"""
+        SELECT {columns} FROM stock_metrics_daily
+        WHERE symbol = ? AND date BETWEEN ? AND ?
+        UNION ALL
+        SELECT {columns} FROM ({self._daily_rollup_select(
+            'stock_metrics', "WHERE symbol = ? AND timestamp >= ? AND timestamp < date(?, '+1 day')"
+        )})
+        ORDER BY date
+        """
+        return pd.read_sql(
+            query, self.conn,
+            params=(symbol, start_date, end_date, symbol, start_date, end_date)
+        )
+    
+    def start_run(self, description: Optional[str] = None) -> int:
+        """
+        Open a new data stage run
+        Returns run_id to pass to insert_stock_metrics
+        """
+        with self.transaction():
+            cursor = self.conn.execute(
+                "INSERT INTO runs (started_at, status, description) VALUES (?, 'running', ?)",
+                (datetime.now(), description)
+            )
+        logger.info(f"Started run {cursor.lastrowid}")
+        return cursor.lastrowid
+    
+    def complete_run(self, run_id: int, status: str = 'complete') -> bool:
+        """
+        Close a run; only 'complete' runs are visible to get_latest_metrics
+        Returns True if successful
+        """
+        try:
+            with self.transaction():
+                self.conn.execute(
+                    """
+                    UPDATE runs
+                    SET status = ?, completed_at = ?,
+                        symbol_count = (SELECT COUNT(*) FROM stock_metrics WHERE run_id = ?)
+                    WHERE run_id = ?
+                    """,
+                    (status, datetime.now(), run_id, run_id)
+                )
+            logger.info(f"Run {run_id} marked {status}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to close run {run_id}: {e}")
+            return False
+    
+    def get_latest_run_id(self) -> Optional[int]:
+        """Most recent complete run, or None if no run has completed"""
+        row = self.conn.execute(
+            "SELECT run_id FROM runs WHERE status = 'complete' ORDER BY run_id DESC LIMIT 1"
+        ).fetchone()
+        return row[0] if row else None
+    
+    def insert_stock_metrics(self, df: pd.DataFrame, timestamp: Optional[datetime] = None,
+                             run_id: Optional[int] = None) -> int:
         """
         Bulk insert stock metrics with comprehensive validation and transaction safety
         Returns number of rows inserted
+        All rows share one timestamp; pass run_id (from start_run) when a run
+        is inserted in several batches
         """
         if df.empty:
             logger.warning("Attempted to insert empty DataFrame")
@@ -364,6 +920,9 @@ class DatabaseManager:
         if missing_columns:
             raise ValueError(f"Missing required columns: {missing_columns}")
         
+        if timestamp is None:
+            timestamp = datetime.now()
+        
         # Only keep columns that exist in our schema
         schema_columns = [
             'symbol', 'price', 'volume', 'dollar_volume', 'market_cap',
@@ -378,40 +937,16 @@ class DatabaseManager:
         
         try:
             # Start with filtered DataFrame
-            df_filtered = df[available_columns].copy()
-            df_filtered['timestamp'] = datetime.now()
+            df_filtered = df[available_columns]
             
-            # Apply comprehensive input validation
-            validated_records = []
-            validation_errors = 0
-            security_violations = 0
+            # Apply comprehensive input validation (column-wise over the frame)
+            df_validated, rejections = InputValidator.validate_stock_metrics_frame(df_filtered)
+            security_violations = int(rejections['security_violation'].sum()) if not rejections.empty else 0
+            validation_errors = len(rejections) - security_violations
             
-            for index, row in df_filtered.iterrows():
-                try:
-                    # Convert row to dict for validation
-                    metrics_dict = row.to_dict()
-                    
-                    # Use input validator for comprehensive checks
-                    validated_metrics = InputValidator.validate_stock_metrics(metrics_dict)
-                    
-                    # Add timestamp to validated record
-                    validated_metrics['timestamp'] = datetime.now()
-                    
-                    validated_records.append(validated_metrics)
-                    
-                except SecurityViolationError as e:
-                    security_violations += 1
-                    logger.error(f"Security violation in row {index}: {e}")
-                    # Skip this record completely for security violations
-                    
-                except ValidationError as e:
-                    validation_errors += 1
-                    logger.warning(f"Validation error in row {index}: {e}")
-                    # Could choose to fix and include, but skip for now
-                    
-                except Exception as e:
-                    validation_errors += 1
-                    logger.error(f"Unexpected error validating row {index}: {e}")
+            for rejection in rejections.head(20).itertuples():
+                log = logger.error if rejection.security_violation else logger.warning
+                log(f"Rejected row {rejection.row} ({rejection.symbol!r}): {rejection.reason}")
             
             # Audit validation results
             audit_input_validation(
@@ -420,24 +955,19 @@ class DatabaseManager:
                 security_violations=security_violations
             )
             
-            if not validated_records:
+            if df_validated.empty:
                 logger.warning("No valid records remaining after security validation")
                 return 0
             
-            # Convert validated records back to DataFrame
-            df_validated = pd.DataFrame(validated_records)
+            df_validated['timestamp'] = timestamp
+            if run_id is not None:
+                df_validated['run_id'] = run_id
             
-            # Convert Decimal objects to float for SQLite compatibility
-            for col in df_validated.columns:
-                if df_validated[col].dtype == 'object':
-                    # Check if column contains Decimal objects
-                    if len(df_validated) > 0 and isinstance(df_validated[col].iloc[0], Decimal):
-                        df_validated[col] = df_validated[col].astype(float)
-            
-            # Use transaction for atomic insert
+            # Use transaction for atomic insert into the timestamp's monthly partition
             with self.transaction():
+                partition = self._ensure_stock_metrics_partitions(pd.Timestamp(timestamp).to_pydatetime())
                 df_validated.to_sql(
-                    'stock_metrics', 
+                    partition, 
                     self.conn, 
                     if_exists='append', 
                     index=False,
@@ -461,13 +991,28 @@ class DatabaseManager:
             logger.error(f"Failed to insert stock metrics: {e}")
             raise
     
-    def get_latest_metrics(self) -> pd.DataFrame:
+    def get_latest_metrics(self, run_id: Optional[int] = None) -> pd.DataFrame:
         """
-        Get most recent stock metrics for filtering with error handling
-        For test purposes, gets all records from the most recent batch
+        Get a complete stock metrics snapshot for filtering
+        
+        Args:
+            run_id: Run to read (None = most recent complete run)
         """
         try:
-            # First try the exact match for production
+            if run_id is None:
+                run_id = self.get_latest_run_id()
+            
+            if run_id is not None:
+                # Index range scan on (run_id, symbol)
+                df = pd.read_sql(
+                    "SELECT * FROM stock_metrics WHERE run_id = ? ORDER BY symbol",
+                    self.conn,
+                    params=(run_id,)
+                )
+                logger.debug(f"Retrieved {len(df)} metrics for run {run_id}")
+                return df
+            
+            # No runs recorded yet: fall back to the latest timestamp
             query = """
             SELECT * FROM stock_metrics
             WHERE timestamp = (SELECT MAX(timestamp) FROM stock_metrics)
@@ -491,6 +1036,16 @@ class DatabaseManager:
             logger.error(f"Failed to get latest metrics: {e}")
             return pd.DataFrame()  # Return empty DataFrame on error
     
+    def bulk_upsert(self, table: str, records: Union[pd.DataFrame, List[Dict]],
+                    conflict_columns: Optional[List[str]] = None,
+                    update_columns: Optional[List[str]] = None) -> int:
+        """
+        Write many rows with one executemany in one transaction
+        Same contract as PostgreSQLManager.bulk_upsert (see bulk_write)
+        """
+        with self.transaction():
+            return bulk_write(self.conn, table, records, conflict_columns, update_columns)
+    
     def log_regime(self, regime_data: Dict) -> bool:
         """
         Log regime for tracking with validation
@@ -524,6 +1079,87 @@ class DatabaseManager:
             logger.error(f"Failed to log regime: {e}")
             return False
     
+    def get_regime_for_dates(self, dates: Sequence) -> pd.DataFrame:
+        """
+        Regime in force on each date (last regime_history row on or before
+        the end of that day) - one query plus an as-of join
+    
+        Args:
+            dates: Dates or date strings (backtests, labelling outcomes)
+    
+        Returns:
+            DataFrame indexed by the requested dates with regime, fear_greed_value,
+            vix, strategy and expected_win_rate (NaN before the first row)
+        """
+        requested = pd.DatetimeIndex(pd.to_datetime(list(dates))).normalize().astype('datetime64[ns]')
+        columns = ['regime', 'fear_greed_value', 'vix', 'strategy', 'expected_win_rate']
+        if requested.empty:
+            return pd.DataFrame(columns=columns)
+    
+        history = pd.read_sql(
+            f"SELECT timestamp, {', '.join(columns)} FROM regime_history "
+            "WHERE timestamp < date(?, '+1 day') ORDER BY timestamp",
+            self.conn, params=(requested.max().strftime('%Y-%m-%d'),)
+        )
+        history['timestamp'] = pd.to_datetime(history['timestamp'], format='ISO8601').astype('datetime64[ns]')
+    
+        lookup = pd.DataFrame({'date': requested, 'day_end': requested + pd.Timedelta(days=1)})
+        order = lookup['day_end'].argsort(kind='stable')
+        matched = pd.merge_asof(
+            lookup.iloc[order], history.sort_values('timestamp'),
+            left_on='day_end', right_on='timestamp',
+            direction='backward', allow_exact_matches=False
+        )
+        matched.index = order.to_numpy()
+        return matched.sort_index().set_index('date')[columns]
+    
+    def enqueue_candidates(self, batch_id: str, candidates: pd.DataFrame, regime_data: Dict) -> int:
+        """
+        Queue a batch's candidates for TradingAgents
+        Symbols already queued for batch_id are left as they are (resume)
+        
+        Returns:
+            Number of newly queued symbols
+        """
+        if candidates.empty:
+            return 0
+        
+        records = candidates.astype(object).where(candidates.notna(), None).to_dict('records')
+        queue = pd.DataFrame({
+            'batch_id': batch_id,
+            'symbol': candidates['symbol'].values,
+            'regime': regime_data.get('regime'),
+            'filter_score': candidates['score'].values if 'score' in candidates else None,
+            'rsi_2': candidates['rsi_2'].values if 'rsi_2' in candidates else None,
+            'volume_ratio': candidates['volume_ratio'].values if 'volume_ratio' in candidates else None,
+            'price': candidates['price'].values if 'price' in candidates else None,
+            'atr': candidates['atr'].values if 'atr' in candidates else None,
+            'candidate_data': [json.dumps(record, default=str) for record in records],
+            'regime_data': json.dumps(regime_data, default=str),
+        })
+        with self.transaction():
+            return bulk_write(self.conn, 'tradingagents_queue', queue,
+                              conflict_columns=['batch_id', 'symbol'], update_columns=[])
+    
+    def get_batch_queue(self, batch_id: str) -> pd.DataFrame:
+        """Queue rows for one batch in the order they were queued"""
+        return pd.read_sql(
+            "SELECT * FROM tradingagents_queue WHERE batch_id = ? ORDER BY id",
+            self.conn, params=(batch_id,)
+        )
+    
+    def mark_queue_processed(self, batch_id: str, symbol: str,
+                             conviction_score: Optional[float] = None,
+                             recommendation: Optional[str] = None) -> bool:
+        """Checkpoint one analyzed candidate; returns False if it was not queued"""
+        with self.transaction():
+            cursor = self.conn.execute("""
+            UPDATE tradingagents_queue
+            SET processed = 1, conviction_score = ?, recommendation = ?, processed_at = ?
+            WHERE batch_id = ? AND symbol = ?
+            """, (conviction_score, recommendation, datetime.now(), batch_id, symbol))
+        return cursor.rowcount > 0
+    
     def save_filter_results(self, filter_results: List[Dict]) -> bool:
         """
         Save filter results for tracking stock selection
@@ -534,23 +1170,21 @@ class DatabaseManager:
             return True
         
         try:
-            with self.transaction():
-                for result in filter_results:
-                    # Validate required fields
-                    if 'symbol' not in result:
-                        raise ValueError("Missing required field: symbol")
-                    
-                    self.conn.execute("""
-                    INSERT OR REPLACE INTO filter_results 
-                    (timestamp, symbol, score, regime, selected)
-                    VALUES (?, ?, ?, ?, ?)
-                    """, (
-                        result.get('timestamp', datetime.now()),
-                        result['symbol'],
-                        result.get('score'),
-                        result.get('regime'),
-                        result.get('selected', 0)
-                    ))
+            # Validate required fields
+            if any('symbol' not in result for result in filter_results):
+                raise ValueError("Missing required field: symbol")
+            
+            now = datetime.now()
+            self.bulk_upsert('filter_results', [
+                {
+                    'timestamp': result.get('timestamp', now),
+                    'symbol': result['symbol'],
+                    'score': result.get('score'),
+                    'regime': result.get('regime'),
+                    'selected': result.get('selected', 0)
+                }
+                for result in filter_results
+            ], conflict_columns=['timestamp', 'symbol'])
             
             logger.debug(f"Saved {len(filter_results)} filter results")
             return True
@@ -577,6 +1211,15 @@ class DatabaseManager:
     
     def close(self):
         """Clean up connection safely"""
+        with self._readers_lock:
+            for reader in self._readers:
+                try:
+                    reader.close()
+                except Exception as e:
+                    logger.error(f"Error closing read connection: {e}")
+            self._readers = []
+        self._local = threading.local()
+        
         if self.conn:
             try:
                 self.conn.close()
@@ -585,3 +1228,70 @@ class DatabaseManager:
                 logger.error(f"Error closing database connection: {e}")
             finally:
                 self.conn = None
+
+
+@lru_cache(maxsize=128)
+def _bulk_write_statement(table: str, columns: Tuple[str, ...],
+                          conflict_columns: Optional[Tuple[str, ...]],
+                          update_columns: Optional[Tuple[str, ...]]) -> str:
+    """
+    INSERT statement for a (table, columns, conflict) shape; built once, and
+    the identical text lets sqlite3 reuse its cached prepared statement
+    """
+    statement = (
+        f"INSERT INTO {table} ({', '.join(columns)}) "
+        f"VALUES ({', '.join('?' for _ in columns)})"
+    )
+    if not conflict_columns:
+        return statement
+    
+    if update_columns is None:
+        update_columns = tuple(c for c in columns if c not in conflict_columns)
+    
+    if update_columns:
+        updates = ', '.join(f"{c} = excluded.{c}" for c in update_columns)
+        return f"{statement} ON CONFLICT ({', '.join(conflict_columns)}) DO UPDATE SET {updates}"
+    return f"{statement} ON CONFLICT ({', '.join(conflict_columns)}) DO NOTHING"
+
+
+def bulk_write(conn: sqlite3.Connection, table: str, records: Union[pd.DataFrame, List[Dict]],
+               conflict_columns: Optional[Sequence[str]] = None,
+               update_columns: Optional[Sequence[str]] = None) -> int:
+    """
+    Insert or upsert many rows with one executemany on an open connection
+    The caller owns the transaction (DatabaseManager.bulk_upsert wraps one)
+    
+    Args:
+        conn: SQLite connection
+        table: Target table
+        records: DataFrame or list of dicts; keys/columns must exist in the table
+        conflict_columns: Unique key to upsert on (None = plain insert)
+        update_columns: Columns to overwrite on conflict
+                        (None = every non-key column, [] = DO NOTHING)
+        
+    Returns:
+        Number of rows inserted or updated
+    """
+    df = records if isinstance(records, pd.DataFrame) else pd.DataFrame.from_records(records)
+    if df.empty:
+        return 0
+    
+    # Plain Python values: NaN -> NULL, Timestamps -> datetime, dicts/lists -> JSON
+    column_values = []
+    for col in df.columns:
+        values = df[col].astype(object).where(df[col].notna(), None).tolist()
+        column_values.append([
+            v.to_pydatetime() if isinstance(v, pd.Timestamp)
+            else json.dumps(v, default=str) if isinstance(v, (dict, list))
+            else v
+            for v in values
+        ])
+    
+    statement = _bulk_write_statement(
+        table,
+        tuple(df.columns),
+        tuple(conflict_columns) if conflict_columns else None,
+        tuple(update_columns) if update_columns is not None else None
+    )
+    cursor = conn.executemany(statement, zip(*column_values))
+    return cursor.rowcount
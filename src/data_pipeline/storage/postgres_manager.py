@@ -9,13 +9,18 @@ from psycopg2 import sql, pool
 from psycopg2.extras import RealDictCursor, Json
 import pandas as pd
 import os
+import io
 import json
 from datetime import datetime
-from typing import List, Dict, Optional, Any, Union
+from typing import List, Dict, Optional, Any, Union, Sequence
 from contextlib import contextmanager
 from pathlib import Path
 from decimal import Decimal
 from urllib.parse import urlparse
+from config.settings.base_config import (
+    STOCK_METRICS_RAW_RETENTION_MONTHS,
+    STOCK_METRICS_PARTITIONS_AHEAD,
+)
 
 # Import input validation for security
 from src.security.input_validator import (
@@ -27,6 +32,19 @@ from src.security.input_validator import (
 
 logger = logging.getLogger(__name__)
 
+# Columns returned for a run snapshot (all carried by idx_stock_metrics_run)
+SNAPSHOT_COLUMNS = [
+    'symbol', 'run_id', 'timestamp', 'price', 'volume', 'dollar_volume', 'market_cap',
+    'rsi_2', 'atr', 'sma_20', 'sma_50', 'avg_volume_20', 'volume_ratio',
+    'change_1d', 'quality_score'
+]
+
+# Metric columns carried into stock_metrics_daily (value of the day's last snapshot)
+ROLLUP_COLUMNS = [
+    'price', 'volume', 'dollar_volume', 'market_cap', 'rsi_2', 'atr',
+    'sma_20', 'sma_50', 'avg_volume_20', 'volume_ratio', 'change_1d', 'quality_score'
+]
+
 
 class PostgreSQLManager:
     """
@@ -189,12 +207,16 @@ class PostgreSQLManager:
                 logger.error(f"Transaction failed, rolling back: {e}")
                 raise
     
-    def insert_stock_metrics(self, df: pd.DataFrame) -> int:
+    def insert_stock_metrics(self, df: pd.DataFrame, timestamp: Optional[datetime] = None,
+                             run_id: Optional[int] = None) -> int:
         """
         Bulk insert stock metrics with comprehensive validation
         
         Args:
             df: DataFrame with stock metrics
+            timestamp: Timestamp shared by all rows (pass the run's timestamp
+                       when a run is inserted in several batches)
+            run_id: Run these rows belong to (from start_run)
             
         Returns:
             Number of rows inserted
@@ -209,6 +231,9 @@ class PostgreSQLManager:
         if missing_columns:
             raise ValueError(f"Missing required columns: {missing_columns}")
         
+        if timestamp is None:
+            timestamp = datetime.now()
+        
         # Available columns that match our schema
         schema_columns = [
             'symbol', 'price', 'volume', 'dollar_volume', 'market_cap',
@@ -222,37 +247,16 @@ class PostgreSQLManager:
         
         try:
             # Filter DataFrame to available columns
-            df_filtered = df[available_columns].copy()
+            df_filtered = df[available_columns]
             
-            # Apply comprehensive input validation
-            validated_records = []
-            validation_errors = 0
-            security_violations = 0
+            # Apply comprehensive input validation (column-wise over the frame)
+            df_validated, rejections = InputValidator.validate_stock_metrics_frame(df_filtered)
+            security_violations = int(rejections['security_violation'].sum()) if not rejections.empty else 0
+            validation_errors = len(rejections) - security_violations
             
-            for index, row in df_filtered.iterrows():
-                try:
-                    # Convert row to dict for validation
-                    metrics_dict = row.to_dict()
-                    
-                    # Use input validator for comprehensive checks
-                    validated_metrics = InputValidator.validate_stock_metrics(metrics_dict)
-                    
-                    # Add timestamp
-                    validated_metrics['timestamp'] = datetime.now()
-                    
-                    validated_records.append(validated_metrics)
-                    
-                except SecurityViolationError as e:
-                    security_violations += 1
-                    logger.error(f"Security violation in row {index}: {e}")
-                    
-                except ValidationError as e:
-                    validation_errors += 1
-                    logger.warning(f"Validation error in row {index}: {e}")
-                    
-                except Exception as e:
-                    validation_errors += 1
-                    logger.error(f"Unexpected error validating row {index}: {e}")
+            for rejection in rejections.head(20).itertuples():
+                log = logger.error if rejection.security_violation else logger.warning
+                log(f"Rejected row {rejection.row} ({rejection.symbol!r}): {rejection.reason}")
             
             # Audit validation results
             audit_input_validation(
@@ -261,18 +265,13 @@ class PostgreSQLManager:
                 security_violations=security_violations
             )
             
-            if not validated_records:
+            if df_validated.empty:
                 logger.warning("No valid records remaining after security validation")
                 return 0
             
-            # Convert to DataFrame and prepare for PostgreSQL
-            df_validated = pd.DataFrame(validated_records)
-            
-            # Convert Decimal objects to float for JSON serialization
-            for col in df_validated.columns:
-                if df_validated[col].dtype == 'object':
-                    if len(df_validated) > 0 and isinstance(df_validated[col].iloc[0], Decimal):
-                        df_validated[col] = df_validated[col].astype(float)
+            df_validated['timestamp'] = timestamp
+            if run_id is not None:
+                df_validated['run_id'] = run_id
             
             # Bulk insert with PostgreSQL
             rows_inserted = self._bulk_insert_stock_metrics(df_validated)
@@ -295,42 +294,319 @@ class PostgreSQLManager:
     
     def _bulk_insert_stock_metrics(self, df: pd.DataFrame) -> int:
         """Perform bulk insert using PostgreSQL COPY"""
+        self._ensure_stock_metrics_partitions(pd.Timestamp(df['timestamp'].iloc[0]).to_pydatetime())
+        return self.bulk_upsert(
+            'stock_metrics', df,
+            conflict_columns=['symbol', 'timestamp']
+        )
+    
+    def bulk_upsert(self, table: str, df: Union[pd.DataFrame, List[Dict]],
+                    conflict_columns: Optional[List[str]] = None,
+                    update_columns: Optional[List[str]] = None) -> int:
+        """
+        Bulk load a DataFrame (or list of records) with COPY FROM STDIN
+        
+        With conflict_columns, rows are COPYed into a temporary staging table
+        and merged with one INSERT ... SELECT ... ON CONFLICT DO UPDATE (the
+        last duplicate in df wins). Without them rows are COPYed straight
+        into the table.
+        
+        Args:
+            table: Target table
+            df: Rows to load (DataFrame or list of dicts); columns must exist in the table
+            conflict_columns: Unique key to upsert on (None = append only)
+            update_columns: Columns to overwrite on conflict
+                            (None = every non-key column, [] = DO NOTHING)
+            
+        Returns:
+            Number of rows inserted or updated
+        """
+        if not isinstance(df, pd.DataFrame):
+            df = pd.DataFrame.from_records(df)
+        if df.empty:
+            return 0
+        
+        columns = list(df.columns)
+        column_list = sql.SQL(', ').join(map(sql.Identifier, columns))
+        buffer = self._to_copy_buffer(df)
+        
         try:
             with self.transaction() as conn:
                 with conn.cursor() as cursor:
-                    # Prepare column names and values
-                    columns = list(df.columns)
+                    if not conflict_columns:
+                        copy_sql = sql.SQL("COPY {} ({}) FROM STDIN WITH (FORMAT csv, NULL '\\N')").format(
+                            sql.Identifier(table), column_list
+                        )
+                        cursor.copy_expert(copy_sql.as_string(conn), buffer)
+                        return len(df)
                     
-                    # Create INSERT statement with ON CONFLICT handling
-                    insert_sql = sql.SQL("""
-                    INSERT INTO stock_metrics ({})
-                    VALUES ({})
-                    ON CONFLICT (symbol, timestamp) 
-                    DO UPDATE SET {}
-                    """).format(
-                        sql.SQL(', ').join(map(sql.Identifier, columns)),
-                        sql.SQL(', ').join(sql.Placeholder() * len(columns)),
-                        sql.SQL(', ').join([
-                            sql.SQL('{} = EXCLUDED.{}').format(
-                                sql.Identifier(col), sql.Identifier(col)
-                            ) for col in columns if col not in ['symbol', 'timestamp']
-                        ])
+                    stage = sql.Identifier(f"_stage_{table}")
+                    
+                    # Staging table with the target's column types, dropped at commit
+                    cursor.execute(sql.SQL(
+                        "CREATE TEMP TABLE {} ON COMMIT DROP AS SELECT {} FROM {} WITH NO DATA"
+                    ).format(stage, column_list, sql.Identifier(table)))
+                    cursor.execute(sql.SQL(
+                        "ALTER TABLE {} ADD COLUMN _load_order BIGSERIAL"
+                    ).format(stage))
+                    
+                    copy_sql = sql.SQL("COPY {} ({}) FROM STDIN WITH (FORMAT csv, NULL '\\N')").format(
+                        stage, column_list
                     )
+                    cursor.copy_expert(copy_sql.as_string(conn), buffer)
                     
-                    # Execute batch insert
-                    data = [tuple(row) for row in df.values]
-                    cursor.executemany(insert_sql, data)
+                    if update_columns is None:
+                        update_columns = [c for c in columns if c not in conflict_columns]
                     
-                    return len(data)
+                    if update_columns:
+                        on_conflict = sql.SQL("DO UPDATE SET {}").format(
+                            sql.SQL(', ').join(
+                                sql.SQL('{} = EXCLUDED.{}').format(sql.Identifier(c), sql.Identifier(c))
+                                for c in update_columns
+                            )
+                        )
+                    else:
+                        on_conflict = sql.SQL("DO NOTHING")
+                    
+                    key_list = sql.SQL(', ').join(map(sql.Identifier, conflict_columns))
+                    
+                    # DISTINCT ON keeps one row per key so ON CONFLICT never
+                    # touches the same target row twice
+                    cursor.execute(sql.SQL("""
+                    INSERT INTO {table} ({columns})
+                    SELECT DISTINCT ON ({keys}) {columns} FROM {stage}
+                    ORDER BY {keys}, _load_order DESC
+                    ON CONFLICT ({keys}) {on_conflict}
+                    """).format(
+                        table=sql.Identifier(table),
+                        columns=column_list,
+                        keys=key_list,
+                        stage=stage,
+                        on_conflict=on_conflict
+                    ))
+                    return cursor.rowcount
                     
         except Exception as e:
-            logger.error(f"Bulk insert failed: {e}")
+            logger.error(f"Bulk load into {table} failed: {e}")
             raise
     
-    def get_latest_metrics(self) -> pd.DataFrame:
-        """Get most recent stock metrics"""
+    @staticmethod
+    def _to_copy_buffer(df: pd.DataFrame) -> io.StringIO:
+        """Serialize a DataFrame as CSV for COPY (dicts/lists become JSON, NaN becomes NULL)"""
+        out = df.copy()
+        for col in out.columns:
+            if out[col].dtype == 'object':
+                out[col] = out[col].map(
+                    lambda v: json.dumps(v, default=str) if isinstance(v, (dict, list)) else v
+                )
+            elif pd.api.types.is_float_dtype(out[col]):
+                # Integer columns holding NULLs arrive as float; "3.0" is not valid BIGINT input
+                values = out[col].dropna()
+                if len(values) and (values == values.round()).all() and values.abs().max() < 2**53:
+                    out[col] = out[col].astype('Int64')
+        
+        buffer = io.StringIO()
+        out.to_csv(buffer, index=False, header=False, na_rep='\\N')
+        buffer.seek(0)
+        return buffer
+    
+    def _ensure_stock_metrics_partitions(self, when: Optional[datetime] = None) -> str:
+        """
+        Create the monthly partition for `when` (default now) and the
+        configured months ahead; returns the partition name for `when`
+        """
+        when = when or datetime.now()
+        with self.transaction() as conn:
+            with conn.cursor() as cursor:
+                names = []
+                for months_ahead in range(STOCK_METRICS_PARTITIONS_AHEAD + 1):
+                    cursor.execute(
+                        "SELECT ensure_stock_metrics_partition(%s + make_interval(months => %s))",
+                        (when, months_ahead)
+                    )
+                    names.append(cursor.fetchone()[0])
+        return names[0]
+    
+    def apply_stock_metrics_retention(self, now: Optional[datetime] = None) -> Dict:
+        """
+        Roll up and drop stock_metrics partitions older than
+        STOCK_METRICS_RAW_RETENTION_MONTHS (one transaction per partition)
+        Returns {'dropped': [partition names], 'rolled_up': daily rows written}
+        """
+        now = now or datetime.now()
+        self._ensure_stock_metrics_partitions(now)
+        
+        cutoff_index = now.year * 12 + now.month - 1 - STOCK_METRICS_RAW_RETENTION_MONTHS
+        cutoff = f"stock_metrics_p{cutoff_index // 12:04d}{cutoff_index % 12 + 1:02d}"
+        
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                SELECT child.relname
+                FROM pg_inherits
+                JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+                JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+                WHERE parent.relname = 'stock_metrics'
+                ORDER BY child.relname
+                """)
+                partitions = [row[0] for row in cursor.fetchall()]
+        
+        columns = ['symbol', 'date', 'price_open', 'price_high', 'price_low'] + ROLLUP_COLUMNS + ['samples']
+        last_values = sql.SQL(', ').join(
+            sql.SQL("(array_agg({c} ORDER BY timestamp DESC))[1]").format(c=sql.Identifier(c))
+            for c in ROLLUP_COLUMNS
+        )
+        updates = sql.SQL(', ').join(
+            sql.SQL('{c} = EXCLUDED.{c}').format(c=sql.Identifier(c)) for c in columns[2:]
+        )
+        result = {'dropped': [], 'rolled_up': 0}
+        
+        for partition in partitions:
+            if partition >= cutoff:
+                break
+            
+            with self.transaction() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute(sql.SQL("""
+                    INSERT INTO stock_metrics_daily ({columns})
+                    SELECT symbol,
+                           timestamp::date,
+                           (array_agg(price ORDER BY timestamp))[1],
+                           MAX(price),
+                           MIN(price),
+                           {last_values},
+                           COUNT(*)
+                    FROM {partition}
+                    GROUP BY symbol, timestamp::date
+                    ON CONFLICT (symbol, date) DO UPDATE SET {updates}
+                    """).format(
+                        columns=sql.SQL(', ').join(map(sql.Identifier, columns)),
+                        last_values=last_values,
+                        partition=sql.Identifier(partition),
+                        updates=updates
+                    ))
+                    rolled_up = cursor.rowcount
+                    cursor.execute(sql.SQL("ALTER TABLE stock_metrics DETACH PARTITION {}").format(
+                        sql.Identifier(partition)
+                    ))
+                    cursor.execute(sql.SQL("DROP TABLE {}").format(sql.Identifier(partition)))
+            
+            result['dropped'].append(partition)
+            result['rolled_up'] += rolled_up
+            logger.info(f"Rolled up {rolled_up} daily rows from {partition} and dropped it")
+        
+        return result
+    
+    def get_metric_history(self, symbol: str, start_date: Optional[str] = None,
+                           end_date: Optional[str] = None) -> pd.DataFrame:
+        """
+        Daily metric history for one symbol (for charts)
+        Rolled-up days come from stock_metrics_daily, recent days are
+        summarized on the fly from the live partitions (pruned by timestamp)
+        """
+        start_date = start_date or '1900-01-01'
+        end_date = end_date or '9999-12-31'
+        last_values = ', '.join(
+            f"(array_agg({c} ORDER BY timestamp DESC))[1] AS {c}" for c in ROLLUP_COLUMNS
+        )
+        columns = ', '.join(['symbol', 'date', 'price_open', 'price_high', 'price_low'] + ROLLUP_COLUMNS + ['samples'])
+        
+        query = f"""
+        SELECT {columns} FROM stock_metrics_daily
+        WHERE symbol = %(symbol)s AND date BETWEEN %(start)s AND %(end)s
+        UNION ALL
+        SELECT symbol,
+               timestamp::date AS date,
+               (array_agg(price ORDER BY timestamp))[1] AS price_open,
+               MAX(price) AS price_high,
+               MIN(price) AS price_low,
+               {last_values},
+               COUNT(*) AS samples
+        FROM stock_metrics
+        WHERE symbol = %(symbol)s
+          AND timestamp >= %(start)s::date
+          AND timestamp < %(end)s::date + 1
+        GROUP BY symbol, timestamp::date
+        ORDER BY date
+        """
+        with self.get_connection() as conn:
+            return pd.read_sql(
+                query, conn,
+                params={'symbol': symbol, 'start': start_date, 'end': end_date}
+            )
+    
+    def start_run(self, description: Optional[str] = None) -> int:
+        """
+        Open a new data stage run
+        Returns run_id to pass to insert_stock_metrics
+        """
+        with self.transaction() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    "INSERT INTO runs (started_at, status, description) VALUES (%s, 'running', %s) RETURNING run_id",
+                    (datetime.now(), description)
+                )
+                run_id = cursor.fetchone()[0]
+        logger.info(f"Started run {run_id}")
+        return run_id
+    
+    def complete_run(self, run_id: int, status: str = 'complete') -> bool:
+        """
+        Close a run; only 'complete' runs are visible to get_latest_metrics
+        Returns True if successful
+        """
         try:
+            with self.transaction() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute(
+                        """
+                        UPDATE runs
+                        SET status = %s, completed_at = %s,
+                            symbol_count = (SELECT COUNT(*) FROM stock_metrics WHERE run_id = %s)
+                        WHERE run_id = %s
+                        """,
+                        (status, datetime.now(), run_id, run_id)
+                    )
+            logger.info(f"Run {run_id} marked {status}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to close run {run_id}: {e}")
+            return False
+    
+    def get_latest_run_id(self) -> Optional[int]:
+        """Most recent complete run, or None if no run has completed"""
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    "SELECT run_id FROM runs WHERE status = 'complete' ORDER BY run_id DESC LIMIT 1"
+                )
+                row = cursor.fetchone()
+                return row[0] if row else None
+    
+    def get_latest_metrics(self, run_id: Optional[int] = None) -> pd.DataFrame:
+        """
+        Get a complete stock metrics snapshot
+        
+        Args:
+            run_id: Run to read (None = most recent complete run)
+        """
+        try:
+            if run_id is None:
+                run_id = self.get_latest_run_id()
+            
             with self.get_connection() as conn:
+                if run_id is not None:
+                    # Index-only scan on the covering (run_id, symbol) index
+                    df = pd.read_sql(
+                        f"SELECT {', '.join(SNAPSHOT_COLUMNS)} FROM stock_metrics "
+                        "WHERE run_id = %(run_id)s ORDER BY symbol",
+                        conn,
+                        params={'run_id': run_id}
+                    )
+                    logger.debug(f"Retrieved {len(df)} metrics for run {run_id}")
+                    return df
+                
+                # No runs recorded yet: fall back to the latest timestamp
                 query = """
                 SELECT * FROM stock_metrics
                 WHERE timestamp = (SELECT MAX(timestamp) FROM stock_metrics)
@@ -383,36 +659,54 @@ class PostgreSQLManager:
             logger.error(f"Failed to log regime: {e}")
             return False
     
+    def get_regime_for_dates(self, dates: Sequence) -> pd.DataFrame:
+        """
+        Regime in force on each date (last regime_history row on or before
+        the end of that day) - one LATERAL lookup per date on the primary key
+        """
+        requested = pd.DatetimeIndex(pd.to_datetime(list(dates))).normalize()
+        columns = ['regime', 'fear_greed_value', 'vix', 'strategy', 'expected_win_rate']
+        if requested.empty:
+            return pd.DataFrame(columns=columns)
+        
+        query = f"""
+        SELECT d.date, {', '.join('r.' + c for c in columns)}
+        FROM unnest(%(dates)s::date[]) WITH ORDINALITY AS d(date, position)
+        LEFT JOIN LATERAL (
+            SELECT {', '.join(columns)} FROM regime_history
+            WHERE timestamp < d.date + 1
+            ORDER BY timestamp DESC
+            LIMIT 1
+        ) r ON TRUE
+        ORDER BY d.position
+        """
+        with self.get_connection() as conn:
+            result = pd.read_sql(
+                query, conn,
+                params={'dates': [d.date() for d in requested]}
+            )
+        result['date'] = pd.to_datetime(result['date'])
+        return result.set_index('date')[columns]
+    
     def insert_tradingagents_analysis(self, analysis_results: List[Dict]) -> int:
         """Insert TradingAgents analysis results with JSON support"""
         if not analysis_results:
             return 0
         
+        columns = [
+            'batch_id', 'symbol', 'analysis_date', 'decision', 'conviction_score',
+            'entry_price', 'target_price', 'stop_loss', 'position_size_pct',
+            'analysis_summary', 'fundamental_analysis', 'technical_analysis',
+            'sentiment_analysis', 'risk_analysis', 'regime'
+        ]
+        
         try:
-            with self.transaction() as conn:
-                with conn.cursor() as cursor:
-                    insert_sql = """
-                    INSERT INTO tradingagents_analysis_results (
-                        batch_id, symbol, analysis_date, decision, conviction_score,
-                        entry_price, target_price, stop_loss, position_size_pct,
-                        analysis_summary, fundamental_analysis, technical_analysis,
-                        sentiment_analysis, risk_analysis, regime
-                    ) VALUES (
-                        %(batch_id)s, %(symbol)s, %(analysis_date)s, %(decision)s, 
-                        %(conviction_score)s, %(entry_price)s, %(target_price)s, 
-                        %(stop_loss)s, %(position_size_pct)s, %(analysis_summary)s,
-                        %(fundamental_analysis)s, %(technical_analysis)s,
-                        %(sentiment_analysis)s, %(risk_analysis)s, %(regime)s
-                    )
-                    ON CONFLICT (batch_id, symbol) DO UPDATE SET
-                        analysis_date = EXCLUDED.analysis_date,
-                        decision = EXCLUDED.decision,
-                        conviction_score = EXCLUDED.conviction_score,
-                        analysis_summary = EXCLUDED.analysis_summary
-                    """
-                    
-                    cursor.executemany(insert_sql, analysis_results)
-                    return len(analysis_results)
+            df = pd.DataFrame(analysis_results).reindex(columns=columns)
+            return self.bulk_upsert(
+                'tradingagents_analysis_results', df,
+                conflict_columns=['batch_id', 'symbol'],
+                update_columns=['analysis_date', 'decision', 'conviction_score', 'analysis_summary']
+            )
                     
         except Exception as e:
             logger.error(f"Failed to insert analysis results: {e}")
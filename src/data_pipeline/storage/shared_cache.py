@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+██╗  ██╗██╗  ██╗ █████╗ ███████╗ █████╗ ██████╗       ██████╗ ██╗   ██╗███╗   ███╗
+██║ ██╔╝██║  ██║██╔══██╗╚══███╔╝██╔══██╗██╔══██╗      ██╔══██╗██║   ██║████╗ ████║
+█████╔╝ ███████║███████║  ███╔╝ ███████║██║  ██║█████╗██║  ██║██║   ██║██╔████╔██║
+██╔═██╗ ██╔══██║██╔══██║ ███╔╝  ██╔══██║██║  ██║╚════╝██║  ██║██║   ██║██║╚██╔╝██║
+██║  ██╗██║  ██║██║  ██║███████╗██║  ██║██████╔╝      ██████╔╝╚██████╔╝██║ ╚═╝ ██║
+╚═╝  ╚═╝╚═╝  ╚═╝╚═╝  ╚═╝╚══════╝╚═╝  ╚═╝╚═════╝       ╚═════╝  ╚═════╝ ╚═╝     ╚═╝
+
+🏔️ ALGORITHMIC TRADING SYSTEM - "They delved too greedily and too deep..."
+
+┌─────────────────────────────────────────────────────────────────────────────────────┐
+│ 📋 MODULE: Shared Market Data Cache                                                  │
+│ 📄 FILE: shared_cache.py                                                             │
+│ 📅 CREATED: 2026-10-16                                                               │
+│ 👑 AUTHOR: FeanorKingofNoldor                                                        │
+│ 🔗 REPOSITORY: https://github.com/FeanorKingofNoldor/khazad_dum                      │
+│ 📧 CONTACT: [Your Contact Info]                                                      │
+│                                                                                     │
+│ 🎯 PURPOSE:                                                                          │
+│ TTL cache shared by every component and process on the host, backed by              │
+│ SQLite (default) or Redis, with stale-while-revalidate semantics                    │
+│                                                                                     │
+│ 🔧 DEPENDENCIES:                                                                     │
+│ - sqlite3 (default backend, WAL)                                                    │
+│ - redis (optional backend, docker-compose service)                                  │
+│ - threading (background revalidation)                                               │
+│                                                                                     │
+│ 📈 TRADING PIPELINE STAGE: 1. Market Regime Detection                                │
+│ └── 1. Market Regime Detection ← Regime / F&G / VIX cache                           │
+│ └── 2. Stock Screening                                                              │
+│ └── 3. AI Analysis (TradingAgents)                                                  │
+│ └── 4. Pattern Recognition                                                          │
+│ └── 5. Portfolio Construction                                                       │
+│ └── 6. Performance Observation                                                      │
+│                                                                                     │
+│ ⚠️  CRITICAL NOTES:                                                                 │
+│ - Values are stored as JSON - cache plain dicts, lists and numbers                  │
+│ - Stale values are served while one process refreshes behind a shared lock          │
+│ - A failed refresh keeps serving the last good value                                │
+│                                                                                     │
+│ 📊 PERFORMANCE NOTES:                                                                │
+│ - Fresh hits are a single primary-key read (or one Redis GET)                       │
+│ - Network cost is paid once per TTL across all processes, not per instance          │
+│                                                                                     │
+│ 🧪 TESTING:                                                                          │
+│ - Unit Tests: tests/unit/data_pipeline/test_shared_cache.py                         │
+│                                                                                     │
+│ 📚 DOCUMENTATION:                                                                    │
+│ - API Docs: Auto-generated from docstrings                                          │
+│ - Usage Guide: docs/guides/MARKET_REGIME_USAGE.md                                   │
+└─────────────────────────────────────────────────────────────────────────────────────┘
+
+Licensed under MIT License - See LICENSE file for details
+Copyright (c) 2024 FeanorKingofNoldor
+
+"In the depths of Khazad-dûm, the markets reveal their secrets to those who dare..."
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, NamedTuple, Optional, Union
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+from config.settings.base_config import (
+    SHARED_CACHE_BACKEND,
+    SHARED_CACHE_PATH,
+    SHARED_CACHE_LOCK_TTL,
+    SHARED_CACHE_WAIT_TIMEOUT,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class CacheEntry(NamedTuple):
+    """A cached value and when it was stored (epoch seconds)"""
+    value: Any
+    stored_at: float
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.stored_at
+
+
+class SQLiteCacheBackend:
+    """
+    Cache entries and refresh locks in a small WAL SQLite file
+    Every process opening the same path shares the cache
+    """
+
+    def __init__(self, db_path: Optional[Union[str, Path]] = None):
+        self.db_path = Path(db_path) if db_path else Path(SHARED_CACHE_PATH)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Background revalidation runs on its own thread, so share one connection under a lock
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False,
+                                    isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+        CREATE TABLE IF NOT EXISTS cache_entries (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL,
+            stored_at REAL NOT NULL
+        )
+        """)
+        self.conn.execute("""
+        CREATE TABLE IF NOT EXISTS cache_locks (
+            key TEXT PRIMARY KEY,
+            expires_at REAL NOT NULL
+        )
+        """)
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT value, stored_at FROM cache_entries WHERE key = ?", (key,)
+            ).fetchone()
+        return CacheEntry(json.loads(row[0]), row[1]) if row else None
+
+    def set(self, key: str, value: Any):
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (key, value, stored_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value, default=str), time.time())
+            )
+
+    def delete(self, key: str):
+        with self._lock:
+            self.conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+
+    def acquire_lock(self, key: str, ttl: float) -> bool:
+        """Take the refresh lock for key unless another holder's lock is still live"""
+        now = time.time()
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                self.conn.execute("DELETE FROM cache_locks WHERE key = ? AND expires_at < ?", (key, now))
+                acquired = self.conn.execute(
+                    "INSERT OR IGNORE INTO cache_locks (key, expires_at) VALUES (?, ?)", (key, now + ttl)
+                ).rowcount == 1
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+        return acquired
+
+    def release_lock(self, key: str):
+        with self._lock:
+            self.conn.execute("DELETE FROM cache_locks WHERE key = ?", (key,))
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+
+class RedisCacheBackend:
+    """
+    Cache entries and refresh locks in Redis, shared across hosts
+    """
+
+    PREFIX = "khazad:cache:"
+
+    def __init__(self, client):
+        self.client = client
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        raw = self.client.get(self.PREFIX + key)
+        if raw is None:
+            return None
+        entry = json.loads(raw)
+        return CacheEntry(entry['value'], entry['stored_at'])
+
+    def set(self, key: str, value: Any):
+        self.client.set(self.PREFIX + key, json.dumps({'value': value, 'stored_at': time.time()}, default=str))
+
+    def delete(self, key: str):
+        self.client.delete(self.PREFIX + key)
+
+    def acquire_lock(self, key: str, ttl: float) -> bool:
+        return bool(self.client.set(f"{self.PREFIX}lock:{key}", "1", nx=True, px=int(ttl * 1000)))
+
+    def release_lock(self, key: str):
+        self.client.delete(f"{self.PREFIX}lock:{key}")
+
+    def close(self):
+        self.client.close()
+
+
+class SharedCache:
+    """
+    TTL cache with stale-while-revalidate
+
+    - age < ttl: cached value
+    - ttl <= age < stale_ttl: cached value now, refreshed in the background by
+      whichever process takes the refresh lock
+    - older or missing: refreshed in the caller (or waits for the process
+      already refreshing); a failed refresh raises, since a value this old
+      is not served as current
+    """
+
+    def __init__(self, backend=None, lock_ttl: float = SHARED_CACHE_LOCK_TTL,
+                 wait_timeout: float = SHARED_CACHE_WAIT_TIMEOUT):
+        self.backend = backend or SQLiteCacheBackend()
+        self.lock_ttl = lock_ttl
+        self.wait_timeout = wait_timeout
+        self._threads = set()
+        self._threads_lock = threading.Lock()
+
+    def get_or_refresh(self, key: str, fetch: Callable[[], Any], ttl: float, stale_ttl: float) -> Any:
+        """
+        Cached value for key, calling fetch() when it needs refreshing
+
+        Raises:
+            Whatever fetch() raised, when there is no earlier value to fall back to
+        """
+        entry = self.backend.get(key)
+
+        if entry is not None and entry.age < ttl:
+            return entry.value
+
+        if entry is not None and entry.age < stale_ttl:
+            self._revalidate_in_background(key, fetch)
+            return entry.value
+
+        return self._refresh_now(key, fetch, entry)
+
+    def refresh(self, key: str, fetch: Callable[[], Any], stale_ttl: Optional[float] = None) -> Any:
+        """
+        Fetch and store now, regardless of age
+
+        Raises:
+            Whatever fetch() raised, unless the cached value is younger than
+            stale_ttl, which is then returned instead (None = never)
+        """
+        entry = self.backend.get(key)
+        try:
+            value = fetch()
+        except Exception as e:
+            if entry is None or stale_ttl is None or entry.age >= stale_ttl:
+                raise
+            logger.warning(f"Refreshing {key} failed, keeping cached value: {e}")
+            return entry.value
+        self.backend.set(key, value)
+        return value
+
+    def invalidate(self, key: str):
+        self.backend.delete(key)
+
+    def wait(self, timeout: Optional[float] = None):
+        """Block until background refreshes finish (tests, shutdown)"""
+        with self._threads_lock:
+            threads = list(self._threads)
+        for thread in threads:
+            thread.join(timeout)
+
+    def close(self):
+        self.wait(self.wait_timeout)
+        self.backend.close()
+
+    def _refresh_now(self, key: str, fetch: Callable[[], Any], entry: Optional[CacheEntry]) -> Any:
+        """Synchronous refresh, or wait for the process that holds the refresh lock"""
+        if not self.backend.acquire_lock(key, self.lock_ttl):
+            published = self._wait_for_refresh(key, entry)
+            if published is not None:
+                return published.value
+            logger.warning(f"Timed out waiting for another refresh of {key}, fetching directly")
+            return self.refresh(key, fetch)
+
+        try:
+            return self.refresh(key, fetch)
+        finally:
+            self.backend.release_lock(key)
+
+    def _wait_for_refresh(self, key: str, entry: Optional[CacheEntry]) -> Optional[CacheEntry]:
+        """Poll until a value newer than entry is published"""
+        deadline = time.monotonic() + self.wait_timeout
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            current = self.backend.get(key)
+            if current is not None and (entry is None or current.stored_at > entry.stored_at):
+                return current
+        return None
+
+    def _revalidate_in_background(self, key: str, fetch: Callable[[], Any]):
+        if not self.backend.acquire_lock(key, self.lock_ttl):
+            return  # Another thread or process is already refreshing
+
+        thread = threading.Thread(target=self._revalidate, args=(key, fetch),
+                                  name=f"cache-revalidate-{key}", daemon=True)
+        with self._threads_lock:
+            self._threads.add(thread)
+        thread.start()
+
+    def _revalidate(self, key: str, fetch: Callable[[], Any]):
+        try:
+            self.backend.set(key, fetch())
+            logger.debug(f"Revalidated {key} in the background")
+        except Exception as e:
+            logger.warning(f"Background refresh of {key} failed, serving stale value: {e}")
+        finally:
+            self.backend.release_lock(key)
+            with self._threads_lock:
+                self._threads.discard(threading.current_thread())
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_shared_cache() -> SharedCache:
+    """
+    Process-wide SharedCache on the configured backend
+    Redis falls back to SQLite when the package is missing or the server is unreachable
+    """
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = SharedCache(_create_backend(SHARED_CACHE_BACKEND))
+        return _shared_cache
+
+
+def _create_backend(name: str):
+    if name == 'redis':
+        if redis is None:
+            logger.warning("redis package not installed, using the SQLite shared cache")
+        else:
+            try:
+                client = redis.Redis(
+                    host=os.getenv('REDIS_HOST', 'localhost'),
+                    port=int(os.getenv('REDIS_PORT', 6379)),
+                    password=os.getenv('REDIS_PASSWORD'),
+                    db=int(os.getenv('REDIS_DB', 0)),
+                    socket_timeout=5,
+                    decode_responses=True
+                )
+                client.ping()
+                return RedisCacheBackend(client)
+            except Exception as e:
+                logger.warning(f"Redis unavailable ({e}), using the SQLite shared cache")
+    return SQLiteCacheBackend()
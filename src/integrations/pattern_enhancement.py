@@ -79,10 +79,12 @@ class PatternEnhancement:
             return {}
     
     def analyze_with_patterns(self, symbol: str, stock_metrics: Dict, 
-                            regime_data: Dict, batch_id: str) -> Dict:
+                            regime_data: Dict, batch_id: str, agent=None) -> Dict:
         """
         Enhanced analysis with pattern intelligence
         UPDATED to inject real-time pattern context
+        
+        agent: AgentWrapper.fork() to run on (None = the wrapped AgentWrapper)
         """
         # Step 1: Classify the pattern
         pattern_result = self.classifier.classify_trade(stock_metrics, regime_data)
@@ -106,7 +108,7 @@ class PatternEnhancement:
                 logger.debug(f"Injected real-time pattern memory for {symbol}")
         
         # Step 4: Call base TradingAgents (will now use the injected memory)
-        result = self.base_wrapper.analyze_stock(
+        result = (agent or self.base_wrapper).analyze_stock(
             symbol=symbol,
             date=datetime.now().strftime('%Y-%m-%d')
         )
@@ -60,10 +60,13 @@ Copyright (c) 2024 FeanorKingofNoldor
 
 import re
 import logging
+import warnings
 from typing import Any, Dict, List, Union, Optional, Tuple
 from decimal import Decimal, InvalidOperation
 from datetime import datetime, date
 import bleach
+import numpy as np
+import pandas as pd
 from config.logging.logging_config import log_security_event
 
 logger = logging.getLogger('security.input_validator')
@@ -349,6 +352,208 @@ class InputValidator:
             logger.error(f"Validation failed for stock metrics {metrics_dict.get('symbol', 'unknown')}: {e}")
             raise
     
+    # Stock metric fields checked by validate_stock_metrics_frame, in the same
+    # order validate_stock_metrics checks them: (column, kind, range key)
+    STOCK_METRIC_FIELDS = [
+        ('price', 'decimal', 'price'),
+        ('volume', 'integer', 'volume'),
+        ('market_cap', 'integer', 'market_cap'),
+        ('rsi_2', 'decimal', 'rsi'),
+        ('rsi_14', 'decimal', 'rsi'),
+        ('volume_ratio', 'decimal', 'percentage'),
+        ('price_change_pct', 'decimal', 'percentage'),
+        ('fear_greed_index', 'integer', 'fear_greed'),
+    ]
+    
+    # Indicator columns passed through by validate_stock_metrics_frame
+    # NaN is allowed (stored as NULL, e.g. sma_50 on short histories); inf is not
+    INDICATOR_RANGES = {
+        'dollar_volume': (0, np.inf),
+        'atr': (0, np.inf),
+        'sma_20': (0, np.inf),
+        'sma_50': (0, np.inf),
+        'avg_volume_20': (0, np.inf),
+        'change_1d': (-np.inf, np.inf),
+        'quality_score': (0, 1),
+    }
+    
+    @classmethod
+    def validate_stock_metrics_frame(cls, df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Validate a whole stock metrics DataFrame one column at a time
+        Applies the validate_stock_metrics rules with vectorized masks
+        
+        Returns:
+            (clean, rejections) - clean holds the validated columns of accepted
+            rows; rejections has one row per rejected input row with the first
+            failing field: row, symbol, field, reason, security_violation
+        """
+        n = len(df)
+        failures = []  # (field, mask, reason, is_security) in check order
+        clean = {}
+        
+        for field in ('symbol', 'price', 'volume'):
+            if field not in df.columns:
+                failures.append((field, np.ones(n, dtype=bool), "Required field missing", False))
+        
+        if 'symbol' in df.columns:
+            symbols, security, invalid = cls._validate_symbol_column(df['symbol'])
+            failures.append(('symbol', security, "Security violation in symbol", True))
+            failures.append(('symbol', invalid, "Invalid symbol format", False))
+            clean['symbol'] = symbols
+        
+        for field, kind, range_key in cls.STOCK_METRIC_FIELDS:
+            if field not in df.columns:
+                continue
+            values, security, invalid = cls._numeric_column(df[field], integer=(kind == 'integer'))
+            min_val, max_val = cls.NUMERIC_RANGES[range_key]
+            with np.errstate(invalid='ignore'):
+                invalid |= ~((values >= min_val) & (values <= max_val))
+            failures.append((field, security, f"Security violation in {field}", True))
+            failures.append((field, invalid & ~security, f"{field} not numeric or outside valid range [{min_val}, {max_val}]", False))
+            clean[field] = values
+        
+        if 'regime' in df.columns:
+            regimes, security = cls._sanitize_column(df['regime'], 'regime')
+            failures.append(('regime', security, "Security violation in regime", True))
+            clean['regime'] = regimes
+        
+        for field, (min_val, max_val) in cls.INDICATOR_RANGES.items():
+            if field not in df.columns:
+                continue
+            values, security, invalid = cls._numeric_column(df[field], integer=False, allow_negative=True)
+            invalid &= df[field].notna().to_numpy()
+            with np.errstate(invalid='ignore'):
+                invalid |= np.isinf(values) | (values < min_val) | (values > max_val)
+            failures.append((field, security, f"Security violation in {field}", True))
+            failures.append((field, invalid & ~security, f"{field} not finite or outside [{min_val}, {max_val}]", False))
+            clean[field] = values
+        
+        # First failing field per row, mirroring the row validator's check order
+        rejected = np.zeros(n, dtype=bool)
+        report = []
+        raw_symbols = df['symbol'].astype(str).str.slice(0, 100).to_numpy() if 'symbol' in df.columns else np.full(n, '')
+        for field, mask, reason, is_security in failures:
+            new = mask & ~rejected
+            if new.any():
+                for i in np.flatnonzero(new):
+                    report.append((i, df.index[i], raw_symbols[i], field, reason, is_security))
+                rejected |= new
+        
+        report.sort()
+        rejections = pd.DataFrame(
+            [entry[1:] for entry in report],
+            columns=['row', 'symbol', 'field', 'reason', 'security_violation']
+        )
+        
+        if rejections['security_violation'].any():
+            violations = rejections[rejections['security_violation']]
+            log_security_event(
+                'input_validation_violation',
+                f"Potential injection detected in {len(violations)} stock metric rows",
+                {'input_sample': violations['symbol'].head(5).tolist(), 'fields': violations['field'].unique().tolist()}
+            )
+        
+        if any(f in ('symbol', 'price', 'volume') and r == "Required field missing" for f, _, r, _ in failures):
+            # Every row is rejected when a required column is missing
+            return pd.DataFrame(), rejections
+        
+        keep = ~rejected
+        result = pd.DataFrame({field: np.asarray(values)[keep] for field, values in clean.items()})
+        for field, kind, _ in cls.STOCK_METRIC_FIELDS:
+            if kind == 'integer' and field in result.columns:
+                result[field] = result[field].astype('int64')
+        
+        return result, rejections
+    
+    @classmethod
+    def _injection_mask(cls, values: pd.Series) -> np.ndarray:
+        """Vectorized detect_injection_attempt over a string Series"""
+        pattern = '|'.join(f'(?:{p})' for p in cls.SQL_INJECTION_PATTERNS)
+        with warnings.catch_warnings():
+            # Only a match/no-match answer is needed; pandas warns about the patterns' groups
+            warnings.simplefilter('ignore', UserWarning)
+            mask = values.str.contains(pattern, case=False, regex=True)
+        mask |= values.str.len() > 50000
+        mask |= values.str.contains('\x00', regex=False)
+        mask |= values.str.contains('../', regex=False) | values.str.contains('..\\', regex=False)
+        return mask.fillna(False).to_numpy(dtype=bool)
+    
+    @classmethod
+    def _validate_symbol_column(cls, series: pd.Series) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Vectorized validate_symbol: returns (cleaned, security_mask, invalid_mask)"""
+        missing = series.isna().to_numpy() | (series.astype(str) == '').to_numpy()
+        text = series.astype(str).str.strip()
+        
+        security = ~missing & cls._injection_mask(text)
+        
+        # bleach only changes values containing markup characters
+        cleaned = text.copy()
+        markup = text.str.contains('[<>&]', regex=True).to_numpy() & ~security
+        if markup.any():
+            cleaned[markup] = text[markup].map(lambda v: bleach.clean(v, tags=[], strip=True))
+        cleaned = cleaned.str.slice(0, cls.MAX_STRING_LENGTHS['symbol'])
+        
+        valid_format = cleaned.str.match(cls.SYMBOL_PATTERN.pattern).to_numpy(dtype=bool)
+        invalid = ~security & (missing | ~valid_format)
+        return cleaned.to_numpy(dtype=object), security, invalid
+    
+    @classmethod
+    def _numeric_column(cls, series: pd.Series, integer: bool,
+                        allow_negative: bool = False) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Vectorized validate_decimal / validate_integer parsing
+        Returns (values, security_mask, invalid_mask); range checks are left to the caller
+        """
+        n = len(series)
+        security = np.zeros(n, dtype=bool)
+        invalid = np.zeros(n, dtype=bool)
+        
+        if pd.api.types.is_bool_dtype(series):
+            return np.full(n, np.nan), security, np.ones(n, dtype=bool)
+        
+        if pd.api.types.is_numeric_dtype(series):
+            values = series.to_numpy(dtype=float, na_value=np.nan)
+        else:
+            # Strings must pass the same injection and format checks as single values
+            obj = series.astype(object)
+            is_str = obj.map(lambda v: isinstance(v, str)).to_numpy(dtype=bool)
+            if is_str.any():
+                strings = obj[is_str].astype(str)
+                security[is_str] = cls._injection_mask(strings)
+                number_pattern = cls.INTEGER_PATTERN if integer else cls.DECIMAL_PATTERN
+                if allow_negative:
+                    number_pattern = re.compile(r'^-?' + number_pattern.pattern[1:])
+                bad_format = ~strings.str.strip().str.match(number_pattern.pattern).to_numpy(dtype=bool)
+                invalid[is_str] = bad_format & ~security[is_str]
+                obj = obj.where(~pd.Series(is_str, index=obj.index), obj.astype(str).str.strip())
+            values = np.array(pd.to_numeric(obj, errors='coerce'), dtype=float)
+            values[security | invalid] = np.nan
+        
+        if integer:
+            # int() truncates toward zero; NaN/inf cannot be converted
+            invalid |= ~np.isfinite(values)
+            with np.errstate(invalid='ignore'):
+                values = np.trunc(values)
+                invalid |= values < 0
+        
+        invalid |= np.isnan(values) & ~security
+        return values, security, invalid
+    
+    @classmethod
+    def _sanitize_column(cls, series: pd.Series, field_type: str) -> Tuple[np.ndarray, np.ndarray]:
+        """sanitize_string applied once per distinct value: returns (cleaned, security_mask)"""
+        cleaned = {}
+        for value in series.dropna().unique():
+            try:
+                cleaned[value] = cls.sanitize_string(value, field_type=field_type)
+            except SecurityViolationError:
+                cleaned[value] = None
+        
+        result = series.map(lambda v: "" if pd.isna(v) else cleaned[v])
+        security = series.notna().to_numpy() & result.isna().to_numpy()
+        return result.to_numpy(dtype=object), security
+    
     @classmethod
     def validate_trading_decision(cls, decision_dict: Dict[str, Any]) -> Dict[str, Any]:
         """Validate trading decision dictionary"""
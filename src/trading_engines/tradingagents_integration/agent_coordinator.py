@@ -5,6 +5,8 @@ Complete orchestration of TradingAgents with KHAZAD_DUM context
 
 import sys
 import os
+import copy
+import threading
 from datetime import datetime
 import logging
 
@@ -18,6 +20,7 @@ from config.settings.base_config import (
     IBKR_DEFAULT_PORT,
     ENV_FILE_PATH,
     DEFAULT_ANALYSIS_DATE,
+    TRADINGAGENTS_PREFETCH_WORKERS,
     load_api_keys_from_env
 )
 
@@ -103,6 +106,9 @@ class AgentWrapper:
         # Initialize TradingAgents with config
         self.graph = TradingAgentsGraph(debug=True, config=self.config)
         
+        # Shared by fork()ed workers so concurrent analyses query IBKR one at a time
+        self._context_lock = threading.Lock()
+        
         # Print setup info
         mode = "LIVE" if self.ibkr_port == 4001 else "PAPER"
         ibkr_status = "ENABLED" if self.use_ibkr else "DISABLED"
@@ -128,7 +134,8 @@ class AgentWrapper:
         else:
             regime_context = market_context
 
-        portfolio_context = self.portfolio_provider.get_portfolio_context()
+        with self._context_lock:
+            portfolio_context = self.portfolio_provider.get_portfolio_context()
 
         print(
             f"Market Regime: {regime_context['regime']} (F&G: {regime_context['fear_greed_value']})"
@@ -195,6 +202,46 @@ class AgentWrapper:
 
         return enhanced_result
 
+    def prefetch(self, symbols, date=None):
+        """
+        Pull every symbol's tool inputs before any analysis runs, so the
+        agents' price, indicator, news and fundamentals tools answer from memory
+        
+        Args:
+            symbols: Tickers about to be analyzed
+            date: Analysis date the agents will use (None = today)
+        """
+        date = date or datetime.now().strftime("%Y-%m-%d")
+        started = datetime.now()
+        summary = self.graph.toolkit.prefetch(
+            list(symbols), date, max_workers=TRADINGAGENTS_PREFETCH_WORKERS
+        )
+        elapsed = (datetime.now() - started).total_seconds()
+        print(f"Prefetched {summary['prices']} price histories and {summary['calls']} tool calls "
+              f"({summary['failed']} failed) in {elapsed:.1f}s")
+        return summary
+
+    def release_prefetch(self):
+        """
+        Free the price histories prefetch() loaded; call when the batch that
+        prefetched them is finished so they don't outlive it
+        """
+        self.graph.toolkit.release_prefetch()
+
+    def fork(self):
+        """
+        Wrapper for one concurrent worker
+        Shares the LLM clients, toolkit, memories and compiled graph (so injected
+        pattern memories reach every worker) but has its own propagate() state -
+        TradingAgentsGraph keeps ticker/curr_state/log_states_dict on itself
+        """
+        worker = copy.copy(self)
+        worker.graph = copy.copy(self.graph)
+        worker.graph.ticker = None
+        worker.graph.curr_state = None
+        worker.graph.log_states_dict = {}
+        return worker
+
     def get_portfolio_summary(self):
         """Get a summary of current portfolio for monitoring"""
         context = self.portfolio_provider.get_portfolio_context()
@@ -10,6 +10,9 @@ sys.path.append(os.path.join(os.path.dirname(__file__), "../../"))
 
 import pandas as pd
 import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime
 from typing import Dict, List, Optional
 import logging
@@ -22,6 +25,9 @@ from config.settings.base_config import (
     IBKR_ENABLED,
     IBKR_DEFAULT_PORT,
     PATTERN_LEARNING_TRIGGER,
+    TRADINGAGENTS_MAX_PARALLEL,
+    TRADINGAGENTS_SYMBOL_TIMEOUT,
+    TRADINGAGENTS_PREFETCH_ENABLED,
 )
 
 # ADD: Pattern system imports (only if they exist)
@@ -97,9 +103,16 @@ class BatchProcessor:
         
         return memories_injected
 
-    def __init__(self, khazad_dum_database: DatabaseManager):
+    def __init__(self, khazad_dum_database: DatabaseManager,
+                 max_parallel: int = TRADINGAGENTS_MAX_PARALLEL,
+                 symbol_timeout: float = TRADINGAGENTS_SYMBOL_TIMEOUT):
         self.db = khazad_dum_database
         
+        # Candidate analysis concurrency (see _analyze_candidates)
+        self.max_parallel = max(1, max_parallel)
+        self.symbol_timeout = symbol_timeout
+        self._workers = threading.local()
+        
         # Use settings instead of hardckhazad_dumg
         self.tradingagents = AgentWrapper(
             khazad_dum_database=khazad_dum_database,
@@ -130,86 +143,96 @@ class BatchProcessor:
         candidates: pd.DataFrame,
         regime_data: Dict,
         portfolio_context: Optional[Dict] = None,
+        batch_id: Optional[str] = None,
     ) -> Dict:
         """
         Process all candidates through TradingAgents and select portfolio
         (Enhanced with optional pattern tracking)
+        
+        Candidates are checkpointed in tradingagents_queue: each one is marked
+        processed as soon as its analysis is stored, and symbols already
+        processed for batch_id are skipped (see resume)
 
         Args:
             candidates: DataFrame of filtered stocks from KHAZAD_DUM
             regime_data: Current market regime information
             portfolio_context: Current portfolio state
+            batch_id: Existing batch to continue (None = start a new batch)
 
         Returns:
             Dictionary with final selections and analysis results
         """
         # Generate batch ID
-        batch_id = f"batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        batch_id = batch_id or f"batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         logger.info(f"Starting batch {batch_id} with {len(candidates)} candidates")
 
-        # Step 1: Process each stock through TradingAgents
-        analysis_results = []
-        failed_count = 0
-
-        for idx, row in candidates.iterrows():
-            try:
-                logger.info(f"Analyzing {row['symbol']} ({idx+1}/{len(candidates)})")
+        # Step 0: Checkpoint the candidate list, skip work an earlier run finished
+        self.db.enqueue_candidates(batch_id, candidates, regime_data)
+        completed = self._completed_symbols(batch_id)
+        if completed:
+            logger.info(f"Resuming {batch_id}: {len(completed)} of {len(candidates)} candidates already analyzed")
+            candidates = candidates[~candidates["symbol"].isin(completed)]
 
-                # ENHANCED: Use pattern-aware analysis if available
-                if self.pattern_wrapper:
-                    try:
-                        result = self.pattern_wrapper.analyze_with_patterns(
-                            symbol=row["symbol"],
-                            stock_metrics=row.to_dict(),
-                            regime_data=regime_data,
-                            batch_id=batch_id
-                        )
-                    except Exception as e:
-                        logger.warning(f"Pattern analysis failed, using standard: {e}")
-                        # Fallback to standard analysis
-                        result = self.tradingagents.analyze_stock(
-                            symbol=row["symbol"],
-                            date=datetime.now().strftime("%Y-%m-%d"),
-                            market_context=regime_data,
-                        )
-                else:
-                    # Standard TradingAgents analysis (original code)
-                    result = self.tradingagents.analyze_stock(
-                        symbol=row["symbol"],
-                        date=datetime.now().strftime("%Y-%m-%d"),
-                        market_context=regime_data,
+        # Prefetched prices belong to this batch only (released in the finally below)
+        try:
+            # Prefetch tool inputs for every candidate (network I/O up front, not inside the LLM loop)
+            if TRADINGAGENTS_PREFETCH_ENABLED and not candidates.empty:
+                try:
+                    self.tradingagents.prefetch(
+                        candidates["symbol"].tolist(), datetime.now().strftime("%Y-%m-%d")
                     )
+                except Exception as e:
+                    logger.warning(f"Prefetch failed, agents will fetch on demand: {e}")
 
-                # Check if we got a valid result (original validation)
-                if not result or 'decision' not in result:
-                    logger.warning(f"No valid decision for {row['symbol']}, skipping")
-                    failed_count += 1
-                    continue
+            # Step 1: Process each stock through TradingAgents
+            # (max_parallel at a time, saved in candidate order)
+            analysis_results = []
+            failed_count = 0
 
-                # Parse and store result (using original method)
-                analysis_data = self._parse_tradingagents_result(
-                    result, row, regime_data
-                )
-                analysis_data["batch_id"] = batch_id
+            for row, result in self._analyze_candidates(candidates, regime_data, batch_id):
+                try:
+                    # Check if we got a valid result (original validation)
+                    if not result or 'decision' not in result:
+                        logger.warning(f"No valid decision for {row['symbol']}, skipping")
+                        failed_count += 1
+                        continue
+
+                    # Parse and store result (using original method)
+                    analysis_data = self._parse_tradingagents_result(
+                        result, row, regime_data
+                    )
+                    analysis_data["batch_id"] = batch_id
                 
-                # ADD: Pattern data if available
-                if self.pattern_wrapper and 'pattern_id' in result:
-                    analysis_data["pattern_id"] = result.get("pattern_id")
-                    analysis_data["pattern_win_rate"] = result.get("pattern_context", {}).get("win_rate", 0)
-                    analysis_data["pattern_expectancy"] = result.get("pattern_context", {}).get("expectancy", 0)
-
-                # Save to database (will work with or without pattern fields)
-                self._save_analysis_result(analysis_data)
-                analysis_results.append(analysis_data)
+                    # ADD: Pattern data if available
+                    if self.pattern_wrapper and 'pattern_id' in result:
+                        analysis_data["pattern_id"] = result.get("pattern_id")
+                        analysis_data["pattern_win_rate"] = result.get("pattern_context", {}).get("win_rate", 0)
+                        analysis_data["pattern_expectancy"] = result.get("pattern_context", {}).get("expectancy", 0)
+
+                    # Save to database (will work with or without pattern fields)
+                    # together with its checkpoint, so a crash can't store one without the other
+                    with self.db.transaction():
+                        self._save_analysis_result(analysis_data)
+                        self.db.mark_queue_processed(
+                            batch_id, row["symbol"], analysis_data["conviction_score"], analysis_data["decision"]
+                        )
+                    analysis_results.append(analysis_data)
 
-            except Exception as e:
-                logger.error(f"Failed to analyze {row['symbol']}: {e}")
-                failed_count += 1
-                continue
+                except Exception as e:
+                    logger.error(f"Failed to save analysis for {row['symbol']}: {e}")
+                    failed_count += 1
+                    continue
+        finally:
+            self.tradingagents.release_prefetch()
 
         logger.info(
             f"Completed TradingAgents analysis: {len(analysis_results)} successful, {failed_count} failed"
         )
+        self._log_tool_memo_stats()
+
+        # Results stored by the interrupted run(s) count towards this batch
+        if completed:
+            analysis_results = self._load_analysis_results(batch_id, completed) + analysis_results
 
         # CRITICAL: Check if we have ANY results (original validation)
         if len(analysis_results) == 0:
@@ -277,6 +300,8 @@ class BatchProcessor:
             "batch_id": batch_id,
             "total_analyzed": len(analysis_results),
             "failed_analyses": failed_count,
+            "resumed": len(completed),
+            "regime": regime_data.get("regime"),
             "buy_signals": sum(1 for r in analysis_results if r["decision"] == "BUY"),
             "selections": portfolio_result.get("selections", []),
             "excluded": portfolio_result.get("excluded", []),
@@ -286,6 +311,144 @@ class BatchProcessor:
             "patterns_enabled": self.pattern_wrapper is not None
         }
     
+    def _analyze_candidates(self, candidates: pd.DataFrame, regime_data: Dict, batch_id: str):
+        """
+        Run candidates through TradingAgents on max_parallel worker threads
+        
+        Yields (row, result) in candidate order as soon as every earlier
+        candidate has finished, so results are saved in the same order no
+        matter which analysis completes first. result is None when the
+        analysis raised or ran past symbol_timeout; a timed-out call cannot be
+        interrupted and keeps its worker until the LLM call returns.
+        """
+        rows = [row for _, row in candidates.iterrows()]
+        outcomes = {}
+        started = {}
+        next_index = 0
+        
+        pool = ThreadPoolExecutor(max_workers=self.max_parallel, thread_name_prefix="tradingagents")
+        try:
+            futures = {
+                pool.submit(self._analyze_candidate, index, row, len(rows), regime_data, batch_id, started): index
+                for index, row in enumerate(rows)
+            }
+            pending = set(futures)
+            
+            while next_index < len(rows):
+                done, pending = wait(pending, timeout=self._next_deadline(started, outcomes),
+                                     return_when=FIRST_COMPLETED)
+                
+                for future in done:
+                    index = futures[future]
+                    try:
+                        outcomes[index] = future.result()
+                    except Exception as e:
+                        logger.error(f"Failed to analyze {rows[index]['symbol']}: {e}")
+                        outcomes[index] = None
+                
+                # Abandon analyses that have run past the per-symbol timeout
+                now = time.monotonic()
+                for future in list(pending):
+                    index = futures[future]
+                    if index in started and now - started[index] > self.symbol_timeout:
+                        logger.error(f"Timed out analyzing {rows[index]['symbol']} "
+                                     f"after {self.symbol_timeout:.0f}s")
+                        outcomes[index] = None
+                        pending.discard(future)
+                
+                while next_index in outcomes:
+                    yield rows[next_index], outcomes.pop(next_index)
+                    next_index += 1
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+    
+    def _log_tool_memo_stats(self):
+        """Log how many TradingAgents tool calls were answered from the per-date memo"""
+        memo = getattr(getattr(self.tradingagents.graph, 'toolkit', None), 'memo', None)
+        if memo is None:
+            return
+        stats = memo.stats()
+        total = stats.pop('total')
+        logger.info(f"Tool memo: {total['hits']} hits, {total['misses']} misses "
+                    f"({total['hit_rate']:.0%} hit rate)")
+        for name, row in stats.items():
+            logger.debug(f"  {name}: {row['hits']}/{row['hits'] + row['misses']} from memo")
+    
+    def _next_deadline(self, started: Dict[int, float], outcomes: Dict) -> float:
+        """Seconds until the earliest running analysis times out (poll at least every second)"""
+        running = [t for index, t in list(started.items()) if index not in outcomes]
+        if not running:
+            return 1.0
+        return min(1.0, max(0.0, min(running) + self.symbol_timeout - time.monotonic()))
+    
+    def _analyze_candidate(self, index: int, row: pd.Series, total: int,
+                           regime_data: Dict, batch_id: str, started: Dict[int, float]) -> Dict:
+        """Analyze one candidate on this worker's own AgentWrapper fork"""
+        started[index] = time.monotonic()
+        logger.info(f"Analyzing {row['symbol']} ({index+1}/{total})")
+        
+        agent = getattr(self._workers, 'agent', None)
+        if agent is None:
+            agent = self._workers.agent = self.tradingagents.fork()
+
+        # ENHANCED: Use pattern-aware analysis if available
+        if self.pattern_wrapper:
+            try:
+                return self.pattern_wrapper.analyze_with_patterns(
+                    symbol=row["symbol"],
+                    stock_metrics=row.to_dict(),
+                    regime_data=regime_data,
+                    batch_id=batch_id,
+                    agent=agent
+                )
+            except Exception as e:
+                logger.warning(f"Pattern analysis failed, using standard: {e}")
+        
+        # Standard TradingAgents analysis (original code)
+        return agent.analyze_stock(
+            symbol=row["symbol"],
+            date=datetime.now().strftime("%Y-%m-%d"),
+            market_context=regime_data,
+        )
+    
+    def resume(self, batch_id: str, portfolio_context: Optional[Dict] = None) -> Dict:
+        """
+        Finish an interrupted batch from its tradingagents_queue checkpoint
+        Only candidates not yet marked processed are analyzed again
+        """
+        queue = self.db.get_batch_queue(batch_id)
+        if queue.empty or queue["candidate_data"].isna().all():
+            logger.error(f"No resumable queue for {batch_id}")
+            return {
+                'batch_id': batch_id,
+                'total_analyzed': 0,
+                'buy_signals': 0,
+                'selections': [],
+                'excluded': [],
+                'error': f'No queued candidates for {batch_id}',
+                'timestamp': datetime.now().isoformat()
+            }
+
+        candidates = pd.DataFrame([json.loads(row) for row in queue["candidate_data"].dropna()])
+        regime_data = json.loads(queue["regime_data"].dropna().iloc[0])
+        return self.process_batch(candidates, regime_data, portfolio_context, batch_id=batch_id)
+
+    def _completed_symbols(self, batch_id: str) -> List[str]:
+        """Symbols of batch_id whose analysis is already stored"""
+        queue = self.db.get_batch_queue(batch_id)
+        return queue.loc[queue["processed"] == 1, "symbol"].tolist()
+
+    def _load_analysis_results(self, batch_id: str, symbols: List[str]) -> List[Dict]:
+        """Stored analyses of earlier runs of batch_id, in the shape process_batch builds"""
+        placeholders = ", ".join("?" for _ in symbols)
+        df = pd.read_sql(
+            f"SELECT * FROM tradingagents_analysis_results WHERE batch_id = ? AND symbol IN ({placeholders})",
+            self.db.conn, params=(batch_id, *symbols)
+        )
+        records = df.astype(object).where(df.notna(), None).to_dict("records")
+        # Unset columns (e.g. pattern_id) are left out, as in a fresh analysis_data
+        return [{key: value for key, value in record.items() if value is not None} for record in records]
+
     # ADD: New methods for pattern system (won't affect existing functionality)
     def close_position_with_learning(self, position_data: Dict):
         """Close position and trigger pattern learning if available"""
@@ -428,7 +591,10 @@ class BatchProcessor:
         }
 
     def _save_analysis_result(self, data: Dict):
-        """Save TradingAgents analysis to database (handles pattern fields gracefully)"""
+        """
+        Save TradingAgents analysis to database (handles pattern fields gracefully)
+        Runs inside the caller's db.transaction(), which commits it
+        """
         try:
             # Try to save with pattern fields if they exist
             if "pattern_id" in data:
@@ -519,5 +685,4 @@ class BatchProcessor:
                 ),
             )
         
-        self.db.conn.commit()
         logger.info(f"Successfully saved analysis for {data['symbol']}")
\ No newline at end of file
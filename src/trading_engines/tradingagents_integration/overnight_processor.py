@@ -12,6 +12,7 @@ from typing import List, Dict
 from src.core.market_analysis.regime_detector import RegimeDetector
 from src.data_pipeline.storage.database_manager import DatabaseManager
 from src.data_pipeline.market_data.stock_data_fetcher import StockDataFetcher
+from src.data_pipeline.metrics_pipeline import MetricsPipeline
 from src.core.stock_screening.stock_filter import StockFilter
 
 
@@ -26,6 +27,7 @@ class OvernightProcessor:
         self.regime_detector = RegimeDetector()
         self.fetcher = StockDataFetcher()
         self.filter = StockFilter(self.db)
+        self.last_batch_id = None  # Queue written by the latest run (see resume_batch in main.py)
         
     def run_overnight_batch(self):
         """
@@ -47,14 +49,13 @@ class OvernightProcessor:
             
             # Step 2: Fetch all S&P 500 data
             print("\n[2/4] Fetching S&P 500 Data...")
-            metrics = self.fetcher.fetch_all_sp500()
+            data_stage = MetricsPipeline(self.fetcher, self.db, prefilter=self.filter.apply_hard_constraints).run()
             
-            if metrics.empty:
+            if data_stage['fetched'] == 0:
                 print("   ⚠ No data fetched - aborting")
                 return None
                 
-            print(f"   ✓ Fetched {len(metrics)} stocks")
-            self.db.insert_stock_metrics(metrics)
+            print(f"   ✓ Fetched {data_stage['fetched']} stocks")
             
             # Step 3: Run filtering
             print("\n[3/4] Running 3-Layer Filter...")
@@ -66,7 +67,7 @@ class OvernightProcessor:
             
             # Step 4: Prepare for TradingAgents
             print(f"\n[4/4] Preparing {len(candidates)} candidates for TradingAgents...")
-            self.prepare_tradingagents_queue(candidates, regime)
+            self.last_batch_id = self.prepare_tradingagents_queue(candidates, regime)
             
             # Summary
             end_time = datetime.now()
@@ -74,6 +75,7 @@ class OvernightProcessor:
             print(f"\n{'='*60}")
             print(f"BATCH COMPLETE - Duration: {duration:.1f} seconds")
             print(f"Candidates ready for TradingAgents analysis")
+            print(f"Analyze with: python main.py --resume {self.last_batch_id}")
             print(f"{'='*60}\n")
             
             return candidates
@@ -82,51 +84,19 @@ class OvernightProcessor:
             print(f"\n❌ Batch failed: {e}")
             return None
     
-    def prepare_tradingagents_queue(self, candidates: pd.DataFrame, regime: Dict):
+    def prepare_tradingagents_queue(self, candidates: pd.DataFrame, regime: Dict) -> str:
         """
         Prepare candidates for TradingAgents analysis
-        Save to queue table for processing
-        """
-        # Create queue table if not exists
-        self.db.conn.execute("""
-        CREATE TABLE IF NOT EXISTS tradingagents_queue (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            symbol TEXT NOT NULL,
-            queued_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-            regime TEXT,
-            filter_score REAL,
-            rsi_2 REAL,
-            volume_ratio REAL,
-            price REAL,
-            atr REAL,
-            processed BOOLEAN DEFAULT 0,
-            conviction_score REAL,
-            recommendation TEXT,
-            processed_at DATETIME
-        )
-        """)
-        
-        # Clear old queue
-        self.db.conn.execute("DELETE FROM tradingagents_queue WHERE processed = 0")
+        Save to queue table for processing (BatchProcessor.resume picks it up)
         
-        # Insert new candidates
-        for _, row in candidates.iterrows():
-            self.db.conn.execute("""
-            INSERT INTO tradingagents_queue 
-            (symbol, regime, filter_score, rsi_2, volume_ratio, price, atr)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (
-                row['symbol'],
-                regime['regime'],
-                row['score'],
-                row['rsi_2'],
-                row['volume_ratio'],
-                row['price'],
-                row['atr']
-            ))
+        Returns:
+            batch_id the candidates were queued under
+        """
+        batch_id = f"batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        queued = self.db.enqueue_candidates(batch_id, candidates, regime)
         
-        self.db.conn.commit()
-        print(f"   ✓ {len(candidates)} stocks queued for TradingAgents")
+        print(f"   ✓ {queued} stocks queued for TradingAgents ({batch_id})")
+        return batch_id
         
     def is_market_closed(self) -> bool:
         """
@@ -73,6 +73,8 @@ from contextlib import asynccontextmanager
 # Import our existing monitoring system
 from src.monitoring.health_check import health_check_endpoint
 from src.data_pipeline.storage.database_manager import DatabaseManager
+from src.data_pipeline.storage.async_reader import AsyncDatabaseReader
+from config.settings.base_config import DASHBOARD_SEND_TIMEOUT, DASHBOARD_UPDATE_INTERVAL
 
 
 class WebDashboard:
@@ -81,6 +83,7 @@ class WebDashboard:
     def __init__(self):
         self.active_connections: List[WebSocket] = []
         self.db = DatabaseManager()
+        self.reader = AsyncDatabaseReader(self.db)  # Queries run off the event loop
     
     async def connect(self, websocket: WebSocket):
         """Connect a new WebSocket client"""
@@ -93,25 +96,26 @@ class WebDashboard:
             self.active_connections.remove(websocket)
     
     async def broadcast_update(self, data: dict):
-        """Broadcast data to all connected clients"""
+        """Broadcast data to all connected clients (concurrently, so one slow client can't hold up the rest)"""
         if self.active_connections:
             message = json.dumps(data)
-            disconnected = []
+            connections = list(self.active_connections)
             
-            for connection in self.active_connections:
-                try:
-                    await connection.send_text(message)
-                except:
-                    disconnected.append(connection)
+            results = await asyncio.gather(
+                *(asyncio.wait_for(connection.send_text(message), DASHBOARD_SEND_TIMEOUT)
+                  for connection in connections),
+                return_exceptions=True
+            )
             
-            # Clean up disconnected clients
-            for connection in disconnected:
-                self.disconnect(connection)
+            # Clean up disconnected / timed-out clients
+            for connection, result in zip(connections, results):
+                if isinstance(result, Exception):
+                    self.disconnect(connection)
     
     async def get_trading_summary(self) -> Dict[str, Any]:
         """Get current trading summary"""
         try:
-            cursor = self.db.conn.execute("""
+            summary_query = self.reader.fetchone("""
                 SELECT 
                     COUNT(*) as total_positions,
                     COUNT(CASE WHEN status = 'OPEN' THEN 1 END) as open_positions,
@@ -119,10 +123,9 @@ class WebDashboard:
                     SUM(CASE WHEN status = 'CLOSED' AND pnl_dollars IS NOT NULL THEN pnl_dollars ELSE 0 END) as total_pnl
                 FROM position_tracking
             """)
-            row = cursor.fetchone()
             
             # Get recent performance
-            cursor = self.db.conn.execute("""
+            perf_query = self.reader.fetchone("""
                 SELECT 
                     COUNT(*) as recent_trades,
                     AVG(CASE WHEN pnl_pct IS NOT NULL THEN pnl_pct ELSE 0 END) as avg_return,
@@ -131,7 +134,9 @@ class WebDashboard:
                 WHERE exit_date >= date('now', '-7 days')
                 AND status = 'CLOSED'
             """)
-            perf_row = cursor.fetchone()
+            
+            # Both queries run in parallel on the reader pool
+            row, perf_row = await asyncio.gather(summary_query, perf_query)
             
             return {
                 "total_positions": row[0] if row else 0,
@@ -157,7 +162,7 @@ class WebDashboard:
     async def get_active_positions(self) -> List[Dict[str, Any]]:
         """Get list of active positions"""
         try:
-            cursor = self.db.conn.execute("""
+            rows = await self.reader.fetchall("""
                 SELECT 
                     symbol,
                     entry_date,
@@ -174,7 +179,7 @@ class WebDashboard:
             """)
             
             positions = []
-            for row in cursor.fetchall():
+            for row in rows:
                 positions.append({
                     "symbol": row[0],
                     "entry_date": row[1],
@@ -194,7 +199,7 @@ class WebDashboard:
     async def get_recent_signals(self) -> List[Dict[str, Any]]:
         """Get recent trading signals"""
         try:
-            cursor = self.db.conn.execute("""
+            rows = await self.reader.fetchall("""
                 SELECT 
                     symbol,
                     analysis_date,
@@ -209,7 +214,7 @@ class WebDashboard:
             """)
             
             signals = []
-            for row in cursor.fetchall():
+            for row in rows:
                 signals.append({
                     "symbol": row[0],
                     "date": row[1],
@@ -231,10 +236,11 @@ dashboard = WebDashboard()
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
-    asyncio.create_task(update_broadcaster())
+    broadcaster = asyncio.create_task(update_broadcaster())
     yield
     # Shutdown
-    pass
+    broadcaster.cancel()
+    dashboard.reader.close()
 
 app = FastAPI(
     title="Khazad-dûm Trading Dashboard",
@@ -294,11 +300,18 @@ async def update_broadcaster():
     """Background task to broadcast updates to connected clients"""
     while True:
         try:
-            # Collect all data
-            health_data = await health_check_endpoint()
-            trading_summary = await dashboard.get_trading_summary()
-            positions = await dashboard.get_active_positions()
-            signals = await dashboard.get_recent_signals()
+            # Nobody listening - skip the queries
+            if not dashboard.active_connections:
+                await asyncio.sleep(DASHBOARD_UPDATE_INTERVAL)
+                continue
+            
+            # Collect all data concurrently
+            health_data, trading_summary, positions, signals = await asyncio.gather(
+                health_check_endpoint(),
+                dashboard.get_trading_summary(),
+                dashboard.get_active_positions(),
+                dashboard.get_recent_signals()
+            )
             
             # Create update payload
             update_data = {
@@ -318,8 +331,7 @@ async def update_broadcaster():
         except Exception as e:
             print(f"Update broadcaster error: {e}")
         
-        # Update every 30 seconds
-        await asyncio.sleep(30)
+        await asyncio.sleep(DASHBOARD_UPDATE_INTERVAL)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,90 @@
+"""
+Unit tests for PerformanceObserver - buffered (write-behind) stage recording
+"""
+
+import sqlite3
+
+import pytest
+
+from src.core.portfolio_management.performance_observer import PerformanceObserver
+
+DECISIONS = [
+    ('batch_1', 'AAPL', 'filter', {'passed': True, 'score': 81.5, 'layer': 'final', 'rsi_2': 4.2, 'volume_ratio': 1.8}),
+    ('batch_1', 'MSFT', 'filter', {'passed': True, 'score': 74.0, 'layer': 'final', 'rsi_2': 8.1, 'volume_ratio': 1.3}),
+    ('batch_1', 'AAPL', 'tradingagents', {'decision': 'BUY', 'conviction': 88}),
+    ('batch_1', 'MSFT', 'tradingagents', {'decision': 'HOLD', 'conviction': 55}),
+    ('batch_1', 'TSLA', 'tradingagents', {'decision': 'BUY', 'conviction': 70}),  # Never filtered - no row
+    ('batch_1', 'AAPL', 'portfolio_constructor', {'selected': True}),
+    ('batch_1', 'MSFT', 'portfolio_constructor', {'selected': False}),
+    ('batch_1', 'AAPL', 'execution', {'entry_price': 190.5, 'regime': 'fear'}),
+    ('batch_1', 'AAPL', 'execution', {'entry_price': 191.0, 'regime': 'fear'}),
+]
+
+COLUMNS = """symbol, batch_id, passed_filter, filter_score, filter_layer, analyzed_by_tradingagents,
+             tradingagents_decision, tradingagents_conviction, selected_by_portfolio_constructor,
+             executed, entry_price, regime_at_entry"""
+
+
+def observations(conn):
+    return conn.execute(f"SELECT {COLUMNS} FROM observations ORDER BY symbol").fetchall()
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:")
+    yield conn
+    conn.close()
+
+
+class TestBufferedObserver:
+    """Test that buffered recording writes the same rows as direct recording"""
+
+    def test_flush_matches_unbuffered(self, conn):
+        direct_conn = sqlite3.connect(":memory:")
+        direct = PerformanceObserver(direct_conn)
+        buffered = PerformanceObserver(conn, buffered=True)
+
+        for decision in DECISIONS:
+            direct.record_pipeline_decision(*decision)
+            buffered.record_pipeline_decision(*decision)
+
+        assert observations(conn) == []
+        assert buffered.flush() == len(DECISIONS)
+        assert observations(conn) == observations(direct_conn)
+        assert len(observations(conn)) == 2
+        direct_conn.close()
+
+    def test_flush_when_buffer_fills(self, conn):
+        observer = PerformanceObserver(conn, buffered=True, buffer_size=2)
+
+        observer.record_pipeline_decision(*DECISIONS[0])
+        assert observations(conn) == []
+
+        observer.record_pipeline_decision(*DECISIONS[1])
+        assert len(observations(conn)) == 2
+        assert observer.flush() == 0
+
+    def test_close_flushes_and_keeps_existing_rows(self, conn):
+        observer = PerformanceObserver(conn, buffered=True)
+        observer.record_pipeline_decision(*DECISIONS[0])
+        observer.close()
+
+        # A second filter decision on the same day leaves the first row alone
+        observer.record_pipeline_decision('batch_2', 'AAPL', 'filter', {'passed': False, 'score': 10})
+        observer.close()
+
+        rows = observations(conn)
+        assert len(rows) == 1
+        assert rows[0][1] == 'batch_1' and rows[0][3] == 81.5
+
+    def test_failed_flush_keeps_decisions_buffered(self, conn):
+        observer = PerformanceObserver(conn, buffered=True)
+        observer.record_pipeline_decision(*DECISIONS[0])
+        observer.record_pipeline_decision(*DECISIONS[2])
+
+        conn.execute("DROP TABLE observations")
+        assert observer.flush() == 0
+
+        observer.create_observation_tables()
+        assert observer.flush() == 2
+        assert observations(conn)[0][6] == 'BUY'
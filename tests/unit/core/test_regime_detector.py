@@ -0,0 +1,128 @@
+"""
+Unit tests for RegimeDetector - regime, F&G and VIX through the shared cache
+"""
+
+import time
+
+import pytest
+
+from src.core.market_analysis.regime_detector import RegimeDetector
+from src.data_pipeline.storage.shared_cache import SharedCache, SQLiteCacheBackend
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = SharedCache(SQLiteCacheBackend(tmp_path / "shared_cache.db"))
+    yield cache
+    cache.close()
+
+
+def counting_detector(cache, calls):
+    """Detector whose network fetches are replaced by counters"""
+    detector = RegimeDetector(cache=cache)
+
+    def fetch_fear_greed():
+        calls.append('fear_greed')
+        return {'value': 30, 'text': 'Fear'}
+
+    def fetch_vix():
+        calls.append('vix')
+        return 24.0
+
+    detector._fetch_fear_greed = fetch_fear_greed
+    detector._fetch_vix = fetch_vix
+    return detector
+
+
+class TestRegimeDetectorCache:
+    """Test that every detector shares one regime and one set of fetches"""
+
+    def test_detectors_share_one_regime(self, cache):
+        calls = []
+        first = counting_detector(cache, calls).get_current_regime()
+        second = counting_detector(cache, calls).get_current_regime()
+
+        assert first == second
+        assert first['regime'] == 'fear' and first['vix'] == 24.0
+        assert sorted(calls) == ['fear_greed', 'vix']
+
+    def test_force_refresh_and_clear(self, cache):
+        calls = []
+        detector = counting_detector(cache, calls)
+        detector.get_current_regime()
+
+        detector.get_current_regime(force_refresh=True)
+        assert sorted(calls) == ['fear_greed'] * 2 + ['vix'] * 2
+
+        detector.clear_cache()
+        detector.get_current_regime()
+        assert sorted(calls) == ['fear_greed'] * 3 + ['vix'] * 3
+
+    def test_fear_greed_outage_falls_back_to_vix(self, cache):
+        calls = []
+        detector = counting_detector(cache, calls)
+
+        def cnn_down():
+            raise ConnectionError("CNN down")
+
+        detector._fetch_fear_greed = cnn_down
+        regime = detector.get_current_regime()
+
+        assert regime['fear_greed_value'] == 35  # VIX 24 maps to Fear
+        assert cache.backend.get('fear_greed') is None
+        assert calls == ['vix']  # The fallback reuses the VIX already fetched
+
+    def test_expired_fear_greed_not_reused_when_cnn_down(self, cache):
+        calls = []
+        detector = counting_detector(cache, calls)
+        detector.get_current_regime()  # Caches F&G 30
+        cache.backend.conn.execute(
+            "UPDATE cache_entries SET stored_at = stored_at - ?", (detector.stale_duration + 3600,)
+        )
+
+        def cnn_down():
+            raise ConnectionError("CNN down")
+
+        detector._fetch_fear_greed = cnn_down
+        regime = detector.get_current_regime()
+
+        assert regime['fear_greed_value'] == 35  # VIX 24 estimate, not the expired 30
+        assert regime['fear_greed_text'] == 'Fear'
+
+    def test_sources_fetched_concurrently(self, cache):
+        detector = RegimeDetector(cache=cache)
+
+        def slow(value):
+            def fetch():
+                time.sleep(0.3)
+                return value
+            return fetch
+
+        detector._fetch_fear_greed = slow({'value': 60, 'text': 'Greed'})
+        detector._fetch_vix = slow(14.0)
+
+        start = time.perf_counter()
+        regime = detector.get_current_regime()
+        elapsed = time.perf_counter() - start
+
+        assert regime['regime'] == 'greed' and regime['volatility_regime'] == 'low'
+        assert elapsed < 0.55
+
+    def test_stale_regime_rebuilt_from_fresh_sources(self, cache):
+        fear_greed = {'value': 30, 'text': 'Fear'}
+        detector = RegimeDetector(cache=cache)
+        detector._fetch_fear_greed = lambda: dict(fear_greed)
+        detector._fetch_vix = lambda: 24.0
+        detector.cache_duration = 0.2
+
+        assert detector.get_current_regime()['fear_greed_value'] == 30
+        time.sleep(0.25)
+        fear_greed.update(value=80, text='Extreme Greed')
+
+        # Stale regime is served while it is rebuilt in the background...
+        assert detector.get_current_regime()['fear_greed_value'] == 30
+        cache.wait()
+
+        # ...from a new F&G reading, not the equally stale cached one
+        regime = detector.get_current_regime()
+        assert regime['fear_greed_value'] == 80 and regime['regime'] == 'extreme_greed'
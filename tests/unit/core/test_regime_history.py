@@ -0,0 +1,153 @@
+"""
+Unit tests for regime history backfill and vectorized regime classification
+"""
+
+import importlib.util
+import json
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from src.core.market_analysis.regime_detector import RegimeDetector, classify_regimes, vix_to_fear_greed
+from src.core.market_analysis.regime_history import (
+    backfill_regime_history, build_regime_history, load_fear_greed_history, load_vix_history
+)
+from src.data_pipeline.storage.database_manager import DatabaseManager
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = DatabaseManager(str(tmp_path / "regimes.db"))
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def history_files(tmp_path):
+    """CNN graphdata JSON for three days, CBOE-style VIX CSV with a gap"""
+    days = pd.to_datetime(['2024-03-04', '2024-03-05', '2024-03-06'])
+    fear_greed = {'fear_and_greed_historical': {'data': [
+        {'x': int(day.timestamp() * 1000) + 15 * 3600 * 1000, 'y': value}
+        for day, value in zip(days, [18.4, 52.0, 81.7])
+    ]}}
+    fg_path = tmp_path / "fear_greed.json"
+    fg_path.write_text(json.dumps(fear_greed))
+
+    vix_path = tmp_path / "VIX_History.csv"
+    vix_path.write_text("DATE,OPEN,HIGH,LOW,CLOSE\n"
+                        "03/01/2024,13.0,14.0,12.5,13.11\n"
+                        "03/04/2024,13.5,15.0,13.0,33.20\n"
+                        "03/07/2024,14.0,15.0,13.0,17.50\n")
+    return fg_path, vix_path
+
+
+class TestClassifyRegimes:
+    """Test that the vectorized classifier matches the live detector"""
+
+    @pytest.mark.parametrize("fear_greed, vix, regime, strategy, win_rate, volatility", [
+        (10, 20.0, 'extreme_fear', 'mean_reversion', 0.80, 'normal'),
+        (25, 14.9, 'fear', 'mean_reversion', 0.70, 'low'),
+        (50, 15.0, 'neutral', 'mixed', 0.60, 'normal'),
+        (60, 30.0, 'greed', 'momentum', 0.62, 'normal'),
+        (60, 31.0, 'greed', 'mean_reversion', 0.80, 'high'),  # VIX > 30 override
+        (80, 12.0, 'extreme_greed', 'momentum', 0.55, 'low'),
+        (100, 20.0, 'neutral', 'mixed', 0.60, 'normal'),  # Outside every band
+    ])
+    def test_classification(self, fear_greed, vix, regime, strategy, win_rate, volatility):
+        row = classify_regimes([fear_greed], [vix]).iloc[0]
+
+        assert row['regime'] == regime
+        assert row['strategy'] == strategy
+        assert row['expected_win_rate'] == win_rate
+        assert row['volatility_regime'] == volatility
+
+    def test_detector_uses_classifier(self):
+        detector = RegimeDetector(cache=object())
+
+        regime = detector._interpret_regime(30.0, 31.0)
+
+        assert regime == {
+            'regime': 'fear', 'position_multiplier': 1.2, 'filter_percentile': 93,
+            'expected_win_rate': 0.80, 'strategy': 'mean_reversion', 'volatility_regime': 'high',
+        }
+        assert json.loads(json.dumps(regime)) == regime  # Plain types, cacheable
+        assert detector._vix_fallback_regime(22.0) == {'value': 35, 'text': 'Fear'}
+
+    def test_vix_to_fear_greed(self):
+        assert list(vix_to_fear_greed([12.0, 17.0, 25.0, 40.0])) == [65, 50, 35, 15]
+
+
+class TestRegimeHistory:
+    """Test loading, backfilling and as-of lookups"""
+
+    def test_build_joins_vix_as_of(self, history_files):
+        fg_path, vix_path = history_files
+        history = build_regime_history(load_fear_greed_history(fg_path), load_vix_history(vix_path))
+
+        assert list(history['timestamp']) == list(pd.to_datetime(['2024-03-04', '2024-03-05', '2024-03-06']))
+        assert list(history['fear_greed_value']) == [18, 52, 82]
+        assert list(history['vix']) == [33.2, 33.2, 33.2]  # Last close carried forward
+        assert list(history['regime']) == ['extreme_fear', 'neutral', 'extreme_greed']
+        assert (history['strategy'] == 'mean_reversion').all()  # VIX > 30 override
+
+        filled = build_regime_history(load_fear_greed_history(fg_path), load_vix_history(vix_path),
+                                      fill_from_vix=True)
+        assert len(filled) == 5
+        assert filled.iloc[0]['fear_greed_value'] == 65  # 2024-03-01 estimated from VIX 13.11
+
+    def test_backfill_and_lookup(self, db, history_files):
+        fg_path, vix_path = history_files
+        assert backfill_regime_history(db, fg_path, vix_path, fill_from_vix=True) == 5
+        assert backfill_regime_history(db, fg_path, vix_path, fill_from_vix=True) == 5  # Idempotent
+        assert db.conn.execute("SELECT COUNT(*) FROM regime_history").fetchone()[0] == 5
+
+        # An intraday live row on 03-06 supersedes the backfilled day
+        db.log_regime({'regime': 'greed', 'fear_greed_value': 70})
+        db.conn.execute("UPDATE regime_history SET timestamp = ? "
+                        "WHERE rowid = (SELECT MAX(rowid) FROM regime_history)",
+                        (datetime(2024, 3, 6, 14, 30, 5, 123456),))
+
+        regimes = db.get_regime_for_dates(['2024-03-10', '2024-02-28', '2024-03-06', '2024-03-04'])
+
+        assert list(regimes.index) == list(pd.to_datetime(['2024-03-10', '2024-02-28', '2024-03-06', '2024-03-04']))
+        assert regimes['regime'].iloc[0] == 'neutral'  # 03-07 backfill: VIX 17.5 -> F&G 50
+        assert pd.isna(regimes['regime'].iloc[1])
+        assert regimes['regime'].iloc[2] == 'greed'
+        assert regimes['regime'].iloc[3] == 'extreme_fear'
+
+
+class TestBackfillScript:
+    """Smoke test for scripts/backfill_regime_history.py"""
+
+    @pytest.fixture
+    def script(self):
+        pytest.importorskip("psycopg2")  # get_database_manager lives in postgres_manager
+        path = Path(__file__).resolve().parents[3] / "scripts" / "backfill_regime_history.py"
+        spec = importlib.util.spec_from_file_location("backfill_regime_history", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+
+    def test_help(self, script, capsys):
+        with pytest.raises(SystemExit) as exit_info:
+            script.main(['--help'])
+
+        assert exit_info.value.code == 0
+        assert '--fear-greed' in capsys.readouterr().out
+
+    def test_dry_run_writes_nothing(self, script, history_files, monkeypatch):
+        fg_path, vix_path = history_files
+        monkeypatch.setattr(script, 'get_database_manager', lambda: pytest.fail("dry run opened a database"))
+
+        script.main(['--fear-greed', str(fg_path), '--vix', str(vix_path), '--dry-run'])
+
+    def test_backfill_uses_database_manager(self, script, db, history_files, monkeypatch):
+        fg_path, vix_path = history_files
+        monkeypatch.setattr(script, 'get_database_manager', lambda: db)
+        monkeypatch.setattr(db, 'close', lambda: None)  # Fixture closes it
+
+        script.main(['--fear-greed', str(fg_path), '--vix', str(vix_path), '--vix-fallback'])
+
+        assert db.conn.execute("SELECT COUNT(*) FROM regime_history").fetchone()[0] == 5
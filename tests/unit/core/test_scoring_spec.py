@@ -0,0 +1,90 @@
+"""
+Unit tests for scoring spec compilation and StockFilter variant scoring
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from config.settings.base_config import SCORING_SPECS
+from src.core.stock_screening.scoring_spec import compile_scoring_spec
+from src.core.stock_screening.stock_filter import StockFilter, score_column
+
+
+@pytest.fixture
+def metrics():
+    return pd.DataFrame({
+        'price': [10.0, 20.0, 30.0, 40.0],
+        'sma_20': [12.0, 18.0, 30.0, 35.0],
+        'rsi_2': [5.0, 40.0, 50.0, 95.0],
+        'volume_ratio': [0.5, 1.5, 2.5, 4.0],
+        'quality_score': [0.2, 0.4, 0.6, 0.8],
+    })
+
+
+class TestCompileScoringSpec:
+    """Test factor normalizations and compile-time validation"""
+
+    def test_normalizations(self, metrics):
+        rising = compile_scoring_spec({'factors': [
+            {'column': 'volume_ratio', 'weight': 1.0, 'clip': (0, 2), 'normalize': 'rising'}]})
+        falling = compile_scoring_spec({'factors': [
+            {'column': 'rsi_2', 'weight': 2.0, 'clip': (0, 30), 'normalize': 'falling'}]})
+        peak = compile_scoring_spec({'factors': [
+            {'column': 'rsi_2', 'weight': 1.0, 'normalize': 'peak', 'range': (0, 100)}]})
+
+        np.testing.assert_allclose(rising.evaluate(metrics), [0.25, 0.75, 1.0, 1.0])
+        np.testing.assert_allclose(falling.evaluate(metrics), [2 * 25 / 30, 0.0, 0.0, 0.0])
+        np.testing.assert_allclose(peak.evaluate(metrics), [0.1, 0.8, 1.0, 0.1])
+
+    def test_blend_applies_only_when_columns_exist(self, metrics):
+        momentum = compile_scoring_spec(SCORING_SPECS['momentum'])
+        without_ma = momentum.evaluate(metrics.drop(columns='sma_20'))
+        with_ma = momentum.evaluate(metrics)
+
+        above = (metrics['price'] > metrics['sma_20']).astype(float).to_numpy()
+        np.testing.assert_allclose(with_ma, without_ma * 0.8 + above * 0.2)
+
+    def test_compiled_once_per_spec(self):
+        spec = {'factors': [{'column': 'quality_score', 'weight': 1.0}]}
+        assert compile_scoring_spec(spec) is compile_scoring_spec(dict(spec))
+
+        stock_filter = StockFilter(None)
+        assert stock_filter.scorers['fear'] is stock_filter.scorers['extreme_fear']
+
+    @pytest.mark.parametrize('spec', [
+        {'factors': []},
+        {'factors': [{'column': 'rsi_2'}]},
+        {'factors': [{'column': 'rsi_2', 'weight': 1, 'normalize': 'rising'}]},
+        {'factors': [{'column': 'rsi_2', 'weight': 1, 'clip': (30, 0)}]},
+        {'factors': [{'column': 'rsi_2', 'weight': 1, 'clip': (0, 30), 'normalize': 'log'}]},
+        {'factors': [{'column': 'rsi_2', 'weight': 1, 'scale': 2}]},
+    ])
+    def test_invalid_specs_rejected(self, spec):
+        with pytest.raises(ValueError):
+            compile_scoring_spec(spec)
+
+
+class TestScoreVariants:
+    """Test A/B scoring of one snapshot"""
+
+    def test_variants_side_by_side(self, metrics):
+        stock_filter = StockFilter(None)
+        quality_only = {'factors': [{'column': 'quality_score', 'weight': 1.0}]}
+
+        variants = stock_filter.score_variants(metrics, {
+            'baseline': SCORING_SPECS['mean_reversion'],
+            'quality_only': quality_only,
+        })
+
+        assert list(variants.columns) == ['baseline', 'quality_only']
+        np.testing.assert_allclose(variants['quality_only'], metrics['quality_score'])
+        np.testing.assert_allclose(variants['baseline'],
+                                   stock_filter.score_all_regimes(metrics)[score_column('fear')])
+
+    def test_custom_specs_drive_regime_scoring(self, metrics):
+        quality_only = {'factors': [{'column': 'quality_score', 'weight': 1.0}]}
+        specs = dict(SCORING_SPECS, momentum=quality_only)
+
+        scored = StockFilter(None, scoring_specs=specs).apply_regime_scoring(metrics, {'regime': 'greed'})
+        assert list(scored['quality_score']) == [0.8, 0.6, 0.4, 0.2]
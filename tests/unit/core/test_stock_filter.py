@@ -0,0 +1,91 @@
+"""
+Unit tests for StockFilter - vectorized regime scoring and candidate selection
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from config.settings.base_config import FILTER_PERCENTILES
+from src.core.stock_screening.stock_filter import StockFilter, REGIMES, score_column
+
+
+@pytest.fixture
+def universe():
+    rng = np.random.default_rng(7)
+    n = 400
+    price = rng.uniform(10, 200, n)
+    return pd.DataFrame({
+        'symbol': [f"SYM{i:04d}" for i in range(n)],
+        'price': price,
+        'sma_20': price * rng.uniform(0.9, 1.1, n),
+        'rsi_2': rng.uniform(0, 100, n),
+        'volume_ratio': rng.uniform(0, 4, n),
+        'quality_score': rng.uniform(0, 1, n),
+        'dollar_volume': rng.uniform(1e6, 1e9, n),
+    })
+
+
+def reference_score(df, regime_name):
+    """Per-regime formulas as the filter documented them"""
+    rsi, quality, volume = df['rsi_2'], df['quality_score'], df['volume_ratio']
+    if regime_name in ['extreme_fear', 'fear']:
+        return 0.5 * (30 - rsi.clip(0, 30)) / 30 + 0.3 * quality + 0.2 * volume.clip(0, 3) / 3
+    if regime_name in ['greed', 'extreme_greed']:
+        score = 0.4 * (rsi.clip(50, 100) - 50) / 50 + 0.3 * volume.clip(0, 2) / 2 + 0.3 * quality
+        return score * 0.8 + (df['price'] > df['sma_20']).astype(float) * 0.2
+    return 0.33 * quality + 0.33 * volume.clip(0, 2) / 2 + 0.34 * (50 - abs(rsi - 50)) / 50
+
+
+class TestRegimeScoring:
+    """Test that one pass scores every regime"""
+
+    def test_all_regime_columns_match_formulas(self, universe):
+        scored = StockFilter(None).score_all_regimes(universe)
+
+        for name in REGIMES:
+            np.testing.assert_allclose(scored[score_column(name)], reference_score(universe, name))
+        assert 'score' not in universe.columns  # Input frame untouched
+
+    def test_active_score_sorted(self, universe):
+        scored = StockFilter(None).apply_regime_scoring(universe, {'regime': 'greed'})
+
+        assert scored['score'].is_monotonic_decreasing
+        np.testing.assert_allclose(scored['score'], scored[score_column('greed')])
+
+
+class TestCandidateSelection:
+    """Test mask-based selection and the what-if API"""
+
+    def test_selection_reasons(self, universe):
+        stock_filter = StockFilter(None)
+        scored = stock_filter.apply_regime_scoring(universe, {'regime': 'fear'})
+        final = stock_filter.select_candidates(scored, {'regime': 'fear'}, max_stocks=30)
+
+        threshold = np.percentile(scored['score'], FILTER_PERCENTILES['fear'])
+        top = final['selection_reason'] == 'top_score'
+
+        assert len(final) == 30 and final['selected'].all()
+        assert (final.loc[top, 'score'] >= threshold).all()
+        assert (final.loc[~top, 'score'] < threshold).all()
+        assert top.sum() == (scored['score'] >= threshold).sum()
+        assert final['score'].is_monotonic_decreasing
+
+    def test_candidates_for_regime(self, universe):
+        stock_filter = StockFilter(None)
+        scored = stock_filter.apply_regime_scoring(universe, {'regime': 'fear'})
+
+        picks = stock_filter.candidates_for_regime(scored, 'extreme_greed')
+        expected = reference_score(universe, 'extreme_greed')
+        threshold = np.percentile(expected, FILTER_PERCENTILES['extreme_greed'])
+
+        assert set(picks['symbol']) == set(universe.loc[expected >= threshold, 'symbol'])
+        assert (picks['selection_reason'] == 'top_score').all()
+
+        # Raw Layer 1 frames are scored on demand and give the same answer
+        raw_picks = stock_filter.candidates_for_regime(universe, 'extreme_greed')
+        assert list(raw_picks['symbol']) == list(picks['symbol'])
+
+    def test_empty_frame(self):
+        empty = pd.DataFrame(columns=['symbol', 'price', 'rsi_2', 'volume_ratio', 'quality_score'])
+        assert StockFilter(None).candidates_for_regime(empty, 'fear').empty
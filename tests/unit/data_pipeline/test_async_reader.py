@@ -0,0 +1,96 @@
+"""
+Unit tests for AsyncDatabaseReader - awaitable read-only queries for the dashboard
+"""
+
+import asyncio
+import sqlite3
+import threading
+
+import pandas as pd
+import pytest
+
+from src.data_pipeline.storage.async_reader import AsyncDatabaseReader
+from src.data_pipeline.storage.database_manager import DatabaseManager
+
+# Recursive count that keeps a reader busy for a noticeable moment
+SLOW_QUERY = """
+WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n WHERE x < 300000)
+SELECT COUNT(*) FROM n
+"""
+
+
+@pytest.fixture
+def db_manager(tmp_path):
+    db = DatabaseManager(str(tmp_path / "dashboard.db"))
+    db.log_regime({'regime': 'fear', 'fear_greed_value': 30, 'vix': 22.5})
+    yield db
+    db.close()
+
+
+class TestAsyncDatabaseReader:
+    """Test that queries run on pool threads with their own connections"""
+
+    def test_queries_return_rows(self, db_manager):
+        reader = AsyncDatabaseReader(db_manager, max_workers=2)
+
+        async def main():
+            row = await reader.fetchone("SELECT regime, fear_greed_value FROM regime_history")
+            rows = await reader.fetchall("SELECT regime FROM regime_history")
+            df = await reader.read_sql("SELECT * FROM regime_history WHERE regime = ?", ('fear',))
+            return row, rows, df
+
+        row, rows, df = asyncio.run(main())
+        reader.close()
+
+        assert row['regime'] == 'fear' and row[1] == 30
+        assert len(rows) == 1
+        assert isinstance(df, pd.DataFrame) and len(df) == 1
+
+    def test_event_loop_not_blocked(self, db_manager):
+        """The loop keeps ticking while a slow query runs on the pool"""
+        reader = AsyncDatabaseReader(db_manager, max_workers=2)
+        ticks = 0
+
+        async def ticker(done: asyncio.Event):
+            nonlocal ticks
+            while not done.is_set():
+                ticks += 1
+                await asyncio.sleep(0)
+
+        async def main():
+            done = asyncio.Event()
+            tick_task = asyncio.create_task(ticker(done))
+            row = await reader.fetchone(SLOW_QUERY)
+            done.set()
+            await tick_task
+            return row
+
+        row = asyncio.run(main())
+        reader.close()
+
+        assert row[0] == 300000
+        assert ticks > 1
+
+    def test_pool_threads_use_separate_read_only_connections(self, db_manager):
+        reader = AsyncDatabaseReader(db_manager, max_workers=2)
+        barrier = threading.Barrier(2, timeout=5)
+
+        def connection_and_thread(conn):
+            barrier.wait()  # Both calls are in flight at once, on different threads
+            return id(conn), threading.current_thread().name
+
+        async def main():
+            return await asyncio.gather(reader.run(connection_and_thread),
+                                        reader.run(connection_and_thread))
+
+        (conn_a, thread_a), (conn_b, thread_b) = asyncio.run(main())
+
+        assert thread_a != thread_b and thread_a.startswith("db-reader")
+        assert conn_a != conn_b
+
+        async def write():
+            return await reader.fetchall("DELETE FROM regime_history")
+
+        with pytest.raises(sqlite3.OperationalError):
+            asyncio.run(write())
+        reader.close()
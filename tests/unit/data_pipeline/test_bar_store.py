@@ -0,0 +1,108 @@
+"""
+Unit tests for BarStore - local daily OHLCV history used by the fetcher
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from src.data_pipeline.market_data.bar_store import BarStore
+from src.data_pipeline.market_data.stock_data_fetcher import StockDataFetcher
+
+
+def make_download(tickers, start, days, base=100.0):
+    """Build a frame shaped like a multi-ticker yf.download result"""
+    dates = pd.bdate_range(start=start, periods=days)
+    frames = {}
+    for i, ticker in enumerate(tickers):
+        close = base + i + np.arange(days, dtype=float)
+        frames[ticker] = pd.DataFrame({
+            'Close': close,
+            'High': close + 1,
+            'Low': close - 1,
+            'Open': close,
+            'Volume': np.full(days, 1_000_000.0),
+        }, index=dates)
+    data = pd.concat(frames, axis=1).swaplevel(0, 1, axis=1).sort_index(axis=1)
+    data.index.name = 'Date'
+    return data
+
+
+@pytest.fixture
+def bar_store(tmp_path):
+    store = BarStore(tmp_path / "bars.db")
+    yield store
+    store.close()
+
+
+class TestBarStore:
+    """Test storage and retrieval of daily bars"""
+
+    def test_round_trip(self, bar_store):
+        data = make_download(['AAPL', 'MSFT'], '2024-01-01', 30)
+
+        written = bar_store.upsert_bars(data, ['AAPL', 'MSFT'])
+        assert written == 60
+
+        history = bar_store.load_history(['AAPL', 'MSFT'], datetime(2024, 1, 1))
+        assert isinstance(history.columns, pd.MultiIndex)
+        assert len(history) == 30
+        pd.testing.assert_series_equal(
+            history[('Close', 'AAPL')], data[('Close', 'AAPL')],
+            check_names=False, check_freq=False
+        )
+
+    def test_last_dates_and_upsert_is_idempotent(self, bar_store):
+        data = make_download(['AAPL'], '2024-01-01', 10)
+        bar_store.upsert_bars(data, ['AAPL'])
+        bar_store.upsert_bars(data, ['AAPL'])
+
+        last_dates = bar_store.get_last_dates(['AAPL', 'MSFT'])
+        assert last_dates == {'AAPL': data.index[-1].date()}
+        assert bar_store.conn.execute("SELECT COUNT(*) FROM daily_bars").fetchone()[0] == 10
+
+    def test_find_restated_ignores_last_partial_bar(self, bar_store):
+        data = make_download(['AAPL', 'MSFT'], '2024-01-01', 10)
+        bar_store.upsert_bars(data, ['AAPL', 'MSFT'])
+        last = data.index[-1].date()
+
+        # Partial last bar changed: not a restatement
+        refreshed = data.copy()
+        refreshed.loc[refreshed.index[-1], ('Close', 'AAPL')] += 5
+        assert bar_store.find_restated(refreshed, ['AAPL', 'MSFT'], {'AAPL': last, 'MSFT': last}) == []
+
+        # Whole history halved (2:1 split adjustment): restated
+        split = data.copy()
+        split[('Close', 'MSFT')] = split[('Close', 'MSFT')] / 2
+        assert bar_store.find_restated(split, ['AAPL', 'MSFT'], {'AAPL': last, 'MSFT': last}) == ['MSFT']
+
+    def test_prune_old_bars(self, bar_store):
+        old_start = datetime.now() - timedelta(days=800)
+        bar_store.upsert_bars(make_download(['AAPL'], old_start, 5), ['AAPL'])
+        bar_store.upsert_bars(make_download(['AAPL'], datetime.now() - timedelta(days=10), 5), ['AAPL'])
+
+        assert bar_store.prune(keep_days=400) == 5
+        assert bar_store.conn.execute("SELECT COUNT(*) FROM daily_bars").fetchone()[0] == 5
+
+
+class TestIncrementalFetch:
+    """Test that the fetcher only downloads what the bar store is missing"""
+
+    def test_second_run_fetches_from_last_stored_date(self, bar_store):
+        fetcher = StockDataFetcher(bar_store=bar_store)
+        tickers = ['AAPL', 'MSFT']
+        end = datetime.now()
+        start = end - timedelta(days=60)
+        full = make_download(tickers, start, 40)
+
+        with patch('src.data_pipeline.market_data.download_scheduler.yf.download', return_value=full) as dl:
+            assert fetcher.sync_bar_store(tickers, start, end) == []
+            first_start = dl.call_args.kwargs['start']
+
+            fetcher.sync_bar_store(tickers, start, end)
+            second_start = dl.call_args.kwargs['start']
+
+        assert first_start == start.date()
+        assert second_start == full.index[-1].date() - timedelta(days=5)
@@ -0,0 +1,146 @@
+"""
+Unit tests for DownloadScheduler - concurrent, rate-limited batch downloads
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+from src.data_pipeline.market_data.download_scheduler import DownloadScheduler, TokenBucket
+
+
+def fake_frame(tickers):
+    """Small frame in the yfinance (field, symbol) layout"""
+    dates = pd.bdate_range('2024-01-01', periods=3)
+    columns = pd.MultiIndex.from_product([['Close', 'Volume'], tickers])
+    return pd.DataFrame(np.ones((3, len(columns))), index=dates, columns=columns)
+
+
+def fast_bucket():
+    return TokenBucket(rate=1000, capacity=10, cooldown=0)
+
+
+class FakeProvider:
+    """Records calls; raises for batches containing BAD, drops EMPTY from results"""
+
+    def __init__(self, throttle_first=0):
+        self.calls = []
+        self.throttle_first = throttle_first
+        self.lock = threading.Lock()
+
+    def __call__(self, batch, start, end):
+        with self.lock:
+            self.calls.append(list(batch))
+            if self.throttle_first > 0:
+                self.throttle_first -= 1
+                raise Exception("429 Client Error: Too Many Requests")
+        if 'BAD' in batch:
+            raise ValueError("boom")
+        return fake_frame([t for t in batch if t != 'EMPTY'])
+
+
+def run(scheduler, tickers):
+    failed = []
+    got = []
+    for data, batch in scheduler.run(tickers, '2024-01-01', '2024-01-10', failed):
+        assert set(batch) <= set(data['Close'].columns)
+        got.extend(batch)
+    return got, failed
+
+
+class TestDownloadScheduler:
+    """Test batching, retry and throttling behaviour"""
+
+    def test_all_tickers_downloaded_in_batches(self):
+        provider = FakeProvider()
+        tickers = [f"T{i}" for i in range(23)]
+        scheduler = DownloadScheduler(provider, batch_size=5, max_workers=3, bucket=fast_bucket())
+
+        got, failed = run(scheduler, tickers)
+
+        assert sorted(got) == sorted(tickers)
+        assert failed == []
+        assert len(provider.calls) == 5
+
+    def test_bisect_isolates_failing_ticker(self):
+        provider = FakeProvider()
+        tickers = [f"T{i}" for i in range(7)] + ['BAD']
+        scheduler = DownloadScheduler(provider, batch_size=8, max_retries=2, bucket=fast_bucket())
+
+        got, failed = run(scheduler, tickers)
+
+        assert sorted(got) == sorted(tickers[:-1])
+        assert failed == ['BAD']
+        # 1 + 2 + 2 + 2 bisection calls, then 2 single-ticker retries for BAD
+        assert provider.calls.count(['BAD']) == 3
+
+    def test_missing_tickers_are_retried_alone(self):
+        provider = FakeProvider()
+        scheduler = DownloadScheduler(provider, batch_size=10, max_retries=1, bucket=fast_bucket())
+
+        got, failed = run(scheduler, ['A', 'EMPTY', 'B'])
+
+        assert sorted(got) == ['A', 'B']
+        assert failed == ['EMPTY']
+        assert provider.calls[1:] == [['EMPTY']]
+
+    def test_throttling_backs_off_and_retries_batch(self):
+        provider = FakeProvider(throttle_first=1)
+        bucket = fast_bucket()
+        scheduler = DownloadScheduler(provider, batch_size=10, bucket=bucket)
+
+        got, failed = run(scheduler, ['A', 'B'])
+
+        assert sorted(got) == ['A', 'B']
+        assert failed == []
+        assert provider.calls == [['A', 'B'], ['A', 'B']]
+        assert bucket.rate < 1000
+
+    def test_empty_batch_of_bad_symbols_does_not_throttle(self):
+        bucket = CountingBucket()
+        provider = lambda batch, start, end: fake_frame([t for t in batch if not t.startswith('DEAD')])
+        scheduler = DownloadScheduler(provider, batch_size=4, max_workers=1, max_retries=0, bucket=bucket)
+
+        got, failed = run(scheduler, ['A', 'B', 'C', 'D'] + [f"DEAD{i}" for i in range(4)])
+
+        assert sorted(got) == ['A', 'B', 'C', 'D']
+        assert len(failed) == 4
+        assert bucket.throttles == 0
+
+    def test_repeated_empty_batches_throttle(self):
+        bucket = CountingBucket()
+        provider = lambda batch, start, end: pd.DataFrame()
+        scheduler = DownloadScheduler(provider, batch_size=2, max_workers=1, max_retries=0, bucket=bucket)
+
+        run(scheduler, [f"T{i}" for i in range(6)])
+
+        assert bucket.throttles == 1
+
+
+class CountingBucket(TokenBucket):
+    """Fast bucket that counts throttle() calls"""
+
+    def __init__(self):
+        super().__init__(rate=1000, capacity=10, max_rate=1000, cooldown=0)
+        self.throttles = 0
+
+    def throttle(self):
+        self.throttles += 1
+        super().throttle()
+
+
+class TestTokenBucket:
+    """Test AIMD rate adaptation"""
+
+    def test_throttle_halves_and_recover_creeps_up(self):
+        bucket = TokenBucket(rate=2.0, capacity=1, min_rate=0.5, max_rate=2.0, cooldown=0)
+
+        bucket.throttle()
+        assert bucket.rate == 1.0
+        bucket.throttle()
+        bucket.throttle()
+        assert bucket.rate == 0.5
+
+        bucket.recover()
+        assert bucket.rate == 0.6
@@ -0,0 +1,115 @@
+"""
+Unit tests for IndicatorEngine - vectorized screening indicators
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_pipeline.market_data.indicator_engine import IndicatorEngine
+
+
+def reference_metrics(ticker_data: pd.DataFrame, ticker: str) -> dict:
+    """Per-ticker pandas implementation the engine replaced"""
+    ticker_data = ticker_data.dropna(subset=['Close'])
+    latest = ticker_data.iloc[-1]
+    close = ticker_data['Close']
+
+    delta = close.diff()
+    gain = delta.where(delta > 0, 0).rolling(2).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(2).mean()
+    rsi = 100.0 if loss.iloc[-1] == 0 else float((100 - 100 / (1 + gain / loss)).iloc[-1])
+
+    tr = pd.concat([
+        ticker_data['High'] - ticker_data['Low'],
+        abs(ticker_data['High'] - close.shift()),
+        abs(ticker_data['Low'] - close.shift()),
+    ], axis=1).max(axis=1)
+
+    avg_volume = ticker_data['Volume'].rolling(20).mean().iloc[-1]
+    return {
+        'symbol': ticker,
+        'price': latest['Close'],
+        'volume': latest['Volume'],
+        'rsi_2': rsi,
+        'atr': tr.rolling(14).mean().iloc[-1],
+        'sma_20': close.rolling(20).mean().iloc[-1],
+        'sma_50': close.rolling(50).mean().iloc[-1] if len(ticker_data) >= 50 else np.nan,
+        'avg_volume_20': avg_volume,
+        'volume_ratio': latest['Volume'] / avg_volume,
+        'change_1d': (latest['Close'] - close.iloc[-2]) / close.iloc[-2] * 100,
+    }
+
+
+def make_bars(tickers, days=60, seed=7):
+    """Random-walk bars in the yfinance (field, symbol) layout"""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range('2024-01-01', periods=days)
+    frames = {}
+    for ticker in tickers:
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, days)))
+        frames[ticker] = pd.DataFrame({
+            'Close': close,
+            'High': close * (1 + rng.uniform(0, 0.02, days)),
+            'Low': close * (1 - rng.uniform(0, 0.02, days)),
+            'Open': close,
+            'Volume': rng.integers(1_000_000, 5_000_000, days).astype(float),
+        }, index=dates)
+    return pd.concat(frames, axis=1).swaplevel(0, 1, axis=1).sort_index(axis=1)
+
+
+class TestIndicatorEngine:
+    """Engine output must match the per-ticker calculation"""
+
+    def test_matches_per_ticker_calculation(self):
+        tickers = ['AAPL', 'MSFT', 'GAPPY', 'SHORT', 'YOUNG']
+        data = make_bars(tickers)
+        # Missing bars in the middle, a symbol with too little history,
+        # and one that only started trading 30 days ago
+        data.loc[data.index[[10, 11, 40]], ('Close', 'GAPPY')] = np.nan
+        data.loc[data.index[:45], ('Close', 'SHORT')] = np.nan
+        data.loc[data.index[:30], pd.IndexSlice[:, 'YOUNG']] = np.nan
+
+        result = IndicatorEngine().compute(data, tickers + ['MISSING']).set_index('symbol')
+
+        assert list(result.index) == ['AAPL', 'MSFT', 'GAPPY', 'YOUNG']
+        for ticker in result.index:
+            expected = reference_metrics(data.xs(ticker, level=1, axis=1), ticker)
+            for column, value in expected.items():
+                if column == 'symbol':
+                    continue
+                np.testing.assert_allclose(result.loc[ticker, column], value, rtol=1e-9, err_msg=f"{ticker}.{column}")
+
+    def test_quality_score_and_output_columns(self):
+        data = make_bars(['AAPL', 'MSFT'])
+        result = IndicatorEngine().compute(data, ['AAPL', 'MSFT'])
+
+        assert list(result.columns) == [
+            'symbol', 'price', 'volume', 'dollar_volume', 'rsi_2', 'atr',
+            'sma_20', 'sma_50', 'avg_volume_20', 'volume_ratio', 'change_1d',
+            'market_cap', 'quality_score'
+        ]
+        for _, row in result.iterrows():
+            expected = 0
+            if 0.5 < row['volume_ratio'] < 2.0:
+                expected += 0.33
+            if row['rsi_2'] > 30:
+                expected += 0.33
+            if row['price'] > row['sma_20']:
+                expected += 0.34
+            assert row['quality_score'] == pytest.approx(expected)
+
+    def test_single_ticker_flat_frame(self):
+        data = make_bars(['AAPL']).xs('AAPL', level=1, axis=1)
+        result = IndicatorEngine().compute(data, ['AAPL'])
+
+        assert list(result['symbol']) == ['AAPL']
+        assert result['sma_20'].iloc[0] == pytest.approx(data['Close'].tail(20).mean())
+
+    def test_flat_frame_not_copied_to_several_tickers(self):
+        data = make_bars(['AAPL']).xs('AAPL', level=1, axis=1)
+
+        assert IndicatorEngine().compute(data, ['AAPL', 'MSFT']).empty
+
+    def test_empty_input(self):
+        assert IndicatorEngine().compute(pd.DataFrame(), ['AAPL']).empty
@@ -0,0 +1,187 @@
+"""
+Unit tests for MetricsPipeline - streaming fetch/compute/insert data stage
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_pipeline.metrics_pipeline import MetricsPipeline
+from src.data_pipeline.market_data.bar_store import BarStore
+from src.data_pipeline.market_data.download_scheduler import DownloadScheduler, TokenBucket
+from src.data_pipeline.market_data.stock_data_fetcher import StockDataFetcher
+from src.data_pipeline.storage.database_manager import DatabaseManager
+from src.core.stock_screening.stock_filter import StockFilter
+
+
+def fake_download(batch, start, end):
+    """Deterministic bars for every requested ticker"""
+    dates = pd.bdate_range(end=pd.Timestamp(end).normalize(), periods=40)
+    frames = {}
+    for i, ticker in enumerate(batch):
+        close = 50.0 + i + np.sin(np.arange(len(dates)))
+        frames[ticker] = pd.DataFrame({
+            'Close': close, 'High': close + 1, 'Low': close - 1, 'Open': close,
+            'Volume': np.full(len(dates), 2_000_000.0),
+        }, index=dates)
+    return pd.concat(frames, axis=1).swaplevel(0, 1, axis=1).sort_index(axis=1)
+
+
+def thin_download(requests):
+    """fake_download where PENNY trades too little to pass the hard constraints"""
+    def download(batch, start, end):
+        requests.append((list(batch), pd.Timestamp(end) - pd.Timestamp(start)))
+        data = fake_download(batch, start, end)
+        if 'PENNY' in batch:
+            data[('Volume', 'PENNY')] = 100.0
+        return data
+    return download
+
+
+@pytest.fixture
+def db_manager(tmp_path):
+    db = DatabaseManager(str(tmp_path / "pipeline.db"))
+    yield db
+    db.close()
+
+
+class TestMetricsPipeline:
+    """Test batch-by-batch streaming into the database"""
+
+    def test_batches_stream_into_one_snapshot(self, db_manager):
+        scheduler = DownloadScheduler(fake_download, batch_size=3, max_workers=2,
+                                      bucket=TokenBucket(rate=1000, capacity=10, cooldown=0))
+        fetcher = StockDataFetcher(bar_store=False, download_scheduler=scheduler)
+        tickers = ['AAPL', 'MSFT', 'NVDA', 'AMZN', 'META', 'GOOGL', 'JPM']
+
+        inserted_batches = []
+        original_insert = db_manager.insert_stock_metrics
+
+        def recording_insert(df, timestamp=None, run_id=None):
+            inserted_batches.append(len(df))
+            return original_insert(df, timestamp=timestamp, run_id=run_id)
+
+        db_manager.insert_stock_metrics = recording_insert
+        summary = MetricsPipeline(fetcher, db_manager).run(tickers)
+
+        assert summary['fetched'] == len(tickers)
+        assert summary['inserted'] == len(tickers)
+        assert summary['failed_tickers'] == []
+        assert sorted(inserted_batches) == [1, 3, 3]
+
+        # All batches belong to one completed run, which reads back whole
+        latest = db_manager.get_latest_metrics()
+        assert sorted(latest['symbol']) == sorted(tickers)
+        assert set(latest['run_id']) == {summary['run_id']}
+        assert latest['timestamp'].nunique() == 1
+
+    def test_failed_run_is_not_visible(self, db_manager):
+        class BrokenFetcher:
+            def stream_metrics(self, tickers, failed_tickers):
+                yield pd.DataFrame({'symbol': ['AAPL'], 'price': [150.0], 'volume': [1e6]})
+                raise ConnectionError("provider went away")
+
+        with pytest.raises(ConnectionError):
+            MetricsPipeline(BrokenFetcher(), db_manager).run(['AAPL', 'MSFT'])
+
+        assert db_manager.get_latest_run_id() is None
+
+    def test_failed_download_not_scored_from_stored_history(self, db_manager, tmp_path):
+        bar_store = BarStore(tmp_path / "bars.db")
+        stored = fake_download(['AAPL', 'DEAD'], None, pd.Timestamp.now() - pd.Timedelta(days=30))
+        bar_store.upsert_bars(stored, ['AAPL', 'DEAD'])
+
+        def download(batch, start, end):
+            live = [t for t in batch if t != 'DEAD']
+            return fake_download(live, start, end) if live else pd.DataFrame()
+
+        fetcher = StockDataFetcher(
+            bar_store=bar_store,
+            download_scheduler=DownloadScheduler(download, batch_size=2, max_retries=1,
+                                                 bucket=TokenBucket(rate=1000, capacity=10, cooldown=0))
+        )
+        summary = MetricsPipeline(fetcher, db_manager).run(['AAPL', 'DEAD'])
+
+        assert summary['failed_tickers'] == ['DEAD']
+        assert db_manager.get_latest_metrics()['symbol'].tolist() == ['AAPL']
+        bar_store.close()
+
+    def test_snapshot_screen_limits_full_download(self, db_manager, tmp_path):
+        requests = []
+        bucket = TokenBucket(rate=1000, capacity=10, cooldown=0)
+        fetcher = StockDataFetcher(
+            bar_store=BarStore(tmp_path / "bars.db"),
+            download_scheduler=DownloadScheduler(thin_download(requests), batch_size=3, bucket=bucket),
+            snapshot_scheduler=DownloadScheduler(thin_download(requests), batch_size=10, bucket=bucket)
+        )
+        tickers = ['AAPL', 'PENNY', 'MSFT', 'NVDA']
+
+        summary = MetricsPipeline(fetcher, db_manager, prefilter=StockFilter(None).apply_hard_constraints,
+                                  snapshot_min_universe=3).run(tickers)
+
+        assert summary['universe'] == 4 and summary['screened'] == 3
+        assert sorted(db_manager.get_latest_metrics()['symbol']) == ['AAPL', 'MSFT', 'NVDA']
+
+        # One short snapshot request for everything, full windows only for survivors
+        snapshot = [batch for batch, window in requests if window.days <= 7]
+        full = [t for batch, window in requests if window.days > 7 for t in batch]
+        assert snapshot == [tickers]
+        assert sorted(full) == ['AAPL', 'MSFT', 'NVDA']
+
+    def test_snapshot_failures_retried_in_full_download(self, db_manager, tmp_path):
+        requests = []
+        thin = thin_download(requests)
+
+        def download(batch, start, end):
+            data = thin(batch, start, end)
+            if pd.Timestamp(end) - pd.Timestamp(start) <= pd.Timedelta(days=7):
+                data = data.drop(columns='FLAKY', level=1, errors='ignore')
+            return data
+
+        bucket = TokenBucket(rate=1000, capacity=10, cooldown=0)
+        fetcher = StockDataFetcher(
+            bar_store=BarStore(tmp_path / "bars.db"),
+            download_scheduler=DownloadScheduler(download, batch_size=3, bucket=bucket),
+            snapshot_scheduler=DownloadScheduler(download, batch_size=10, max_retries=0, bucket=bucket)
+        )
+        tickers = ['AAPL', 'PENNY', 'FLAKY']
+
+        summary = MetricsPipeline(fetcher, db_manager, prefilter=StockFilter(None).apply_hard_constraints,
+                                  snapshot_min_universe=3).run(tickers)
+
+        assert summary['snapshot_failed'] == ['FLAKY']
+        assert summary['failed_tickers'] == []
+        assert summary['screened'] == 2
+        assert sorted(db_manager.get_latest_metrics()['symbol']) == ['AAPL', 'FLAKY']
+
+    def test_small_universe_on_bar_store_skips_snapshot(self, db_manager, tmp_path):
+        requests = []
+        bucket = TokenBucket(rate=1000, capacity=10, cooldown=0)
+        fetcher = StockDataFetcher(
+            bar_store=BarStore(tmp_path / "bars.db"),
+            download_scheduler=DownloadScheduler(thin_download(requests), batch_size=3, bucket=bucket),
+            snapshot_scheduler=DownloadScheduler(thin_download(requests), batch_size=10, bucket=bucket)
+        )
+        tickers = ['AAPL', 'PENNY', 'MSFT', 'NVDA']
+
+        summary = MetricsPipeline(fetcher, db_manager, prefilter=StockFilter(None).apply_hard_constraints,
+                                  snapshot_min_universe=5).run(tickers)
+
+        assert summary['universe'] == 4 and summary['screened'] is None
+        assert all(window.days > 7 for _, window in requests)  # No snapshot pass
+        assert sorted(t for batch, _ in requests for t in batch) == sorted(tickers)
+
+    def test_snapshot_screen_without_bar_store(self, db_manager):
+        requests = []
+        bucket = TokenBucket(rate=1000, capacity=10, cooldown=0)
+        fetcher = StockDataFetcher(
+            bar_store=False,
+            download_scheduler=DownloadScheduler(thin_download(requests), batch_size=3, bucket=bucket),
+            snapshot_scheduler=DownloadScheduler(thin_download(requests), batch_size=10, bucket=bucket)
+        )
+
+        summary = MetricsPipeline(fetcher, db_manager, prefilter=StockFilter(None).apply_hard_constraints,
+                                  snapshot_min_universe=None).run(['AAPL', 'PENNY', 'MSFT'])
+
+        assert summary['screened'] == 2
+        assert sorted(db_manager.get_latest_metrics()['symbol']) == ['AAPL', 'MSFT']
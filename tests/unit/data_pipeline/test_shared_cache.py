@@ -0,0 +1,139 @@
+"""
+Unit tests for SharedCache - cross-process TTL cache with stale-while-revalidate
+"""
+
+import threading
+import time
+
+import pytest
+
+from src.data_pipeline.storage.shared_cache import SharedCache, SQLiteCacheBackend
+
+
+class CountingFetch:
+    """fetch() stand-in that counts calls and can be told to fail"""
+
+    def __init__(self, value=None):
+        self.calls = 0
+        self.value = value
+        self.error = None
+
+    def __call__(self):
+        self.calls += 1
+        if self.error:
+            raise self.error
+        return self.value if self.value is not None else {'regime': 'fear', 'call': self.calls}
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return tmp_path / "shared_cache.db"
+
+
+@pytest.fixture
+def cache(cache_path):
+    cache = SharedCache(SQLiteCacheBackend(cache_path), wait_timeout=2)
+    yield cache
+    cache.close()
+
+
+def age_entry(cache, key, seconds):
+    """Pretend the stored entry was written seconds ago"""
+    cache.backend.conn.execute(
+        "UPDATE cache_entries SET stored_at = stored_at - ? WHERE key = ?", (seconds, key)
+    )
+
+
+class TestSharedCache:
+    """Test TTL, stale-while-revalidate and sharing between instances"""
+
+    def test_fresh_value_fetched_once(self, cache):
+        fetch = CountingFetch()
+
+        first = cache.get_or_refresh('regime', fetch, ttl=60, stale_ttl=600)
+        second = cache.get_or_refresh('regime', fetch, ttl=60, stale_ttl=600)
+
+        assert first == second == {'regime': 'fear', 'call': 1}
+        assert fetch.calls == 1
+
+        # Callers get copies, so mutations never reach the cache
+        second['regime'] = 'greed'
+        assert cache.get_or_refresh('regime', fetch, ttl=60, stale_ttl=600)['regime'] == 'fear'
+
+    def test_shared_between_instances(self, cache, cache_path):
+        fetch = CountingFetch()
+        cache.get_or_refresh('regime', fetch, ttl=60, stale_ttl=600)
+
+        other = SharedCache(SQLiteCacheBackend(cache_path))
+        assert other.get_or_refresh('regime', fetch, ttl=60, stale_ttl=600) == {'regime': 'fear', 'call': 1}
+        assert fetch.calls == 1
+        other.close()
+
+    def test_stale_served_while_revalidating(self, cache):
+        fetch = CountingFetch()
+        cache.get_or_refresh('regime', fetch, ttl=60, stale_ttl=600)
+        age_entry(cache, 'regime', 120)
+
+        stale = cache.get_or_refresh('regime', fetch, ttl=60, stale_ttl=600)
+        cache.wait(5)
+
+        assert stale['call'] == 1
+        assert fetch.calls == 2
+        assert cache.get_or_refresh('regime', fetch, ttl=60, stale_ttl=600)['call'] == 2
+
+    def test_expired_refreshed_in_caller(self, cache):
+        fetch = CountingFetch()
+        cache.get_or_refresh('regime', fetch, ttl=60, stale_ttl=600)
+        age_entry(cache, 'regime', 3600)
+
+        assert cache.get_or_refresh('regime', fetch, ttl=60, stale_ttl=600)['call'] == 2
+
+    def test_failed_refresh_keeps_value_within_stale_ttl(self, cache):
+        fetch = CountingFetch()
+        cache.get_or_refresh('vix', fetch, ttl=60, stale_ttl=600)
+        age_entry(cache, 'vix', 300)
+
+        fetch.error = ConnectionError("CNN down")
+        assert cache.refresh('vix', fetch, stale_ttl=600)['call'] == 1
+
+        cache.invalidate('vix')
+        with pytest.raises(ConnectionError):
+            cache.get_or_refresh('vix', fetch, ttl=60, stale_ttl=600)
+
+    def test_failed_refresh_does_not_serve_expired_value(self, cache):
+        """A persistent entry days old is not passed off as current"""
+        fetch = CountingFetch()
+        cache.get_or_refresh('vix', fetch, ttl=60, stale_ttl=600)
+        age_entry(cache, 'vix', 3 * 24 * 3600)
+
+        fetch.error = ConnectionError("CNN down")
+        with pytest.raises(ConnectionError):
+            cache.get_or_refresh('vix', fetch, ttl=60, stale_ttl=600)
+        with pytest.raises(ConnectionError):
+            cache.refresh('vix', fetch, stale_ttl=600)
+        with pytest.raises(ConnectionError):
+            cache.refresh('vix', fetch)  # No stale_ttl: never falls back
+
+    def test_concurrent_misses_fetch_once(self, cache_path):
+        release = threading.Event()
+        fetch = CountingFetch({'vix': 21.5})
+
+        def slow_fetch():
+            release.wait(5)
+            return fetch()
+
+        caches = [SharedCache(SQLiteCacheBackend(cache_path), wait_timeout=5) for _ in range(3)]
+        results = []
+        threads = [threading.Thread(target=lambda c=c: results.append(
+            c.get_or_refresh('vix', slow_fetch, ttl=60, stale_ttl=600))) for c in caches]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.2)
+        release.set()
+        for thread in threads:
+            thread.join(10)
+
+        assert results == [{'vix': 21.5}] * 3
+        assert fetch.calls == 1
+        for c in caches:
+            c.close()
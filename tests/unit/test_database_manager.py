@@ -5,12 +5,15 @@ Unit tests for DatabaseManager - critical data handling component
 import pytest
 import pandas as pd
 import tempfile
+import json
 import sqlite3
 from pathlib import Path
 from datetime import datetime
 from unittest.mock import patch, MagicMock
 
-from src.data_pipeline.storage.database_manager import DatabaseManager
+from src.data_pipeline.storage.database_manager import (
+    DatabaseManager, SCHEMA_VERSION, QUERY_INDEXES, bulk_write, _bulk_write_statement
+)
 from src.security.input_validator import ValidationError, SecurityViolationError
 
 
@@ -46,7 +49,7 @@ class TestDatabaseManager:
         assert version > 0
         
         # Verify core tables exist
-        cursor = db.conn.execute("SELECT name FROM sqlite_master WHERE type='table'")
+        cursor = db.conn.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'view')")
         tables = [row[0] for row in cursor.fetchall()]
         
         required_tables = [
@@ -249,7 +252,7 @@ class TestDatabaseManager:
             assert rows_inserted == 0  # No malicious data should be inserted
         
         # Verify database structure is intact
-        cursor = db_manager.conn.execute("SELECT name FROM sqlite_master WHERE type='table'")
+        cursor = db_manager.conn.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'view')")
         tables = [row[0] for row in cursor.fetchall()]
         assert 'stock_metrics' in tables  # Table should still exist
     
@@ -282,6 +285,398 @@ class TestDatabaseManager:
         assert symbols == expected_symbols
 
 
+class TestRunSnapshots:
+    """Test run-scoped stock metrics snapshots"""
+    
+    def metrics(self, symbols):
+        return pd.DataFrame({
+            'symbol': symbols,
+            'price': [100.0 + i for i in range(len(symbols))],
+            'volume': [1000000] * len(symbols)
+        })
+    
+    def test_latest_complete_run_is_returned(self, db_manager):
+        """Batches of a run read back together; runs still in progress are ignored"""
+        run_id = db_manager.start_run()
+        db_manager.insert_stock_metrics(self.metrics(['AAPL', 'MSFT']), run_id=run_id)
+        db_manager.insert_stock_metrics(self.metrics(['NVDA']), run_id=run_id)
+        db_manager.complete_run(run_id)
+        
+        in_progress = db_manager.start_run()
+        db_manager.insert_stock_metrics(self.metrics(['XOM']), run_id=in_progress)
+        
+        latest = db_manager.get_latest_metrics()
+        assert list(latest['symbol']) == ['AAPL', 'MSFT', 'NVDA']
+        assert list(db_manager.get_latest_metrics(run_id=in_progress)['symbol']) == ['XOM']
+        
+        count = db_manager.conn.execute("SELECT symbol_count FROM runs WHERE run_id = ?", (run_id,)).fetchone()[0]
+        assert count == 3
+    
+    def test_snapshot_read_uses_run_index(self, db_manager):
+        """get_latest_metrics is an index range scan on (run_id, symbol)"""
+        plan = db_manager.conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM stock_metrics WHERE run_id = ? ORDER BY symbol", (1,)
+        ).fetchall()
+        details = ' '.join(row[-1] for row in plan)
+        assert 'idx_stock_metrics_run' in details
+        assert 'TEMP B-TREE' not in details
+    
+    def test_migration_from_v3(self, temp_db_path):
+        """v3 databases gain the runs table and run_id column without data loss"""
+        conn = sqlite3.connect(temp_db_path)
+        conn.execute("CREATE TABLE schema_version (version INTEGER PRIMARY KEY, applied_at DATETIME, description TEXT)")
+        conn.execute("INSERT INTO schema_version (version) VALUES (3)")
+        conn.execute("CREATE TABLE stock_metrics (symbol TEXT NOT NULL, timestamp DATETIME NOT NULL, price REAL, "
+                     "volume INTEGER, PRIMARY KEY (symbol, timestamp))")
+        conn.execute("INSERT INTO stock_metrics VALUES ('AAPL', '2024-01-02 09:00:00', 150.0, 1000000)")
+        conn.commit()
+        conn.close()
+        
+        db = DatabaseManager(temp_db_path)
+        columns = [row[1] for row in db.conn.execute("PRAGMA table_info(stock_metrics)")]
+        assert 'run_id' in columns
+        assert db._get_schema_version() == SCHEMA_VERSION
+        assert db.conn.execute("SELECT symbol, run_id FROM stock_metrics").fetchall() == [('AAPL', None)]
+        db.close()
+
+
+class TestSchemaMigrations:
+    """Test the versioned migration runner and query-driven indexes"""
+    
+    def _v4_database(self, path):
+        """Database at v4 with the query indexes missing"""
+        db = DatabaseManager(path)
+        for indexes in QUERY_INDEXES.values():
+            for name, _ in indexes:
+                db.conn.execute(f"DROP INDEX IF EXISTS {name}")
+        db.conn.execute("UPDATE schema_version SET version = 4")
+        db.conn.commit()
+        db.close()
+    
+    def test_each_version_recorded(self, temp_db_path):
+        """Every applied migration leaves its own schema_version row"""
+        self._v4_database(temp_db_path)
+        
+        db = DatabaseManager(temp_db_path)
+        versions = [row[0] for row in db.conn.execute("SELECT version FROM schema_version ORDER BY version")]
+        assert versions[-1] == SCHEMA_VERSION
+        assert db.conn.execute(
+            "SELECT name FROM sqlite_master WHERE name = 'idx_position_tracking_status_exit'"
+        ).fetchone()
+        db.close()
+    
+    def test_failed_migration_rolls_back(self, temp_db_path):
+        """A failing step leaves neither partial DDL nor a version bump"""
+        self._v4_database(temp_db_path)
+        
+        def broken_step(self):
+            self.conn.execute("CREATE INDEX idx_partial ON position_tracking(symbol)")
+            raise sqlite3.OperationalError("boom")
+        
+        with patch.object(DatabaseManager, '_create_query_indexes', broken_step):
+            with pytest.raises(sqlite3.OperationalError):
+                DatabaseManager(temp_db_path)
+        
+        conn = sqlite3.connect(temp_db_path)
+        assert conn.execute("SELECT MAX(version) FROM schema_version").fetchone()[0] == 4
+        assert conn.execute("SELECT name FROM sqlite_master WHERE name = 'idx_partial'").fetchone() is None
+        conn.close()
+    
+    def test_hot_queries_use_indexes(self, db_manager):
+        """Dashboard and tracker queries are served by an index"""
+        queries = [
+            ("SELECT * FROM position_tracking WHERE exit_date IS NULL AND status = 'OPEN' ORDER BY symbol", ()),
+            ("SELECT * FROM tradingagents_analysis_results WHERE batch_id = ? ORDER BY conviction_score DESC", ('b1',)),
+            ("SELECT * FROM tradingagents_analysis_results ORDER BY created_at DESC LIMIT 20", ()),
+        ]
+        for query, params in queries:
+            plan = ' '.join(row[-1] for row in db_manager.conn.execute(f"EXPLAIN QUERY PLAN {query}", params))
+            assert 'USING INDEX' in plan or 'USING COVERING INDEX' in plan, query
+            assert 'TEMP B-TREE' not in plan, query
+    
+    def test_late_tables_indexed_on_startup(self, temp_db_path):
+        """Indexes for tables created after migration appear on the next start"""
+        db = DatabaseManager(temp_db_path)
+        db.conn.execute("CREATE TABLE pattern_learning_log (id INTEGER PRIMARY KEY, learning_date DATE)")
+        db.conn.commit()
+        db.close()
+        
+        db = DatabaseManager(temp_db_path)
+        assert db.conn.execute(
+            "SELECT name FROM sqlite_master WHERE name = 'idx_pattern_learning_log_date'"
+        ).fetchone()
+        db.close()
+
+
+class TestStockMetricsPartitions:
+    """Test monthly stock_metrics partitions, daily rollups and retention"""
+    
+    def _insert(self, db, timestamp, price):
+        db.insert_stock_metrics(
+            pd.DataFrame({'symbol': ['AAPL', 'MSFT'], 'price': [price, price * 2], 'volume': [1000, 2000]}),
+            timestamp=timestamp
+        )
+    
+    def test_rows_routed_to_month_partition(self, db_manager):
+        """Inserts land in their month's table and show through the view"""
+        self._insert(db_manager, datetime(2024, 3, 15, 16, 0), 100.0)
+        
+        assert 'stock_metrics_p202403' in db_manager._stock_metrics_partitions()
+        assert db_manager.conn.execute("SELECT COUNT(*) FROM stock_metrics_p202403").fetchone()[0] == 2
+        assert db_manager.conn.execute(
+            "SELECT COUNT(*) FROM stock_metrics WHERE symbol = 'AAPL'"
+        ).fetchone()[0] == 1
+    
+    def test_retention_rolls_up_and_drops(self, db_manager):
+        """Old partitions become daily summaries and disappear whole"""
+        self._insert(db_manager, datetime(2024, 1, 10, 10, 0), 100.0)
+        self._insert(db_manager, datetime(2024, 1, 10, 16, 0), 104.0)
+        self._insert(db_manager, datetime(2024, 1, 11, 16, 0), 102.0)
+        self._insert(db_manager, datetime(2024, 6, 3, 16, 0), 110.0)
+        
+        result = db_manager.apply_stock_metrics_retention(now=datetime(2024, 6, 15))
+        
+        assert result['dropped'] == ['stock_metrics_p202401', 'stock_metrics_p202402']
+        assert result['rolled_up'] == 4
+        assert 'stock_metrics_p202401' not in db_manager._stock_metrics_partitions()
+        
+        day = db_manager.conn.execute(
+            "SELECT price_open, price_high, price_low, price, samples FROM stock_metrics_daily "
+            "WHERE symbol = 'AAPL' AND date = '2024-01-10'"
+        ).fetchone()
+        assert day == (100.0, 104.0, 100.0, 104.0, 2)
+        
+        # Recent raw rows are untouched
+        assert db_manager.conn.execute("SELECT COUNT(*) FROM stock_metrics").fetchone()[0] == 2
+    
+    def test_history_spans_rollups_and_raw(self, db_manager):
+        """History reads rolled-up days and live partitions as one daily series"""
+        self._insert(db_manager, datetime(2024, 1, 10, 16, 0), 100.0)
+        db_manager.apply_stock_metrics_retention(now=datetime(2024, 6, 15))
+        self._insert(db_manager, datetime(2024, 6, 3, 10, 0), 108.0)
+        self._insert(db_manager, datetime(2024, 6, 3, 16, 0), 110.0)
+        
+        history = db_manager.get_metric_history('AAPL', '2024-01-01', '2024-06-30')
+        
+        assert list(history['date']) == ['2024-01-10', '2024-06-03']
+        assert list(history['price']) == [100.0, 110.0]
+        assert list(history['price_open']) == [100.0, 108.0]
+
+
+class TestBulkWrite:
+    """Test the executemany bulk write / upsert API"""
+    
+    def test_upsert_updates_on_conflict(self, db_manager):
+        """Rows sharing the conflict key are updated in place, last one wins"""
+        rows = pd.DataFrame({
+            'timestamp': [pd.Timestamp('2024-01-02 10:00')] * 3,
+            'symbol': ['AAPL', 'MSFT', 'AAPL'],
+            'score': [50.0, float('nan'), 75.0],
+            'regime': 'fear',
+            'selected': True
+        })
+        db_manager.bulk_upsert('filter_results', rows, conflict_columns=['timestamp', 'symbol'])
+        
+        result = db_manager.conn.execute(
+            "SELECT symbol, score, selected FROM filter_results ORDER BY symbol"
+        ).fetchall()
+        assert result == [('AAPL', 75.0, 1), ('MSFT', None, 1)]
+    
+    def test_records_and_do_nothing(self, db_manager):
+        """Lists of dicts are accepted; update_columns=[] keeps existing rows"""
+        record = {'batch_id': 'b1', 'selection_date': '2024-01-02', 'symbol': 'AAPL', 'rank': 1}
+        db_manager.bulk_upsert('portfolio_selections', [record], conflict_columns=['batch_id', 'symbol'])
+        db_manager.bulk_upsert('portfolio_selections', [dict(record, rank=5)],
+                               conflict_columns=['batch_id', 'symbol'], update_columns=[])
+        
+        assert db_manager.conn.execute("SELECT rank FROM portfolio_selections").fetchall() == [(1,)]
+    
+    def test_bulk_write_joins_caller_transaction(self, db_manager):
+        """bulk_write runs inside the caller's transaction and rolls back with it"""
+        with pytest.raises(RuntimeError):
+            with db_manager.transaction() as conn:
+                bulk_write(conn, 'regime_history', [{'timestamp': '2024-01-02', 'regime': 'fear'}])
+                raise RuntimeError("abort")
+        
+        assert db_manager.conn.execute("SELECT COUNT(*) FROM regime_history").fetchone()[0] == 0
+    
+    def test_statement_built_once_per_shape(self, db_manager):
+        """Repeated writes of the same shape reuse the cached statement"""
+        _bulk_write_statement.cache_clear()
+        for day in ('2024-01-02', '2024-01-03'):
+            db_manager.bulk_upsert('regime_history', [{'timestamp': day, 'regime': 'fear'}],
+                                   conflict_columns=['timestamp'])
+        
+        info = _bulk_write_statement.cache_info()
+        assert info.misses == 1 and info.hits == 1
+    
+    def test_save_filter_results(self, db_manager):
+        """save_filter_results writes through the bulk API"""
+        assert db_manager.save_filter_results([
+            {'symbol': 'AAPL', 'score': 80.0, 'regime': 'fear', 'selected': 1},
+            {'symbol': 'MSFT', 'score': 60.0, 'regime': 'fear'}
+        ])
+        assert db_manager.conn.execute("SELECT COUNT(*) FROM filter_results").fetchone()[0] == 2
+
+
+class TestTradingAgentsQueue:
+    """Test the batch-scoped tradingagents_queue checkpoints"""
+
+    candidates = pd.DataFrame({
+        'symbol': ['AAPL', 'MSFT'],
+        'score': [80.0, 60.0],
+        'rsi_2': [5.0, float('nan')],
+        'volume_ratio': [1.5, 2.0],
+        'price': [150.0, 280.0],
+        'atr': [2.5, 4.0]
+    })
+    regime = {'regime': 'fear', 'vix': 24.0}
+
+    def test_enqueue_is_idempotent_per_batch(self, db_manager):
+        """Re-queueing a batch keeps processed checkpoints; other batches are separate"""
+        assert db_manager.enqueue_candidates('b1', self.candidates, self.regime) == 2
+        assert db_manager.mark_queue_processed('b1', 'AAPL', 72.0, 'BUY')
+        assert db_manager.enqueue_candidates('b1', self.candidates, self.regime) == 0
+        assert db_manager.enqueue_candidates('b2', self.candidates, self.regime) == 2
+
+        queue = db_manager.get_batch_queue('b1')
+        assert queue['symbol'].tolist() == ['AAPL', 'MSFT']
+        assert queue['processed'].tolist() == [1, 0]
+        assert queue.loc[0, 'recommendation'] == 'BUY'
+        assert json.loads(queue.loc[1, 'candidate_data'])['rsi_2'] is None
+        assert json.loads(queue.loc[0, 'regime_data']) == self.regime
+        assert not db_manager.mark_queue_processed('b1', 'TSLA')
+
+    def test_migration_adds_batch_columns(self, temp_db_path):
+        """Queues created by the old OvernightProcessor gain the batch columns"""
+        db = DatabaseManager(temp_db_path)
+        db.conn.execute("DROP TABLE tradingagents_queue")
+        db.conn.execute("""
+        CREATE TABLE tradingagents_queue (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, symbol TEXT NOT NULL,
+            queued_at DATETIME DEFAULT CURRENT_TIMESTAMP, regime TEXT, filter_score REAL,
+            rsi_2 REAL, volume_ratio REAL, price REAL, atr REAL, processed BOOLEAN DEFAULT 0,
+            conviction_score REAL, recommendation TEXT, processed_at DATETIME
+        )
+        """)
+        db.conn.execute("INSERT INTO tradingagents_queue (symbol, regime) VALUES ('AAPL', 'fear')")
+        db.conn.execute("UPDATE schema_version SET version = 6 WHERE version = 7")
+        db.conn.commit()
+        db.close()
+
+        db = DatabaseManager(temp_db_path)
+        columns = [row[1] for row in db.conn.execute("PRAGMA table_info(tradingagents_queue)")]
+        assert {'batch_id', 'candidate_data', 'regime_data'} <= set(columns)
+        assert db._get_schema_version() == SCHEMA_VERSION
+        assert db.enqueue_candidates('b1', self.candidates, self.regime) == 2
+        assert db.conn.execute("SELECT COUNT(*) FROM tradingagents_queue").fetchone()[0] == 3
+        db.close()
+
+
+class TestConcurrencyMode:
+    """Test WAL mode, the serialized writer and per-thread readers"""
+    
+    def test_wal_mode_enabled(self, db_manager):
+        """Writer connection runs in WAL mode"""
+        mode = db_manager.conn.execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode.upper() == 'WAL'
+    
+    def test_reader_is_read_only(self, db_manager):
+        """Reader connections cannot write (runs is a real table, stock_metrics a view)"""
+        run_id = db_manager.start_run("read-only check")
+        with pytest.raises(sqlite3.OperationalError, match="readonly|read-only"):
+            db_manager.reader().execute("DELETE FROM runs")
+        assert db_manager.conn.execute("SELECT run_id FROM runs").fetchall() == [(run_id,)]
+    
+    def test_reader_not_blocked_by_open_write(self, db_manager):
+        """Readers see the last committed snapshot while a write is in progress"""
+        db_manager.insert_stock_metrics(pd.DataFrame({
+            'symbol': ['AAPL'], 'price': [150.25], 'volume': [1000000]
+        }))
+        
+        partition = db_manager._ensure_stock_metrics_partitions()
+        with db_manager.transaction() as conn:
+            conn.execute(f"DELETE FROM {partition}")
+            
+            # Uncommitted delete is invisible and the read returns immediately
+            count = db_manager.reader().execute("SELECT COUNT(*) FROM stock_metrics").fetchone()[0]
+            assert count == 1
+        
+        count = db_manager.reader().execute("SELECT COUNT(*) FROM stock_metrics").fetchone()[0]
+        assert count == 0
+    
+    def test_reader_per_thread(self, db_manager):
+        """Each thread gets its own read connection"""
+        import threading
+        
+        readers = []
+        thread = threading.Thread(target=lambda: readers.append(db_manager.reader()))
+        thread.start()
+        thread.join()
+        
+        assert db_manager.reader() is db_manager.reader()
+        assert readers[0] is not db_manager.reader()
+        
+        row = db_manager.reader().execute("SELECT COUNT(*) AS n FROM stock_metrics").fetchone()
+        assert row['n'] == row[0]
+
+    def test_raw_commit_waits_for_other_threads_write(self, db_manager):
+        """Direct conn writes from another thread cannot commit an open transaction"""
+        import threading
+
+        conn = db_manager.conn
+        conn.execute("INSERT INTO regime_history (timestamp, regime) VALUES ('2024-01-02', 'main')")
+
+        def component_write():
+            conn.cursor().execute("INSERT INTO regime_history (timestamp, regime) VALUES ('2024-01-03', 'worker')")
+            conn.commit()
+
+        thread = threading.Thread(target=component_write)
+        thread.start()
+        thread.join(timeout=0.2)
+        assert thread.is_alive()  # Blocked behind the open transaction
+
+        conn.rollback()
+        thread.join(timeout=5)
+
+        assert conn.execute("SELECT regime FROM regime_history").fetchall() == [('worker',)]
+
+    def test_failed_statement_does_not_keep_lock(self, db_manager):
+        """A thread whose only write failed (and never rolls back) releases the writer"""
+        import threading
+
+        conn = db_manager.conn
+
+        def failing_write():
+            with pytest.raises(sqlite3.IntegrityError):
+                conn.execute("INSERT INTO regime_history (timestamp, regime) VALUES ('2024-01-02', NULL)")
+
+        thread = threading.Thread(target=failing_write)
+        thread.start()
+        thread.join()
+
+        assert not conn.in_transaction
+        assert conn.write_lock.acquire(timeout=1)
+        conn.write_lock.release()
+
+    def test_nested_transaction_joins_outer(self, db_manager):
+        """An inner transaction() commits only with the outermost one"""
+        db_manager.enqueue_candidates('b1', TestTradingAgentsQueue.candidates, TestTradingAgentsQueue.regime)
+
+        with pytest.raises(RuntimeError):
+            with db_manager.transaction():
+                assert db_manager.mark_queue_processed('b1', 'AAPL', 72.0, 'BUY')
+                assert db_manager.conn.in_transaction  # Inner block did not commit
+                raise RuntimeError("Save failed after the checkpoint")
+
+        assert db_manager.get_batch_queue('b1')['processed'].tolist() == [0, 0]
+
+        with db_manager.transaction():
+            db_manager.mark_queue_processed('b1', 'AAPL', 72.0, 'BUY')
+        assert not db_manager.conn.in_transaction
+        assert db_manager.get_batch_queue('b1')['processed'].tolist() == [1, 0]
+
+
 class TestDatabaseManagerErrorHandling:
     """Test error handling scenarios"""
     
@@ -350,7 +745,7 @@ class TestDatabaseSecurity:
         assert isinstance(result, bool)
         
         # Verify table still exists
-        cursor = db_manager.conn.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='stock_metrics'")
+        cursor = db_manager.conn.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'view') AND name='stock_metrics'")
         table_exists = cursor.fetchone() is not None
         assert table_exists
     
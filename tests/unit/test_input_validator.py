@@ -252,4 +252,74 @@ class TestSecurityScenarios:
         null_byte_attempt = "AAPL\x00.txt"
         
         detected = InputValidator.detect_injection_attempt(null_byte_attempt)
-        assert "null_byte" in detected
\ No newline at end of file
+        assert "null_byte" in detected
+
+class TestFrameValidation:
+    """Test column-wise validation of stock metrics frames"""
+    
+    def mixed_frame(self):
+        return pd.DataFrame({
+            'symbol': ['AAPL', "EVIL'; DROP TABLE x; --", 'INVALID_SYMBOL_TOO_LONG', '', 'BRK<b>',
+                       'MSFT', 'NVDA', 'AMD', 'INTC', 'XOM'],
+            'price': [150.25, 100.0, 20.0, 30.0, 40.0, -5.0, float('nan'), 99.5, 45.0, 110.0],
+            'volume': [1e6, 1e3, 1e3, 1e3, 1e3, 1e3, 1e3, 2.5e6 + 0.7, float('inf'), 5e6],
+            'rsi_2': [45.6, 50.0, 50.0, 50.0, 50.0, 50.0, 50.0, 12.5, 50.0, 101.0],
+        })
+    
+    def test_matches_row_validator(self):
+        """Frame validation accepts and rejects the same rows as validate_stock_metrics"""
+        df = self.mixed_frame()
+        clean, rejections = InputValidator.validate_stock_metrics_frame(df)
+        
+        expected = []
+        expected_security = 0
+        for row in df.to_dict('records'):
+            try:
+                expected.append(InputValidator.validate_stock_metrics(row))
+            except SecurityViolationError:
+                expected_security += 1
+            except (ValidationError, OverflowError):
+                pass
+        
+        assert list(clean['symbol']) == [r['symbol'] for r in expected]
+        assert list(clean['price']) == [float(r['price']) for r in expected]
+        assert list(clean['volume']) == [r['volume'] for r in expected]
+        assert rejections['security_violation'].sum() == expected_security
+        assert len(clean) + len(rejections) == len(df)
+    
+    def test_rejection_report(self):
+        """Each rejected row is reported once with its first failing field"""
+        clean, rejections = InputValidator.validate_stock_metrics_frame(self.mixed_frame())
+        
+        report = rejections.set_index('row')
+        assert report.loc[1, 'field'] == 'symbol' and report.loc[1, 'security_violation']
+        assert report.loc[2, 'field'] == 'symbol'
+        assert report.loc[5, 'field'] == 'price'
+        assert report.loc[8, 'field'] == 'volume'
+        assert report.loc[9, 'field'] == 'rsi_2'
+        assert rejections['row'].is_unique
+    
+    def test_indicator_columns_pass_through(self):
+        """Indicator columns are kept, NaN allowed, inf rejected"""
+        df = pd.DataFrame({
+            'symbol': ['AAPL', 'MSFT', 'NVDA'],
+            'price': [150.0, 280.0, 120.0],
+            'volume': [1e6, 2e6, 3e6],
+            'sma_50': [148.0, float('nan'), 118.0],
+            'atr': [2.5, 3.1, float('inf')],
+            'quality_score': [0.67, 1.0, 0.33],
+        })
+        clean, rejections = InputValidator.validate_stock_metrics_frame(df)
+        
+        assert list(clean['symbol']) == ['AAPL', 'MSFT']
+        assert pd.isna(clean.loc[1, 'sma_50'])
+        assert list(clean['atr']) == [2.5, 3.1]
+        assert list(rejections['field']) == ['atr']
+    
+    def test_missing_required_column(self):
+        """All rows rejected when a required column is missing"""
+        df = pd.DataFrame({'symbol': ['AAPL', 'MSFT'], 'price': [150.0, 280.0]})
+        clean, rejections = InputValidator.validate_stock_metrics_frame(df)
+        
+        assert clean.empty
+        assert list(rejections['field']) == ['volume', 'volume']
@@ -0,0 +1,54 @@
+"""
+Unit tests for PostgreSQLManager - COPY serialization (no server needed)
+"""
+
+import csv
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("psycopg2")
+
+from src.data_pipeline.storage.postgres_manager import PostgreSQLManager
+
+
+def copy_lines(df):
+    """Raw CSV text PostgreSQL would receive through COPY"""
+    return PostgreSQLManager._to_copy_buffer(df).getvalue()
+
+
+def copy_rows(df):
+    return list(csv.reader(io.StringIO(copy_lines(df))))
+
+
+class TestCopyBuffer:
+    """Test the CSV rendering used by bulk_upsert"""
+
+    def test_nulls_become_unquoted_marker(self):
+        df = pd.DataFrame({'symbol': ['AAPL', None], 'price': [150.5, np.nan], 'note': ['', 'x']})
+
+        # Empty strings stay empty strings; only the \N marker is NULL
+        assert copy_lines(df).splitlines() == ['AAPL,150.5,', '\\N,\\N,x']
+
+    def test_integer_columns_with_nulls_stay_integers(self):
+        df = pd.DataFrame({'volume': [1_000_000.0, np.nan], 'price': [1.5, 2.0]})
+
+        assert copy_rows(df) == [['1000000', '1.5'], ['\\N', '2.0']]
+
+    def test_tabs_newlines_and_quotes_round_trip(self):
+        text = 'line one\nline "two"\tend, comma'
+        df = pd.DataFrame({'symbol': ['AAPL'], 'trader_analysis': [text]})
+
+        assert copy_rows(df) == [['AAPL', text]]
+
+    def test_dicts_and_lists_become_json(self):
+        df = pd.DataFrame({
+            'symbol': ['AAPL', 'MSFT'],
+            'decision_data': [{'score': 80, 'note': 'a "quoted"\nvalue'}, ['x', 1]]
+        })
+
+        rows = copy_rows(df)
+        assert rows[0] == ['AAPL', '{"score": 80, "note": "a \\"quoted\\"\\nvalue"}']
+        assert rows[1] == ['MSFT', '["x", 1]']
@@ -0,0 +1,153 @@
+"""
+Unit tests for BatchProcessor - concurrent candidate analysis on fake agents
+"""
+
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("langchain_openai")
+
+from src.data_pipeline.storage.database_manager import DatabaseManager
+from src.trading_engines.tradingagents_integration import batch_processor
+from src.trading_engines.tradingagents_integration.batch_processor import BatchProcessor
+
+REGIME = {'regime': 'fear', 'fear_greed_value': 30, 'vix': 24.0}
+
+
+class FakeAgent:
+    """AgentWrapper stand-in: per-symbol delay, BOOM raises, counts calls in flight"""
+
+    delays = {}
+
+    def __init__(self, **kwargs):
+        self.released = False
+        self.graph = None
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def fork(self):
+        return self
+
+    def release_prefetch(self):
+        self.released = True
+
+    def analyze_stock(self, symbol, date, market_context=None):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delays.get(symbol, 0.02))
+            if symbol == 'BOOM':
+                raise RuntimeError("LLM backend down")
+            return {'decision': f"BUY conviction: 70 for {symbol}", 'trader_analysis': ''}
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+
+class FakeConstructor:
+    def __init__(self, conn):
+        pass
+
+    def construct_portfolio(self, **kwargs):
+        return {'selections': [], 'excluded': []}
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = DatabaseManager(str(tmp_path / "batch.db"))
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def make_processor(db, monkeypatch):
+    monkeypatch.setattr(batch_processor, 'AgentWrapper', FakeAgent)
+    monkeypatch.setattr(batch_processor, 'PortfolioConstructor', FakeConstructor)
+    monkeypatch.setattr(batch_processor, 'PATTERNS_AVAILABLE', False)
+    monkeypatch.setattr(batch_processor, 'TRADINGAGENTS_PREFETCH_ENABLED', False)
+    monkeypatch.setattr(FakeAgent, 'delays', {})
+
+    def make(**kwargs):
+        return BatchProcessor(db, **kwargs)
+    return make
+
+
+def candidates(symbols):
+    return pd.DataFrame({
+        'symbol': symbols,
+        'price': 100.0,
+        'score': 80.0,
+        'rsi_2': 5.0,
+        'volume_ratio': 1.5,
+        'atr': 2.0,
+    })
+
+
+def saved_symbols(db):
+    return [row[0] for row in db.conn.execute(
+        "SELECT symbol FROM tradingagents_analysis_results ORDER BY rowid")]
+
+
+class TestParallelAnalysis:
+    """Test concurrent analysis with ordered, checkpointed persistence"""
+
+    def test_results_saved_in_candidate_order(self, db, make_processor):
+        symbols = ['AAPL', 'MSFT', 'NVDA', 'AMZN']
+        FakeAgent.delays = {'AAPL': 0.3, 'MSFT': 0.2, 'NVDA': 0.1}  # First finishes last
+        processor = make_processor(max_parallel=4, symbol_timeout=5)
+
+        result = processor.process_batch(candidates(symbols), REGIME, batch_id='b1')
+
+        assert result['total_analyzed'] == 4 and result['failed_analyses'] == 0
+        assert saved_symbols(db) == symbols
+        assert db.get_batch_queue('b1')['processed'].tolist() == [1, 1, 1, 1]
+
+    def test_timeout_and_error_are_failures(self, db, make_processor):
+        FakeAgent.delays = {'HANG': 2.0}
+        processor = make_processor(max_parallel=3, symbol_timeout=0.3)
+
+        start = time.monotonic()
+        result = processor.process_batch(candidates(['AAPL', 'HANG', 'BOOM', 'MSFT']), REGIME, batch_id='b1')
+
+        assert time.monotonic() - start < 1.5  # Did not wait for HANG
+        assert result['total_analyzed'] == 2 and result['failed_analyses'] == 2
+        assert saved_symbols(db) == ['AAPL', 'MSFT']
+        queue = db.get_batch_queue('b1').set_index('symbol')['processed']
+        assert queue.to_dict() == {'AAPL': 1, 'HANG': 0, 'BOOM': 0, 'MSFT': 1}
+
+    def test_max_parallel_bounds_calls_in_flight(self, db, make_processor):
+        FakeAgent.delays = {f"S{i}": 0.1 for i in range(6)}
+        processor = make_processor(max_parallel=2, symbol_timeout=5)
+
+        processor.process_batch(candidates(list(FakeAgent.delays)), REGIME, batch_id='b1')
+
+        assert processor.tradingagents.max_in_flight == 2
+        assert len(saved_symbols(db)) == 6
+
+    def test_prefetched_prices_released_after_batch(self, db, make_processor):
+        processor = make_processor(max_parallel=2, symbol_timeout=5)
+
+        processor.process_batch(candidates(['AAPL', 'BOOM']), REGIME, batch_id='b1')
+
+        assert processor.tradingagents.released
+
+    def test_result_and_checkpoint_saved_together(self, db, make_processor, monkeypatch):
+        processor = make_processor(max_parallel=2, symbol_timeout=5)
+        mark = db.mark_queue_processed
+
+        def flaky_mark(batch_id, symbol, *args):
+            if symbol == 'MSFT':
+                raise RuntimeError("disk I/O error")
+            return mark(batch_id, symbol, *args)
+        monkeypatch.setattr(db, 'mark_queue_processed', flaky_mark)
+
+        result = processor.process_batch(candidates(['AAPL', 'MSFT']), REGIME, batch_id='b1')
+
+        assert result['failed_analyses'] == 1
+        assert saved_symbols(db) == ['AAPL']  # MSFT's result rolled back with its checkpoint
+        assert db.get_batch_queue('b1')['processed'].tolist() == [1, 0]
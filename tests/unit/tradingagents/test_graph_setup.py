@@ -0,0 +1,186 @@
+"""
+Unit tests for GraphSetup - parallel analyst branches on stub nodes
+"""
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("langgraph")
+pytest.importorskip("langchain_openai")
+
+from langchain_core.messages import AIMessage, ToolMessage
+
+from tradingagents_lib.tradingagents.graph import setup
+from tradingagents_lib.tradingagents.graph.conditional_logic import ConditionalLogic
+from tradingagents_lib.tradingagents.graph.propagation import Propagator
+from tradingagents_lib.tradingagents.graph.setup import ANALYST_REPORT_FIELDS, GraphSetup
+
+ANALYSTS = ["market", "social", "news", "fundamentals"]
+# Tool round trips per analyst; market keeps calling tools after the others are done
+TOOL_ROUNDS = {"market": 3, "social": 1, "news": 1, "fundamentals": 0}
+
+
+class Recorder:
+    """Node execution order and the messages each analyst was shown"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.events = []
+        self.seen = {analyst: [] for analyst in ANALYSTS}
+
+    def record(self, event):
+        with self.lock:
+            self.events.append(event)
+
+
+def stub_analyst(analyst_type, recorder):
+    def node(state):
+        messages = state["messages"]
+        recorder.seen[analyst_type].append([m.content for m in messages])
+        rounds = sum(isinstance(m, ToolMessage) for m in messages)
+        if rounds < TOOL_ROUNDS[analyst_type]:
+            call = {"name": f"{analyst_type}_tool", "args": {}, "id": f"{analyst_type}-{rounds}"}
+            return {"messages": [AIMessage(content=f"{analyst_type} asks", tool_calls=[call])]}
+        recorder.record(f"{analyst_type} done")
+        return {
+            "messages": [AIMessage(content=f"{analyst_type} final")],
+            ANALYST_REPORT_FIELDS[analyst_type]: f"{analyst_type} report",
+        }
+    return node
+
+
+def stub_tools(analyst_type):
+    def node(state):
+        call = state["messages"][-1].tool_calls[0]
+        time.sleep(0.01)  # Let the branches overlap
+        return {"messages": [ToolMessage(content=f"{analyst_type} data", tool_call_id=call["id"])]}
+    return node
+
+
+@pytest.fixture
+def recorder(monkeypatch):
+    recorder = Recorder()
+    for analyst_type in ANALYSTS:
+        name = "social_media" if analyst_type == "social" else analyst_type
+        monkeypatch.setattr(
+            setup, f"create_{name}_analyst",
+            lambda llm, toolkit, t=analyst_type: stub_analyst(t, recorder),
+        )
+
+    def bull(llm, memory):
+        def node(state):
+            recorder.record("bull")
+            recorder.reports = {field: state[field] for field in ANALYST_REPORT_FIELDS.values()}
+            return {"investment_debate_state": {
+                "history": "", "current_response": "Bull", "count": 99,
+            }}
+        return node
+
+    def passthrough(*args):
+        return lambda state: {}
+
+    def risky(llm):
+        return lambda state: {"risk_debate_state": {
+            "history": "", "latest_speaker": "Risky", "count": 99,
+        }}
+
+    monkeypatch.setattr(setup, "create_bull_researcher", bull)
+    for name in ["create_bear_researcher", "create_research_manager", "create_trader",
+                 "create_neutral_debator", "create_safe_debator", "create_risk_manager"]:
+        monkeypatch.setattr(setup, name, passthrough)
+    monkeypatch.setattr(setup, "create_risky_debator", risky)
+    return recorder
+
+
+def build_graph(selected=ANALYSTS):
+    graph_setup = GraphSetup(
+        quick_thinking_llm=None,
+        deep_thinking_llm=None,
+        toolkit=None,
+        tool_nodes={analyst_type: stub_tools(analyst_type) for analyst_type in ANALYSTS},
+        bull_memory=None,
+        bear_memory=None,
+        trader_memory=None,
+        invest_judge_memory=None,
+        risk_manager_memory=None,
+        conditional_logic=ConditionalLogic(),
+    )
+    return graph_setup.setup_graph(selected, parallel_analysts=True)
+
+
+def run(graph):
+    return graph.invoke(Propagator().create_initial_state("NVDA", "2026-10-15"))
+
+
+class TestParallelAnalysts:
+    """Test the fan-out/join analyst graph"""
+
+    def test_every_report_merged(self, recorder):
+        final_state = run(build_graph())
+
+        for analyst_type, field in ANALYST_REPORT_FIELDS.items():
+            assert final_state[field] == f"{analyst_type} report"
+
+    def test_branches_do_not_see_each_others_messages(self, recorder):
+        run(build_graph())
+
+        for analyst_type, calls in recorder.seen.items():
+            assert len(calls) == TOOL_ROUNDS[analyst_type] + 1
+            # Private list: the ticker, then only this analyst's own tool loop
+            for messages in calls:
+                assert messages[0] == "NVDA"
+                others = [m for m in messages[1:] if not m.startswith(analyst_type)]
+                assert others == []
+
+    def test_branch_messages_not_merged_into_shared_state(self, recorder):
+        final_state = run(build_graph())
+
+        assert [m.content for m in final_state["messages"]] == ["NVDA"]
+
+    def test_bull_researcher_waits_for_all_analysts(self, recorder):
+        run(build_graph())
+
+        bull_at = recorder.events.index("bull")
+        assert sorted(recorder.events[:bull_at]) == sorted(f"{a} done" for a in ANALYSTS)
+        assert recorder.events.count("bull") == 1
+        assert all(recorder.reports.values())
+
+    def test_selected_subset(self, recorder):
+        final_state = run(build_graph(["news", "market"]))
+
+        assert final_state["news_report"] == "news report"
+        assert final_state["market_report"] == "market report"
+        assert final_state["sentiment_report"] == ""
+        assert recorder.seen["social"] == []
+
+
+class TestDebugTrace:
+    """Test debug streaming of the parallel analyst graph"""
+
+    def test_analyst_messages_traced(self, recorder, capsys, monkeypatch):
+        trading_graph = pytest.importorskip("tradingagents_lib.tradingagents.graph.trading_graph")
+        monkeypatch.setattr(
+            setup, "create_risk_manager",
+            lambda llm, memory: lambda state: {"final_trade_decision": "BUY"},
+        )
+        graph = trading_graph.TradingAgentsGraph.__new__(trading_graph.TradingAgentsGraph)
+        graph.debug = True
+        graph.graph = build_graph()
+        graph.propagator = Propagator()
+        graph.toolkit = SimpleNamespace(memo=None)
+        graph._log_state = lambda trade_date, final_state: None
+        graph.process_signal = lambda decision: decision
+
+        final_state, decision = graph.propagate("NVDA", "2026-10-15")
+
+        out = capsys.readouterr().out
+        for analyst_type in ANALYSTS:
+            assert f"{analyst_type} final" in out
+        assert "market data" in out  # Tool traffic inside the branches
+        # The returned state is the top-level graph state, not a branch's
+        assert final_state["market_report"] == "market report"
+        assert [m.content for m in final_state["messages"]] == ["NVDA"]
+        assert decision == "BUY"
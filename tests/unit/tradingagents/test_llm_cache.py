@@ -0,0 +1,153 @@
+"""
+Unit tests for LLMResponseCache - the persistent chat model response cache
+"""
+
+import pytest
+
+pytest.importorskip("langchain_core")
+
+from langchain_core.language_models import FakeListChatModel
+from langchain_core.messages import HumanMessage
+from langchain_core.outputs import Generation
+
+from tradingagents_lib.tradingagents.agents.utils import llm_cache
+from tradingagents_lib.tradingagents.agents.utils.llm_cache import LLMResponseCache
+
+
+class FakeClock:
+    """Stands in for the time module inside llm_cache"""
+
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(llm_cache, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def make_cache(tmp_path):
+    caches = []
+
+    def make(**kwargs):
+        cache = LLMResponseCache(str(tmp_path / "cache" / "llm_cache.db"), **kwargs)
+        caches.append(cache)
+        return cache
+    yield make
+    for cache in caches:
+        cache.close()
+
+
+def texts(generations):
+    return [g.text for g in generations] if generations is not None else None
+
+
+class TestCacheKey:
+    """Test what a cached response is keyed on"""
+
+    def test_round_trip(self, make_cache):
+        cache = make_cache()
+        cache.update("prompt", "model-a", [Generation(text="BUY")])
+
+        assert texts(cache.lookup("prompt", "model-a")) == ["BUY"]
+        assert cache.stats()["hits"] == 1
+
+    def test_model_prompt_and_namespace_change_the_key(self, make_cache):
+        cache = make_cache(namespace="openai|https://api.openai.com/v1")
+        cache.update("prompt", "model-a", [Generation(text="BUY")])
+
+        assert cache.lookup("prompt", "model-b") is None
+        assert cache.lookup("other prompt", "model-a") is None
+        other_backend = make_cache(namespace="ollama|http://localhost:11434/v1")
+        assert other_backend.lookup("prompt", "model-a") is None
+        assert cache.stats()["misses"] == 2
+
+    def test_key_parts_do_not_run_together(self, make_cache):
+        cache = make_cache()
+
+        assert cache.cache_key("bc", "a") != cache.cache_key("c", "ab")
+
+    def test_chat_model_messages(self, make_cache):
+        cache = make_cache()
+        model = FakeListChatModel(responses=["first", "second", "third"], cache=cache)
+
+        assert model.invoke([HumanMessage("Analyze NVDA")]).content == "first"
+        assert model.invoke([HumanMessage("Analyze NVDA")]).content == "first"  # Served from cache
+        assert model.invoke([HumanMessage("Analyze AAPL")]).content == "second"
+        assert cache.stats() == {"hits": 1, "misses": 2, "entries": 2, "bytes": cache.stats()["bytes"]}
+
+    def test_survives_reopen(self, make_cache):
+        make_cache().update("prompt", "model-a", [Generation(text="BUY")])
+
+        assert texts(make_cache().lookup("prompt", "model-a")) == ["BUY"]
+
+
+class TestExpiry:
+    """Test TTL expiry"""
+
+    def test_entry_expires_after_ttl(self, make_cache, clock):
+        cache = make_cache(ttl_seconds=60)
+        cache.update("prompt", "model-a", [Generation(text="BUY")])
+
+        clock.now += 60
+        assert texts(cache.lookup("prompt", "model-a")) == ["BUY"]
+        clock.now += 1
+        assert cache.lookup("prompt", "model-a") is None
+
+    def test_expired_entries_evicted_on_update(self, make_cache, clock):
+        cache = make_cache(ttl_seconds=60)
+        cache.update("old", "model-a", [Generation(text="BUY")])
+
+        clock.now += 120
+        cache.update("new", "model-a", [Generation(text="SELL")])
+
+        assert cache.stats()["entries"] == 1
+
+    def test_no_ttl_never_expires(self, make_cache, clock):
+        cache = make_cache(ttl_seconds=None)
+        cache.update("prompt", "model-a", [Generation(text="BUY")])
+
+        clock.now += 10 * 365 * 24 * 3600
+        assert texts(cache.lookup("prompt", "model-a")) == ["BUY"]
+
+
+class TestEviction:
+    """Test least-recently-used eviction past max_bytes"""
+
+    def test_least_recently_used_evicted(self, make_cache, clock):
+        probe = make_cache(max_bytes=None)
+        probe.update("size", "model", [Generation(text="x" * 100)])
+        entry_size = probe.stats()["bytes"]
+        probe.clear()
+        cache = make_cache(max_bytes=int(entry_size * 2.5))
+
+        for prompt in ("a", "b"):
+            cache.update(prompt, "model", [Generation(text="x" * 100)])
+            clock.now += 1
+        cache.lookup("a", "model")  # "b" is now least recently used
+        clock.now += 1
+        cache.update("c", "model", [Generation(text="x" * 100)])
+        clock.now += 1
+        cache.update("d", "model", [Generation(text="x" * 100)])
+
+        stats = cache.stats()
+        assert stats["bytes"] <= cache.max_bytes
+        assert cache.lookup("b", "model") is None
+        assert cache.lookup("a", "model") is None  # Oldest use once "d" arrived
+        assert cache.lookup("c", "model") is not None
+        assert cache.lookup("d", "model") is not None
+
+    def test_clear(self, make_cache):
+        cache = make_cache()
+        cache.update("prompt", "model-a", [Generation(text="BUY")])
+
+        cache.clear()
+
+        assert cache.stats()["entries"] == 0
+        assert cache.lookup("prompt", "model-a") is None
@@ -0,0 +1,104 @@
+"""
+Unit tests for the TradingAgents batch price cache
+"""
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("stockstats")
+
+from tradingagents_lib.tradingagents.dataflows import price_cache
+
+
+def history(days=30, start="2026-01-02"):
+    index = pd.bdate_range(start, periods=days, tz="America/New_York")
+    close = pd.Series(range(100, 100 + days), index=index, dtype=float)
+    return pd.DataFrame({
+        "Open": close - 1, "High": close + 1, "Low": close - 2, "Close": close,
+        "Volume": 1_000_000, "Dividends": 0.0, "Stock Splits": 0.0,
+    })
+
+
+@pytest.fixture
+def download(monkeypatch):
+    """Fake yf.download returning a group_by='ticker' frame; records each call"""
+    calls = []
+
+    def fake_download(symbols, **kwargs):
+        calls.append(list(symbols))
+        frames = {s: history() for s in symbols if s != "DELISTED"}
+        data = pd.concat(frames, axis=1)
+        if "DELISTED" in symbols:  # Requested but all NaN, like a failed ticker
+            for column in history().columns:
+                data[("DELISTED", column)] = float("nan")
+        return data
+
+    monkeypatch.setattr(price_cache.yf, "download", fake_download)
+    price_cache.clear_price_cache()
+    yield calls
+    price_cache.clear_price_cache()
+
+
+class TestPrefetch:
+    """Test the batched download"""
+
+    def test_one_download_for_all_symbols(self, download):
+        loaded = price_cache.prefetch_price_history(["msft", "AAPL", "MSFT", "DELISTED"])
+
+        assert loaded == 2
+        assert download == [["AAPL", "DELISTED", "MSFT"]]
+        assert price_cache.get_price_history("DELISTED", "2026-01-01", "2026-03-01") is None
+
+    def test_not_prefetched_returns_none(self, download):
+        assert price_cache.get_price_history("AAPL", "2026-01-01", "2026-03-01") is None
+        assert price_cache.get_stats_frame("AAPL") is None
+
+    def test_clear_forgets_histories(self, download):
+        price_cache.prefetch_price_history(["AAPL"])
+        price_cache.clear_price_cache()
+
+        assert price_cache.get_price_history("AAPL", "2026-01-01", "2026-03-01") is None
+
+
+class TestGetPriceHistory:
+    """Test slicing of a prefetched history"""
+
+    def test_end_date_is_exclusive(self, download):
+        price_cache.prefetch_price_history(["AAPL"])
+
+        rows = price_cache.get_price_history("aapl", "2026-01-05", "2026-01-09")
+
+        assert rows.index.tz is None and rows.index.name == "Date"
+        assert [d.strftime("%Y-%m-%d") for d in rows.index] == ["2026-01-05", "2026-01-06", "2026-01-07", "2026-01-08"]
+
+    def test_slice_is_a_copy(self, download):
+        price_cache.prefetch_price_history(["AAPL"])
+
+        rows = price_cache.get_price_history("AAPL", "2026-01-05", "2026-01-09")
+        rows["Close"] = 0.0
+
+        again = price_cache.get_price_history("AAPL", "2026-01-05", "2026-01-09")
+        assert (again["Close"] > 0).all()
+
+
+class TestStatsFrame:
+    """Test reuse of stockstats frames"""
+
+    def test_frame_and_lock_reused(self, download):
+        price_cache.prefetch_price_history(["AAPL"])
+
+        df, lock = price_cache.get_stats_frame("AAPL")
+        df["close_10_sma"]  # Indicator column computed once, kept on the frame
+        again, again_lock = price_cache.get_stats_frame("aapl")
+
+        assert again is df and again_lock is lock
+        assert "close_10_sma" in again.columns
+        assert again["Date"].iloc[0] == "2026-01-02"
+
+    def test_new_prefetch_rebuilds_frame(self, download):
+        price_cache.prefetch_price_history(["AAPL"])
+        df, _ = price_cache.get_stats_frame("AAPL")
+
+        price_cache.prefetch_price_history(["AAPL"])
+
+        assert price_cache.get_stats_frame("AAPL")[0] is not df
@@ -0,0 +1,179 @@
+"""
+Unit tests for ToolMemo - per-date memoization of Toolkit calls
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+pytest.importorskip("langchain_core")
+
+from langchain_core.tools import tool
+
+from tradingagents_lib.tradingagents.agents.utils.tool_memo import ToolMemo
+
+
+class CountingFunc:
+    """Tool body that counts calls and can be held until released"""
+
+    def __init__(self, fail=False):
+        self.calls = 0
+        self.fail = fail
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+
+    def __call__(self, ticker):
+        self.calls += 1
+        self.started.set()
+        self.release.wait(5)
+        if self.fail:
+            raise RuntimeError("rate limited")
+        return f"news for {ticker} #{self.calls}"
+
+
+def call_on(memo, trade_date, func, **kwargs):
+    with memo.scope(trade_date):
+        return memo.call("get_news", func, kwargs)
+
+
+def wait_for_hits(memo, hits):
+    deadline = time.monotonic() + 5
+    while memo.stats()["total"]["hits"] < hits:
+        assert time.monotonic() < deadline, "callers never reached the memo"
+        time.sleep(0.005)
+
+
+class TestScoping:
+    """Test per-date scoping and eviction"""
+
+    def test_same_date_and_arguments_computed_once(self):
+        memo, func = ToolMemo(), CountingFunc()
+
+        first = call_on(memo, "2026-10-15", func, ticker="NVDA")
+        second = call_on(memo, "2026-10-15", func, ticker="NVDA")
+
+        assert first == second == "news for NVDA #1"
+        assert func.calls == 1
+
+    def test_arguments_and_dates_are_separate_entries(self):
+        memo, func = ToolMemo(), CountingFunc()
+
+        call_on(memo, "2026-10-15", func, ticker="NVDA")
+        call_on(memo, "2026-10-15", func, ticker="AAPL")
+        call_on(memo, "2026-10-16", func, ticker="NVDA")
+
+        assert func.calls == 3
+
+    def test_oldest_date_evicted_past_max_dates(self):
+        memo, func = ToolMemo(max_dates=2), CountingFunc()
+
+        for trade_date in ("2026-10-13", "2026-10-14", "2026-10-15"):
+            call_on(memo, trade_date, func, ticker="NVDA")
+        call_on(memo, "2026-10-14", func, ticker="NVDA")  # Still kept
+        assert func.calls == 3
+
+        call_on(memo, "2026-10-13", func, ticker="NVDA")  # Evicted, computed again
+        assert func.calls == 4
+
+    def test_recent_use_keeps_a_date(self):
+        memo, func = ToolMemo(max_dates=2), CountingFunc()
+
+        call_on(memo, "2026-10-14", func, ticker="NVDA")
+        call_on(memo, "2026-10-15", func, ticker="NVDA")
+        call_on(memo, "2026-10-14", func, ticker="NVDA")  # 2026-10-15 is now oldest
+        call_on(memo, "2026-10-16", func, ticker="NVDA")
+        call_on(memo, "2026-10-14", func, ticker="NVDA")
+
+        assert func.calls == 3
+
+    def test_wrapped_tool_memoized_inside_scope(self):
+        memo, func = ToolMemo(), CountingFunc()
+
+        @tool
+        def get_news(ticker: str) -> str:
+            """News for a ticker"""
+            return func(ticker)
+
+        memoized = memo.wrap(get_news)
+        with memo.scope("2026-10-15"):
+            assert memoized.invoke({"ticker": "NVDA"}) == memoized.invoke({"ticker": "NVDA"})
+
+        assert memoized.name == "get_news" and memoized.args_schema is get_news.args_schema
+        assert func.calls == 1
+
+
+class TestConcurrency:
+    """Test single-flight behaviour"""
+
+    def test_concurrent_identical_calls_share_one_execution(self):
+        memo, func = ToolMemo(), CountingFunc()
+        func.release.clear()
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            futures = [pool.submit(call_on, memo, "2026-10-15", func, ticker="NVDA") for _ in range(4)]
+            assert func.started.wait(5)
+            wait_for_hits(memo, 3)  # Every other caller is waiting on the first
+            func.release.set()
+            results = [future.result() for future in futures]
+
+        assert results == ["news for NVDA #1"] * 4
+        assert func.calls == 1
+
+
+class TestFailures:
+    """Test that failed calls are not memoized"""
+
+    def test_failure_retried_on_next_call(self):
+        memo, func = ToolMemo(), CountingFunc(fail=True)
+
+        with pytest.raises(RuntimeError):
+            call_on(memo, "2026-10-15", func, ticker="NVDA")
+        func.fail = False
+
+        assert call_on(memo, "2026-10-15", func, ticker="NVDA") == "news for NVDA #2"
+
+    def test_waiting_callers_see_the_failure(self):
+        memo, func = ToolMemo(), CountingFunc(fail=True)
+        func.release.clear()
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            futures = [pool.submit(call_on, memo, "2026-10-15", func, ticker="NVDA") for _ in range(2)]
+            assert func.started.wait(5)
+            wait_for_hits(memo, 1)
+            func.release.set()
+            for future in futures:
+                with pytest.raises(RuntimeError):
+                    future.result()
+
+        assert func.calls == 1
+
+
+class TestStats:
+    """Test hit/miss accounting"""
+
+    def test_stats_per_tool_and_total(self):
+        memo, func = ToolMemo(), CountingFunc()
+
+        with memo.scope("2026-10-15"):
+            memo.call("get_news", func, {"ticker": "NVDA"})
+            memo.call("get_news", func, {"ticker": "NVDA"})
+            memo.call("get_news", func, {"ticker": "NVDA"})
+            memo.call("get_fundamentals", func, {"ticker": "NVDA"})
+
+        stats = memo.stats()
+        assert stats["get_news"] == {"hits": 2, "misses": 1, "hit_rate": 2 / 3}
+        assert stats["get_fundamentals"] == {"hits": 0, "misses": 1, "hit_rate": 0.0}
+        assert stats["total"] == {"hits": 2, "misses": 2, "hit_rate": 0.5}
+
+    def test_clear_resets_entries_and_counters(self):
+        memo, func = ToolMemo(), CountingFunc()
+        call_on(memo, "2026-10-15", func, ticker="NVDA")
+
+        memo.clear()
+
+        assert memo.stats() == {"total": {"hits": 0, "misses": 0, "hit_rate": 0.0}}
+        call_on(memo, "2026-10-15", func, ticker="NVDA")
+        assert func.calls == 2
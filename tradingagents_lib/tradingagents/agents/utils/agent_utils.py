@@ -3,8 +3,10 @@ from typing import List
 from typing import Annotated
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.messages import RemoveMessage
-from langchain_core.tools import tool
+from langchain_core.tools import BaseTool, tool
 from datetime import date, timedelta, datetime
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
 import functools
 import pandas as pd
 import os
@@ -12,6 +14,7 @@ from dateutil.relativedelta import relativedelta
 from langchain_openai import ChatOpenAI
 import tradingagents_lib.tradingagents.dataflows.interface as interface
 from tradingagents_lib.tradingagents.default_config import DEFAULT_CONFIG
+from tradingagents_lib.tradingagents.agents.utils.tool_memo import ToolMemo
 from langchain_core.messages import HumanMessage
 
 
@@ -48,6 +51,60 @@ class Toolkit:
         if config:
             self.update_config(config)
 
+        # Instance-level memoized copies of the tools, shared by every agent
+        # and candidate using this toolkit (see ToolMemo)
+        self.memo = None
+        if self._config.get("memoize_tools", True):
+            self.memo = ToolMemo()
+            for name in dir(Toolkit):
+                value = getattr(Toolkit, name)
+                if isinstance(value, BaseTool):
+                    setattr(self, name, self.memo.wrap(value))
+
+    def prefetch(self, symbols, trade_date, max_workers=8):
+        """Fetch every candidate's tool inputs before any graph runs.
+
+        Price history for all symbols comes down in one batched download and
+        is served from memory to the price and indicator tools. The news and
+        fundamentals calls, whose arguments are known up front, run
+        concurrently and are stored in the tool memo for trade_date. Returns
+        {"prices": symbols loaded, "calls": memoized calls, "failed": failed calls}.
+        """
+        summary = {"prices": 0, "calls": 0, "failed": 0}
+        if self.memo is None or not self.config["online_tools"]:
+            return summary
+
+        trade_date = str(trade_date)
+        try:
+            summary["prices"] = interface.prefetch_price_history(symbols)
+        except Exception as e:
+            print(f"Price prefetch failed, tools will fetch on demand: {e}")
+
+        calls = [(self.get_global_news_openai, {"curr_date": trade_date})]
+        for symbol in symbols:
+            calls.append((self.get_stock_news_openai, {"ticker": symbol, "curr_date": trade_date}))
+            calls.append((self.get_fundamentals_openai, {"ticker": symbol, "curr_date": trade_date}))
+
+        with self.memo.scope(trade_date):
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                futures = [
+                    pool.submit(copy_context().run, tool.invoke, kwargs)
+                    for tool, kwargs in calls
+                ]
+                for future in futures:
+                    try:
+                        future.result()
+                        summary["calls"] += 1
+                    except Exception as e:
+                        summary["failed"] += 1
+                        print(f"Prefetch call failed: {e}")
+
+        return summary
+
+    def release_prefetch(self):
+        """Drop the prefetched price histories once their batch is done."""
+        interface.clear_price_cache()
+
     @staticmethod
     @tool
     def get_reddit_news(
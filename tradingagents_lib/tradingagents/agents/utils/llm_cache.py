@@ -0,0 +1,169 @@
+# TradingAgents/agents/utils/llm_cache.py
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Optional
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.load import dumps, loads
+
+
+class LLMResponseCache(BaseCache):
+    """Persistent, content-addressed cache of chat model responses.
+
+    Plugged into a chat model through its ``cache`` field, so LangChain
+    consults it on every non-streaming call. Entries are keyed by a SHA-256
+    of the namespace (provider + backend), the model's ``llm_string`` (model
+    name, sampling parameters and any bound tool schemas) and the serialized
+    message list, so a rerun of the same symbol and date is answered from
+    disk while any change in prompt, tool output or model is a miss.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        namespace: str = "",
+        ttl_seconds: Optional[float] = 7 * 24 * 3600,
+        max_bytes: Optional[int] = 512 * 1024 * 1024,
+    ):
+        """Open (or create) the cache database.
+
+        Args:
+            path: SQLite file holding the responses
+            namespace: Extra key material, e.g. "openai|https://api.openai.com/v1"
+            ttl_seconds: Entries older than this are ignored and evicted (None = never)
+            max_bytes: Least recently used entries are evicted past this size (None = unbounded)
+        """
+        self.path = path
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_llm_cache_last_used ON llm_cache (last_used)"
+        )
+        self._conn.commit()
+
+    def cache_key(self, prompt: str, llm_string: str) -> str:
+        """Content address of one call."""
+        digest = hashlib.sha256()
+        for part in (self.namespace, llm_string, prompt):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        """Return the cached generations for this call, if fresh."""
+        key = self.cache_key(prompt, llm_string)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or self._expired(row[1], now):
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE llm_cache SET last_used = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            self.hits += 1
+        return loads(row[0])
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        """Store the generations for this call and enforce TTL / size limits."""
+        response = dumps(list(return_val))
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, response, size, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (self.cache_key(prompt, llm_string), response, len(response), now, now),
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def clear(self, **kwargs: Any) -> None:
+        """Drop every cached response."""
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        """Hit/miss counters for this process and the on-disk footprint."""
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache"
+            ).fetchone()
+        return {"hits": self.hits, "misses": self.misses, "entries": entries, "bytes": size}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds is not None and now - created_at > self.ttl_seconds
+
+    def _evict(self, now: float) -> None:
+        """Delete expired entries, then least recently used ones past max_bytes."""
+        if self.ttl_seconds is not None:
+            self._conn.execute(
+                "DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl_seconds,)
+            )
+        if self.max_bytes is None:
+            return
+        (total,) = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM llm_cache"
+        ).fetchone()
+        if total <= self.max_bytes:
+            return
+        excess = total - self.max_bytes
+        victims = []
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM llm_cache ORDER BY last_used"
+        ):
+            victims.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        self._conn.executemany("DELETE FROM llm_cache WHERE key = ?", victims)
+
+
+def create_llm_cache(config: dict) -> Optional[LLMResponseCache]:
+    """Build the response cache described by a TradingAgents config (None when disabled)."""
+    if not config.get("llm_cache_enabled", False):
+        return None
+    path = config.get("llm_cache_path") or os.path.join(
+        config["data_cache_dir"], "llm_cache.db"
+    )
+    ttl_hours = config.get("llm_cache_ttl_hours", 24 * 7)
+    max_mb = config.get("llm_cache_max_mb", 512)
+    return LLMResponseCache(
+        path,
+        namespace=f"{config['llm_provider'].lower()}|{config.get('backend_url', '')}",
+        ttl_seconds=ttl_hours * 3600 if ttl_hours else None,
+        max_bytes=int(max_mb * 1024 * 1024) if max_mb else None,
+    )
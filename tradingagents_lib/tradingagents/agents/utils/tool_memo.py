@@ -0,0 +1,119 @@
+# TradingAgents/agents/utils/tool_memo.py
+
+import json
+import threading
+from collections import OrderedDict, defaultdict
+from concurrent.futures import Future
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+from langchain_core.tools import BaseTool, StructuredTool
+
+# Trade date of the propagate() running in this context; LangChain copies
+# context into the threads that execute tool nodes
+_current_trade_date: ContextVar[Optional[str]] = ContextVar(
+    "tool_memo_trade_date", default=None
+)
+
+
+class ToolMemo:
+    """Per-run memo of Toolkit results, keyed by tool and arguments.
+
+    Entries are scoped by trade date: every analyst and every candidate
+    analysed for the same date share them (global news is fetched once per
+    date, not once per symbol), and only the most recent ``max_dates``
+    dates are kept. Concurrent identical calls wait for the first one
+    instead of repeating it. Failed calls are not memoized.
+    """
+
+    def __init__(self, max_dates: int = 2):
+        self.max_dates = max_dates
+        self._lock = threading.Lock()
+        self._dates: "OrderedDict[Optional[str], Dict[tuple, Future]]" = OrderedDict()
+        self._hits = defaultdict(int)
+        self._misses = defaultdict(int)
+
+    @contextmanager
+    def scope(self, trade_date):
+        """Attribute tool calls made inside this block to trade_date."""
+        token = _current_trade_date.set(str(trade_date))
+        try:
+            yield self
+        finally:
+            _current_trade_date.reset(token)
+
+    def call(self, tool_name: str, func, kwargs: Dict[str, Any]):
+        """Return func(**kwargs), computing it once per (date, tool, arguments)."""
+        key = (tool_name, json.dumps(kwargs, sort_keys=True, default=str))
+        with self._lock:
+            entries = self._entries(_current_trade_date.get())
+            future = entries.get(key)
+            owner = future is None
+            if owner:
+                future = entries[key] = Future()
+                self._misses[tool_name] += 1
+            else:
+                self._hits[tool_name] += 1
+
+        if not owner:
+            return future.result()
+
+        try:
+            result = func(**kwargs)
+        except BaseException as e:
+            with self._lock:
+                entries.pop(key, None)
+            future.set_exception(e)
+            raise
+        future.set_result(result)
+        return result
+
+    def wrap(self, tool: BaseTool) -> BaseTool:
+        """Memoized copy of a @tool with the same name, description and schema."""
+        func = tool.func
+
+        def memoized(**kwargs):
+            return self.call(tool.name, func, kwargs)
+
+        return StructuredTool.from_function(
+            func=memoized,
+            name=tool.name,
+            description=tool.description,
+            args_schema=tool.args_schema,
+        )
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Hits, misses and hit rate per tool, plus a "total" row."""
+        with self._lock:
+            names = sorted(set(self._hits) | set(self._misses))
+            rows = {name: (self._hits[name], self._misses[name]) for name in names}
+        rows["total"] = (
+            sum(hits for hits, _ in rows.values()),
+            sum(misses for _, misses in rows.values()),
+        )
+        return {
+            name: {
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+            }
+            for name, (hits, misses) in rows.items()
+        }
+
+    def clear(self):
+        """Forget every memoized result and reset the counters."""
+        with self._lock:
+            self._dates.clear()
+            self._hits.clear()
+            self._misses.clear()
+
+    def _entries(self, trade_date) -> Dict[tuple, Future]:
+        """Entries for one trade date, dropping the oldest dates (caller holds the lock)."""
+        if trade_date in self._dates:
+            self._dates.move_to_end(trade_date)
+        else:
+            self._dates[trade_date] = {}
+            while len(self._dates) > self.max_dates:
+                self._dates.popitem(last=False)
+        return self._dates[trade_date]
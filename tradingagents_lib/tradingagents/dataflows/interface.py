@@ -14,6 +14,7 @@ from tqdm import tqdm
 import yfinance as yf
 from openai import OpenAI
 from .config import get_config, set_config, DATA_DIR
+from .price_cache import clear_price_cache, get_price_history, prefetch_price_history
 
 
 def get_finnhub_news(
@@ -634,11 +635,14 @@ def get_YFin_data_online(
     datetime.strptime(start_date, "%Y-%m-%d")
     datetime.strptime(end_date, "%Y-%m-%d")
 
-    # Create ticker object
-    ticker = yf.Ticker(symbol.upper())
+    # Served from the batch prefetch when available, else fetched now
+    data = get_price_history(symbol, start_date, end_date)
+    if data is None:
+        # Create ticker object
+        ticker = yf.Ticker(symbol.upper())
 
-    # Fetch historical data for the specified date range
-    data = ticker.history(start=start_date, end=end_date)
+        # Fetch historical data for the specified date range
+        data = ticker.history(start=start_date, end=end_date)
 
     # Check if data is empty
     if data.empty:
@@ -0,0 +1,101 @@
+# TradingAgents/dataflows/price_cache.py
+
+import threading
+from typing import Dict, Iterable, Optional, Tuple
+
+import pandas as pd
+import yfinance as yf
+from stockstats import wrap
+
+PRICE_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+# Symbol -> daily history prefetched for the current batch
+_histories: Dict[str, pd.DataFrame] = {}
+# Symbol -> (stockstats frame, lock); indicators are computed once per frame
+_stats_frames: Dict[str, Tuple[pd.DataFrame, threading.Lock]] = {}
+_lock = threading.Lock()
+
+
+def prefetch_price_history(symbols: Iterable[str], years: int = 15) -> int:
+    """Download daily history for every symbol in one batched request.
+
+    Online price and indicator tools read the result from memory instead of
+    calling Yahoo Finance from inside the LLM loop. Returns the number of
+    symbols that came back with data.
+    """
+    symbols = sorted({symbol.upper() for symbol in symbols})
+    if not symbols:
+        return 0
+
+    end = pd.Timestamp.today().normalize() + pd.Timedelta(days=1)
+    start = end - pd.DateOffset(years=years)
+    data = yf.download(
+        symbols,
+        start=start.strftime("%Y-%m-%d"),
+        end=end.strftime("%Y-%m-%d"),
+        group_by="ticker",
+        auto_adjust=True,
+        actions=True,
+        progress=False,
+        threads=True,
+    )
+    if data is None or data.empty:
+        return 0
+
+    loaded = {}
+    for symbol in symbols:
+        if isinstance(data.columns, pd.MultiIndex):
+            if symbol not in data.columns.get_level_values(0):
+                continue
+            frame = data[symbol]
+        else:
+            frame = data
+        frame = frame.dropna(subset=["Close"])
+        if frame.empty:
+            continue
+        if frame.index.tz is not None:
+            frame = frame.tz_localize(None)
+        frame.index.name = "Date"
+        loaded[symbol] = frame
+
+    with _lock:
+        _histories.update(loaded)
+        for symbol in loaded:
+            _stats_frames.pop(symbol, None)
+    return len(loaded)
+
+
+def get_price_history(
+    symbol: str, start_date: str, end_date: str
+) -> Optional[pd.DataFrame]:
+    """Prefetched rows in [start_date, end_date), like Ticker.history (None = not prefetched)."""
+    with _lock:
+        history = _histories.get(symbol.upper())
+    if history is None:
+        return None
+    index = history.index
+    return history[
+        (index >= pd.Timestamp(start_date)) & (index < pd.Timestamp(end_date))
+    ].copy()
+
+
+def get_stats_frame(symbol: str) -> Optional[Tuple[pd.DataFrame, threading.Lock]]:
+    """Stockstats frame over the prefetched history plus the lock guarding it."""
+    with _lock:
+        cached = _stats_frames.get(symbol.upper())
+        if cached is not None:
+            return cached
+        history = _histories.get(symbol.upper())
+        if history is None:
+            return None
+        df = wrap(history[PRICE_COLUMNS].reset_index())
+        df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
+        cached = _stats_frames[symbol.upper()] = (df, threading.Lock())
+        return cached
+
+
+def clear_price_cache():
+    """Forget every prefetched history."""
+    with _lock:
+        _histories.clear()
+        _stats_frames.clear()
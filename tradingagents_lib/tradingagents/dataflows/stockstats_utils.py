@@ -4,6 +4,7 @@ from stockstats import wrap
 from typing import Annotated
 import os
 from .config import get_config
+from .price_cache import get_stats_frame
 
 
 class StockstatsUtils:
@@ -40,6 +41,15 @@ class StockstatsUtils:
             except FileNotFoundError:
                 raise Exception("Stockstats fail: Yahoo Finance data not fetched yet!")
         else:
+            # Batch prefetch (price_cache) answers from memory, indicators computed once
+            prefetched = get_stats_frame(symbol)
+            if prefetched is not None:
+                df, lock = prefetched
+                with lock:
+                    return StockstatsUtils._indicator_value(
+                        df, indicator, pd.to_datetime(curr_date).strftime("%Y-%m-%d")
+                    )
+
             # Get today's date as YYYY-mm-dd to add to cache
             today_date = pd.Timestamp.today()
             curr_date = pd.to_datetime(curr_date)
@@ -77,6 +87,10 @@ class StockstatsUtils:
             df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
             curr_date = curr_date.strftime("%Y-%m-%d")
 
+        return StockstatsUtils._indicator_value(df, indicator, curr_date)
+
+    @staticmethod
+    def _indicator_value(df, indicator, curr_date):
         df[indicator]  # trigger stockstats to calculate the indicator
         matching_rows = df[df["Date"].str.startswith(curr_date)]
 
@@ -17,6 +17,15 @@ DEFAULT_CONFIG = {
     "max_debate_rounds": 1,
     "max_risk_discuss_rounds": 1,
     "max_recur_limit": 100,
+    # Run the four analysts concurrently instead of one after another
+    "parallel_analysts": False,
     # Tool settings
     "online_tools": True,
+    # Memoize Toolkit calls per trade date (shared by agents and symbols)
+    "memoize_tools": True,
+    # LLM response cache (reruns of the same symbol/date skip the API)
+    "llm_cache_enabled": False,
+    "llm_cache_path": None,  # None = <data_cache_dir>/llm_cache.db
+    "llm_cache_ttl_hours": 24 * 7,
+    "llm_cache_max_mb": 512,
 }
@@ -3,6 +3,7 @@
 import os
 from pathlib import Path
 import json
+from contextlib import nullcontext
 from datetime import date
 from typing import Dict, Any, Tuple, List, Optional
 
@@ -15,6 +16,7 @@ from langgraph.prebuilt import ToolNode
 from tradingagents_lib.tradingagents.agents import *
 from tradingagents_lib.tradingagents.default_config import DEFAULT_CONFIG
 from tradingagents_lib.tradingagents.agents.utils.memory import FinancialSituationMemory
+from tradingagents_lib.tradingagents.agents.utils.llm_cache import create_llm_cache
 from tradingagents_lib.tradingagents.agents.utils.agent_states import (
     AgentState,
     InvestDebateState,
@@ -57,16 +59,19 @@ class TradingAgentsGraph:
             exist_ok=True,
         )
 
+        # Optional on-disk response cache (None = LangChain default, no caching)
+        self.llm_cache = create_llm_cache(self.config)
+
         # Initialize LLMs
         if self.config["llm_provider"].lower() == "openai" or self.config["llm_provider"] == "ollama" or self.config["llm_provider"] == "openrouter":
-            self.deep_thinking_llm = ChatOpenAI(model=self.config["deep_think_llm"], base_url=self.config["backend_url"])
-            self.quick_thinking_llm = ChatOpenAI(model=self.config["quick_think_llm"], base_url=self.config["backend_url"])
+            self.deep_thinking_llm = ChatOpenAI(model=self.config["deep_think_llm"], base_url=self.config["backend_url"], cache=self.llm_cache)
+            self.quick_thinking_llm = ChatOpenAI(model=self.config["quick_think_llm"], base_url=self.config["backend_url"], cache=self.llm_cache)
         elif self.config["llm_provider"].lower() == "anthropic":
-            self.deep_thinking_llm = ChatAnthropic(model=self.config["deep_think_llm"], base_url=self.config["backend_url"])
-            self.quick_thinking_llm = ChatAnthropic(model=self.config["quick_think_llm"], base_url=self.config["backend_url"])
+            self.deep_thinking_llm = ChatAnthropic(model=self.config["deep_think_llm"], base_url=self.config["backend_url"], cache=self.llm_cache)
+            self.quick_thinking_llm = ChatAnthropic(model=self.config["quick_think_llm"], base_url=self.config["backend_url"], cache=self.llm_cache)
         elif self.config["llm_provider"].lower() == "google":
-            self.deep_thinking_llm = ChatGoogleGenerativeAI(model=self.config["deep_think_llm"])
-            self.quick_thinking_llm = ChatGoogleGenerativeAI(model=self.config["quick_think_llm"])
+            self.deep_thinking_llm = ChatGoogleGenerativeAI(model=self.config["deep_think_llm"], cache=self.llm_cache)
+            self.quick_thinking_llm = ChatGoogleGenerativeAI(model=self.config["quick_think_llm"], cache=self.llm_cache)
         else:
             raise ValueError(f"Unsupported LLM provider: {self.config['llm_provider']}")
         
@@ -107,7 +112,10 @@ class TradingAgentsGraph:
         self.log_states_dict = {}  # date to full state dict
 
         # Set up the graph
-        self.graph = self.graph_setup.setup_graph(selected_analysts)
+        self.graph = self.graph_setup.setup_graph(
+            selected_analysts,
+            parallel_analysts=self.config.get("parallel_analysts", False),
+        )
 
     def _create_tool_nodes(self) -> Dict[str, ToolNode]:
         """Create tool nodes for different data sources."""
@@ -165,20 +173,31 @@ class TradingAgentsGraph:
         )
         args = self.propagator.get_graph_args()
 
-        if self.debug:
-            # Debug mode with tracing
-            trace = []
-            for chunk in self.graph.stream(init_agent_state, **args):
-                if len(chunk["messages"]) == 0:
-                    pass
-                else:
-                    chunk["messages"][-1].pretty_print()
-                    trace.append(chunk)
-
-            final_state = trace[-1]
-        else:
-            # Standard mode without tracing
-            final_state = self.graph.invoke(init_agent_state, **args)
+        # Tool results are memoized per trade date across agents and symbols
+        memo_scope = (
+            self.toolkit.memo.scope(trade_date) if self.toolkit.memo else nullcontext()
+        )
+
+        with memo_scope:
+            if self.debug:
+                # Debug mode with tracing; subgraphs=True also streams the
+                # parallel analysts, which run their tool loops in subgraphs
+                trace = []
+                for namespace, chunk in self.graph.stream(
+                    init_agent_state, subgraphs=True, **args
+                ):
+                    if len(chunk["messages"]) == 0:
+                        pass
+                    else:
+                        chunk["messages"][-1].pretty_print()
+                        # Only top-level states are full graph states
+                        if not namespace:
+                            trace.append(chunk)
+
+                final_state = trace[-1]
+            else:
+                # Standard mode without tracing
+                final_state = self.graph.invoke(init_agent_state, **args)
 
         # Store current state for reflection
         self.curr_state = final_state